@@ -26,8 +26,9 @@ class Settings(BaseSettings):
     database_url: str = "sqlite:///chatdf.db"
     cors_origins: str = "http://localhost:5173"
     token_limit: int = 5_000_000
-    worker_memory_limit: int = 512
+    worker_memory_limit: int = 512  # MB of resident memory per worker; 0 disables
     worker_pool_size: int = 4
+    worker_result_transport: str = "pickle"  # "pickle" or "arrow_ipc"
     session_duration_days: int = 7
     secure_cookies: bool = False
     upload_dir: str = "uploads"
@@ -80,7 +80,9 @@ CREATE TABLE IF NOT EXISTS datasets (
     status          TEXT NOT NULL DEFAULT 'loading' CHECK(status IN ('loading', 'ready', 'error')),
     error_message   TEXT,
     loaded_at       TEXT NOT NULL,
-    file_size_bytes INTEGER
+    file_size_bytes INTEGER,
+    version         TEXT,
+    preview_json    TEXT
 );
 
 CREATE TABLE IF NOT EXISTS token_usage (
@@ -141,6 +143,17 @@ CREATE TABLE IF NOT EXISTS query_results_cache (
     expires_at      TEXT NOT NULL
 );
 
+CREATE TABLE IF NOT EXISTS dataset_profiles (
+    url             TEXT NOT NULL,
+    version         TEXT NOT NULL,
+    column_name     TEXT NOT NULL,
+    variant         TEXT NOT NULL,
+    profile_json    TEXT NOT NULL,
+    row_count       INTEGER,
+    created_at      TEXT NOT NULL,
+    PRIMARY KEY (url, version, column_name, variant)
+);
+
 CREATE INDEX IF NOT EXISTS idx_query_cache_expires ON query_results_cache(expires_at);
 CREATE INDEX IF NOT EXISTS idx_saved_queries_user_id ON saved_queries(user_id);
 CREATE INDEX IF NOT EXISTS idx_query_history_user_id ON query_history(user_id, created_at);
@@ -367,6 +380,24 @@ async def init_db_schema(conn: aiosqlite.Connection) -> None:
     except Exception:
         pass  # Index already exists
 
+    # Migration: add version column to datasets (upstream version id)
+    try:
+        await conn.execute(
+            "ALTER TABLE datasets ADD COLUMN version TEXT"
+        )
+        await conn.commit()
+    except Exception:
+        pass  # Column already exists
+
+    # Migration: add preview_json column to datasets (preview snapshot)
+    try:
+        await conn.execute(
+            "ALTER TABLE datasets ADD COLUMN preview_json TEXT"
+        )
+        await conn.commit()
+    except Exception:
+        pass  # Column already exists
+
 
 # Backward compatibility alias
 init_db = init_db_schema
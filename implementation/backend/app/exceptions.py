@@ -32,3 +32,17 @@ class ConflictError(Exception):
     def __init__(self, message: str) -> None:
         super().__init__(message)
         self.message = message
+
+
+class QueueFullError(Exception):
+    """Raised when the worker task queue cannot take another task.
+
+    ``status_code`` is 429 when the user's own queued tasks hit their cap,
+    503 when the shared queue is full.
+    """
+
+    def __init__(self, message: str, *, status_code: int, retry_after_seconds: int) -> None:
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.retry_after_seconds = retry_after_seconds
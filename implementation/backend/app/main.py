@@ -21,7 +21,7 @@ from starlette.middleware.sessions import SessionMiddleware
 
 from app.config import get_settings
 from app.database import DatabasePool
-from app.exceptions import ConflictError, NotFoundError, RateLimitError
+from app.exceptions import ConflictError, NotFoundError, QueueFullError, RateLimitError
 from app.routers import auth, conversations, datasets, export, health, query_history, saved_queries, shared, usage
 from app.routers import settings as settings_router
 from app.routers.conversations import public_router as shared_router
@@ -29,6 +29,7 @@ from app.routers.websocket import router as ws_router
 from app.services import persistent_cache, worker_pool
 from app.services.connection_manager import ConnectionManager
 from app.workers.file_cache import startup_cleanup as file_cache_startup_cleanup
+from app.workers.result_transport import cleanup_stale as result_transport_cleanup
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +46,8 @@ async def _periodic_cache_cleanup(db_pool: DatabasePool) -> None:
     """Run persistent cache cleanup every 30 minutes.
 
     Removes expired entries from the ``query_results_cache`` table using
-    the pool's write connection.  Runs until cancelled on shutdown.
+    the pool's write connection, and stale Arrow IPC result files from
+    shared memory.  Runs until cancelled on shutdown.
     """
     while True:
         try:
@@ -54,6 +56,8 @@ async def _periodic_cache_cleanup(db_pool: DatabasePool) -> None:
             removed = await persistent_cache.cleanup(write_conn)
             if removed > 0:
                 logger.info("Cache cleanup: removed %d expired entries", removed)
+            # Arrow IPC results orphaned by tasks that died mid-handoff
+            result_transport_cleanup()
         except asyncio.CancelledError:
             break
         except Exception:
@@ -85,12 +89,19 @@ async def lifespan(application: FastAPI):
 
     # -- Worker pool --
     # Implements: spec/backend/plan.md#Lifespan (start worker pool on startup)
-    pool = worker_pool.start(settings.worker_pool_size)
+    pool = worker_pool.start(
+        settings.worker_pool_size,
+        settings.worker_result_transport,
+        settings.worker_memory_limit,
+    )
     pool.set_db_pool(db_pool)  # enable persistent query result caching
+    pool.set_notifier(application.state.connection_manager.send_to_user)  # queue positions
     application.state.worker_pool = pool
 
     # -- File cache startup cleanup (remove orphaned temp files) --
     file_cache_startup_cleanup()
+    # -- Remove Arrow IPC results orphaned by a previous run --
+    result_transport_cleanup()
 
     # -- Periodic cache cleanup --
     _cleanup_task = asyncio.create_task(_periodic_cache_cleanup(db_pool))
@@ -217,6 +228,15 @@ async def rate_limit_handler(request: Request, exc: RateLimitError):
     )
 
 
+@app.exception_handler(QueueFullError)
+async def queue_full_handler(request: Request, exc: QueueFullError):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"error": exc.message, "details": f"Retry in {exc.retry_after_seconds}s"},
+        headers={"Retry-After": str(exc.retry_after_seconds)},
+    )
+
+
 @app.exception_handler(ConflictError)
 async def conflict_handler(request: Request, exc: ConflictError):
     return JSONResponse(status_code=409, content={"error": exc.message})
@@ -70,6 +70,7 @@ class ProfileColumnRequest(BaseModel):
 
     column_name: str = Field(..., min_length=1)
     column_type: str = Field(..., min_length=1)
+    mode: Literal["exact", "approximate"] = "exact"
 
 
 class RunQueryRequest(BaseModel):
@@ -78,6 +79,10 @@ class RunQueryRequest(BaseModel):
     sql: str = Field(..., min_length=1, max_length=50000)
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=100, ge=1, le=1000)
+    # Serve the page from an earlier result instead of re-running ``sql``
+    cursor_id: str | None = Field(default=None, max_length=64)
+    sort_by: str | None = Field(default=None, max_length=500)
+    sort_desc: bool = False
 
 
 class RunQueryResponse(BaseModel):
@@ -92,6 +97,7 @@ class RunQueryResponse(BaseModel):
     total_pages: int = 1
     cached: bool = False
     limit_applied: bool = False
+    cursor_id: str | None = None
 
 
 # ---------------------------------------------------------------------------
@@ -221,6 +227,38 @@ class DatasetAckResponse(BaseModel):
     status: Literal["loading"]
 
 
+class BulkAddDatasetsRequest(BaseModel):
+    """Body for ``POST /conversations/{id}/datasets/bulk-add``."""
+
+    urls: list[str] = Field(..., min_length=1, max_length=50)
+
+
+class BulkRefreshDatasetsRequest(BaseModel):
+    """Body for ``POST /conversations/{id}/datasets/bulk-refresh``.
+
+    Without ``dataset_ids`` every ready dataset of the conversation is
+    refreshed.  ``force`` re-reads datasets whose version is unchanged.
+    """
+
+    dataset_ids: list[str] | None = Field(default=None, min_length=1, max_length=50)
+    force: bool = False
+
+
+class BulkDatasetResult(BaseModel):
+    """Outcome for one URL or dataset of a bulk add / refresh."""
+
+    url: str | None = None
+    dataset_id: str | None = None
+    status: Literal["loading", "refreshed", "unchanged", "error"]
+    error: str | None = None
+
+
+class BulkDatasetsResponse(BaseModel):
+    """Response for the bulk dataset endpoints, one result per item."""
+
+    results: list[BulkDatasetResult]
+
+
 class ClearAllResponse(BaseModel):
     """Response for ``DELETE /conversations``."""
 
@@ -28,6 +28,7 @@ import json
 import logging
 import math
 import secrets
+import time
 from datetime import datetime, timezone
 from uuid import uuid4
 
@@ -65,6 +66,9 @@ from app.models import (
 )
 from app.services import chat_service
 from app.services import dataset_service, llm_service
+from app.services.task_scheduler import INTERACTIVE, TaskContext
+from app.services.worker_pool import rows_as_lists
+from app.workers import cursor_store
 
 router = APIRouter()
 public_router = APIRouter()
@@ -1276,7 +1280,7 @@ async def fork_conversation(
 
     # Copy all datasets from source conversation
     cursor = await db.execute(
-        "SELECT url, name, row_count, column_count, schema_json, status, error_message, loaded_at, file_size_bytes, column_descriptions "
+        "SELECT url, name, row_count, column_count, schema_json, status, error_message, loaded_at, file_size_bytes, column_descriptions, version, preview_json "
         "FROM datasets WHERE conversation_id = ?",
         (conv_id,),
     )
@@ -1285,8 +1289,8 @@ async def fork_conversation(
     for ds in datasets_to_copy:
         new_ds_id = str(uuid4())
         await db.execute(
-            "INSERT INTO datasets (id, conversation_id, url, name, row_count, column_count, schema_json, status, error_message, loaded_at, file_size_bytes, column_descriptions) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "INSERT INTO datasets (id, conversation_id, url, name, row_count, column_count, schema_json, status, error_message, loaded_at, file_size_bytes, column_descriptions, version, preview_json) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
             (
                 new_ds_id,
                 fork_id,
@@ -1300,6 +1304,8 @@ async def fork_conversation(
                 ds["loaded_at"],
                 ds["file_size_bytes"],
                 ds["column_descriptions"] or "{}",
+                ds["version"],
+                ds["preview_json"],
             ),
         )
 
@@ -1410,12 +1416,19 @@ async def run_query(
     user: dict = Depends(get_current_user),
     db: aiosqlite.Connection = Depends(get_db),
 ) -> RunQueryResponse:
-    """Execute a SQL query against the conversation's loaded datasets."""
+    """Execute a SQL query against the conversation's loaded datasets.
+
+    The result (up to ``MAX_QUERY_ROWS`` rows) is kept as a server-side
+    cursor bound to this conversation and to the SQL and datasets it ran on.
+    Requests that pass back a live ``cursor_id`` for the same SQL are paged
+    and sorted from it without re-running the query; an expired or
+    non-matching cursor falls back to re-execution.
+    """
     conv_id = conversation["id"]
 
     # Fetch datasets for this conversation
     cursor = await db.execute(
-        "SELECT url, name FROM datasets WHERE conversation_id = ? AND status = 'ready'",
+        "SELECT url, name, version FROM datasets WHERE conversation_id = ? AND status = 'ready'",
         (conv_id,),
     )
     rows = await cursor.fetchall()
@@ -1426,17 +1439,34 @@ async def run_query(
             detail="No datasets loaded in this conversation",
         )
 
-    datasets_list = [{"url": row["url"], "table_name": row["name"]} for row in rows]
+    datasets_list = [
+        {"url": row["url"], "table_name": row["name"], "version": row["version"]}
+        for row in rows
+    ]
+
+    if body.cursor_id is not None:
+        start = time.monotonic()
+        page_result = await _read_cursor_page(
+            body.cursor_id, body,
+            key=cursor_store.query_key(body.sql, datasets_list), owner=conv_id,
+        )
+        if page_result is not None:
+            return _cursor_response(
+                page_result, body, body.cursor_id, (time.monotonic() - start) * 1000,
+                cached=True, limit_applied=page_result["limit_applied"],
+                total_rows=page_result["result_total_rows"],
+            )
 
     # Execute via worker pool (includes cache check)
     pool = getattr(request.app.state, "worker_pool", None)
     if pool is None:
         raise HTTPException(status_code=503, detail="Worker pool unavailable")
 
-    import time
-
     start = time.monotonic()
-    result = await pool.run_query(body.sql, datasets_list)
+    result = await pool.run_query(
+        body.sql, datasets_list, cursor=True,
+        context=TaskContext(user["id"], conv_id, INTERACTIVE),
+    )
     elapsed_ms = (time.monotonic() - start) * 1000
 
     if "error_type" in result:
@@ -1470,19 +1500,28 @@ async def run_query(
     # Detect whether an auto-LIMIT was injected by the worker
     is_limit_applied = result.pop("limit_applied", False)
 
-    # Convert row dicts to list-of-lists
-    columns = result.get("columns", [])
-    row_dicts = result.get("rows", [])
-    result_rows = [[row.get(col) for col in columns] for row in row_dicts]
-    total_rows = result.get("total_rows", len(result_rows))
-
-    # Apply server-side pagination
-    page = body.page
-    page_size = body.page_size
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-    paginated_rows = result_rows[start_idx:end_idx]
-    total_pages = math.ceil(len(result_rows) / page_size) if result_rows else 1
+    # Serve the requested page from the result's cursor, handing it to this
+    # conversation first (a cached result may carry another conversation's
+    # cursor for the same query); without one, paginate within the rows the
+    # worker returned.
+    cursor_id = result.get("cursor_id")
+    page_result = None
+    if cursor_id is not None:
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, cursor_store.bind, cursor_id, conv_id):
+            page_result = await _read_cursor_page(cursor_id, body)
+    if page_result is None:
+        cursor_id = None
+        if body.sort_by is not None:
+            raise HTTPException(status_code=400, detail="Sorting requires a result cursor")
+        result_rows = rows_as_lists(result)
+        start_idx = (body.page - 1) * body.page_size
+        page_result = {
+            "columns": result.get("columns", []),
+            "rows": result_rows[start_idx:start_idx + body.page_size],
+            "total_rows": len(result_rows),
+        }
+    total_rows = result.get("total_rows", page_result["total_rows"])
 
     # Record successful query in history
     try:
@@ -1505,16 +1544,62 @@ async def run_query(
     except Exception:
         pass  # Don't fail the request if history recording fails
 
+    return _cursor_response(
+        page_result, body, cursor_id, elapsed_ms,
+        cached=is_cached, limit_applied=is_limit_applied, total_rows=total_rows,
+    )
+
+
+async def _read_cursor_page(
+    cursor_id: str,
+    body: RunQueryRequest,
+    key: str | None = None,
+    owner: str | None = None,
+) -> dict | None:
+    """Read the page *body* asks for from a cursor, off the event loop.
+
+    Returns ``None`` if the cursor is unknown, expired, or does not match
+    *key* / *owner* (see ``cursor_store.read_page``).
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            None,
+            cursor_store.read_page,
+            cursor_id,
+            (body.page - 1) * body.page_size,
+            body.page_size,
+            body.sort_by,
+            body.sort_desc,
+            key,
+            owner,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _cursor_response(
+    page_result: dict,
+    body: RunQueryRequest,
+    cursor_id: str | None,
+    elapsed_ms: float,
+    cached: bool,
+    limit_applied: bool,
+    total_rows: int | None = None,
+) -> RunQueryResponse:
+    """Build a RunQueryResponse for one page of a result."""
+    pageable_rows = page_result["total_rows"]
     return RunQueryResponse(
-        columns=columns,
-        rows=paginated_rows,
-        total_rows=total_rows,
+        columns=page_result["columns"],
+        rows=page_result["rows"],
+        total_rows=pageable_rows if total_rows is None else total_rows,
         execution_time_ms=round(elapsed_ms, 2),
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-        cached=is_cached,
-        limit_applied=is_limit_applied,
+        page=body.page,
+        page_size=body.page_size,
+        total_pages=math.ceil(pageable_rows / body.page_size) if pageable_rows else 1,
+        cached=cached,
+        limit_applied=limit_applied,
+        cursor_id=cursor_id,
     )
 
 
@@ -4,6 +4,8 @@ Implements: spec/backend/rest_api/plan.md#routersdatasetspy
 
 Endpoints (all under /conversations/{conversation_id}/datasets):
 - POST /                          -> add_dataset
+- POST /bulk-add                  -> bulk_add_datasets
+- POST /bulk-refresh              -> bulk_refresh_datasets
 - POST /upload                    -> upload_dataset (file upload)
 - PATCH /{dataset_id}             -> rename_dataset
 - POST /{dataset_id}/refresh      -> refresh_dataset_schema
@@ -15,7 +17,6 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import math
 import os
 from datetime import datetime, timezone
 from pathlib import Path
@@ -28,6 +29,9 @@ from app.config import get_settings
 from app.dependencies import get_conversation, get_current_user, get_db
 from app.models import (
     AddDatasetRequest,
+    BulkAddDatasetsRequest,
+    BulkDatasetsResponse,
+    BulkRefreshDatasetsRequest,
     DatasetAckResponse,
     DatasetDetailResponse,
     DatasetPreviewResponse,
@@ -36,6 +40,8 @@ from app.models import (
     SuccessResponse,
 )
 from app.services import dataset_service
+from app.services.task_scheduler import BACKGROUND, INTERACTIVE, TaskContext
+from app.services.worker_pool import rows_as_lists
 
 logger = logging.getLogger(__name__)
 
@@ -60,23 +66,35 @@ def _get_worker_pool(request: Request) -> object:
     return request.app.state.worker_pool
 
 
+def _task_context(conversation: dict, priority: int = INTERACTIVE) -> TaskContext:
+    """Scheduler context for worker tasks run on behalf of *conversation*."""
+    return TaskContext(conversation["user_id"], conversation["id"], priority)
+
+
 async def _auto_profile_dataset(
-    worker_pool, connection_manager, user_id: str, dataset_id: str, url: str
+    db: aiosqlite.Connection, worker_pool, connection_manager, user_id: str, dataset: dict,
 ) -> None:
-    """Background task: profile columns after dataset load, send results via WS."""
+    """Background task: profile columns after dataset load, send results via WS.
+
+    Columns already profiled for the same URL and version are served from
+    the profile store (see dataset_service.profile_dataset).
+    """
     try:
-        profile_result = await worker_pool.profile_columns(url)
+        profile_result = await dataset_service.profile_dataset(
+            db, dataset, worker_pool,
+            context=TaskContext(user_id, dataset["conversation_id"], BACKGROUND),
+        )
         if connection_manager is not None and profile_result.get("profiles"):
             await connection_manager.send_to_user(
                 user_id,
                 {
                     "type": "dataset_profiled",
-                    "dataset_id": dataset_id,
+                    "dataset_id": dataset["id"],
                     "profiles": profile_result["profiles"],
                 },
             )
     except Exception:
-        logger.warning("Auto-profile failed for dataset %s", dataset_id, exc_info=True)
+        logger.warning("Auto-profile failed for dataset %s", dataset["id"], exc_info=True)
 
 
 # ---------------------------------------------------------------------------
@@ -90,7 +108,7 @@ async def _get_dataset_or_404(
     """Fetch a dataset by ID scoped to conversation_id. Raise 404 if not found."""
     cursor = await db.execute(
         "SELECT id, conversation_id, url, name, row_count, column_count, "
-        "schema_json, status, error_message, loaded_at, file_size_bytes, column_descriptions "
+        "schema_json, status, error_message, loaded_at, file_size_bytes, column_descriptions, version "
         "FROM datasets WHERE id = ? AND conversation_id = ?",
         (dataset_id, conversation_id),
     )
@@ -125,6 +143,59 @@ def _parse_schema_json(schema_json: str | None) -> dict | None:
 # ---------------------------------------------------------------------------
 
 
+async def _load_dataset_in_background(
+    db: aiosqlite.Connection, worker_pool, connection_manager, user_id: str,
+    dataset: dict, context: TaskContext, profile: bool = True,
+) -> dict | None:
+    """Background task: load a dataset row, streaming progress via WS, then profile it.
+
+    Returns the loaded dataset, or ``None`` if it failed to load.
+    """
+
+    async def notify(message: dict) -> None:
+        if connection_manager is not None:
+            await connection_manager.send_to_user(user_id, message)
+
+    try:
+        dataset = await dataset_service.load_dataset(
+            db, dataset["id"], dataset["url"], worker_pool, context=context, notify=notify,
+        )
+    except ValueError as exc:
+        logger.info("Dataset %s failed to load: %s", dataset["id"], exc)
+        return None
+
+    if profile:
+        await _auto_profile_dataset(db, worker_pool, connection_manager, user_id, dataset)
+    return dataset
+
+
+async def _bulk_load_in_background(
+    db: aiosqlite.Connection, worker_pool, connection_manager, user_id: str,
+    datasets: list[dict], context: TaskContext,
+) -> None:
+    """Background task: load several dataset rows side by side, then profile them.
+
+    The loads share dataset_service's ``MAX_CONCURRENT_LOADS`` limit.  The
+    auto-profiles start once every load has finished and run one at a
+    time, so they stay within that limit and never queue ahead of the
+    bulk's own loads.
+    """
+    loaded = await asyncio.gather(
+        *(
+            _load_dataset_in_background(
+                db, worker_pool, connection_manager, user_id, dataset, context, profile=False,
+            )
+            for dataset in datasets
+        ),
+        return_exceptions=True,
+    )
+    for dataset, result in zip(datasets, loaded):
+        if isinstance(result, BaseException):
+            logger.error("Loading dataset %s failed", dataset["id"], exc_info=result)
+        elif result is not None:
+            await _auto_profile_dataset(db, worker_pool, connection_manager, user_id, result)
+
+
 @router.post("", status_code=201, response_model=DatasetAckResponse)
 async def add_dataset(
     request: Request,
@@ -133,47 +204,103 @@ async def add_dataset(
     user: dict = Depends(get_current_user),
     db: aiosqlite.Connection = Depends(get_db),
 ) -> DatasetAckResponse:
-    """Add a dataset to the conversation via the validation pipeline."""
+    """Add a dataset to the conversation via the validation pipeline.
+
+    Only the cheap checks run before responding; the dataset row starts out
+    ``loading`` and is loaded in the background, with progress, the loaded
+    schema or the error sent over the WebSocket.
+    """
     worker_pool = _get_worker_pool(request)
 
     try:
-        result = await dataset_service.add_dataset(
-            db, conversation["id"], body.url, worker_pool, name=body.name
+        dataset = await dataset_service.start_dataset(
+            db, conversation["id"], body.url, name=body.name,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    # Send dataset_loaded WS event so frontend can update from "loading" to "ready"
     connection_manager = getattr(request.app.state, "connection_manager", None)
-    if connection_manager is not None:
-        await connection_manager.send_to_user(
-            user["id"],
-            {
-                "type": "dataset_loaded",
-                "dataset": {
-                    "id": result["id"],
-                    "conversation_id": conversation["id"],
-                    "url": result["url"],
-                    "name": result["name"],
-                    "row_count": result["row_count"],
-                    "column_count": result["column_count"],
-                    "schema_json": result["schema_json"],
-                    "status": "ready",
-                    "error_message": None,
-                    "file_size_bytes": result.get("file_size_bytes"),
-                },
-            },
+    load_task = asyncio.create_task(
+        _load_dataset_in_background(
+            db, worker_pool, connection_manager, user["id"], dataset,
+            _task_context(conversation),
         )
+    )
+    load_task.add_done_callback(_log_task_exception)
+
+    return DatasetAckResponse(dataset_id=dataset["id"], status="loading")
+
+
+# ---------------------------------------------------------------------------
+# POST /conversations/{conversation_id}/datasets/bulk-add
+# Add several datasets at once, loading them concurrently
+# ---------------------------------------------------------------------------
+
+
+@router.post("/bulk-add", status_code=201, response_model=BulkDatasetsResponse)
+async def bulk_add_datasets(
+    request: Request,
+    body: BulkAddDatasetsRequest,
+    conversation: dict = Depends(get_conversation),
+    user: dict = Depends(get_current_user),
+    db: aiosqlite.Connection = Depends(get_db),
+) -> BulkDatasetsResponse:
+    """Add several datasets, one result per distinct URL.
 
-    # Fire-and-forget: auto-profile columns in the background
-    profile_task = asyncio.create_task(
-        _auto_profile_dataset(
-            worker_pool, connection_manager, user["id"], result["id"], result["url"]
+    Accepted URLs get a ``loading`` row each and are loaded in the
+    background side by side, as for ``POST /``, then profiled; rejected
+    ones (bad format, duplicate, over the limit) report why.
+    """
+    worker_pool = _get_worker_pool(request)
+    connection_manager = getattr(request.app.state, "connection_manager", None)
+    context = _task_context(conversation)
+
+    items = await dataset_service.start_datasets(db, conversation["id"], body.urls)
+
+    results = []
+    started = []
+    for item in items:
+        if "error" in item:
+            results.append({"url": item["url"], "status": "error", "error": item["error"]})
+            continue
+        started.append(item["dataset"])
+        results.append({"url": item["url"], "dataset_id": item["dataset"]["id"], "status": "loading"})
+
+    if started:
+        load_task = asyncio.create_task(
+            _bulk_load_in_background(
+                db, worker_pool, connection_manager, user["id"], started, context,
+            )
         )
-    )
-    profile_task.add_done_callback(_log_task_exception)
+        load_task.add_done_callback(_log_task_exception)
+
+    return BulkDatasetsResponse(results=results)
+
+
+# ---------------------------------------------------------------------------
+# POST /conversations/{conversation_id}/datasets/bulk-refresh
+# Refresh several datasets at once, skipping unchanged ones
+# ---------------------------------------------------------------------------
 
-    return DatasetAckResponse(dataset_id=result["id"], status="loading")
+
+@router.post("/bulk-refresh", response_model=BulkDatasetsResponse)
+async def bulk_refresh_datasets(
+    request: Request,
+    body: BulkRefreshDatasetsRequest,
+    conversation: dict = Depends(get_conversation),
+    db: aiosqlite.Connection = Depends(get_db),
+) -> BulkDatasetsResponse:
+    """Re-fetch the schema of several datasets concurrently.
+
+    Datasets whose upstream version is unchanged are reported
+    ``unchanged`` without being re-read, unless ``force`` is set.
+    """
+    results = await dataset_service.refresh_datasets(
+        db, conversation["id"], _get_worker_pool(request),
+        dataset_ids=body.dataset_ids, context=_task_context(conversation),
+        force=body.force,
+    )
+    return BulkDatasetsResponse(results=results)
 
 
 # ---------------------------------------------------------------------------
@@ -239,7 +366,7 @@ async def upload_dataset(
 
     # 6. Extract schema using worker pool (local file path)
     local_path = str(saved_path.resolve())
-    schema_result = await worker_pool.get_schema(local_path)
+    schema_result = await worker_pool.get_schema(local_path, context=_task_context(conversation))
     if "error_type" in schema_result:
         # Clean up the saved file on schema extraction failure
         saved_path.unlink(missing_ok=True)
@@ -259,11 +386,17 @@ async def upload_dataset(
     file_size_bytes = len(content)
     stored_url = f"file://{local_path}"
 
+    preview_json = dataset_service.serialize_preview(schema_result)
+
     await db.execute(
         "INSERT INTO datasets "
-        "(id, conversation_id, url, name, row_count, column_count, schema_json, status, error_message, loaded_at, file_size_bytes) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (dataset_id, conversation_id, stored_url, table_name, row_count, column_count, schema_json, "ready", None, now, file_size_bytes),
+        "(id, conversation_id, url, name, row_count, column_count, schema_json, status, error_message, loaded_at, "
+        "file_size_bytes, preview_json) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            dataset_id, conversation_id, stored_url, table_name, row_count, column_count, schema_json,
+            "ready", None, now, file_size_bytes, preview_json,
+        ),
     )
     await db.commit()
 
@@ -348,7 +481,9 @@ async def refresh_dataset_schema(
     worker_pool = _get_worker_pool(request)
 
     try:
-        result = await dataset_service.refresh_schema(db, dataset_id, worker_pool)
+        result = await dataset_service.refresh_schema(
+            db, dataset_id, worker_pool, context=_task_context(conversation)
+        )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -375,14 +510,22 @@ async def refresh_dataset_schema(
 async def profile_dataset(
     request: Request,
     dataset_id: str,
+    sampling: str = Query(default="prefix", pattern="^(prefix|row_groups|full)$"),
     conversation: dict = Depends(get_conversation),
     db: aiosqlite.Connection = Depends(get_db),
 ):
-    """Compute per-column profiling statistics for a dataset."""
+    """Compute per-column profiling statistics for a dataset.
+
+    Columns profiled before for the same URL and version are served from
+    the profile store.  *sampling* picks the rows profiled: the first 100K (``prefix``), 100K
+    from row groups spread over the file (``row_groups``) or all (``full``).
+    """
     ds = await _get_dataset_or_404(db, dataset_id, conversation["id"])
 
     worker_pool = _get_worker_pool(request)
-    result = await worker_pool.profile_columns(ds["url"])
+    result = await dataset_service.profile_dataset(
+        db, ds, worker_pool, context=_task_context(conversation), sampling=sampling,
+    )
 
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
@@ -406,16 +549,23 @@ async def profile_single_column(
     conversation: dict = Depends(get_conversation),
     db: aiosqlite.Connection = Depends(get_db),
 ):
-    """Profile a single column with detailed statistics."""
+    """Profile a single column with detailed statistics (stored per dataset version).
+
+    ``mode="approximate"`` estimates them from a mergeable column sketch,
+    with error bounds, instead of computing them exactly.
+    """
     ds = await _get_dataset_or_404(db, dataset_id, conversation["id"])
 
     worker_pool = _get_worker_pool(request)
-    result = await worker_pool.profile_column(
-        ds["url"], ds["name"], body.column_name, body.column_type
+    result = await dataset_service.profile_dataset_column(
+        db, ds, body.column_name, body.column_type, worker_pool,
+        context=_task_context(conversation), mode=body.mode,
     )
 
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
+    if "error_type" in result:
+        raise HTTPException(status_code=500, detail=result.get("message", "Profiling failed"))
 
     return result
 
@@ -464,67 +614,47 @@ async def preview_dataset(
     worker_pool = _get_worker_pool(request)
     table_name = ds["name"]
 
-    # Build SQL based on sample_method
-    if sample_method == "head":
-        sql = f'SELECT * FROM "{table_name}" LIMIT {sample_size}'
-
-    elif sample_method == "tail":
-        sql = (
-            f'SELECT * FROM ('
-            f'SELECT *, ROW_NUMBER() OVER () as _rn FROM "{table_name}"'
-            f') sub ORDER BY _rn DESC LIMIT {sample_size}'
-        )
-
-    elif sample_method == "random":
-        sql = f'SELECT * FROM "{table_name}" ORDER BY RANDOM() LIMIT {sample_size}'
-
-    elif sample_method == "stratified":
-        # Validate sample_column exists in schema
-        schema_json = ds.get("schema_json", "[]")
-        try:
-            columns_schema = json.loads(schema_json) if schema_json else []
-        except (json.JSONDecodeError, TypeError):
-            columns_schema = []
-        column_names = [c.get("name", "") for c in columns_schema if isinstance(c, dict)]
-        if sample_column not in column_names:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Column '{sample_column}' not found in dataset schema",
-            )
-
-        # Get distinct count to compute per-group limit
-        count_sql = f'SELECT COUNT(DISTINCT "{sample_column}") as cnt FROM "{table_name}"'
-        datasets_arg = [{"url": ds["url"], "table_name": table_name}]
-        count_result = await worker_pool.run_query(count_sql, datasets_arg)
-        if "error_type" in count_result:
-            raise HTTPException(
-                status_code=500,
-                detail=count_result.get("message", "Failed to count distinct values"),
-            )
-        count_rows = count_result.get("rows", [])
-        num_distinct = count_rows[0].get("cnt", 1) if count_rows else 1
-        num_distinct = max(num_distinct, 1)
-        per_group = math.ceil(sample_size / num_distinct)
-
-        sql = (
-            f'SELECT * FROM ('
-            f'SELECT *, ROW_NUMBER() OVER (PARTITION BY "{sample_column}" ORDER BY RANDOM()) as _rn '
-            f'FROM "{table_name}"'
-            f') sub WHERE _rn <= {per_group} LIMIT {sample_size}'
-        )
-
-    elif sample_method == "percentage":
+    # Tail, random and stratified samples read only the row groups they
+    # touch (see workers/sampler.py); percentage is a random sample.
+    method = sample_method
+    if sample_method == "percentage":
         total_rows = ds["row_count"] or 0
-        computed_count = max(1, min(100, round(total_rows * sample_percentage / 100)))
-        sql = f'SELECT * FROM "{table_name}" ORDER BY RANDOM() LIMIT {computed_count}'
-
-    else:
-        # Should not reach here due to regex validation, but just in case
-        sql = f'SELECT * FROM "{table_name}" LIMIT {sample_size}'
+        sample_size = max(1, min(100, round(total_rows * sample_percentage / 100)))
+        method = "random"
 
-    datasets = [{"url": ds["url"], "table_name": table_name}]
+    # Head and random previews come from the snapshot stored at load time,
+    # so they need no worker; datasets without one fall through.
+    result = None
+    if method in ("head", "random"):
+        result = await dataset_service.snapshot_preview(db, ds["id"], method, sample_size)
 
-    result = await worker_pool.run_query(sql, datasets)
+    if result is None and method == "head":
+        sql = f'SELECT * FROM "{table_name}" LIMIT {sample_size}'
+        datasets = [{"url": ds["url"], "table_name": table_name}]
+        result = await worker_pool.run_query(sql, datasets, context=_task_context(conversation))
+
+    elif result is None:
+        if sample_method == "stratified":
+            # Validate sample_column exists in schema
+            schema_json = ds.get("schema_json", "[]")
+            try:
+                columns_schema = json.loads(schema_json) if schema_json else []
+            except (json.JSONDecodeError, TypeError):
+                columns_schema = []
+            column_names = [c.get("name", "") for c in columns_schema if isinstance(c, dict)]
+            if sample_column not in column_names:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Column '{sample_column}' not found in dataset schema",
+                )
+
+        result = await worker_pool.sample_dataset(
+            ds["url"],
+            method,
+            sample_size,
+            column=sample_column if sample_method == "stratified" else None,
+            context=_task_context(conversation),
+        )
 
     if "error_type" in result:
         raise HTTPException(
@@ -532,12 +662,9 @@ async def preview_dataset(
             detail=result.get("message", "Preview query failed"),
         )
 
-    # Convert row dicts to list-of-lists for the response
-    columns = result.get("columns", [])
-    row_dicts = result.get("rows", [])
-    # Filter out internal columns added by window functions
-    display_columns = [c for c in columns if c != "_rn"]
-    rows = [[row.get(col) for col in display_columns] for row in row_dicts]
+    # Convert rows to list-of-lists for the response
+    display_columns = result.get("columns", [])
+    rows = rows_as_lists(result, display_columns)
 
     return DatasetPreviewResponse(
         columns=display_columns,
@@ -84,6 +84,21 @@ async def cache_stats(request: Request):
     }
 
 
+@router.get("/workers")
+async def worker_stats(request: Request):
+    """Return worker pool statistics (scan registry hit rates, tracked, queued and routed tasks)."""
+    pool = getattr(request.app.state, "worker_pool", None)
+    if pool is None:
+        raise HTTPException(status_code=503, detail="Worker pool unavailable")
+
+    return {
+        "scan_registry": pool.scan_registry_stats,
+        "tasks": pool.task_stats,
+        "scheduler": pool.scheduler_stats,
+        "routing": pool.routing_stats,
+    }
+
+
 @router.post("/cache/clear")
 async def cache_clear(request: Request):
     """Clear the query cache. Useful for debugging."""
@@ -0,0 +1,105 @@
+"""Dataset-affinity routing of worker tasks to worker lanes.
+
+A single ``multiprocessing.Pool`` hands each task to whichever worker
+takes it first, so a table's warm state -- the worker's scan registry,
+its file handles, the pages it just read -- is usually on a different
+worker than the next query against that table.  The pool is therefore
+split into *lanes*, one single-worker Pool each, and tasks are routed to
+a lane by consistent hashing on the dataset URLs they touch: the five
+queries of an LLM turn against one table all land on the same worker.
+
+Each lane runs one task at a time, so a task never waits behind a busy
+lane while another sits idle: it goes to the first idle lane in ring
+order from its hash -- its own lane when that is free, otherwise the
+next one, so a hot dataset spills over a stable sequence of lanes.  Only
+when every lane is busy do bounded loads apply: a lane is chosen while
+it holds fewer than ``ceil(LOAD_FACTOR * (tasks + 1) / lanes)`` routed
+tasks, walking the ring the same way.
+
+All methods run on the event loop thread; no locking is needed.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import math
+from contextlib import contextmanager
+
+LOAD_FACTOR = 1.25   # max lane load relative to the average
+RING_REPLICAS = 64   # points per lane on the hash ring
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class AffinityRouter:
+    """Pick a worker lane for a task from the dataset URLs it touches."""
+
+    def __init__(
+        self,
+        lanes: int,
+        load_factor: float = LOAD_FACTOR,
+        replicas: int = RING_REPLICAS,
+    ) -> None:
+        self._load = [0] * lanes
+        self._load_factor = load_factor
+        ring = sorted(
+            (_hash(f"lane-{lane}-{i}"), lane)
+            for lane in range(lanes)
+            for i in range(replicas)
+        )
+        self._points = [point for point, _lane in ring]
+        self._owners = [lane for _point, lane in ring]
+        self._affine = 0
+        self._spilled = 0
+
+    @contextmanager
+    def route(self, urls: list[str]):
+        """Yield the lane to run a task on for the ``with`` block's duration."""
+        lane = self._pick(urls)
+        self._load[lane] += 1
+        try:
+            yield lane
+        finally:
+            self._load[lane] -= 1
+
+    def _pick(self, urls: list[str]) -> int:
+        lanes = len(self._load)
+        if lanes == 1:
+            return 0
+        if not urls:
+            return min(range(lanes), key=self._load.__getitem__)
+        order = self._ring_order(urls)
+        lane = next((lane for lane in order if self._load[lane] == 0), None)
+        if lane is None:
+            cap = math.ceil(self._load_factor * (sum(self._load) + 1) / lanes)
+            # The cap always leaves some lane below it.
+            lane = next(lane for lane in order if self._load[lane] < cap)
+        if lane == order[0]:
+            self._affine += 1
+        else:
+            self._spilled += 1
+        return lane
+
+    def _ring_order(self, urls: list[str]) -> list[int]:
+        """Return every lane once, in ring order from the hash of *urls*."""
+        start = bisect.bisect(self._points, _hash("\n".join(sorted(set(urls)))))
+        order: list[int] = []
+        for i in range(len(self._points)):
+            lane = self._owners[(start + i) % len(self._points)]
+            if lane not in order:
+                order.append(lane)
+                if len(order) == len(self._load):
+                    break
+        return order
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "lanes": len(self._load),
+            "load": list(self._load),
+            "affine": self._affine,
+            "spilled": self._spilled,
+        }
@@ -146,7 +146,11 @@ async def process_message(
         # -------------------------------------------------------------------
         # Step 6: Fetch datasets
         # -------------------------------------------------------------------
-        datasets = await dataset_service.get_datasets(db, conversation_id)
+        # Datasets still loading (or failed) have no schema to offer yet.
+        datasets = [
+            ds for ds in await dataset_service.get_datasets(db, conversation_id)
+            if ds.get("status", "ready") == "ready"
+        ]
 
         # -------------------------------------------------------------------
         # Step 6b: Read user's selected model from user_settings
@@ -175,6 +179,7 @@ async def process_message(
             db=db,
             conversation_id=conversation_id,
             model_id=selected_model,
+            user_id=user_id,
         )
 
         # -------------------------------------------------------------------
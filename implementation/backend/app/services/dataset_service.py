@@ -5,22 +5,46 @@ Implements: spec/backend/dataset_handling/plan.md
 Provides:
 - ``validate_url(url)``: Format check for http/https URL.
 - ``add_dataset(db, conversation_id, url, worker_pool)``: 6-step pipeline.
+- ``start_dataset(db, conversation_id, url)``: Steps 1-3, insert a ``loading`` row.
+- ``load_dataset(db, dataset_id, url, worker_pool)``: Steps 4-6 for that row,
+  reporting progress as it goes; run it in the background.
 - ``remove_dataset(db, dataset_id)``: Delete from datasets table.
+- ``start_datasets(db, conversation_id, urls)``: start_dataset for many URLs.
 - ``refresh_schema(db, dataset_id, worker_pool)``: Re-run steps 4-5, update row.
+- ``refresh_datasets(db, conversation_id, worker_pool)``: Refresh many datasets
+  concurrently, skipping those whose version is unchanged.
+- ``profile_dataset(db, dataset, worker_pool)``: Column profiles, served from
+  the profile store where possible.
+- ``profile_dataset_column(db, dataset, column_name, column_type, worker_pool)``:
+  Detailed profile of one column, likewise.
+- ``snapshot_preview(db, dataset_id, method, sample_size)``: Head or random
+  preview rows from the snapshot stored at load time, without a worker.
 - ``get_datasets(db, conversation_id)``: Query all datasets for a conversation.
 - ``_next_table_name(db, conversation_id)``: Auto-naming: table1, table2, ...
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
+import random
 import re
+import weakref
+from dataclasses import replace
 from datetime import datetime, timezone
+from typing import Any
 from uuid import uuid4
 
 import aiosqlite
+from pydantic import TypeAdapter
+from pydantic_core import PydanticSerializationError
+
+from app.exceptions import QueueFullError
+from app.services import profile_store, ws_messages
+from app.services.task_scheduler import TaskContext
+from app.workers import file_cache, sketches
 
 logger = logging.getLogger(__name__)
 
@@ -29,10 +53,21 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 MAX_DATASETS_PER_CONVERSATION = 50
+MAX_CONCURRENT_LOADS = 4       # dataset loads waiting on the worker pool at once
+PROGRESS_POLL_SECONDS = 0.5    # how often a load checks its progress record
+LOAD_QUEUE_ATTEMPTS = 12       # tries at a load while the worker queue is full
+MAX_PREVIEW_BYTES = 256 * 1024  # larger preview snapshots are not stored
+
+# Encodes preview snapshots the way the preview response model encodes live
+# rows (ISO dates, NaN as null, ...), so both serve identical JSON.
+_PREVIEW_ENCODER = TypeAdapter(Any)
 
 # Regex: http or https scheme, no spaces
 _URL_PATTERN = re.compile(r"^https?://\S+$")
 
+# One semaphore per event loop bounding concurrent loads (see _load_slots)
+_load_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
 
 # ---------------------------------------------------------------------------
 # validate_url
@@ -71,29 +106,45 @@ async def _next_table_name(db: aiosqlite.Connection, conversation_id: str) -> st
 
 
 # ---------------------------------------------------------------------------
-# add_dataset
-# Implements: spec/backend/dataset_handling/plan.md#validation-pipeline
+# _ingest
+# Implements: spec/backend/dataset_handling/plan.md#validation-pipeline (steps 4-5)
 # ---------------------------------------------------------------------------
 
 
-async def add_dataset(
+async def _ingest(url: str, worker_pool: object, context: TaskContext | None) -> dict:
+    """Validate *url* and extract its schema via ``worker_pool.ingest_dataset``.
+
+    Returns the worker result (``file_size_bytes``, ``columns``,
+    ``row_count``, ``version``).
+    Raises ``ValueError`` with the worker's message if either step failed.
+    """
+    result = await worker_pool.ingest_dataset(url, context=context)
+    if not result.get("valid"):
+        raise ValueError(result.get("error") or result.get("message") or "Could not access URL")
+    return result
+
+
+# ---------------------------------------------------------------------------
+# start_dataset
+# Implements: spec/backend/dataset_handling/plan.md#validation-pipeline (steps 1-3)
+# ---------------------------------------------------------------------------
+
+
+async def start_dataset(
     db: aiosqlite.Connection,
     conversation_id: str,
     url: str,
-    worker_pool: object,
     name: str | None = None,
 ) -> dict:
-    """Run the 6-step validation pipeline and persist a new dataset.
+    """Run the cheap checks and insert a ``loading`` row for *url*.
 
     Steps:
     1. Format check (validate_url)
-    2. Duplicate check (same URL in this conversation)
+    2. Duplicate check (same URL in this conversation, unless that load failed;
+       the failed row is replaced so the URL can be retried)
     3. Limit check (MAX_DATASETS_PER_CONVERSATION)
-    4. HEAD + magic bytes via worker_pool.validate_url
-    5. Schema extraction via worker_pool.get_schema
-    6. Persist to datasets table
 
-    Returns the created dataset dict.
+    Returns the created dataset dict; pass its ``id`` to :func:`load_dataset`.
     Raises ``ValueError`` with a user-facing message on any failure.
     """
     # Step 1: Format check
@@ -101,11 +152,15 @@ async def add_dataset(
 
     # Step 2: Duplicate check
     cursor = await db.execute(
-        "SELECT 1 FROM datasets WHERE conversation_id = ? AND url = ?",
+        "SELECT 1 FROM datasets WHERE conversation_id = ? AND url = ? AND status != 'error'",
         (conversation_id, url),
     )
     if await cursor.fetchone() is not None:
         raise ValueError("This dataset is already loaded")
+    await db.execute(
+        "DELETE FROM datasets WHERE conversation_id = ? AND url = ? AND status = 'error'",
+        (conversation_id, url),
+    )
 
     # Step 3: Limit check
     cursor = await db.execute(
@@ -114,27 +169,9 @@ async def add_dataset(
     )
     row = await cursor.fetchone()
     if row["cnt"] >= MAX_DATASETS_PER_CONVERSATION:
+        await db.commit()
         raise ValueError("Maximum 50 datasets reached")
 
-    # Step 4: HEAD + magic bytes
-    validate_result = await worker_pool.validate_url(url)
-    if not validate_result.get("valid"):
-        error_msg = validate_result.get("error", "Could not access URL")
-        raise ValueError(error_msg)
-
-    # Capture file_size_bytes from validation result
-    file_size_bytes = validate_result.get("file_size_bytes")
-
-    # Step 5: Schema extraction
-    schema_result = await worker_pool.get_schema(url)
-    if "error" in schema_result:
-        raise ValueError(schema_result["error"])
-
-    # Step 6: Persist
-    columns = schema_result.get("columns", [])
-    row_count = schema_result.get("row_count", 0)
-    column_count = len(columns)
-    schema_json = json.dumps(columns)
     if not name:
         name = await _next_table_name(db, conversation_id)
 
@@ -143,9 +180,9 @@ async def add_dataset(
 
     await db.execute(
         "INSERT INTO datasets "
-        "(id, conversation_id, url, name, row_count, column_count, schema_json, status, error_message, loaded_at, file_size_bytes) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (dataset_id, conversation_id, url, name, row_count, column_count, schema_json, "ready", None, now, file_size_bytes),
+        "(id, conversation_id, url, name, row_count, column_count, schema_json, status, error_message, loaded_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (dataset_id, conversation_id, url, name, 0, 0, "[]", "loading", None, now),
     )
     await db.commit()
 
@@ -154,16 +191,232 @@ async def add_dataset(
         "conversation_id": conversation_id,
         "url": url,
         "name": name,
-        "row_count": row_count,
-        "column_count": column_count,
-        "schema_json": schema_json,
-        "status": "ready",
+        "row_count": 0,
+        "column_count": 0,
+        "schema_json": "[]",
+        "status": "loading",
         "error_message": None,
         "loaded_at": now,
-        "file_size_bytes": file_size_bytes,
+        "file_size_bytes": None,
+        "version": None,
     }
 
 
+# ---------------------------------------------------------------------------
+# start_datasets
+# ---------------------------------------------------------------------------
+
+
+async def start_datasets(
+    db: aiosqlite.Connection, conversation_id: str, urls: list[str]
+) -> list[dict]:
+    """Call :func:`start_dataset` for each distinct URL in *urls*, in order.
+
+    Returns one item per distinct URL: ``{"url", "dataset"}`` with the
+    created ``loading`` row, or ``{"url", "error"}`` with the reason it was
+    rejected.  The caller loads the started rows, typically all at once.
+    """
+    items = []
+    for url in dict.fromkeys(urls):
+        try:
+            items.append({"url": url, "dataset": await start_dataset(db, conversation_id, url)})
+        except ValueError as exc:
+            items.append({"url": url, "error": str(exc)})
+    return items
+
+
+# ---------------------------------------------------------------------------
+# load_dataset
+# Implements: spec/backend/dataset_handling/plan.md#validation-pipeline (steps 4-6)
+# ---------------------------------------------------------------------------
+
+
+def _load_slots() -> asyncio.Semaphore:
+    """Return the semaphore bounding concurrent loads on the running loop."""
+    loop = asyncio.get_running_loop()
+    slots = _load_semaphores.get(loop)
+    if slots is None:
+        slots = _load_semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_LOADS)
+    return slots
+
+
+async def _ingest_with_progress(
+    dataset_id: str, url: str, worker_pool: object, context: TaskContext | None, notify
+) -> dict:
+    """Run ``worker_pool.ingest_dataset``, relaying its progress record to *notify*.
+
+    The worker runs in another process, so its phase and byte counts are
+    read from the file_cache progress record it keeps (see
+    file_cache.report_progress) every ``PROGRESS_POLL_SECONDS``.
+    """
+    ingest = asyncio.ensure_future(worker_pool.ingest_dataset(url, context=context))
+    last = None
+    try:
+        while True:
+            done, _ = await asyncio.wait({ingest}, timeout=PROGRESS_POLL_SECONDS)
+            if done:
+                return ingest.result()
+            progress = file_cache.read_progress(url)
+            if notify is not None and progress and progress != last:
+                last = progress
+                await notify(ws_messages.dataset_loading(
+                    dataset_id=dataset_id,
+                    url=url,
+                    phase=progress.get("phase"),
+                    bytes_done=progress.get("done"),
+                    bytes_total=progress.get("total"),
+                ))
+    finally:
+        ingest.cancel()  # no-op once it has finished
+
+
+async def _ingest_when_admitted(
+    dataset_id: str, url: str, worker_pool: object, context: TaskContext, notify
+) -> dict:
+    """Run :func:`_ingest_with_progress`, waiting out a full worker queue.
+
+    On ``QueueFullError`` the ingest is retried after the suggested delay,
+    up to ``LOAD_QUEUE_ATTEMPTS`` tries in all; the last error propagates.
+    """
+    attempt = 1
+    while True:
+        try:
+            return await _ingest_with_progress(dataset_id, url, worker_pool, context, notify)
+        except QueueFullError as exc:
+            if attempt >= LOAD_QUEUE_ATTEMPTS:
+                raise
+            attempt += 1
+            logger.info("Worker queue full loading dataset %s; retrying", dataset_id)
+            await asyncio.sleep(exc.retry_after_seconds)
+
+
+async def load_dataset(
+    db: aiosqlite.Connection,
+    dataset_id: str,
+    url: str,
+    worker_pool: object,
+    context: TaskContext | None = None,
+    notify=None,
+) -> dict:
+    """Run steps 4-6 of the validation pipeline for a row made by :func:`start_dataset`.
+
+    Steps:
+    4. Probe + magic bytes and
+    5. Schema extraction, both in one worker task via worker_pool.ingest_dataset
+    6. Mark the row ``ready`` with its schema (or ``error`` with the message)
+
+    At most ``MAX_CONCURRENT_LOADS`` loads wait on the worker pool at once;
+    the rest queue here.  Loads are therefore internal tasks, exempt from
+    the user's pending cap (see task_scheduler.py), and a full worker
+    queue delays a load instead of failing it.  *notify*, an optional async ``notify(message)``,
+    receives ``dataset_loading`` events (phase, bytes downloaded) while the
+    load runs and ``dataset_loaded`` or ``dataset_error`` when it ends.
+
+    Returns the ready dataset dict.
+    Raises ``ValueError`` with a user-facing message if the load failed or
+    the row was removed meanwhile.
+    """
+    if notify is not None:
+        await notify(ws_messages.dataset_loading(dataset_id=dataset_id, url=url, phase="queued"))
+
+    context = replace(context or TaskContext(), internal=True)
+    async with _load_slots():
+        try:
+            result = await _ingest_when_admitted(dataset_id, url, worker_pool, context, notify)
+        except QueueFullError as exc:
+            result = {"valid": False, "error": exc.message}
+        except Exception:
+            logger.exception("Loading dataset %s failed", dataset_id)
+            result = {"valid": False, "error": "Unexpected error during dataset loading"}
+
+    if not result.get("valid"):
+        error = result.get("error") or result.get("message") or "Could not access URL"
+        cursor = await db.execute(
+            "UPDATE datasets SET status = ?, error_message = ? WHERE id = ?",
+            ("error", error, dataset_id),
+        )
+        await db.commit()
+        if notify is not None and cursor.rowcount:
+            await notify(ws_messages.dataset_error(dataset_id=dataset_id, error=error))
+        raise ValueError(error)
+
+    # Step 6: Persist
+    columns = result.get("columns", [])
+    row_count = result.get("row_count", 0)
+    column_count = len(columns)
+    schema_json = json.dumps(columns)
+    file_size_bytes = result.get("file_size_bytes")
+    version = result.get("version")
+    preview_json = serialize_preview(result)
+    now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+    cursor = await db.execute(
+        "UPDATE datasets SET row_count = ?, column_count = ?, schema_json = ?, status = ?, "
+        "error_message = NULL, loaded_at = ?, file_size_bytes = ?, version = ?, preview_json = ? "
+        "WHERE id = ?",
+        (
+            row_count, column_count, schema_json, "ready", now, file_size_bytes, version,
+            preview_json, dataset_id,
+        ),
+    )
+    await db.commit()
+    if not cursor.rowcount:
+        raise ValueError("Dataset was removed while loading")
+
+    cursor = await db.execute(
+        "SELECT id, conversation_id, url, name, row_count, column_count, "
+        "schema_json, status, error_message, loaded_at, file_size_bytes, version FROM datasets WHERE id = ?",
+        (dataset_id,),
+    )
+    dataset = dict(await cursor.fetchone())
+
+    if notify is not None:
+        await notify(ws_messages.dataset_loaded(
+            dataset_id=dataset_id,
+            name=dataset["name"],
+            row_count=row_count,
+            column_count=column_count,
+            schema=columns,
+            conversation_id=dataset["conversation_id"],
+            url=url,
+            file_size_bytes=file_size_bytes,
+        ))
+    return dataset
+
+
+# ---------------------------------------------------------------------------
+# add_dataset
+# Implements: spec/backend/dataset_handling/plan.md#validation-pipeline
+# ---------------------------------------------------------------------------
+
+
+async def add_dataset(
+    db: aiosqlite.Connection,
+    conversation_id: str,
+    url: str,
+    worker_pool: object,
+    name: str | None = None,
+    context: TaskContext | None = None,
+) -> dict:
+    """Run the 6-step validation pipeline and persist a new dataset, waiting for it.
+
+    :func:`start_dataset` followed by :func:`load_dataset`.  Unlike a
+    background load, a failure leaves no row behind.
+
+    *context* is passed to the worker pool's scheduler (see task_scheduler.py).
+
+    Returns the created dataset dict.
+    Raises ``ValueError`` with a user-facing message on any failure.
+    """
+    dataset = await start_dataset(db, conversation_id, url, name=name)
+    try:
+        return await load_dataset(db, dataset["id"], url, worker_pool, context=context)
+    except ValueError:
+        await db.execute("DELETE FROM datasets WHERE id = ?", (dataset["id"],))
+        await db.commit()
+        raise
+
+
 # ---------------------------------------------------------------------------
 # remove_dataset
 # Implements: spec/backend/dataset_handling/plan.md#dataset-removal
@@ -217,9 +470,15 @@ async def refresh_schema(
     db: aiosqlite.Connection,
     dataset_id: str,
     worker_pool: object,
+    context: TaskContext | None = None,
 ) -> dict:
     """Re-run steps 4-5 of the validation pipeline and update the existing row.
 
+    The row's ``version`` is replaced with the one the schema was read from,
+    so query caches keyed on it (see query_cache.py) stop matching results
+    computed against an older upstream file; stored profiles of other
+    versions of the URL are dropped.  The preview snapshot is replaced too.
+
     Returns the updated dataset dict.
     Raises ``ValueError`` if worker validation or schema extraction fails.
     On failure, the existing row is NOT modified.
@@ -234,40 +493,296 @@ async def refresh_schema(
 
     url = row["url"]
 
-    # Step 4: HEAD + magic bytes
-    validate_result = await worker_pool.validate_url(url)
-    if not validate_result.get("valid"):
-        error_msg = validate_result.get("error", "Could not access URL")
-        raise ValueError(error_msg)
-
-    # Step 5: Schema extraction
-    schema_result = await worker_pool.get_schema(url)
-    if "error" in schema_result:
-        raise ValueError(schema_result["error"])
+    # Steps 4-5: Probe + magic bytes, schema extraction
+    result = await _ingest(url, worker_pool, context)
 
     # Update the row
-    columns = schema_result.get("columns", [])
-    row_count = schema_result.get("row_count", 0)
+    columns = result.get("columns", [])
+    row_count = result.get("row_count", 0)
     column_count = len(columns)
     schema_json = json.dumps(columns)
+    version = result.get("version")
+    preview_json = serialize_preview(result)
     now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
 
     await db.execute(
-        "UPDATE datasets SET schema_json = ?, row_count = ?, column_count = ?, loaded_at = ? WHERE id = ?",
-        (schema_json, row_count, column_count, now, dataset_id),
+        "UPDATE datasets SET schema_json = ?, row_count = ?, column_count = ?, loaded_at = ?, "
+        "version = ?, preview_json = ? WHERE id = ?",
+        (schema_json, row_count, column_count, now, version, preview_json, dataset_id),
     )
     await db.commit()
+    await profile_store.invalidate(db, url, keep_version=version)
 
     # Return the updated dataset
     cursor = await db.execute(
         "SELECT id, conversation_id, url, name, row_count, column_count, "
-        "schema_json, status, error_message, loaded_at, file_size_bytes FROM datasets WHERE id = ?",
+        "schema_json, status, error_message, loaded_at, file_size_bytes, version FROM datasets WHERE id = ?",
         (dataset_id,),
     )
     updated_row = await cursor.fetchone()
     return dict(updated_row)
 
 
+# ---------------------------------------------------------------------------
+# refresh_datasets
+# ---------------------------------------------------------------------------
+
+
+async def _refresh_if_changed(
+    db: aiosqlite.Connection,
+    dataset: dict,
+    worker_pool: object,
+    context: TaskContext | None,
+    force: bool,
+) -> dict:
+    """Refresh one dataset row unless its version is unchanged; never raises."""
+    item = {"dataset_id": dataset["id"], "url": dataset["url"]}
+    async with _load_slots():
+        try:
+            if not force and dataset["version"]:
+                current = await worker_pool.dataset_version(dataset["url"], context=context)
+                if current.get("version") == dataset["version"]:
+                    return {**item, "status": "unchanged"}
+            await refresh_schema(db, dataset["id"], worker_pool, context=context)
+        except QueueFullError as exc:
+            return {**item, "status": "error", "error": exc.message}
+        except ValueError as exc:
+            return {**item, "status": "error", "error": str(exc)}
+    return {**item, "status": "refreshed"}
+
+
+async def refresh_datasets(
+    db: aiosqlite.Connection,
+    conversation_id: str,
+    worker_pool: object,
+    dataset_ids: list[str] | None = None,
+    context: TaskContext | None = None,
+    force: bool = False,
+) -> list[dict]:
+    """Refresh the schema of several datasets of *conversation_id* concurrently.
+
+    Without *dataset_ids* every ready dataset of the conversation is
+    refreshed.  A dataset whose current version (see
+    worker_pool.dataset_version) matches the stored one is reported
+    ``unchanged`` without being re-read, unless *force* is set.  At most
+    ``MAX_CONCURRENT_LOADS`` datasets are processed at once.
+
+    Returns one ``{"dataset_id", "url", "status", "error"?}`` item per
+    dataset, in order; ``status`` is ``refreshed``, ``unchanged`` or
+    ``error``.
+    """
+    cursor = await db.execute(
+        "SELECT id, url, status, version FROM datasets WHERE conversation_id = ? ORDER BY loaded_at",
+        (conversation_id,),
+    )
+    rows = {row["id"]: dict(row) for row in await cursor.fetchall()}
+    if dataset_ids is None:
+        dataset_ids = [ds_id for ds_id, row in rows.items() if row["status"] == "ready"]
+
+    async def refresh(dataset_id: str) -> dict:
+        dataset = rows.get(dataset_id)
+        if dataset is None:
+            return {"dataset_id": dataset_id, "status": "error", "error": "Dataset not found"}
+        if dataset["status"] != "ready":
+            return {
+                "dataset_id": dataset_id, "url": dataset["url"],
+                "status": "error", "error": "Dataset is not loaded",
+            }
+        return await _refresh_if_changed(db, dataset, worker_pool, context, force)
+
+    return list(await asyncio.gather(*(refresh(ds_id) for ds_id in dict.fromkeys(dataset_ids))))
+
+
+# ---------------------------------------------------------------------------
+# profile_dataset
+# ---------------------------------------------------------------------------
+
+
+def _schema_columns(dataset: dict) -> list[str]:
+    """Return the column names in *dataset*'s stored schema."""
+    try:
+        columns = json.loads(dataset.get("schema_json") or "[]")
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return [c["name"] for c in columns if isinstance(c, dict) and "name" in c]
+
+
+async def profile_dataset(
+    db: aiosqlite.Connection,
+    dataset: dict,
+    worker_pool: object,
+    context: TaskContext | None = None,
+    sampling: str = "prefix",
+) -> dict:
+    """Return the column profiles of *dataset*, computing only missing ones.
+
+    Profiles computed for the same URL and version -- in any conversation --
+    are served from the profile store (see profile_store.py); the columns
+    not stored yet are profiled in one worker task and stored.  Datasets
+    without a version are always profiled from scratch.
+
+    Returns:
+        {"profiles": [...], "row_count": int, "sampling": str}, in schema
+        order, or the worker's error dict.
+    """
+    url, version = dataset["url"], dataset.get("version")
+    if version is None:
+        return await worker_pool.profile_columns(url, context=context, sampling=sampling)
+
+    columns = _schema_columns(dataset)
+    stored = await profile_store.get(db, url, version, sampling, columns)
+    profiles = {name: item["profile"] for name, item in stored.items()}
+    row_count = next((item["row_count"] for item in stored.values()), None)
+
+    missing = [name for name in columns if name not in stored]
+    if missing or not columns:
+        # Profile everything when nothing is stored; it spares the worker
+        # a column projection the schema may not know about yet.
+        result = await worker_pool.profile_columns(
+            url, context=context, sampling=sampling, columns=missing if stored else None,
+        )
+        if "error" in result or "error_type" in result:
+            return result
+        computed = {p["name"]: p for p in result.get("profiles", [])}
+        row_count = result.get("row_count")
+        await profile_store.put(db, url, version, sampling, computed, row_count)
+        profiles.update(computed)
+
+    order = columns or list(profiles)
+    return {
+        "profiles": [profiles[name] for name in order if name in profiles],
+        "row_count": row_count,
+        "sampling": sampling,
+    }
+
+
+async def profile_dataset_column(
+    db: aiosqlite.Connection,
+    dataset: dict,
+    column_name: str,
+    column_type: str,
+    worker_pool: object,
+    context: TaskContext | None = None,
+    mode: str = "exact",
+) -> dict:
+    """Return the detailed profile of one column, from the profile store if stored.
+
+    With ``mode="approximate"`` the statistics are estimated from a column
+    sketch (see sketches.py) -- built one row group at a time and stored
+    in place of the statistics -- and carry ``error_bounds``.
+
+    Returns:
+        {"stats": {...}} as from worker_pool.profile_column, or its error dict.
+    """
+    if mode == "approximate":
+        return await _approximate_column_profile(
+            db, dataset, column_name, column_type, worker_pool, context,
+        )
+
+    url, version = dataset["url"], dataset.get("version")
+    variant = profile_store.detail_variant(column_type)
+    stored = await profile_store.get(db, url, version, variant, [column_name])
+    if column_name in stored:
+        return stored[column_name]["profile"]
+
+    result = await worker_pool.profile_column(
+        url, dataset["name"], column_name, column_type, context=context,
+    )
+    if "error" not in result and "error_type" not in result:
+        await profile_store.put(db, url, version, variant, {column_name: result})
+    return result
+
+
+async def _approximate_column_profile(
+    db: aiosqlite.Connection,
+    dataset: dict,
+    column_name: str,
+    column_type: str,
+    worker_pool: object,
+    context: TaskContext | None,
+) -> dict:
+    """Estimate the statistics of one column from its stored or a new sketch."""
+    url, version = dataset["url"], dataset.get("version")
+    variant = profile_store.sketch_variant(column_type)
+    stored = await profile_store.get(db, url, version, variant, [column_name])
+    sketch = None
+    if column_name in stored:
+        sketch = sketches.from_dict(stored[column_name]["profile"])
+
+    if sketch is None:
+        result = await worker_pool.sketch_column(url, column_name, column_type, context=context)
+        if "error" in result or "error_type" in result:
+            return result
+        await profile_store.put(db, url, version, variant, {column_name: result["sketch"]})
+        sketch = sketches.from_dict(result["sketch"])
+    return sketches.summarize(sketch)
+
+
+# ---------------------------------------------------------------------------
+# Preview snapshot
+# ---------------------------------------------------------------------------
+
+
+def serialize_preview(result: dict) -> str | None:
+    """Return the preview snapshot of a schema result as JSON for ``preview_json``.
+
+    Values are encoded as the preview endpoint encodes rows read live.
+    ``None`` if the worker could not read one, it holds values that cannot
+    be encoded (e.g. non-UTF-8 binary) or it is larger than
+    ``MAX_PREVIEW_BYTES``; previews are then read live.
+    """
+    preview = result.get("preview")
+    if not preview:
+        return None
+    try:
+        preview_json = _PREVIEW_ENCODER.dump_json(preview).decode()
+    except PydanticSerializationError:
+        return None
+    if len(preview_json) > MAX_PREVIEW_BYTES:
+        return None
+    return preview_json
+
+
+async def snapshot_preview(
+    db: aiosqlite.Connection, dataset_id: str, method: str, sample_size: int
+) -> dict | None:
+    """Return preview rows of a dataset from its stored snapshot.
+
+    The snapshot (see sampler.preview_snapshot) holds the first rows and a
+    fixed random sample of the dataset.  A ``"head"`` preview is the first
+    *sample_size* rows; a ``"random"`` preview is *sample_size* rows drawn
+    from the random sample, in file order.
+
+    Returns:
+        {"columns": list[str], "dtypes": list[str], "rows": list[list],
+        "row_format": "list"}, or ``None`` if the dataset has no snapshot,
+        or none that can serve *method*; the caller then asks a worker.
+    """
+    cursor = await db.execute("SELECT preview_json FROM datasets WHERE id = ?", (dataset_id,))
+    row = await cursor.fetchone()
+    if row is None or not row["preview_json"]:
+        return None
+    try:
+        snapshot = json.loads(row["preview_json"])
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+    if method == "head":
+        rows = snapshot.get("head", [])[:sample_size]
+    elif method == "random":
+        pool = snapshot.get("random", [])
+        picks = sorted(random.sample(range(len(pool)), min(sample_size, len(pool))))
+        rows = [pool[i] for i in picks]
+    else:
+        return None
+    return {
+        "columns": snapshot.get("columns", []),
+        "dtypes": snapshot.get("dtypes", []),
+        "rows": rows,
+        "row_format": "list",
+    }
+
+
 # ---------------------------------------------------------------------------
 # get_datasets
 # Implements: spec/backend/dataset_handling/plan.md#database-operations
@@ -281,7 +796,7 @@ async def get_datasets(
     cursor = await db.execute(
         "SELECT id, conversation_id, url, name, row_count, column_count, "
         "schema_json, status, error_message, loaded_at, file_size_bytes, "
-        "column_descriptions "
+        "column_descriptions, version "
         "FROM datasets WHERE conversation_id = ? ORDER BY loaded_at",
         (conversation_id,),
     )
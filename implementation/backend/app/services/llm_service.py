@@ -21,6 +21,9 @@ from app.config import get_settings
 from app.services import worker_pool
 from app.services import dataset_service
 from app.services import ws_messages
+from app.exceptions import QueueFullError
+from app.services.task_scheduler import LLM, TaskContext
+from app.services.worker_pool import rows_as_dicts, rows_as_lists
 from app.workers.error_translator import translate_polars_error
 
 logger = logging.getLogger(__name__)
@@ -35,6 +38,7 @@ MAX_TOOL_CALLS_PER_TURN = 5
 MAX_SQL_RETRIES = 3
 MAX_GEMINI_RETRIES = 3
 GEMINI_RETRY_BASE_DELAY = 2  # seconds; doubles each retry (2, 4, 8)
+LOAD_DATASET_WAIT_SECONDS = 10  # load_dataset tool: longer loads finish in the background
 
 # ---------------------------------------------------------------------------
 # Gemini client (module-level singleton)
@@ -322,8 +326,9 @@ def build_system_prompt(datasets: list[dict]) -> str:
                             f"range: {col_stats['min']}\u2013{col_stats['max']}"
                         )
                     if "unique_count" in col_stats:
+                        approx = "~" if col_stats.get("unique_count_approximate") else ""
                         paren_parts.append(
-                            f"{col_stats['unique_count']} unique values"
+                            f"{approx}{col_stats['unique_count']} unique values"
                         )
                     if "null_count" in col_stats:
                         paren_parts.append(
@@ -748,6 +753,16 @@ def _messages_to_contents(messages: list[dict]) -> list[types.Content]:
     return contents
 
 
+def _consume_load_result(task: asyncio.Task) -> None:
+    """Done-callback for load_dataset tool tasks that may outlive the tool call.
+
+    Their failures are already reported to the user (``dataset_error``);
+    this only keeps asyncio from logging them as never retrieved.
+    """
+    if not task.cancelled():
+        task.exception()
+
+
 async def stream_chat(
     messages: list[dict],
     datasets: list[dict],
@@ -757,6 +772,7 @@ async def stream_chat(
     db: object | None = None,
     conversation_id: str | None = None,
     model_id: str | None = None,
+    user_id: str | None = None,
 ) -> StreamResult:
     """Stream a chat response from Gemini, handling tool calls.
 
@@ -769,6 +785,7 @@ async def stream_chat(
         db: Optional database connection for dataset loading.
         conversation_id: Optional conversation ID for dataset loading.
         model_id: Optional model ID override (defaults to MODULE_ID constant).
+        user_id: Optional user ID, for fair scheduling of worker tasks.
 
     Returns:
         StreamResult with token counts, assistant message, and tool call count.
@@ -778,6 +795,7 @@ async def stream_chat(
     contents = _messages_to_contents(messages)
     effective_model = model_id or MODEL_ID
     trace_entries: list[dict] = []
+    task_context = TaskContext(user_id, conversation_id, LLM)
 
     config = types.GenerateContentConfig(
         system_instruction=system_prompt,
@@ -934,10 +952,20 @@ async def stream_chat(
                 await ws_send(ws_messages.query_progress(query_number=sql_query_count))
                 # Map dataset dicts to worker format (execute_query expects "table_name")
                 worker_datasets = [
-                    {"url": ds["url"], "table_name": ds["name"]}
+                    {"url": ds["url"], "table_name": ds["name"], "version": ds.get("version")}
                     for ds in datasets
                 ]
-                query_result = await pool.run_query(query, worker_datasets)
+                try:
+                    query_result = await pool.run_query(
+                        query, worker_datasets, cancel_event=cancel_event,
+                        context=task_context,
+                    )
+                except QueueFullError as exc:
+                    query_result = {"error_type": "busy", "message": exc.message}
+                if query_result.get("error_type") == "cancelled":
+                    # Stopped by the user; the worker query was killed.
+                    result.assistant_message = collected_text
+                    return result
 
                 if "error_type" in query_result or "error" in query_result:
                     sql_retry_count += 1
@@ -959,16 +987,12 @@ async def stream_chat(
                             "Please explain the error to the user instead of retrying."
                         )
                 else:
-                    rows = query_result.get("rows", [])
                     columns = query_result.get("columns", [])
-                    total = query_result.get("total_rows", len(rows))
-                    # Convert dict rows to arrays (Polars to_dicts() returns
-                    # list[dict], but the frontend expects list[list]).
+                    # The frontend expects list[list] rows whichever
+                    # transport the worker used.
                     # full_rows: up to 1000 rows for DB persistence
-                    all_rows = [
-                        [row.get(c) for c in columns]
-                        for row in rows
-                    ]
+                    all_rows = rows_as_lists(query_result)
+                    total = query_result.get("total_rows", len(all_rows))
                     # rows: capped at 100 for WS transmission
                     capped_rows = all_rows[:100]
                     result.sql_executions.append(SqlExecution(
@@ -983,20 +1007,35 @@ async def stream_chat(
                         f"Query executed successfully.\n"
                         f"Columns: {columns}\n"
                         f"Total rows: {total}\n"
-                        f"Results (first {len(rows)} rows): {json.dumps(rows[:20], default=str)}"
+                        f"Results (first {len(all_rows)} rows): {json.dumps(rows_as_dicts(query_result, limit=20), default=str)}"
                     )
 
         elif tool_call_name == "load_dataset":
             url = tool_call_args.get("url", "")
             try:
-                ds_result = await dataset_service.add_dataset(db, conversation_id, url, pool)
+                ds_row = await dataset_service.start_dataset(db, conversation_id, url)
+                # The load outlives this tool call if it is slow; its
+                # progress and outcome reach the user over ws_send.
+                load_task = asyncio.ensure_future(dataset_service.load_dataset(
+                    db, ds_row["id"], url, pool, context=task_context, notify=ws_send,
+                ))
+                load_task.add_done_callback(_consume_load_result)
+                ds_result = await asyncio.wait_for(asyncio.shield(load_task), LOAD_DATASET_WAIT_SECONDS)
+                datasets = [*datasets, ds_result]
                 tool_result_str = (
                     f"Dataset loaded successfully.\n"
                     f"Table name: {ds_result.get('name', 'unknown')}\n"
                     f"Rows: {ds_result.get('row_count', 0)}\n"
                     f"Columns: {ds_result.get('column_count', 0)}"
                 )
-            except ValueError as exc:
+            except asyncio.TimeoutError:
+                tool_result_str = (
+                    f"Dataset is still loading in the background.\n"
+                    f"Table name: {ds_row.get('name', 'unknown')}\n"
+                    f"It cannot be queried in this response; tell the user it "
+                    f"will appear in their dataset list once loaded."
+                )
+            except (ValueError, QueueFullError) as exc:
                 tool_result_str = f"Error loading dataset: {exc}"
         elif tool_call_name == "create_chart":
             chart_spec = tool_call_args
@@ -18,6 +18,8 @@ from datetime import datetime, timedelta, timezone
 
 import aiosqlite
 
+from app.services.query_cache import dataset_key
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -39,7 +41,7 @@ def _make_key(sql: str, datasets: list[dict]) -> str:
     Uses the same algorithm as :meth:`QueryCache._make_key` so the two
     cache layers produce identical keys for the same inputs.
     """
-    sorted_urls = sorted(d.get("url", "") for d in datasets)
+    sorted_urls = sorted(dataset_key(d) for d in datasets)
     raw = sql.strip() + "|" + "|".join(sorted_urls)
     return hashlib.sha256(raw.encode()).hexdigest()
 
@@ -0,0 +1,152 @@
+"""Persistent SQLite-backed store for dataset column profiles.
+
+Stores one row per profiled column in the ``dataset_profiles`` table,
+keyed by dataset URL, version (see file_cache.version_id) and column, so a
+public dataset loaded in many conversations is profiled once per version
+rather than once per load or click.
+
+A *variant* tells apart profiles of the same column computed differently:
+the sampling strategy for summary profiles (``"prefix"``, ``"row_groups"``,
+``"full"``, see profiler.py), ``"detail:<type>"`` for single-column
+detail profiles and ``"sketch:<type>"`` for column sketches (see
+sketches.py), from which approximate statistics are estimated.
+
+Datasets without a version cannot be told apart from a changed upstream
+file, so their profiles are never stored.  Refreshing a dataset drops the
+profiles of every other version of its URL (see :func:`invalidate`).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timezone
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+MAX_STORED_PROFILES = 20_000  # max column profiles kept across all datasets
+
+
+def detail_variant(column_type: str) -> str:
+    """Return the variant of a single-column detail profile of *column_type*."""
+    return f"detail:{column_type}"
+
+
+def sketch_variant(column_type: str) -> str:
+    """Return the variant of a column sketch of *column_type*."""
+    return f"sketch:{column_type}"
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+async def get(
+    db_conn: aiosqlite.Connection,
+    url: str,
+    version: str | None,
+    variant: str,
+    columns: list[str] | None = None,
+) -> dict[str, dict]:
+    """Return stored profiles of *url* at *version*, by column name.
+
+    Each value is ``{"profile": dict, "row_count": int | None}``.  Only
+    *columns* are looked up when given; columns with no stored profile are
+    missing from the result.
+    """
+    if version is None:
+        return {}
+    try:
+        cursor = await db_conn.execute(
+            "SELECT column_name, profile_json, row_count FROM dataset_profiles "
+            "WHERE url = ? AND version = ? AND variant = ?",
+            (url, version, variant),
+        )
+        rows = await cursor.fetchall()
+    except Exception:
+        logger.exception("Error reading from profile store")
+        return {}
+
+    wanted = set(columns) if columns is not None else None
+    return {
+        row[0]: {"profile": json.loads(row[1]), "row_count": row[2]}
+        for row in rows
+        if wanted is None or row[0] in wanted
+    }
+
+
+async def put(
+    db_conn: aiosqlite.Connection,
+    url: str,
+    version: str | None,
+    variant: str,
+    profiles: dict[str, dict],
+    row_count: int | None = None,
+) -> None:
+    """Store *profiles* (column name -> profile) of *url* at *version*.
+
+    Nothing is stored without a version.  If the store exceeds
+    :data:`MAX_STORED_PROFILES`, the oldest profiles are evicted.
+    """
+    if version is None or not profiles:
+        return
+    now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+    try:
+        await db_conn.executemany(
+            """INSERT OR REPLACE INTO dataset_profiles
+               (url, version, column_name, variant, profile_json, row_count, created_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            [
+                (url, version, name, variant, json.dumps(profile, default=str), row_count, now)
+                for name, profile in profiles.items()
+            ],
+        )
+        await db_conn.commit()
+
+        # Enforce max store size — evict oldest profiles
+        cursor = await db_conn.execute("SELECT COUNT(*) FROM dataset_profiles")
+        (count,) = await cursor.fetchone()
+
+        if count > MAX_STORED_PROFILES:
+            overflow = count - MAX_STORED_PROFILES
+            await db_conn.execute(
+                """DELETE FROM dataset_profiles
+                   WHERE rowid IN (
+                       SELECT rowid FROM dataset_profiles
+                       ORDER BY created_at ASC
+                       LIMIT ?
+                   )""",
+                (overflow,),
+            )
+            await db_conn.commit()
+
+    except Exception:
+        logger.exception("Error writing to profile store")
+
+
+async def invalidate(
+    db_conn: aiosqlite.Connection, url: str, keep_version: str | None = None
+) -> int:
+    """Remove the stored profiles of *url*, except those of *keep_version*.
+
+    Returns:
+        The number of rows removed.
+    """
+    try:
+        cursor = await db_conn.execute(
+            "DELETE FROM dataset_profiles WHERE url = ? AND version IS NOT ?",
+            (url, keep_version),
+        )
+        await db_conn.commit()
+        return cursor.rowcount
+    except Exception:
+        logger.exception("Error invalidating stored profiles")
+        return 0
@@ -1,7 +1,9 @@
 """In-memory LRU cache for SQL query results.
 
 Caches query results keyed by (sql_hash, dataset_urls_hash) to avoid
-re-executing identical queries against the same datasets.
+re-executing identical queries against the same datasets.  A dataset that
+carries a ``version`` (see file_cache.version_id) is keyed on it too, so a
+refreshed dataset never serves results of its previous version.
 """
 
 from __future__ import annotations
@@ -15,6 +17,13 @@ MAX_CACHE_SIZE = 100  # max entries
 TTL_SECONDS = 300  # 5 minute TTL
 
 
+def dataset_key(dataset: dict) -> str:
+    """Return the cache-key component for one dataset: its URL and version."""
+    url = dataset.get("url", "")
+    version = dataset.get("version")
+    return f"{url}@{version}" if version else url
+
+
 class QueryCache:
     """Thread-safe LRU cache with TTL for SQL query results.
 
@@ -41,7 +50,7 @@ class QueryCache:
 
     def _make_key(self, sql: str, datasets: list[dict]) -> str:
         """Create a deterministic cache key from SQL and dataset URLs."""
-        sorted_urls = sorted(d.get("url", "") for d in datasets)
+        sorted_urls = sorted(dataset_key(d) for d in datasets)
         raw = sql.strip() + "|" + "|".join(sorted_urls)
         return hashlib.sha256(raw.encode()).hexdigest()
 
@@ -0,0 +1,285 @@
+"""Admission control and fair queuing in front of the worker pool.
+
+``multiprocessing.Pool`` accepts any number of tasks and runs them in
+submission order, so one user's burst of queries delays everyone else's.
+The scheduler keeps at most ``capacity`` tasks (one per worker) submitted
+to the pool and holds the rest in a bounded queue:
+
+- Tasks carry a :class:`TaskContext` with the user, the conversation and
+  a priority class.  Higher classes always go first: the interactive SQL
+  panel, then LLM tool calls, then background work such as auto-profiling.
+- Within a class, users are served by weighted fair queuing: each task
+  gets a virtual finish tag ``max(now, user's last tag) + 1 / weight``
+  and the smallest tag runs next, so a user with ten queued queries does
+  not delay another user's single query by ten turns.
+- A user and a conversation may only have a few tasks running at once;
+  their further tasks wait even when a worker is free.
+- Admission fails fast: past ``MAX_PENDING_PER_USER`` queued tasks for
+  one user with :class:`~app.exceptions.QueueFullError` (HTTP 429), past
+  ``MAX_PENDING_TASKS`` overall with the same error (HTTP 503).  Only
+  tasks the user asked for directly count toward the per-user cap:
+  background tasks and internal ones (dataset loads, bounded by their
+  caller) neither count nor are rejected by it, so a bulk dataset add
+  cannot lock the user out of their own queries.
+
+Users with queued tasks are told their queue position over WebSocket
+(``ws_messages.task_queued``), again whenever it changes, and position 0
+once the task starts.
+
+All methods run on the event loop thread; no locking is needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from app.exceptions import QueueFullError
+from app.services import ws_messages
+
+logger = logging.getLogger(__name__)
+
+# Priority classes (lower runs first)
+INTERACTIVE = 0  # SQL panel, previews, explicit profiling
+LLM = 1          # execute_sql / load_dataset tool calls
+BACKGROUND = 2   # auto-profiling after a dataset load
+
+MAX_PENDING_TASKS = 10        # queued tasks across all users
+MAX_PENDING_PER_USER = 5      # queued tasks of one user
+MAX_RUNNING_PER_USER = 3      # tasks of one user submitted to the pool
+MAX_RUNNING_PER_CONVERSATION = 2
+RETRY_AFTER_SECONDS = 5
+
+_MAX_USER_TAGS = 1024  # prune finish tags of idle users beyond this many
+
+
+@dataclass(frozen=True)
+class TaskContext:
+    """Who a worker task runs for, and how urgent it is."""
+
+    user_id: str | None = None
+    conversation_id: str | None = None
+    priority: int = INTERACTIVE
+    weight: float = 1.0
+    internal: bool = False  # started by the server, exempt from the per-user pending cap
+
+
+_DEFAULT_CONTEXT = TaskContext()
+
+
+class TaskCancelledError(Exception):
+    """The caller's cancel event fired before the worker task finished."""
+
+
+@dataclass(eq=False)
+class _Waiter:
+    context: TaskContext
+    tag: float
+    seq: int
+    future: asyncio.Future
+    position: int = 0
+
+
+class TaskScheduler:
+    """Bounded, per-user fair queue gating submissions to the worker pool."""
+
+    def __init__(
+        self,
+        capacity: int,
+        max_pending: int = MAX_PENDING_TASKS,
+        max_pending_per_user: int = MAX_PENDING_PER_USER,
+        max_running_per_user: int = MAX_RUNNING_PER_USER,
+        max_running_per_conversation: int = MAX_RUNNING_PER_CONVERSATION,
+    ) -> None:
+        self._capacity = capacity
+        self._max_pending = max_pending
+        self._max_pending_per_user = max_pending_per_user
+        self._max_running_per_user = max_running_per_user
+        self._max_running_per_conversation = max_running_per_conversation
+        self._running = 0
+        self._running_by_user: Counter = Counter()
+        self._running_by_conversation: Counter = Counter()
+        self._waiting: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._vtime = 0.0
+        self._user_tags: dict[str | None, float] = {}
+        self._notify = None
+        self._notify_tasks: set[asyncio.Task] = set()
+        self._rejected = 0
+
+    def set_notifier(self, notify) -> None:
+        """Set an async ``notify(user_id, message)`` for queue-position events."""
+        self._notify = notify
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def reserve(
+        self,
+        context: TaskContext | None = None,
+        cancel_event: asyncio.Event | None = None,
+    ):
+        """Hold a pool slot for the duration of the ``async with`` block.
+
+        Raises:
+            QueueFullError: the task cannot be queued.
+            TaskCancelledError: *cancel_event* was set while queued.
+        """
+        context = context or _DEFAULT_CONTEXT
+        await self._acquire(context, cancel_event)
+        try:
+            yield
+        finally:
+            self._release(context)
+
+    async def _acquire(self, context: TaskContext, cancel_event: asyncio.Event | None) -> None:
+        user = context.user_id
+        tag = max(self._vtime, self._user_tags.get(user, 0.0)) + 1.0 / context.weight
+        waiter = _Waiter(context, tag, next(self._seq), asyncio.get_running_loop().create_future())
+        self._waiting.append(waiter)
+        self._dispatch()
+        if waiter.future.done():
+            self._user_tags[user] = tag
+            return
+
+        # Could not start right away: admit into the bounded queue or reject.
+        queued_for_user = sum(
+            1 for w in self._waiting if w.context.user_id == user and _user_capped(w.context)
+        )
+        if _user_capped(context) and queued_for_user > self._max_pending_per_user:
+            self._reject(waiter)
+            raise QueueFullError(
+                "Too many queued queries; wait for running ones to finish",
+                status_code=429,
+                retry_after_seconds=RETRY_AFTER_SECONDS,
+            )
+        if len(self._waiting) > self._max_pending:
+            self._reject(waiter)
+            raise QueueFullError(
+                "Server busy; try again shortly",
+                status_code=503,
+                retry_after_seconds=RETRY_AFTER_SECONDS,
+            )
+        self._user_tags[user] = tag
+        self._publish_positions()
+
+        waiters = {waiter.future}
+        cancel_waiter = None
+        if cancel_event is not None:
+            cancel_waiter = asyncio.ensure_future(cancel_event.wait())
+            waiters.add(cancel_waiter)
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            self._withdraw(waiter)
+            raise
+        finally:
+            if cancel_waiter is not None:
+                cancel_waiter.cancel()
+        if not waiter.future.done():
+            self._withdraw(waiter)
+            raise TaskCancelledError
+
+    def _reject(self, waiter: _Waiter) -> None:
+        self._waiting.remove(waiter)
+        self._rejected += 1
+        logger.info(
+            "Rejected worker task for user %s (%d queued)",
+            waiter.context.user_id, len(self._waiting),
+        )
+
+    def _withdraw(self, waiter: _Waiter) -> None:
+        """Remove a waiter whose caller gave up, or hand back its slot."""
+        if waiter.future.done():
+            self._release(waiter.context)  # granted just as the caller gave up
+            return
+        waiter.future.cancel()
+        self._waiting.remove(waiter)
+        self._publish_positions()
+
+    def _release(self, context: TaskContext) -> None:
+        self._running -= 1
+        self._running_by_user[context.user_id] -= 1
+        if self._running_by_user[context.user_id] <= 0:
+            del self._running_by_user[context.user_id]
+        if context.conversation_id is not None:
+            self._running_by_conversation[context.conversation_id] -= 1
+            if self._running_by_conversation[context.conversation_id] <= 0:
+                del self._running_by_conversation[context.conversation_id]
+        self._dispatch()
+        self._publish_positions()
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def _eligible(self, context: TaskContext) -> bool:
+        if self._running_by_user[context.user_id] >= self._max_running_per_user:
+            return False
+        conv = context.conversation_id
+        return conv is None or (
+            self._running_by_conversation[conv] < self._max_running_per_conversation
+        )
+
+    def _dispatch(self) -> None:
+        """Start the best eligible waiters while the pool has free slots."""
+        while self._running < self._capacity:
+            candidates = [w for w in self._waiting if self._eligible(w.context)]
+            if not candidates:
+                break
+            waiter = min(candidates, key=_order)
+            self._waiting.remove(waiter)
+            self._vtime = max(self._vtime, waiter.tag - 1.0 / waiter.context.weight)
+            self._running += 1
+            self._running_by_user[waiter.context.user_id] += 1
+            if waiter.context.conversation_id is not None:
+                self._running_by_conversation[waiter.context.conversation_id] += 1
+            waiter.future.set_result(None)
+            if waiter.position:
+                self._send(waiter, 0)
+        if len(self._user_tags) > _MAX_USER_TAGS:
+            self._user_tags = {u: t for u, t in self._user_tags.items() if t > self._vtime}
+
+    def _publish_positions(self) -> None:
+        """Tell users whose queued tasks moved their new queue position."""
+        for position, waiter in enumerate(sorted(self._waiting, key=_order), start=1):
+            if waiter.position != position:
+                waiter.position = position
+                self._send(waiter, position)
+
+    def _send(self, waiter: _Waiter, position: int) -> None:
+        user = waiter.context.user_id
+        if self._notify is None or user is None:
+            return
+        message = ws_messages.task_queued(
+            position=position,
+            queue_length=len(self._waiting),
+            conversation_id=waiter.context.conversation_id,
+        )
+        task = asyncio.ensure_future(self._notify(user, message))
+        self._notify_tasks.add(task)
+        task.add_done_callback(self._notify_tasks.discard)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "running": self._running,
+            "queued": len(self._waiting),
+            "rejected": self._rejected,
+            "capacity": self._capacity,
+        }
+
+
+def _order(waiter: _Waiter) -> tuple:
+    return (waiter.context.priority, waiter.tag, waiter.seq)
+
+
+def _user_capped(context: TaskContext) -> bool:
+    """Whether a task counts toward its user's pending cap."""
+    return context.priority < BACKGROUND and not context.internal
@@ -4,7 +4,8 @@ Implements: spec/backend/worker/plan.md#pool-initialization
 Implements: spec/backend/worker/plan.md#async-wrappers-in-worker_poolpy
 
 Manages the multiprocessing.Pool lifecycle and exposes async wrappers
-for worker tasks (validate_url, get_schema, run_query).
+for worker tasks (validate_url, get_schema, ingest_dataset, dataset_version,
+run_query).
 """
 
 from __future__ import annotations
@@ -13,24 +14,43 @@ import asyncio
 import logging
 import multiprocessing
 import multiprocessing.pool
-from concurrent.futures import ProcessPoolExecutor
+import signal
 
+from app.services.affinity_router import AffinityRouter
 from app.services.query_cache import QueryCache
 from app.services import persistent_cache
+from app.services.task_scheduler import TaskCancelledError, TaskContext, TaskScheduler
 from app.workers.data_worker import (
+    _referenced_tables,
+    dataset_version as _dataset_version_fn,
     execute_query as _execute_query,
     extract_schema as _extract_schema,
     fetch_and_validate as _fetch_and_validate,
+    ingest_dataset as _ingest_dataset_fn,
     profile_column as _profile_column_fn,
     profile_columns as _profile_columns_fn,
+    sample_dataset as _sample_dataset_fn,
+    sketch_column as _sketch_column_fn,
+)
+from app.workers import cursor_store
+from app.workers.result_transport import PICKLE, TRANSPORTS, discard, read_result
+from app.workers.task_runner import (
+    PRELOAD_MODULES,
+    TaskSlots,
+    init_worker,
+    run_tracked,
+    threads_per_worker,
 )
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_POOL_SIZE = 4
-MAX_TASKS_PER_CHILD = 50
 QUERY_TIMEOUT = 300  # seconds
-MAX_PENDING_TASKS = 10
+KILL_GRACE_SECONDS = 2  # SIGTERM -> SIGKILL for workers running abandoned tasks
+WORKER_CHECK_INTERVAL = 0.5  # seconds between liveness checks of a task's worker
+
+# Pending SIGKILL escalations (kept referenced until done)
+_kill_tasks: set[asyncio.Task] = set()
 
 
 class WorkerPool:
@@ -38,12 +58,35 @@ class WorkerPool:
 
     This is the object stored on ``app.state.worker_pool`` and passed to
     service functions so they can call ``pool.validate_url(url)`` etc.
+
+    Every method that runs a worker task takes an optional
+    :class:`~app.services.task_scheduler.TaskContext` naming the user,
+    conversation and priority class; tasks are admitted through the
+    scheduler (see task_scheduler.py) and may raise ``QueueFullError``.
+
+    *pool* is either one Pool or a list of single-worker Pools ("lanes");
+    with lanes, admitted tasks are routed by the datasets they touch (see
+    affinity_router.py).
     """
 
-    def __init__(self, pool: multiprocessing.pool.Pool) -> None:
-        self._pool = pool
+    def __init__(
+        self,
+        pool: multiprocessing.pool.Pool | list[multiprocessing.pool.Pool],
+        result_transport: str = PICKLE,
+        slots: TaskSlots | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ) -> None:
+        self._lanes = list(pool) if isinstance(pool, (list, tuple)) else [pool]
+        self._pool = self._lanes[0]  # the whole pool unless split into lanes
+        self._router = AffinityRouter(len(self._lanes))
+        self._result_transport = result_transport
+        self._slots = slots  # per-task worker tracking (see task_runner.py)
+        self._scheduler = TaskScheduler(pool_size)
         self._query_cache = QueryCache()
         self._db_pool = None  # set later via set_db_pool()
+        # Aggregated per-worker scan registry counters (see scan_registry.py)
+        self._scan_hits = 0
+        self._scan_misses = 0
 
     def set_db_pool(self, db_pool) -> None:
         """Attach the database pool for persistent cache access.
@@ -53,16 +96,55 @@ class WorkerPool:
         """
         self._db_pool = db_pool
 
-    async def validate_url(self, url: str) -> dict:
-        return await _validate_url(self._pool, url)
+    def set_notifier(self, notify) -> None:
+        """Attach an async ``notify(user_id, message)`` for queue positions.
 
-    async def get_schema(self, url: str) -> dict:
-        return await _get_schema(self._pool, url)
+        Called during application lifespan setup with the connection
+        manager's ``send_to_user``.
+        """
+        self._scheduler.set_notifier(notify)
+
+    async def validate_url(self, url: str, context: TaskContext | None = None) -> dict:
+        async with self._scheduler.reserve(context):
+            with self._router.route([url]) as lane:
+                return await _validate_url(self._lanes[lane], url, self._slots)
+
+    async def get_schema(self, url: str, context: TaskContext | None = None) -> dict:
+        async with self._scheduler.reserve(context):
+            with self._router.route([url]) as lane:
+                return await _get_schema(self._lanes[lane], url, self._slots)
+
+    async def ingest_dataset(self, url: str, context: TaskContext | None = None) -> dict:
+        """Validate *url* and extract its schema in one worker task."""
+        async with self._scheduler.reserve(context):
+            with self._router.route([url]) as lane:
+                return await _ingest_dataset(self._lanes[lane], url, self._slots)
+
+    async def dataset_version(self, url: str, context: TaskContext | None = None) -> dict:
+        """Return ``{"version": ...}``, the current version id of *url*."""
+        async with self._scheduler.reserve(context):
+            with self._router.route([url]) as lane:
+                return await _dataset_version(self._lanes[lane], url, self._slots)
+
+    async def run_query(
+        self,
+        sql: str,
+        datasets: list[dict],
+        cursor: bool = False,
+        cancel_event: asyncio.Event | None = None,
+        context: TaskContext | None = None,
+    ) -> dict:
+        """Run *sql* against *datasets*, serving from cache when possible.
 
-    async def run_query(self, sql: str, datasets: list[dict]) -> dict:
+        With ``cursor=True`` the result carries a ``cursor_id`` for paging
+        through the full result (see cursor_store.py); a cached result whose
+        cursor has expired is re-executed to get a fresh one.  Setting
+        *cancel_event* stops the running query and returns a
+        ``"cancelled"`` error.
+        """
         # Check in-memory cache first
         cached = self._query_cache.get(sql, datasets)
-        if cached is not None:
+        if cached is not None and _has_live_cursor(cached, cursor):
             return {**cached, "cached": True}
 
         # Check persistent cache (if database pool is available)
@@ -76,7 +158,9 @@ class WorkerPool:
                 finally:
                     await self._db_pool.release_read(db_conn)
 
-                if persistent_result is not None:
+                if persistent_result is not None and _has_live_cursor(
+                    persistent_result, cursor
+                ):
                     # Promote to in-memory cache for faster subsequent access
                     self._query_cache.put(sql, datasets, persistent_result)
                     return {**persistent_result, "cached": True}
@@ -87,7 +171,16 @@ class WorkerPool:
                 )
 
         # Execute query in worker process
-        result = await _run_query(self._pool, sql, datasets)
+        try:
+            async with self._scheduler.reserve(context, cancel_event):
+                with self._router.route(_referenced_urls(sql, datasets)) as lane:
+                    result = await _run_query(
+                        self._lanes[lane], sql, datasets, self._result_transport,
+                        cursor, slots=self._slots, cancel_event=cancel_event,
+                    )
+        except TaskCancelledError:
+            return _cancelled_error()
+        self._record_scan_stats(result.pop("scan_registry", None))
 
         # Cache successful results in memory
         self._query_cache.put(sql, datasets, result)
@@ -110,42 +203,186 @@ class WorkerPool:
         """Expose the query cache for stats and management endpoints."""
         return self._query_cache
 
+    def _record_scan_stats(self, delta: dict | None) -> None:
+        """Fold a worker's per-query scan registry hits/misses into the totals."""
+        if not delta:
+            return
+        self._scan_hits += delta.get("hits", 0)
+        self._scan_misses += delta.get("misses", 0)
+
+    @property
+    def scan_registry_stats(self) -> dict:
+        """Hit/miss counters of the workers' LazyFrame scan registries."""
+        return {
+            "hits": self._scan_hits,
+            "misses": self._scan_misses,
+            "hit_rate": round(
+                self._scan_hits / max(1, self._scan_hits + self._scan_misses) * 100, 1
+            ),
+        }
+
+    @property
+    def routing_stats(self) -> dict:
+        """Per-lane load and how many tasks went to their dataset's lane or spilled."""
+        return self._router.stats
+
+    @property
+    def scheduler_stats(self) -> dict:
+        """Running / queued / rejected task counts of the admission queue."""
+        return self._scheduler.stats
+
+    @property
+    def task_stats(self) -> dict:
+        """Tracked task and worker lifecycle counters.
+
+        ``cold_tasks`` counts tracked tasks that were the first task of a
+        fresh worker; ``workers_retired`` counts workers recycled for
+        outgrowing their memory budget.
+        """
+        if self._slots is None:
+            return {
+                "in_flight": 0, "workers_killed": 0, "workers_crashed": 0,
+                "workers_retired": 0, "tasks_run": 0, "cold_tasks": 0,
+            }
+        return {
+            "in_flight": self._slots.in_use,
+            "workers_killed": self._slots.killed,
+            "workers_crashed": self._slots.crashed,
+            "workers_retired": self._slots.retired,
+            "tasks_run": self._slots.tasks_run,
+            "cold_tasks": self._slots.cold_tasks,
+        }
+
     @property
     def db_pool(self):
         """Expose the database pool for persistent cache endpoints."""
         return self._db_pool
 
-    async def profile_columns(self, url: str) -> dict:
-        return await _profile_columns(self._pool, url)
+    async def profile_columns(
+        self,
+        url: str,
+        context: TaskContext | None = None,
+        sampling: str = "prefix",
+        columns: list[str] | None = None,
+    ) -> dict:
+        async with self._scheduler.reserve(context):
+            with self._router.route([url]) as lane:
+                return await _profile_columns(
+                    self._lanes[lane], url, self._slots, sampling, columns
+                )
 
     async def profile_column(
-        self, url: str, table_name: str, column_name: str, column_type: str
+        self,
+        url: str,
+        table_name: str,
+        column_name: str,
+        column_type: str,
+        context: TaskContext | None = None,
     ) -> dict:
-        return await _profile_column(
-            self._pool, url, table_name, column_name, column_type
-        )
+        async with self._scheduler.reserve(context):
+            with self._router.route([url]) as lane:
+                return await _profile_column(
+                    self._lanes[lane], url, table_name, column_name, column_type,
+                    self._slots,
+                )
+
+    async def sketch_column(
+        self,
+        url: str,
+        column_name: str,
+        column_type: str,
+        context: TaskContext | None = None,
+    ) -> dict:
+        async with self._scheduler.reserve(context):
+            with self._router.route([url]) as lane:
+                return await _sketch_column(
+                    self._lanes[lane], url, column_name, column_type, self._slots,
+                )
+
+    async def sample_dataset(
+        self,
+        url: str,
+        method: str,
+        sample_size: int,
+        column: str | None = None,
+        seed: int | None = None,
+        context: TaskContext | None = None,
+    ) -> dict:
+        async with self._scheduler.reserve(context):
+            with self._router.route([url]) as lane:
+                return await _sample_dataset(
+                    self._lanes[lane], url, method, sample_size, column, seed, self._slots,
+                )
 
     def shutdown(self) -> None:
-        self._pool.terminate()
-        self._pool.join()
+        for lane in self._lanes:
+            lane.terminate()
+        for lane in self._lanes:
+            lane.join()
 
 
-def start(pool_size: int = DEFAULT_POOL_SIZE) -> WorkerPool:
-    """Create and return a multiprocessing Pool.
+def start(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    result_transport: str = PICKLE,
+    memory_limit_mb: int | None = None,
+) -> WorkerPool:
+    """Create and return the worker pool: one single-worker Pool per worker.
 
     Implements: spec/backend/worker/plan.md#pool-initialization
 
     Args:
         pool_size: Number of worker processes (default 4).
+        result_transport: How query results travel back from the workers,
+            ``"pickle"`` (default) or ``"arrow_ipc"``.
+        memory_limit_mb: Resident-memory limit per worker (``None`` or 0
+            for no limit).  Each worker also gets an equal share of the cores
+            as its Polars thread budget.
+
+    Workers are forked from a forkserver that has already imported Polars
+    and the worker modules, so a replacement worker starts warm and the
+    API process (with its event loop and threads) is never forked.
+    Workers are recycled by memory growth (see task_runner), not after a
+    fixed number of tasks.  Each worker is its own Pool (a "lane") so that
+    tasks can be routed to the worker that has their datasets warm.
 
     Returns:
-        A multiprocessing.Pool instance ready to accept tasks.
+        A WorkerPool ready to accept tasks.
     """
-    pool = multiprocessing.Pool(
-        processes=pool_size,
-        maxtasksperchild=MAX_TASKS_PER_CHILD,
+    if result_transport not in TRANSPORTS:
+        raise ValueError(f"Unknown result transport: {result_transport!r}")
+    ctx = _worker_context()
+    slots = TaskSlots(ctx=ctx)
+    initargs = (
+        slots.array, memory_limit_mb, threads_per_worker(pool_size), slots.counters
     )
-    return WorkerPool(pool)
+    lanes = [
+        ctx.Pool(processes=1, initializer=init_worker, initargs=initargs)
+        for _ in range(pool_size)
+    ]
+    return WorkerPool(lanes, result_transport, slots, pool_size)
+
+
+def _referenced_urls(sql: str, datasets: list[dict]) -> list[str]:
+    """Return the URLs of the datasets whose table name appears in *sql*.
+
+    Uses the same matching as the worker's table registration (see
+    ``data_worker._referenced_tables``), so a task is routed by exactly the
+    tables it will scan.  Falls back to all dataset URLs when the statement
+    cannot be tokenized or names none of them.
+    """
+    referenced = _referenced_tables(sql, [d["table_name"] for d in datasets])
+    if referenced is None:
+        return [d["url"] for d in datasets]
+    return [d["url"] for d in datasets if d["table_name"] in referenced]
+
+
+def _worker_context():
+    """Return the forkserver context (spawn where it is unavailable)."""
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(list(PRELOAD_MODULES))
+    return ctx
 
 
 def shutdown(pool_or_wrapper) -> None:
@@ -162,7 +399,211 @@ def shutdown(pool_or_wrapper) -> None:
     pool_or_wrapper.join()
 
 
-async def _validate_url(pool: multiprocessing.pool.Pool, url: str) -> dict:
+async def _apply(
+    pool: multiprocessing.pool.Pool,
+    fn,
+    args: tuple,
+    slots: TaskSlots | None = None,
+    cancel_event: asyncio.Event | None = None,
+):
+    """Submit *fn* to the pool and await its result without blocking a thread.
+
+    The pool's result-handler thread resolves an asyncio future through
+    ``loop.call_soon_threadsafe``, so N in-flight tasks cost no executor
+    threads.  Raises ``multiprocessing.TimeoutError`` after
+    ``QUERY_TIMEOUT`` seconds, ``TaskCancelledError`` when *cancel_event*
+    is set, and re-raises any exception from the worker.
+
+    With *slots*, the task runs under task_runner.run_tracked so that on
+    timeout, cancellation or the awaiting coroutine being cancelled the
+    worker running it is terminated (and replaced by the Pool) instead of
+    finishing a result nobody will read.  A worker that dies while running
+    the task raises ``WorkerCrashedError`` instead of hanging until the
+    timeout -- flagged ``out_of_memory`` only when it was killed for
+    passing its memory limit (by its own watchdog, see task_runner, or
+    by the kernel OOM killer); a worker that retires instead of running
+    it gets the task resubmitted.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + QUERY_TIMEOUT
+    future = loop.create_future()
+    slot = slots.acquire() if slots is not None else None
+
+    def _settle(setter, value) -> None:
+        if slot is not None:
+            slots.release(slot)
+        if not future.done():
+            setter(value)
+        elif isinstance(value, dict) and "result_ipc" in value:
+            # Late result of a timed-out / cancelled task: nobody will read
+            # its shared-memory file, so remove it now.
+            discard(value["result_ipc"])
+
+    def _callback(value) -> None:
+        # Runs on the pool's result-handler thread; it must never raise,
+        # or the thread dies and every later task hangs.
+        try:
+            loop.call_soon_threadsafe(_settle, future.set_result, value)
+        except RuntimeError:
+            pass  # event loop already closed
+
+    def _error_callback(exc: BaseException) -> None:
+        try:
+            loop.call_soon_threadsafe(_settle, future.set_exception, exc)
+        except RuntimeError:
+            pass
+
+    def _give_up() -> None:
+        # Cancelling the future marks a late result as unwanted (see _settle).
+        if future.cancel():
+            _abandon(pool, async_result, slots, slot)
+        elif not future.cancelled() and future.exception() is None:
+            # Resolved just as the caller gave up; its slot is already released.
+            value = future.result()
+            if isinstance(value, dict) and "result_ipc" in value:
+                discard(value["result_ipc"])
+
+    if slot is not None:
+        fn, args = run_tracked, (slot, fn, args)
+
+    while True:
+        async_result = pool.apply_async(
+            fn, args, callback=_callback, error_callback=_error_callback
+        )
+
+        waiters = {future}
+        cancel_waiter = None
+        if cancel_event is not None:
+            cancel_waiter = asyncio.ensure_future(cancel_event.wait())
+            waiters.add(cancel_waiter)
+        death_waiter = None
+        if slot is not None and getattr(pool, "_pool", None) is not None:
+            death_waiter = asyncio.ensure_future(_worker_death(pool, slots, slot))
+            waiters.add(death_waiter)
+        try:
+            await asyncio.wait(
+                waiters,
+                timeout=max(0.0, deadline - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        except asyncio.CancelledError:
+            _give_up()
+            raise
+        finally:
+            for waiter in (cancel_waiter, death_waiter):
+                if waiter is not None:
+                    waiter.cancel()
+
+        if future.done():
+            return future.result()
+        if death_waiter is None or not death_waiter.done() or death_waiter.cancelled():
+            break
+        # No callback will ever come for this submission: drop it.
+        pool._cache.pop(getattr(async_result, "_job", None), None)
+        exitcode = death_waiter.result()
+        if exitcode is _RETIRED:
+            slots.retired += 1
+            slots.requeue(slot)
+            continue
+        future.cancel()
+        slots.crashed += 1
+        slots.release(slot)
+        if exitcode is _OUT_OF_MEMORY:
+            raise WorkerCrashedError(-signal.SIGKILL, out_of_memory=True)
+        # SIGKILL we did not send ourselves (abandoned tasks never get here)
+        # comes from the kernel OOM killer.
+        raise WorkerCrashedError(exitcode, out_of_memory=exitcode == -signal.SIGKILL)
+
+    _give_up()
+    if cancel_event is not None and cancel_event.is_set():
+        raise TaskCancelledError
+    raise multiprocessing.TimeoutError
+
+
+class WorkerCrashedError(Exception):
+    """The worker process died while running the task.
+
+    ``out_of_memory`` is set when it was killed for passing its memory
+    limit rather than crashing (segfault, abort, Polars panic).
+    """
+
+    def __init__(self, exitcode: int | None, out_of_memory: bool = False) -> None:
+        super().__init__(f"Worker process exited with code {exitcode}")
+        self.exitcode = exitcode
+        self.out_of_memory = out_of_memory
+
+
+# Returned by _worker_death when the worker retired without running the
+# task, or killed itself for passing its memory limit.
+_RETIRED = object()
+_OUT_OF_MEMORY = object()
+
+
+async def _worker_death(pool, slots: TaskSlots, slot: int):
+    """Return once the worker that picked up the task in *slot* has gone.
+
+    Returns the worker's exit code (e.g. ``-6`` for an abort), ``None`` if
+    the Pool already reaped it, ``_RETIRED`` if it retired instead of
+    running the task, or ``_OUT_OF_MEMORY`` if it killed itself for
+    passing its memory limit.
+    """
+    while True:
+        await asyncio.sleep(WORKER_CHECK_INTERVAL)
+        if slots.is_retired(slot):
+            return _RETIRED
+        if slots.is_out_of_memory(slot):
+            return _OUT_OF_MEMORY
+        pid = slots.running_pid(slot)
+        if pid is None:
+            continue  # queued, or finished and the result is on its way
+        for process in list(pool._pool):
+            if process.pid == pid:
+                if process.exitcode is not None:
+                    return process.exitcode
+                break
+        else:
+            # Already reaped and replaced by the Pool -- unless the worker
+            # finished in the meantime.
+            if slots.running_pid(slot) == pid:
+                return None
+
+
+def _abandon(pool, async_result, slots: TaskSlots | None, slot: int | None) -> None:
+    """Stop a task whose result is no longer wanted.
+
+    A queued task is skipped by the worker (its callback still releases
+    the slot).  A running one gets its worker terminated; since its result
+    never arrives, the job is dropped from the pool's bookkeeping and the
+    slot is released once the worker is confirmed gone.
+    """
+    if slot is None:
+        return  # untracked: the worker finishes it and the result is ignored
+    if slots.is_retired(slot):
+        # Its worker exited without running it: no callback will come.
+        pool._cache.pop(getattr(async_result, "_job", None), None)
+        slots.release(slot)
+        return
+    pid = slots.cancel(slot)
+    if pid is None:
+        return
+    pool._cache.pop(getattr(async_result, "_job", None), None)
+    task = asyncio.get_running_loop().create_task(_escalate_kill(slots, slot, pid))
+    _kill_tasks.add(task)
+    task.add_done_callback(_kill_tasks.discard)
+
+
+async def _escalate_kill(slots: TaskSlots, slot: int, pid: int) -> None:
+    """SIGKILL a worker that has not exited ``KILL_GRACE_SECONDS`` after SIGTERM."""
+    try:
+        await asyncio.sleep(KILL_GRACE_SECONDS)
+        slots.kill(slot, pid)
+    finally:
+        slots.release(slot)
+
+
+async def _validate_url(
+    pool: multiprocessing.pool.Pool, url: str, slots: TaskSlots | None = None
+) -> dict:
     """Run fetch_and_validate in a worker process.
 
     Implements: spec/backend/worker/plan.md#async-wrappers-in-worker_poolpy
@@ -175,16 +616,15 @@ async def _validate_url(pool: multiprocessing.pool.Pool, url: str) -> dict:
         Result dict from fetch_and_validate, or error dict on failure.
     """
     try:
-        loop = asyncio.get_event_loop()
-        async_result = pool.apply_async(_fetch_and_validate, (url,))
-        result = await loop.run_in_executor(None, async_result.get, QUERY_TIMEOUT)
-        return result
+        return await _apply(pool, _fetch_and_validate, (url,), slots)
     except multiprocessing.TimeoutError:
         return {
             "error_type": "timeout",
             "message": "URL validation timed out",
             "details": f"Timeout after {QUERY_TIMEOUT}s for URL: {url}",
         }
+    except (WorkerCrashedError, MemoryError) as exc:
+        return _worker_error("URL validation", exc)
     except Exception as exc:
         return {
             "error_type": "internal",
@@ -193,7 +633,9 @@ async def _validate_url(pool: multiprocessing.pool.Pool, url: str) -> dict:
         }
 
 
-async def _get_schema(pool: multiprocessing.pool.Pool, url: str) -> dict:
+async def _get_schema(
+    pool: multiprocessing.pool.Pool, url: str, slots: TaskSlots | None = None
+) -> dict:
     """Run extract_schema in a worker process.
 
     Implements: spec/backend/worker/plan.md#async-wrappers-in-worker_poolpy
@@ -206,16 +648,15 @@ async def _get_schema(pool: multiprocessing.pool.Pool, url: str) -> dict:
         Result dict from extract_schema, or error dict on failure.
     """
     try:
-        loop = asyncio.get_event_loop()
-        async_result = pool.apply_async(_extract_schema, (url,))
-        result = await loop.run_in_executor(None, async_result.get, QUERY_TIMEOUT)
-        return result
+        return await _apply(pool, _extract_schema, (url,), slots)
     except multiprocessing.TimeoutError:
         return {
             "error_type": "timeout",
             "message": "Schema extraction timed out",
             "details": f"Timeout after {QUERY_TIMEOUT}s for URL: {url}",
         }
+    except (WorkerCrashedError, MemoryError) as exc:
+        return _worker_error("Schema extraction", exc)
     except Exception as exc:
         return {
             "error_type": "internal",
@@ -224,10 +665,74 @@ async def _get_schema(pool: multiprocessing.pool.Pool, url: str) -> dict:
         }
 
 
+async def _ingest_dataset(
+    pool: multiprocessing.pool.Pool, url: str, slots: TaskSlots | None = None
+) -> dict:
+    """Run ingest_dataset in a worker process.
+
+    Args:
+        pool: The multiprocessing pool.
+        url: Data file URL.
+
+    Returns:
+        Result dict from ingest_dataset, or error dict on failure.
+    """
+    try:
+        return await _apply(pool, _ingest_dataset_fn, (url,), slots)
+    except multiprocessing.TimeoutError:
+        return {
+            "error_type": "timeout",
+            "message": "Dataset loading timed out",
+            "details": f"Timeout after {QUERY_TIMEOUT}s for URL: {url}",
+        }
+    except (WorkerCrashedError, MemoryError) as exc:
+        return _worker_error("Dataset loading", exc)
+    except Exception as exc:
+        return {
+            "error_type": "internal",
+            "message": f"Unexpected error during dataset loading: {exc}",
+            "details": str(exc),
+        }
+
+
+async def _dataset_version(
+    pool: multiprocessing.pool.Pool, url: str, slots: TaskSlots | None = None
+) -> dict:
+    """Run dataset_version in a worker process.
+
+    Args:
+        pool: The multiprocessing pool.
+        url: Data file URL.
+
+    Returns:
+        Result dict from dataset_version, or error dict on failure.
+    """
+    try:
+        return await _apply(pool, _dataset_version_fn, (url,), slots)
+    except multiprocessing.TimeoutError:
+        return {
+            "error_type": "timeout",
+            "message": "Version check timed out",
+            "details": f"Timeout after {QUERY_TIMEOUT}s for URL: {url}",
+        }
+    except (WorkerCrashedError, MemoryError) as exc:
+        return _worker_error("Version check", exc)
+    except Exception as exc:
+        return {
+            "error_type": "internal",
+            "message": f"Unexpected error during version check: {exc}",
+            "details": str(exc),
+        }
+
+
 async def _run_query(
     pool: multiprocessing.pool.Pool,
     sql: str,
     datasets: list[dict],
+    transport: str = PICKLE,
+    cursor: bool = False,
+    slots: TaskSlots | None = None,
+    cancel_event: asyncio.Event | None = None,
 ) -> dict:
     """Run execute_query in a worker process.
 
@@ -237,14 +742,23 @@ async def _run_query(
         pool: The multiprocessing pool.
         sql: SQL query string.
         datasets: List of {"url": str, "table_name": str} dicts.
+        transport: Result transport passed to execute_query.
+        cursor: Ask execute_query to persist the full result as a cursor.
+        slots: Task slots for killing the worker on timeout / cancellation.
+        cancel_event: When set, the query is stopped and reported as cancelled.
 
     Returns:
-        Result dict from execute_query, or error dict on failure.
+        Result dict from execute_query, or error dict on failure.  Results
+        sent over Arrow IPC come back with list rows (``"row_format": "list"``).
     """
     try:
-        loop = asyncio.get_event_loop()
-        async_result = pool.apply_async(_execute_query, (sql, datasets))
-        result = await loop.run_in_executor(None, async_result.get, QUERY_TIMEOUT)
+        args = (sql, datasets)
+        if transport != PICKLE or cursor:
+            args = (sql, datasets, transport, cursor)
+        result = await _apply(pool, _execute_query, args, slots, cancel_event)
+        if "result_ipc" in result:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, _materialize_ipc_result, result)
         return result
     except multiprocessing.TimeoutError:
         return {
@@ -252,6 +766,10 @@ async def _run_query(
             "message": "Query execution timed out",
             "details": f"Timeout after {QUERY_TIMEOUT}s",
         }
+    except TaskCancelledError:
+        return _cancelled_error()
+    except (WorkerCrashedError, MemoryError) as exc:
+        return _worker_error("Query execution", exc)
     except Exception as exc:
         return {
             "error_type": "internal",
@@ -260,27 +778,108 @@ async def _run_query(
         }
 
 
-async def _profile_columns(pool: multiprocessing.pool.Pool, url: str) -> dict:
+def _worker_error(action: str, exc: BaseException) -> dict:
+    """Error dict for a ``MemoryError`` or a worker that died mid-task."""
+    if isinstance(exc, WorkerCrashedError) and not exc.out_of_memory:
+        return {
+            "error_type": "internal",
+            "message": f"{action} failed: the worker process crashed",
+            "details": str(exc),
+        }
+    return {
+        "error_type": "memory",
+        "message": f"{action} ran out of memory (worker limit exceeded)",
+        "details": str(exc),
+    }
+
+
+def _cancelled_error() -> dict:
+    return {
+        "error_type": "cancelled",
+        "message": "Query cancelled",
+        "details": None,
+    }
+
+
+def _has_live_cursor(result: dict, cursor_wanted: bool) -> bool:
+    """Return False if a cursor is wanted but *result* has no live one."""
+    if not cursor_wanted:
+        return True
+    cursor_id = result.get("cursor_id")
+    return cursor_id is not None and cursor_store.exists(cursor_id)
+
+
+def _materialize_ipc_result(result: dict) -> dict:
+    """Replace an Arrow IPC handle with list rows read from the mapped file."""
+    handle = result.pop("result_ipc")
+    try:
+        df = read_result(handle)
+    except Exception:
+        discard(handle)
+        raise
+    result["rows"] = [list(row) for row in df.rows()]
+    result["row_format"] = "list"
+    return result
+
+
+def rows_as_lists(result: dict, columns: list[str] | None = None) -> list[list]:
+    """Return a query result's rows as lists ordered by *columns*.
+
+    Works for both row formats: dict rows (pickle transport, and older
+    persistent cache entries) and list rows (Arrow IPC transport).
+    *columns* defaults to the result's own columns; a subset drops the
+    other values.
+    """
+    all_columns = result.get("columns", [])
+    columns = all_columns if columns is None else columns
+    rows = result.get("rows", [])
+    if result.get("row_format") == "list":
+        if columns == all_columns:
+            return [list(row) for row in rows]
+        idx = [all_columns.index(col) for col in columns]
+        return [[row[i] for i in idx] for row in rows]
+    return [[row.get(col) for col in columns] for row in rows]
+
+
+def rows_as_dicts(result: dict, limit: int | None = None) -> list[dict]:
+    """Return (up to *limit* of) a query result's rows as column->value dicts."""
+    rows = result.get("rows", [])
+    if limit is not None:
+        rows = rows[:limit]
+    if result.get("row_format") == "list":
+        columns = result.get("columns", [])
+        return [dict(zip(columns, row)) for row in rows]
+    return list(rows)
+
+
+async def _profile_columns(
+    pool: multiprocessing.pool.Pool,
+    url: str,
+    slots: TaskSlots | None = None,
+    sampling: str = "prefix",
+    columns: list[str] | None = None,
+) -> dict:
     """Run profile_columns in a worker process.
 
     Args:
         pool: The multiprocessing pool.
         url: Parquet file URL.
+        sampling: Rows to profile: "prefix", "row_groups" or "full".
+        columns: Columns to profile; all of them when None.
 
     Returns:
         Result dict from profile_columns, or error dict on failure.
     """
     try:
-        loop = asyncio.get_event_loop()
-        async_result = pool.apply_async(_profile_columns_fn, (url,))
-        result = await loop.run_in_executor(None, async_result.get, QUERY_TIMEOUT)
-        return result
+        return await _apply(pool, _profile_columns_fn, (url, sampling, columns), slots)
     except multiprocessing.TimeoutError:
         return {
             "error_type": "timeout",
             "message": "Column profiling timed out",
             "details": f"Timeout after {QUERY_TIMEOUT}s for URL: {url}",
         }
+    except (WorkerCrashedError, MemoryError) as exc:
+        return _worker_error("Column profiling", exc)
     except Exception as exc:
         return {
             "error_type": "internal",
@@ -295,6 +894,7 @@ async def _profile_column(
     table_name: str,
     column_name: str,
     column_type: str,
+    slots: TaskSlots | None = None,
 ) -> dict:
     """Run profile_column in a worker process.
 
@@ -309,18 +909,17 @@ async def _profile_column(
         Result dict from profile_column, or error dict on failure.
     """
     try:
-        loop = asyncio.get_event_loop()
-        async_result = pool.apply_async(
-            _profile_column_fn, (url, table_name, column_name, column_type)
+        return await _apply(
+            pool, _profile_column_fn, (url, table_name, column_name, column_type), slots
         )
-        result = await loop.run_in_executor(None, async_result.get, QUERY_TIMEOUT)
-        return result
     except multiprocessing.TimeoutError:
         return {
             "error_type": "timeout",
             "message": "Column profiling timed out",
             "details": f"Timeout after {QUERY_TIMEOUT}s for column: {column_name}",
         }
+    except (WorkerCrashedError, MemoryError) as exc:
+        return _worker_error("Column profiling", exc)
     except Exception as exc:
         return {
             "error_type": "internal",
@@ -329,3 +928,79 @@ async def _profile_column(
         }
 
 
+async def _sketch_column(
+    pool: multiprocessing.pool.Pool,
+    url: str,
+    column_name: str,
+    column_type: str,
+    slots: TaskSlots | None = None,
+) -> dict:
+    """Run sketch_column in a worker process.
+
+    Args:
+        pool: The multiprocessing pool.
+        url: Parquet file URL.
+        column_name: Column to sketch.
+        column_type: Polars dtype string.
+
+    Returns:
+        Result dict from sketch_column, or error dict on failure.
+    """
+    try:
+        return await _apply(pool, _sketch_column_fn, (url, column_name, column_type), slots)
+    except multiprocessing.TimeoutError:
+        return {
+            "error_type": "timeout",
+            "message": "Column sketch timed out",
+            "details": f"Timeout after {QUERY_TIMEOUT}s for column: {column_name}",
+        }
+    except (WorkerCrashedError, MemoryError) as exc:
+        return _worker_error("Column sketch", exc)
+    except Exception as exc:
+        return {
+            "error_type": "internal",
+            "message": f"Unexpected error during column sketch: {exc}",
+            "details": str(exc),
+        }
+
+
+async def _sample_dataset(
+    pool: multiprocessing.pool.Pool,
+    url: str,
+    method: str,
+    sample_size: int,
+    column: str | None = None,
+    seed: int | None = None,
+    slots: TaskSlots | None = None,
+) -> dict:
+    """Run sample_dataset in a worker process.
+
+    Args:
+        pool: The multiprocessing pool.
+        url: Parquet file URL.
+        method: Sampling method (tail, random, stratified).
+        sample_size: Number of rows to return.
+        column: Stratum column for stratified sampling.
+        seed: Seed for random and stratified samples.
+
+    Returns:
+        Result dict from sample_dataset, or error dict on failure.
+    """
+    try:
+        return await _apply(
+            pool, _sample_dataset_fn, (url, method, sample_size, column, seed), slots,
+        )
+    except multiprocessing.TimeoutError:
+        return {
+            "error_type": "timeout",
+            "message": "Preview sampling timed out",
+            "details": f"Timeout after {QUERY_TIMEOUT}s for {method} sample of: {url}",
+        }
+    except (WorkerCrashedError, MemoryError) as exc:
+        return _worker_error("Preview sampling", exc)
+    except Exception as exc:
+        return {
+            "error_type": "internal",
+            "message": f"Unexpected error during preview sampling: {exc}",
+            "details": str(exc),
+        }
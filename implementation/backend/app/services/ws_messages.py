@@ -65,17 +65,33 @@ def chat_error(*, error: str, details: str | None) -> dict:
     return result
 
 
-def dataset_loading(*, dataset_id: str, url: str) -> dict:
-    """Dataset load started.
+def dataset_loading(
+    *,
+    dataset_id: str,
+    url: str,
+    phase: str | None = None,
+    bytes_done: int | None = None,
+    bytes_total: int | None = None,
+) -> dict:
+    """Dataset load started, or made progress.
 
-    Compressed format: type=dl, dataset_id=did, url=u, status=s
+    Compressed format: type=dl, dataset_id=did, url=u, status=s, phase=ph,
+    bytes_done=bd, bytes_total=bt
+    Omit null fields.
     """
-    return {
+    result: dict = {
         "type": "dl",
         "did": dataset_id,
         "u": url,
         "s": "loading",
     }
+    if phase:
+        result["ph"] = phase
+    if bytes_done is not None:
+        result["bd"] = bytes_done
+    if bytes_total is not None:
+        result["bt"] = bytes_total
+    return result
 
 
 def dataset_loaded(
@@ -85,13 +101,17 @@ def dataset_loaded(
     row_count: int,
     column_count: int,
     schema: list,
+    conversation_id: str | None = None,
+    url: str | None = None,
+    file_size_bytes: int | None = None,
 ) -> dict:
     """Dataset successfully loaded and ready for queries.
 
     Compressed format: type=dld, dataset_id=did, name=n, row_count=rc,
-    column_count=cc, schema=sc
+    column_count=cc, schema=sc, conversation_id=cid, url=u, file_size_bytes=fs
+    Omit null fields.
     """
-    return {
+    result: dict = {
         "type": "dld",
         "did": dataset_id,
         "n": name,
@@ -99,6 +119,13 @@ def dataset_loaded(
         "cc": column_count,
         "sc": schema,
     }
+    if conversation_id:
+        result["cid"] = conversation_id
+    if url:
+        result["u"] = url
+    if file_size_bytes is not None:
+        result["fs"] = file_size_bytes
+    return result
 
 
 def dataset_error(*, dataset_id: str, error: str) -> dict:
@@ -117,6 +144,18 @@ def query_status(*, phase: str) -> dict:
     return {"type": "qs", "p": phase}
 
 
+def task_queued(*, position: int, queue_length: int, conversation_id: str | None) -> dict:
+    """A worker task is waiting in the admission queue (position 0: started).
+
+    Compressed format: type=tq, position=pos, queue_length=len, conversation_id=cid
+    Omit null fields.
+    """
+    result: dict = {"type": "tq", "pos": position, "len": queue_length}
+    if conversation_id:
+        result["cid"] = conversation_id
+    return result
+
+
 def rate_limit_warning(*, usage_percent: float, remaining_tokens: int) -> dict:
     """User is approaching their rate limit.
 
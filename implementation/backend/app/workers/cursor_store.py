@@ -0,0 +1,313 @@
+"""On-disk store of materialized query results ("cursors").
+
+A worker writes the result of a query as an Arrow IPC file and returns its
+cursor id.  The API process then serves pages, sorts and re-fetches by
+memory-mapping and slicing that file, without re-running the SQL against
+the source dataset.
+
+Next to each ``<id>.arrow`` sits an ``<id>.json`` sidecar recording what
+the cursor may be used for: the :func:`query_key` of the statement and
+datasets it came from, the conversations it was handed to (``owners``,
+added by :func:`bind`), whether an automatic LIMIT was applied, and the
+row count of the uncapped result.  :func:`read_page` only serves a cursor
+whose sidecar matches the caller's query key and owner.
+
+A cursor holds at most the rows its writer passes in -- the worker caps it
+at ``MAX_QUERY_ROWS`` -- and a frame estimated above ``MAX_CURSOR_BYTES``
+gets no cursor at all, since the budget sweep would drop it straight away.
+
+Cursors expire ``CURSOR_TTL_SECONDS`` after their last access; the store is
+also held under ``MAX_CURSOR_BYTES`` by evicting least-recently-used files.
+Access time is tracked via the file's mtime, which reads bump explicitly.
+
+No imports from ``app/`` -- fully self-contained, same as file_cache.py.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+_default_dir = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "chatdf-cursors",
+)
+CURSOR_DIR = os.environ.get("CHATDF_CURSOR_DIR", _default_dir)
+CURSOR_TTL_SECONDS = int(os.environ.get("CHATDF_CURSOR_TTL_SECONDS", "1800"))  # 30 min
+MAX_CURSOR_BYTES = int(os.environ.get("CHATDF_MAX_CURSOR_BYTES", str(1024 ** 3)))  # 1 GB
+
+_CURSOR_ID_RE = re.compile(r"[0-9a-f]{32}")
+_SUFFIX = ".arrow"
+_META_SUFFIX = ".json"
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _cursor_path(cursor_id: str) -> str | None:
+    """Return the file path for *cursor_id*, or ``None`` if it is malformed."""
+    if not isinstance(cursor_id, str) or not _CURSOR_ID_RE.fullmatch(cursor_id):
+        return None
+    return os.path.join(CURSOR_DIR, cursor_id + _SUFFIX)
+
+
+def _live_path(cursor_id: str) -> str | None:
+    """Return the path of a live (present, unexpired) cursor, else ``None``."""
+    path = _cursor_path(cursor_id)
+    if path is None:
+        return None
+    try:
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        return None
+    if age > CURSOR_TTL_SECONDS:
+        _remove_cursor(path)
+        return None
+    return path
+
+
+def query_key(sql: str, datasets: list[dict]) -> str:
+    """Return the key tying a cursor to the statement and datasets it ran on."""
+    tables = sorted([d["url"], d["table_name"]] for d in datasets)
+    return hashlib.sha256(json.dumps([sql, tables]).encode()).hexdigest()
+
+
+def _meta_path(arrow_path: str) -> str:
+    return arrow_path[: -len(_SUFFIX)] + _META_SUFFIX
+
+
+def _read_meta(arrow_path: str) -> dict | None:
+    try:
+        with open(_meta_path(arrow_path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: str, data: dict) -> None:
+    """Write *data* to *path* via a temp file and rename."""
+    fd, tmp_path = tempfile.mkstemp(dir=CURSOR_DIR, prefix=".cursor_")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _unlink(tmp_path)
+        raise
+
+
+def _remove_cursor(arrow_path: str) -> None:
+    _unlink(arrow_path)
+    _unlink(_meta_path(arrow_path))
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+
+def write_cursor(
+    df, key: str, limit_applied: bool = False, total_rows: int | None = None
+) -> str | None:
+    """Persist *df* as a new cursor for the query *key* and return its id.
+
+    Returns ``None`` without writing anything if *df* is estimated to be
+    larger than ``MAX_CURSOR_BYTES``.  The sidecar is written before the
+    data file, and both go to a temp name first and are renamed into place,
+    so a reader that finds the data file also finds complete metadata.
+    Runs an expiry/budget sweep afterwards.
+    """
+    if df.estimated_size() > MAX_CURSOR_BYTES:
+        return None
+    os.makedirs(CURSOR_DIR, exist_ok=True)
+    cursor_id = uuid.uuid4().hex
+    arrow_path = os.path.join(CURSOR_DIR, cursor_id + _SUFFIX)
+    _write_json(_meta_path(arrow_path), {
+        "query_key": key,
+        "owners": [],
+        "limit_applied": limit_applied,
+        "total_rows": len(df) if total_rows is None else total_rows,
+    })
+    fd, tmp_path = tempfile.mkstemp(dir=CURSOR_DIR, prefix=".cursor_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            df.write_ipc(f, compression="uncompressed")
+        os.replace(tmp_path, arrow_path)
+    except BaseException:
+        _unlink(tmp_path)
+        _unlink(_meta_path(arrow_path))
+        raise
+    evict()
+    return cursor_id
+
+
+# ---------------------------------------------------------------------------
+# API side
+# ---------------------------------------------------------------------------
+
+
+def exists(cursor_id: str) -> bool:
+    """Return True if *cursor_id* names a live cursor."""
+    return _live_path(cursor_id) is not None
+
+
+def bind(cursor_id: str, owner: str) -> bool:
+    """Allow *owner* (a conversation id) to read *cursor_id*.
+
+    Returns False if the cursor is unknown or expired.  Concurrent binds of
+    the same cursor can lose one owner; that owner's next page request then
+    re-executes its query, which is correct, just slower.
+    """
+    path = _live_path(cursor_id)
+    if path is None:
+        return False
+    meta = _read_meta(path)
+    if meta is None:
+        return False
+    if owner not in meta["owners"]:
+        meta["owners"].append(owner)
+        try:
+            _write_json(_meta_path(path), meta)
+        except OSError:
+            return False
+    return True
+
+
+def read_page(
+    cursor_id: str,
+    offset: int,
+    limit: int,
+    sort_by: str | None = None,
+    descending: bool = False,
+    key: str | None = None,
+    owner: str | None = None,
+) -> dict | None:
+    """Return one page of a cursor, optionally sorted by a column.
+
+    If *key* or *owner* is given, the cursor is only served when its
+    sidecar records the same query key, or lists *owner* among its owners.
+
+    Returns:
+        {"columns": list[str], "rows": list[list],
+         "total_rows": int,         # rows held by the cursor
+         "result_total_rows": int,  # rows of the uncapped result
+         "limit_applied": bool}
+        or ``None`` if the cursor is unknown, expired or does not match.
+
+    Raises:
+        ValueError: if *sort_by* is not a column of the result.
+    """
+    import polars as pl
+
+    path = _live_path(cursor_id)
+    if path is None:
+        return None
+    meta = _read_meta(path)
+    if meta is None:
+        return None
+    if key is not None and meta["query_key"] != key:
+        return None
+    if owner is not None and owner not in meta["owners"]:
+        return None
+    try:
+        lf = pl.scan_ipc(path)
+        columns = lf.collect_schema().names()
+        if sort_by is not None:
+            if sort_by not in columns:
+                raise ValueError(f"Unknown sort column: {sort_by}")
+            lf = lf.sort(sort_by, descending=descending, nulls_last=True)
+        page = lf.slice(offset, limit).collect()
+        total_rows = lf.select(pl.len()).collect().item()
+    except (OSError, pl.exceptions.ComputeError):
+        # Evicted between the liveness check and the read.
+        return None
+    os.utime(path)  # refresh last access for TTL / LRU
+    return {
+        "columns": columns,
+        "rows": [list(row) for row in page.rows()],
+        "total_rows": total_rows,
+        "result_total_rows": meta["total_rows"],
+        "limit_applied": meta["limit_applied"],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------------------------
+
+
+def evict() -> int:
+    """Remove expired cursors, then LRU cursors until under the byte budget.
+
+    Sidecars go with their data file; a sidecar left without one (a writer
+    that crashed in between) is removed once it is older than the TTL.
+    Returns the number of removed cursors.
+    """
+    removed = 0
+    try:
+        now = time.time()
+        names = os.listdir(CURSOR_DIR)
+        entries = []
+        for name in names:
+            if name.endswith(_META_SUFFIX):
+                continue
+            path = os.path.join(CURSOR_DIR, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            # Temp files of crashed writers count as expired after the TTL too.
+            if now - stat.st_mtime > CURSOR_TTL_SECONDS:
+                if name.endswith(_SUFFIX):
+                    _remove_cursor(path)
+                else:
+                    _unlink(path)
+                removed += 1
+            elif name.endswith(_SUFFIX):
+                entries.append((path, stat.st_mtime, stat.st_size))
+
+        total_size = sum(e[2] for e in entries)
+        entries.sort(key=lambda e: e[1])
+        for path, _mtime, size in entries:
+            if total_size <= MAX_CURSOR_BYTES:
+                break
+            _remove_cursor(path)
+            total_size -= size
+            removed += 1
+
+        for name in names:
+            if not name.endswith(_META_SUFFIX):
+                continue
+            path = os.path.join(CURSOR_DIR, name)
+            arrow_path = path[: -len(_META_SUFFIX)] + _SUFFIX
+            try:
+                if not os.path.exists(arrow_path) and now - os.path.getmtime(path) > CURSOR_TTL_SECONDS:
+                    _unlink(path)
+            except OSError:
+                pass
+    except OSError:
+        pass
+    if removed:
+        logger.info("Cursor store: removed %d cursors", removed)
+    return removed
@@ -15,13 +15,29 @@ import time
 import urllib.error
 import urllib.request
 
+from app.workers import profiler as _profiler
+from app.workers import range_cache as _range_cache
+from app.workers import sampler as _sampler
+from app.workers import sketches as _sketches
+from app.workers.cursor_store import query_key, write_cursor
 from app.workers.error_translator import translate_polars_error
+from app.workers.file_cache import RemoteInfo
+from app.workers.file_cache import clear_progress as _clear_progress
+from app.workers.file_cache import report_progress as _report_progress
 from app.workers.file_cache import download_and_cache as _download_and_cache
+from app.workers.file_cache import transcode as _transcode
+from app.workers.file_cache import version_id as _version_id
+from app.workers.parquet_footer import read_footer_stats as _read_footer_stats
+from app.workers.result_transport import ARROW_IPC, PICKLE, write_result
+from app.workers.scan_registry import local_fingerprint as _local_fingerprint
+from app.workers.scan_registry import registry as _scan_registry
+from app.workers.scan_registry import remote_fingerprint as _remote_fingerprint
 
 MAX_RESULT_ROWS = 1000
 MAX_QUERY_ROWS = 10000  # Auto-LIMIT cap for SELECT queries without LIMIT
 HEAD_REQUEST_TIMEOUT = 30  # seconds
 DOWNLOAD_TIMEOUT = 300  # seconds for full file downloads
+EXACT_UNIQUE_MAX_ROWS = 1_000_000  # beyond this, string cardinality is estimated at load
 
 
 def _is_csv_file(path_or_url: str) -> bool:
@@ -50,6 +66,23 @@ def _scan_data_file(path_or_url: str, is_local: bool = False) -> "object":
     return pl.scan_parquet(resolved)
 
 
+def _scan_local(path: str, local_path: str | None = None):
+    """Scan a local file; CSV-family files are read through a Parquet transcode.
+
+    Returns ``(lazy_frame, local_path)`` for the scan registry, where
+    *local_path* becomes the transcode when there is one, so that an
+    evicted transcode invalidates the registry entry.
+    """
+    import polars as pl
+
+    lazy_frame = _scan_data_file(path, is_local=True)
+    if _is_csv_file(path):
+        parquet_path = _transcode(lazy_frame, path)
+        if parquet_path is not None:
+            return pl.scan_parquet(parquet_path), parquet_path
+    return lazy_frame, local_path
+
+
 def _has_limit(sql: str) -> bool:
     """Check if SQL already contains a LIMIT clause.
 
@@ -70,6 +103,82 @@ def _is_select(sql: str) -> bool:
     return stripped.upper().startswith("SELECT") or stripped.upper().startswith("WITH")
 
 
+def _sql_identifiers(sql: str) -> set[str]:
+    """Return every identifier token in *sql*.
+
+    Skips string literals and comments.  Double-quoted and backtick-quoted
+    identifiers are returned verbatim (with doubled quotes unescaped); bare
+    identifiers are returned as written.
+
+    Raises:
+        ValueError: On an unterminated string, quoted identifier or comment.
+    """
+    identifiers: set[str] = set()
+    i = 0
+    n = len(sql)
+    while i < n:
+        ch = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = n if end == -1 else end + 1
+        elif sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            if end == -1:
+                raise ValueError("Unterminated block comment")
+            i = end + 2
+        elif ch in ("'", '"', "`"):
+            j = i + 1
+            chars: list[str] = []
+            while True:
+                if j >= n:
+                    raise ValueError(f"Unterminated {ch} quote")
+                if sql[j] == ch:
+                    if j + 1 < n and sql[j + 1] == ch:
+                        chars.append(ch)
+                        j += 2
+                        continue
+                    break
+                chars.append(sql[j])
+                j += 1
+            if ch != "'":
+                identifiers.add("".join(chars))
+            i = j + 1
+        elif ch.isalpha() or ch == "_":
+            j = i + 1
+            while j < n and (sql[j].isalnum() or sql[j] in "_$"):
+                j += 1
+            identifiers.add(sql[i:j])
+            i = j
+        else:
+            i += 1
+    return identifiers
+
+
+def _referenced_tables(sql: str, table_names: list[str]) -> set[str] | None:
+    """Return the subset of *table_names* that *sql* references.
+
+    A table counts as referenced when its name appears as an identifier
+    token anywhere outside string literals and comments -- in FROM/JOIN
+    clauses, CTE bodies, subqueries or as a column qualifier.  This is a
+    superset of what the query reads (a column sharing a table's name also
+    matches), which is safe: registering an extra table only costs a scan.
+    Bare identifiers match case-insensitively, quoted ones exactly.
+
+    Returns ``None`` when the statement cannot be tokenized or mentions none
+    of the tables, so the caller falls back to registering everything.
+    """
+    try:
+        identifiers = _sql_identifiers(sql)
+    except ValueError:
+        return None
+    folded = {ident.lower() for ident in identifiers}
+    referenced = {
+        name for name in table_names
+        if name in identifiers or name.lower() in folded
+    }
+    return referenced or None
+
+
 def _resolve_url(url: str) -> tuple[str, bool]:
     """Resolve a URL to a path suitable for Polars.
 
@@ -84,14 +193,83 @@ def _resolve_url(url: str) -> tuple[str, bool]:
     return url, False
 
 
-def _download_to_local(url: str) -> str:
+def _download_to_local(url: str, info: RemoteInfo | None = None) -> str:
     """Download a URL (with caching) and return a local file path.
 
     Uses the file cache so repeated downloads of the same URL are served
     from disk.  The returned path is owned by the cache and must NOT be
     deleted by the caller.
     """
-    return _download_and_cache(url)
+    return _download_and_cache(url, info=info)
+
+
+def _registered_scan(url: str, force_download: bool = False, info: RemoteInfo | None = None):
+    """Return the scan registry entry for *url*, scanning it on a miss.
+
+    Remote parquet URLs are scanned directly first (HTTP range requests,
+    through the block cache's local proxy when the server supports ranges,
+    see range_cache.py) and fall back to a cached download if that fails.  CSV-family files
+    are always read locally -- downloaded first if remote -- and
+    transcoded to Parquet once (see file_cache.transcode).  With
+    ``force_download=True`` any existing entry is dropped and the download
+    path is used straight away.
+
+    *info* is what a request the caller just made to a remote *url* said
+    about it (see :func:`_validate`); the block cache, the registry
+    fingerprint and the download then reuse it instead of probing again.
+    """
+    resolved, is_local = _resolve_url(url)
+
+    def scan():
+        if is_local:
+            return _scan_local(resolved)
+        if not force_download and not _is_csv_file(url):
+            try:
+                lf = _scan_data_file(_range_cache.open_url(url, info) or url)
+                lf.collect_schema()  # force metadata read to verify access
+                return lf, None
+            except Exception:
+                pass
+        cached_path = _download_to_local(url, info)
+        return _scan_local(cached_path, cached_path)
+
+    key = resolved if is_local else url
+    if force_download:
+        _scan_registry.invalidate(key)
+        _range_cache.forget(url)
+    fingerprint = info.fingerprint if info is not None else None
+    return _scan_registry.get_or_register(key, is_local, scan, fingerprint)
+
+
+def _invalidate_scan(url: str) -> None:
+    """Drop the scan registry entry for *url* so the next use re-scans it."""
+    resolved, is_local = _resolve_url(url)
+    _scan_registry.invalidate(resolved if is_local else url)
+    if not is_local:
+        _range_cache.forget(url)
+
+
+# Errors in the statement itself; anything else may come from a bad scan.
+_STATEMENT_ERROR_NAMES = (
+    "SQLSyntaxError",
+    "SQLInterfaceError",
+    "ColumnNotFoundError",
+    "SchemaFieldNotFoundError",
+    "InvalidOperationError",
+    "DuplicateError",
+)
+
+
+def _is_statement_error(exc: Exception) -> bool:
+    return type(exc).__name__ in _STATEMENT_ERROR_NAMES
+
+
+def _registry_delta(hits_before: int, misses_before: int) -> dict:
+    """Return scan registry hits/misses accrued since the given counters."""
+    return {
+        "hits": _scan_registry.hits - hits_before,
+        "misses": _scan_registry.misses - misses_before,
+    }
 
 
 def _validate_url_safety(url: str) -> dict | None:
@@ -154,15 +332,25 @@ def fetch_and_validate(url: str) -> dict:
     For CSV/TSV files, only checks that the file exists and has content.
     For parquet files, also checks the PAR1 magic bytes.
 
-    For remote URLs:
-    1. HEAD request to check URL accessibility (timeout 10s).
-    2. For parquet: fetch first 4 bytes and verify parquet magic number (PAR1).
-    3. For CSV/TSV: accessibility check is sufficient.
+    For remote URLs, a single request:
+    1. For parquet: ranged GET of the first 4 bytes -- checks accessibility,
+       reads the size from ``Content-Range`` and verifies the magic number (PAR1).
+    2. For CSV/TSV: HEAD request; accessibility check is sufficient.
 
     Returns:
         {"valid": True} on success.
         {"valid": False, "error": str, "error_type": str} on failure.
     """
+    return _validate(url)[0]
+
+
+def _validate(url: str) -> tuple[dict, RemoteInfo | None]:
+    """Validate *url* as :func:`fetch_and_validate` does.
+
+    Returns the result dict and, for a remote URL that answered, what the
+    request said about the file: its size, whether it honoured the range
+    request, ETag and Last-Modified.
+    """
     resolved, is_local = _resolve_url(url)
     is_csv = _is_csv_file(resolved if is_local else url)
 
@@ -170,7 +358,7 @@ def fetch_and_validate(url: str) -> dict:
     if not is_local:
         safety_error = _validate_url_safety(url)
         if safety_error is not None:
-            return safety_error
+            return safety_error, None
 
     # Local file validation (uploaded files)
     if is_local:
@@ -183,8 +371,8 @@ def fetch_and_validate(url: str) -> dict:
                         "valid": False,
                         "error": "CSV file is empty",
                         "error_type": "validation",
-                    }
-                return {"valid": True, "file_size_bytes": file_size_bytes}
+                    }, None
+                return {"valid": True, "file_size_bytes": file_size_bytes}, None
             # For parquet, check magic bytes
             with open(resolved, "rb") as f:
                 magic_bytes = f.read(4)
@@ -193,38 +381,34 @@ def fetch_and_validate(url: str) -> dict:
                     "valid": False,
                     "error": "Not a valid parquet file",
                     "error_type": "validation",
-                }
-            return {"valid": True, "file_size_bytes": file_size_bytes}
+                }, None
+            return {"valid": True, "file_size_bytes": file_size_bytes}, None
         except FileNotFoundError:
             return {
                 "valid": False,
                 "error": "Uploaded file not found",
                 "error_type": "network",
-            }
+            }, None
         except Exception as exc:
             return {
                 "valid": False,
                 "error": f"Failed to validate file: {exc}",
                 "error_type": "network",
-            }
+            }, None
 
-    # Remote URL validation
-    file_size_bytes = None
+    # Remote URL validation: one request checks accessibility and size
+    # and, for parquet, reads the magic bytes (a ranged GET of the first
+    # 4 bytes; servers without range support send the file and only 4 bytes
+    # are read before the connection is closed).
     try:
-        # Step 1: HEAD request to check accessibility
-        req = urllib.request.Request(url, method="HEAD")
+        if is_csv:
+            req = urllib.request.Request(url, method="HEAD")
+        else:
+            req = urllib.request.Request(url, headers={"Range": "bytes=0-3"})
         with urllib.request.urlopen(req, timeout=HEAD_REQUEST_TIMEOUT) as resp:
-            content_length = resp.headers.get("Content-Length")
-            file_size_bytes = int(content_length) if content_length else None
-
-        # Reject oversized remote files early (before download)
-        if file_size_bytes is not None and file_size_bytes > 500 * 1024 * 1024:
-            size_mb = file_size_bytes / (1024 * 1024)
-            return {
-                "valid": False,
-                "error": f"File is too large ({size_mb:.0f} MB). Maximum supported size is 500 MB.",
-                "error_type": "validation",
-            }
+            file_size_bytes = _response_size(resp)
+            magic_bytes = b"" if is_csv else resp.read(4)
+            info = _remote_info(resp, file_size_bytes, is_csv)
     except (urllib.error.HTTPError, urllib.error.URLError, OSError, ValueError) as exc:
         error_msg = str(exc)
         if isinstance(exc, urllib.error.HTTPError):
@@ -232,48 +416,81 @@ def fetch_and_validate(url: str) -> dict:
                 "valid": False,
                 "error": f"Could not access URL (HTTP {exc.code})",
                 "error_type": "network",
-            }
+            }, None
         return {
             "valid": False,
             "error": f"Could not access URL: {error_msg}",
             "error_type": "network",
-        }
+        }, None
+
+    # Reject oversized remote files early (before download)
+    if file_size_bytes is not None and file_size_bytes > 500 * 1024 * 1024:
+        size_mb = file_size_bytes / (1024 * 1024)
+        return {
+            "valid": False,
+            "error": f"File is too large ({size_mb:.0f} MB). Maximum supported size is 500 MB.",
+            "error_type": "validation",
+        }, None
 
     # For CSV/TSV files, accessibility check is sufficient
     if is_csv:
-        return {"valid": True, "file_size_bytes": file_size_bytes}
+        return {"valid": True, "file_size_bytes": file_size_bytes}, info
 
-    try:
-        # Step 2: Fetch the beginning of the file and check parquet magic bytes.
-        # We download enough to check the 4-byte magic number.
-        with urllib.request.urlopen(url, timeout=HEAD_REQUEST_TIMEOUT) as response:
-            magic_bytes = response.read(4)
+    if len(magic_bytes) < 4:
+        return {
+            "valid": False,
+            "error": "Not a valid parquet file (too few bytes)",
+            "error_type": "validation",
+        }, None
 
-        if len(magic_bytes) < 4:
-            return {
-                "valid": False,
-                "error": "Not a valid parquet file (too few bytes)",
-                "error_type": "validation",
-            }
+    if magic_bytes != b"PAR1":
+        return {
+            "valid": False,
+            "error": "Not a valid parquet file",
+            "error_type": "validation",
+        }, None
 
-        if magic_bytes != b"PAR1":
-            return {
-                "valid": False,
-                "error": "Not a valid parquet file",
-                "error_type": "validation",
-            }
+    return {"valid": True, "file_size_bytes": file_size_bytes}, info
 
-        return {"valid": True, "file_size_bytes": file_size_bytes}
 
-    except Exception as exc:
-        return {
-            "valid": False,
-            "error": f"Failed to validate file: {exc}",
-            "error_type": "network",
-        }
+def _response_size(resp) -> int | None:
+    """Return the full size of the resource behind an HTTP response.
+
+    For a partial (206) response that is the total in ``Content-Range``,
+    otherwise ``Content-Length``; ``None`` if unknown.
+    """
+    content_range = resp.headers.get("Content-Range")
+    if isinstance(content_range, str) and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else None
+    content_length = resp.headers.get("Content-Length")
+    return int(content_length) if content_length else None
 
 
-def _collect_sample_values(lazy_frame, columns: list[dict], max_samples: int = 5) -> list[dict]:
+def _remote_info(resp, size: int | None, is_csv: bool) -> RemoteInfo:
+    """Return what the validation response *resp* said about the remote file.
+
+    For the ranged GET of a Parquet file a 206 proves range support; for a
+    HEAD it is what ``Accept-Ranges`` advertises.
+    """
+    headers = resp.headers
+    if is_csv:
+        accepts_ranges = str(headers.get("Accept-Ranges") or "").lower() == "bytes"
+    else:
+        accepts_ranges = getattr(resp, "status", None) == 206
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    return RemoteInfo(
+        size=size,
+        accepts_ranges=accepts_ranges,
+        etag=etag if isinstance(etag, str) else None,
+        last_modified=last_modified if isinstance(last_modified, str) else None,
+    )
+
+
+def _collect_sample_values(
+    lazy_frame, columns: list[dict], max_samples: int = 5, max_rows: int = 100
+) -> list[dict]:
     """Collect sample non-null unique values for each column.
 
     Fetches a small number of rows and extracts distinct non-null values
@@ -283,14 +500,15 @@ def _collect_sample_values(lazy_frame, columns: list[dict], max_samples: int = 5
         lazy_frame: A Polars LazyFrame.
         columns: List of column info dicts (``{"name": ..., "type": ...}``).
         max_samples: Maximum number of sample values per column.
+        max_rows: Rows to sample from (callers pass the first row group's
+            size for Parquet, so only that row group is read).
 
     Returns:
         The same *columns* list, each dict augmented with a ``sample_values``
         key (list of strings).
     """
     try:
-        # Fetch up to 100 rows to get diverse sample values
-        sample_df = lazy_frame.head(100).collect()
+        sample_df = lazy_frame.head(max_rows).collect()
         for col_info in columns:
             col_name = col_info["name"]
             try:
@@ -313,78 +531,110 @@ def _collect_sample_values(lazy_frame, columns: list[dict], max_samples: int = 5
     return columns
 
 
-def _collect_column_stats(lazy_frame, columns: list[dict]) -> list[dict]:
-    """Collect lightweight column statistics for the system prompt.
+def _collect_column_stats(lazy_frame, columns: list[dict], footer=None) -> tuple[list[dict], int]:
+    """Collect lightweight column statistics for the system prompt, and the row count.
 
     For numeric columns (Int*, UInt*, Float*): min, max.
-    For string columns (Utf8, String): unique count (cardinality).
+    For string columns (Utf8, String): unique count (cardinality), and
+    ``unique_count_approximate`` when it is an estimate.
     For all columns: null count (only if > 0).
 
-    Uses aggregation on the full LazyFrame (Polars pushes predicates down,
-    so this is efficient even for large parquet files).
+    Whatever the Parquet *footer* statistics (parquet_footer.FooterStats)
+    provide -- row count, null counts, numeric min/max -- is taken from
+    there; everything else is computed in one fused aggregation over the
+    LazyFrame, and no scan happens at all if nothing is missing.  An exact
+    string cardinality holds every distinct value in memory, so for
+    footer-backed files above ``EXACT_UNIQUE_MAX_ROWS`` rows it is
+    estimated with ``approx_n_unique`` (HyperLogLog) instead.
 
     Args:
         lazy_frame: A Polars LazyFrame.
         columns: List of column info dicts (already has ``name``, ``type``).
+        footer: Footer statistics of the scanned Parquet file, if any.
 
     Returns:
-        The same *columns* list, each dict augmented with a ``column_stats``
-        dict containing the computed statistics.
+        ``(columns, row_count)``: the same *columns* list, each dict
+        augmented with a ``column_stats`` dict, and the number of rows.
     """
     import polars as pl
 
-    try:
-        # Build aggregation expressions for all columns in a single pass
-        agg_exprs = []
-        for col_info in columns:
-            col_name = col_info["name"]
-            dtype_str = col_info.get("type", "")
-            col_ref = pl.col(col_name)
+    known = footer.columns if footer is not None else {}
+    exact_unique = footer is None or footer.num_rows <= EXACT_UNIQUE_MAX_ROWS
 
-            # Null count for every column
+    agg_exprs = [] if footer is not None else [pl.len().alias("__len__")]
+    for col_info in columns:
+        col_name = col_info["name"]
+        dtype_str = col_info.get("type", "")
+        col_ref = pl.col(col_name)
+        stats = known.get(col_name)
+
+        # Null count for every column
+        if stats is None or stats.null_count is None:
             agg_exprs.append(col_ref.null_count().alias(f"__null__{col_name}"))
 
-            if dtype_str.startswith(("Int", "UInt", "Float")):
+        if dtype_str.startswith(("Int", "UInt", "Float")):
+            if stats is None or stats.min is None or stats.max is None:
                 agg_exprs.append(col_ref.min().alias(f"__min__{col_name}"))
                 agg_exprs.append(col_ref.max().alias(f"__max__{col_name}"))
-            elif dtype_str in ("Utf8", "String"):
-                agg_exprs.append(col_ref.n_unique().alias(f"__nunique__{col_name}"))
-
-        if not agg_exprs:
-            return columns
-
-        stats_row = lazy_frame.select(agg_exprs).collect().to_dicts()[0]
-
-        for col_info in columns:
-            col_name = col_info["name"]
-            dtype_str = col_info.get("type", "")
-            stats: dict = {}
-
-            null_count = stats_row.get(f"__null__{col_name}", 0)
-            if null_count and null_count > 0:
-                stats["null_count"] = null_count
-
-            if dtype_str.startswith(("Int", "UInt", "Float")):
-                min_val = stats_row.get(f"__min__{col_name}")
-                max_val = stats_row.get(f"__max__{col_name}")
-                if min_val is not None:
-                    stats["min"] = min_val
-                if max_val is not None:
-                    stats["max"] = max_val
-            elif dtype_str in ("Utf8", "String"):
-                n_unique = stats_row.get(f"__nunique__{col_name}")
-                if n_unique is not None:
-                    stats["unique_count"] = n_unique
-
-            col_info["column_stats"] = stats
+        elif dtype_str in ("Utf8", "String"):
+            n_unique = col_ref.n_unique() if exact_unique else col_ref.approx_n_unique()
+            agg_exprs.append(n_unique.alias(f"__nunique__{col_name}"))
 
+    stats_row: dict = {}
+    try:
+        if agg_exprs:
+            stats_row = lazy_frame.select(agg_exprs).collect().to_dicts()[0]
     except Exception:
         # If stats collection fails, add empty stats so the system still works
-        for col_info in columns:
-            if "column_stats" not in col_info:
-                col_info["column_stats"] = {}
+        stats_row = {}
+    if footer is not None:
+        row_count = footer.num_rows
+    elif "__len__" in stats_row:
+        row_count = stats_row["__len__"]
+    else:
+        row_count = lazy_frame.select(pl.len()).collect().item()
 
-    return columns
+    for col_info in columns:
+        col_name = col_info["name"]
+        dtype_str = col_info.get("type", "")
+        footer_stats = known.get(col_name)
+        stats: dict = {}
+
+        null_count = stats_row.get(f"__null__{col_name}")
+        if null_count is None and footer_stats is not None:
+            null_count = footer_stats.null_count
+        if null_count and null_count > 0:
+            stats["null_count"] = null_count
+
+        if dtype_str.startswith(("Int", "UInt", "Float")):
+            min_val = stats_row.get(f"__min__{col_name}")
+            max_val = stats_row.get(f"__max__{col_name}")
+            if footer_stats is not None and f"__min__{col_name}" not in stats_row:
+                min_val, max_val = footer_stats.min, footer_stats.max
+            if min_val is not None:
+                stats["min"] = min_val
+            if max_val is not None:
+                stats["max"] = max_val
+        elif dtype_str in ("Utf8", "String"):
+            n_unique = stats_row.get(f"__nunique__{col_name}")
+            if n_unique is not None:
+                stats["unique_count"] = n_unique
+                if not exact_unique:
+                    stats["unique_count_approximate"] = True
+
+        col_info["column_stats"] = stats
+
+    return columns, row_count
+
+
+def _scan_source(url: str, entry) -> str:
+    """Return the file or URL a registered scan reads from."""
+    if entry.local_path is not None:
+        return entry.local_path
+    resolved, is_local = _resolve_url(url)
+    if not is_local:
+        return _range_cache.proxied_url(url) or resolved
+    return resolved
 
 
 def extract_schema(url: str) -> dict:
@@ -394,61 +644,85 @@ def extract_schema(url: str) -> dict:
 
     Supports parquet, CSV, TSV, and CSV.GZ files.
 
-    Uses Polars scan_parquet/scan_csv with HTTP URL directly (range requests
-    for parquet) to read schema without downloading the full file. Falls back
-    to downloading to a cached local file if direct URL access fails.
+    Row count, null counts and numeric min/max come from the Parquet footer
+    when it has them (see parquet_footer.py); only missing statistics are
+    computed, in one fused aggregation, and sample values are taken from
+    the first row group.
+
+    Uses Polars scan_parquet with HTTP URL directly (range requests) to read
+    schema without downloading the full file. Falls back to downloading to a
+    cached local file if direct URL access fails. CSV-family files are
+    downloaded and transcoded to Parquet once, here at load time.
 
     For ``file://`` URIs (uploaded files), reads the local file directly.
 
+    ``version`` identifies the dataset version the schema was read from
+    (see file_cache.version_id); it is ``None`` when the server sends no
+    ETag, Last-Modified or Content-Length.
+
+    ``preview`` is a snapshot of the first rows and a fixed random sample
+    (see sampler.preview_snapshot), stored with the dataset so that head
+    and random previews need no worker; ``None`` if it could not be read.
+
     Returns:
-        {"columns": [{"name": str, "type": str, "sample_values": list[str]}, ...], "row_count": int}
+        {"columns": [{"name": str, "type": str, "sample_values": list[str]}, ...], "row_count": int,
+         "version": str | None, "preview": dict | None}
         On error: {"error_type": str, "message": str, "details": str | None}
     """
+    return _extract_schema(url)
+
+
+def _preview_snapshot(lazy_frame, footer=None) -> dict | None:
+    """Return the preview snapshot of a dataset (see sampler.preview_snapshot).
+
+    ``None`` if it cannot be read; previews then fall back to a worker task.
+    """
     try:
-        import polars as pl
+        return _sampler.preview_snapshot(
+            lazy_frame, footer.row_group_rows if footer is not None else None,
+        )
+    except Exception:
+        return None
 
-        resolved, is_local = _resolve_url(url)
 
-        # For local files, read directly
-        if is_local:
-            lazy_frame = _scan_data_file(resolved, is_local=True)
-            schema = lazy_frame.collect_schema()
+def _extract_schema(url: str, info: RemoteInfo | None = None) -> dict:
+    """Extract the schema of *url* as :func:`extract_schema` does.
+
+    *info* is passed on to :func:`_registered_scan`.
+    """
+    try:
+        import polars as pl
+
+        def describe(entry) -> dict:
+            lazy_frame = entry.lazy_frame
             columns = [
-                {"name": name, "type": str(dtype)}
-                for name, dtype in schema.items()
+                {"name": name, "type": dtype}
+                for name, dtype in entry.schema.items()
             ]
-            row_count = lazy_frame.select(pl.len()).collect().item()
-            columns = _collect_sample_values(lazy_frame, columns)
-            columns = _collect_column_stats(lazy_frame, columns)
-            return {"columns": columns, "row_count": row_count}
+            footer = _read_footer_stats(_scan_source(url, entry))
+            sample_rows = 100
+            if footer is not None and footer.row_group_rows and footer.row_group_rows[0] > 0:
+                sample_rows = min(sample_rows, footer.row_group_rows[0])
+            columns = _collect_sample_values(lazy_frame, columns, max_rows=sample_rows)
+            columns, row_count = _collect_column_stats(lazy_frame, columns, footer)
+            return {
+                "columns": columns,
+                "row_count": row_count,
+                "version": _version_id(entry.fingerprint),
+                "preview": _preview_snapshot(lazy_frame, footer),
+            }
+
+        entry = _registered_scan(url, info=info)
+        if entry.local_path is not None or _resolve_url(url)[1]:
+            return describe(entry)
 
-        # Try direct URL access first (uses HTTP range requests for parquet — fast)
+        # Direct URL access (HTTP range requests for parquet) -- if reading
+        # the data fails, fall back to a cached local download.
         try:
-            lazy_frame = _scan_data_file(url)
-            schema = lazy_frame.collect_schema()
-            columns = [
-                {"name": name, "type": str(dtype)}
-                for name, dtype in schema.items()
-            ]
-            row_count = lazy_frame.select(pl.len()).collect().item()
-            columns = _collect_sample_values(lazy_frame, columns)
-            columns = _collect_column_stats(lazy_frame, columns)
-            return {"columns": columns, "row_count": row_count}
+            return describe(entry)
         except Exception:
             pass
-
-        # Fallback: download (cached) to local file
-        cached_path = _download_to_local(url)
-        lazy_frame = _scan_data_file(cached_path)
-        schema = lazy_frame.collect_schema()
-        columns = [
-            {"name": name, "type": str(dtype)}
-            for name, dtype in schema.items()
-        ]
-        row_count = lazy_frame.select(pl.len()).collect().item()
-        columns = _collect_sample_values(lazy_frame, columns)
-        columns = _collect_column_stats(lazy_frame, columns)
-        return {"columns": columns, "row_count": row_count}
+        return describe(_registered_scan(url, force_download=True, info=info))
 
     except (urllib.error.HTTPError, urllib.error.URLError, OSError) as exc:
         error_msg = str(exc)
@@ -471,94 +745,89 @@ def extract_schema(url: str) -> dict:
         }
 
 
-def profile_columns(url: str) -> dict:
-    """Compute per-column profiling statistics for a dataset.
+def ingest_dataset(url: str) -> dict:
+    """Validate *url* and extract its schema, statistics and samples in one task.
+
+    Does what :func:`fetch_and_validate` followed by :func:`extract_schema`
+    do, but for a remote file the validation request is the only probe:
+    its size, range support, ETag and Last-Modified are handed to the block
+    cache, the scan registry fingerprint and the download fallback, which
+    would otherwise each send their own HEAD.
+
+    Returns:
+        {"valid": True, "file_size_bytes": int | None, "columns": [...],
+         "row_count": int, "version": str | None, "preview": dict | None}
+        on success.
+        {"valid": False, "error": str, "error_type": str, ...} on failure
+        of either step.
+
+    Its phase ("validating", "reading", or "downloading" with byte counts)
+    is kept as a file_cache progress record while it runs.
+    """
+    try:
+        _report_progress(url, "validating")
+        validation, info = _validate(url)
+        if not validation.get("valid"):
+            return validation
+        _report_progress(url, "reading")
+        schema = _extract_schema(url, info)
+    finally:
+        _clear_progress(url)
+    if "error_type" in schema:
+        return {
+            "valid": False,
+            "error": schema["message"],
+            "error_type": schema["error_type"],
+            "details": schema.get("details"),
+        }
+    return {**validation, **schema}
 
-    For each column, computes null count/percent, unique count, and
-    type-specific stats (min/max/mean for numerics, min/max length for strings).
 
-    For large datasets (>100K rows), samples the first 100K rows for speed.
+def dataset_version(url: str) -> dict:
+    """Return the current version id of *url* without reading its data.
 
-    Supports parquet, CSV, TSV, and CSV.GZ files.
+    One HEAD request for a remote URL, a ``stat`` for a local file.  The id
+    is comparable with the ``version`` :func:`extract_schema` returned, so
+    callers can tell whether a dataset changed since it was loaded.
 
     Returns:
-        {"profiles": [{"name": str, ...}, ...]}
-        On error: {"error": str}
+        {"version": str | None} -- ``None`` when the server sends no ETag,
+        Last-Modified or Content-Length, or cannot be reached.
     """
-    try:
-        import polars as pl
+    resolved, is_local = _resolve_url(url)
+    fingerprint = _local_fingerprint(resolved) if is_local else _remote_fingerprint(url)
+    return {"version": _version_id(fingerprint)}
 
-        SAMPLE_THRESHOLD = 100_000
 
-        resolved, is_local = _resolve_url(url)
+def profile_columns(
+    url: str, sampling: str = _profiler.PREFIX, columns: list[str] | None = None
+) -> dict:
+    """Compute per-column profiling statistics for a dataset.
 
-        if is_local:
-            lazy_frame = _scan_data_file(resolved, is_local=True)
-        else:
-            # Try direct URL access first (uses HTTP range requests for parquet)
-            try:
-                lazy_frame = _scan_data_file(url)
-                lazy_frame.collect_schema()  # verify access
-            except Exception:
-                # Fallback: download (cached) to local file
-                cached_path = _download_to_local(url)
-                lazy_frame = _scan_data_file(cached_path)
-
-        # Collect, sampling if needed
-        df = lazy_frame.collect()
-        if len(df) > SAMPLE_THRESHOLD:
-            df = df.head(SAMPLE_THRESHOLD)
-
-        schema = df.schema
-        profiles = []
-
-        for col_name in df.columns:
-            dtype = schema[col_name]
-            series = df[col_name]
-            total = len(series)
-
-            null_count = series.null_count()
-            null_percent = round((null_count / total) * 100, 1) if total > 0 else 0.0
-            unique_count = series.n_unique()
-
-            profile: dict = {
-                "name": col_name,
-                "null_count": null_count,
-                "null_percent": null_percent,
-                "unique_count": unique_count,
-            }
+    For each column, computes null count/percent, approximate unique count,
+    top values and type-specific stats (min/max/mean and a histogram for
+    numerics, min/max length for strings) -- all columns in one fused
+    streaming aggregation, see profiler.py.
+
+    *sampling* picks the rows profiled: ``"prefix"`` (the first 100K),
+    ``"row_groups"`` (100K rows from row groups spread over the file) or
+    ``"full"`` (every row).  With *columns*, only those columns are profiled.
+
+    Supports parquet, CSV, TSV, and CSV.GZ files.
 
-            # Numeric types: Int*, UInt*, Float*
-            dtype_str = str(dtype)
-            if dtype_str.startswith(("Int", "UInt", "Float")):
-                try:
-                    min_val = series.min()
-                    max_val = series.max()
-                    mean_val = series.mean()
-                    profile["min"] = min_val
-                    profile["max"] = max_val
-                    profile["mean"] = round(mean_val, 2) if mean_val is not None else None
-                except Exception:
-                    profile["min"] = None
-                    profile["max"] = None
-                    profile["mean"] = None
-            elif dtype_str in ("Utf8", "String"):
-                try:
-                    non_null = series.drop_nulls()
-                    if len(non_null) > 0:
-                        lengths = non_null.str.len_chars()
-                        profile["min_length"] = lengths.min()
-                        profile["max_length"] = lengths.max()
-                    else:
-                        profile["min_length"] = None
-                        profile["max_length"] = None
-                except Exception:
-                    profile["min_length"] = None
-                    profile["max_length"] = None
-
-            profiles.append(profile)
-
-        return {"profiles": profiles}
+    Returns:
+        {"profiles": [{"name": str, ...}, ...], "row_count": int, "sampling": str}
+        On error: {"error": str}
+    """
+    try:
+        entry = _registered_scan(url)
+        row_group_rows = None
+        if sampling == _profiler.ROW_GROUPS:
+            footer = _read_footer_stats(_scan_source(url, entry))
+            row_group_rows = footer.row_group_rows if footer is not None else None
+        return _profiler.profile_frame(
+            entry.lazy_frame, sampling, row_group_rows=row_group_rows, columns=columns
+        )
 
     except Exception as exc:
         return {"error": translate_polars_error(str(exc))}
@@ -580,17 +849,7 @@ def profile_column(url: str, table_name: str, column_name: str, column_type: str
     try:
         import polars as pl
 
-        resolved, is_local = _resolve_url(url)
-
-        if is_local:
-            lf = _scan_data_file(resolved, is_local=True)
-        else:
-            try:
-                lf = _scan_data_file(url)
-                lf.collect_schema()  # verify access
-            except Exception:
-                cached_path = _download_to_local(url)
-                lf = _scan_data_file(cached_path)
+        lf = _registered_scan(url).lazy_frame
 
         col = pl.col(column_name)
         dtype_str = column_type
@@ -691,17 +950,103 @@ def profile_column(url: str, table_name: str, column_name: str, column_type: str
         return {"error": translate_polars_error(str(e))}
 
 
-def execute_query(sql: str, datasets: list[dict]) -> dict:
+def sketch_column(url: str, column_name: str, column_type: str) -> dict:
+    """Build a mergeable sketch of one column for approximate statistics.
+
+    The column is read one row group at a time (see sketches.py), so memory
+    is bounded by a row group however large the file.
+
+    Args:
+        url: Data file URL or file:// path (parquet, CSV, TSV).
+        column_name: The column to sketch.
+        column_type: The Polars dtype string (e.g. "Int64", "Utf8").
+
+    Returns:
+        {"sketch": dict} in the form of sketches.to_dict.
+        On error: {"error": str}
+    """
+    try:
+        entry = _registered_scan(url)
+        footer = _read_footer_stats(_scan_source(url, entry))
+        sketch = _sketches.sketch_column(
+            entry.lazy_frame, column_name, column_type,
+            footer.row_group_rows if footer is not None else None,
+        )
+        return {"sketch": _sketches.to_dict(sketch)}
+
+    except Exception as exc:
+        return {"error": translate_polars_error(str(exc))}
+
+
+def sample_dataset(
+    url: str,
+    method: str,
+    sample_size: int,
+    column: str | None = None,
+    seed: int | None = None,
+) -> dict:
+    """Sample rows of a dataset for a preview without a full scan.
+
+    Reads only the row groups the sample touches (see sampler.py).
+
+    Args:
+        url: Data file URL or file:// path (parquet, CSV, TSV).
+        method: ``"tail"``, ``"random"`` or ``"stratified"``.
+        sample_size: Number of rows to return.
+        column: The stratum column (stratified only).
+        seed: Seed for random and stratified samples.
+
+    Returns:
+        {"columns": list[str], "rows": list[dict]}
+        On error: {"error_type": "internal", "message": str, "details": str}
+    """
+    try:
+        entry = _registered_scan(url)
+        footer = _read_footer_stats(_scan_source(url, entry))
+        df = _sampler.sample_rows(
+            entry.lazy_frame, method, sample_size,
+            footer.row_group_rows if footer is not None else None,
+            column=column, seed=seed,
+        )
+        return {"columns": df.columns, "rows": df.to_dicts()}
+
+    except Exception as exc:
+        return {
+            "error_type": "internal",
+            "message": translate_polars_error(str(exc)),
+            "details": str(exc),
+        }
+
+
+def _is_panic(exc: BaseException) -> bool:
+    """True for a Rust panic inside Polars, which is not an ``Exception``."""
+    import polars as pl
+
+    return isinstance(exc, pl.exceptions.PanicException)
+
+
+def execute_query(
+    sql: str, datasets: list[dict], transport: str = PICKLE, cursor: bool = False
+) -> dict:
     """Execute SQL query against datasets (parquet, CSV, TSV).
 
     Implements: spec/backend/worker/spec.md#sql-query-execution
 
-    Downloads datasets, loads them with Polars, registers each as a named
-    table in a SQL context, executes the query, and returns up to 1000 rows.
+    Downloads datasets, loads them with Polars, registers each table the
+    statement references in a SQL context, executes the query, and returns
+    up to 1000 rows.
 
     Args:
         sql: SQL query string.
         datasets: List of {"url": str, "table_name": str} dicts.
+        transport: ``"pickle"`` returns the rows inline.  ``"arrow_ipc"``
+            writes them to a shared-memory Arrow IPC file and returns
+            ``"result_ipc": {"path", "size_bytes"}`` in place of ``"rows"``
+            (see result_transport.py).
+        cursor: Also persist the result, capped at ``MAX_QUERY_ROWS`` rows,
+            in the cursor store and return its ``"cursor_id"`` (see
+            cursor_store.py).  The cap matters for statements with their own
+            large LIMIT, which would otherwise copy the dataset to disk.
 
     Returns:
         {
@@ -709,30 +1054,31 @@ def execute_query(sql: str, datasets: list[dict]) -> dict:
             "columns": list[str],  # column names
             "total_rows": int,     # actual total row count
             "execution_time_ms": float,  # query execution time in milliseconds
+            "scan_registry": {"hits": int, "misses": int},  # this call only
         }
         On error: {"error_type": str, "message": str, "details": str | None, "execution_time_ms": float}
+        with error_type ``"sql"``, ``"memory"`` on a ``MemoryError``, or
+        ``"internal"`` when Polars panicked.
     """
     start_time = time.perf_counter()
+    hits_before = _scan_registry.hits
+    misses_before = _scan_registry.misses
+    registered_urls: list[str] = []
     try:
         import polars as pl
 
         ctx = pl.SQLContext()
 
-        # Register each dataset as a named table (try URL directly first)
+        # Register each dataset the statement references as a named table
+        # (all of them if the SQL can't be tokenized).  Scans come from the
+        # per-worker registry, so repeat queries skip the metadata round trip.
+        referenced = _referenced_tables(sql, [d["table_name"] for d in datasets])
         for dataset in datasets:
-            resolved, is_local = _resolve_url(dataset["url"])
-            if is_local:
-                lf = _scan_data_file(resolved, is_local=True)
-                ctx.register(dataset["table_name"], lf)
-            else:
-                try:
-                    lf = _scan_data_file(dataset["url"])
-                    lf.collect_schema()  # force metadata read to verify access
-                    ctx.register(dataset["table_name"], lf)
-                except Exception:
-                    cached_path = _download_to_local(dataset["url"])
-                    lf = _scan_data_file(cached_path)
-                    ctx.register(dataset["table_name"], lf)
+            if referenced is not None and dataset["table_name"] not in referenced:
+                continue
+            registered_urls.append(dataset["url"])
+            entry = _registered_scan(dataset["url"])
+            ctx.register(dataset["table_name"], entry.lazy_frame)
 
         # Auto-inject LIMIT for SELECT queries that don't have one
         limit_applied = False
@@ -754,25 +1100,68 @@ def execute_query(sql: str, datasets: list[dict]) -> dict:
         # Truncate to 1000 rows
         truncated_df = result_df.head(MAX_RESULT_ROWS)
 
-        # Convert to list of dicts
-        rows = truncated_df.to_dicts()
+        if transport == ARROW_IPC:
+            payload = {"result_ipc": write_result(truncated_df)}
+        else:
+            payload = {"rows": truncated_df.to_dicts()}
+        if cursor:
+            try:
+                cursor_id = write_cursor(
+                    result_df.head(MAX_QUERY_ROWS),
+                    query_key(sql, datasets),
+                    limit_applied=limit_applied,
+                    total_rows=total_rows,
+                )
+            except OSError:
+                cursor_id = None
+            # Without a cursor the caller pages within the returned rows.
+            if cursor_id is not None:
+                payload["cursor_id"] = cursor_id
 
         execution_time_ms = (time.perf_counter() - start_time) * 1000
 
         return {
-            "rows": rows,
+            **payload,
             "columns": columns,
             "total_rows": total_rows,
             "execution_time_ms": execution_time_ms,
             "limit_applied": limit_applied,
+            "scan_registry": _registry_delta(hits_before, misses_before),
         }
 
-    except Exception as exc:
+    except BaseException as exc:
+        if not isinstance(exc, Exception) and not _is_panic(exc):
+            raise
         execution_time_ms = (time.perf_counter() - start_time) * 1000
         error_msg = str(exc)
+        # A failure reading the data (expired download, changed remote file
+        # behind an unchanged fingerprint) must not stay cached in the registry.
+        if not _is_statement_error(exc):
+            for url in registered_urls:
+                _invalidate_scan(url)
+        if isinstance(exc, MemoryError):
+            return {
+                "error_type": "memory",
+                "message": "Query ran out of memory (worker limit exceeded)",
+                "details": error_msg,
+                "execution_time_ms": execution_time_ms,
+                "scan_registry": _registry_delta(hits_before, misses_before),
+            }
+        if _is_panic(exc):
+            return {
+                "error_type": "internal",
+                "message": (
+                    "The query engine hit an internal error running this query. "
+                    "Try rewriting or simplifying it."
+                ),
+                "details": error_msg,
+                "execution_time_ms": execution_time_ms,
+                "scan_registry": _registry_delta(hits_before, misses_before),
+            }
         return {
             "error_type": "sql",
             "message": f"SQL execution error: {error_msg}",
             "details": error_msg,
             "execution_time_ms": execution_time_ms,
+            "scan_registry": _registry_delta(hits_before, misses_before),
         }
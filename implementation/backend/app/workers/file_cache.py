@@ -1,8 +1,26 @@
 """File-system cache for downloaded remote datasets.
 
 Caches URL downloads to disk keyed by SHA-256 hash of the URL.
-Provides LRU eviction when total cache size exceeds a configurable limit.
-Safe for concurrent access across worker processes (uses atomic rename).
+Evicts entries when the total cache size exceeds a configurable limit,
+using a small SQLite index shared by all processes (see :func:`_index`)
+that tracks each entry's size, last access and hit count.
+Safe for concurrent access across worker processes: files are placed with
+an atomic rename, and concurrent misses for the same URL are collapsed into
+one download by a per-URL lock file (see :func:`_acquire_download_lock`).
+
+Each downloaded file has a sidecar ``<file>.meta`` (JSON) recording the
+upstream ETag, Last-Modified, size, fetch and validation times and a
+*version id* derived from them (see :func:`version_id`).  Entries are
+revalidated with a conditional GET at most every ``REVALIDATE_SECONDS``
+and re-downloaded when the upstream file changed.
+
+Tasks working on a URL can leave a *progress record* -- their phase and,
+while downloading, bytes done of the total -- that another process reads
+with :func:`read_progress` (see dataset_service.load_dataset).
+
+Also holds the Parquet transcodes of local CSV-family files (see
+:func:`transcode`), keyed by the source path and its size and mtime, under
+the same LRU budget.
 
 No imports from ``app/`` -- fully self-contained, same as data_worker.py.
 """
@@ -10,12 +28,24 @@ No imports from ``app/`` -- fully self-contained, same as data_worker.py.
 from __future__ import annotations
 
 import hashlib
+import json
 import logging
+import math
 import os
+import sqlite3
+import stat
 import tempfile
+import threading
 import time
 import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +62,26 @@ CACHE_DIR = os.environ.get("CHATDF_CACHE_DIR", _default_cache)
 MAX_CACHE_BYTES = int(os.environ.get("CHATDF_MAX_CACHE_BYTES", str(1024 ** 3)))  # 1 GB
 MAX_FILE_BYTES = int(os.environ.get("CHATDF_MAX_FILE_BYTES", str(500 * 1024 ** 2)))  # 500 MB
 DOWNLOAD_TIMEOUT = 300  # seconds
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_CHUNK_BYTES = 1024 ** 2  # 1 MB per read()
+DOWNLOAD_CONNECTIONS = int(os.environ.get("CHATDF_DOWNLOAD_CONNECTIONS", "4"))
+PARALLEL_MIN_BYTES = 8 * 1024 ** 2  # smaller files use a single connection
+DOWNLOAD_LOCK_TIMEOUT = int(os.environ.get("CHATDF_DOWNLOAD_LOCK_TIMEOUT", "900"))  # seconds
+LOCK_POLL_INTERVAL = 0.2  # seconds between follower checks
+LOCKS_SUBDIR = ".locks"
+INDEX_SUBDIR = ".index"
+PROGRESS_SUBDIR = ".progress"
+PROGRESS_INTERVAL = 0.5  # seconds between download progress records
+# Eviction score = last access time + HIT_BONUS_SECONDS * log2(1 + hits):
+# every doubling of an entry's hits keeps it as long as being used this
+# many seconds later would (LRU with a logarithmic LFU bonus).
+HIT_BONUS_SECONDS = float(os.environ.get("CHATDF_CACHE_HIT_BONUS_SECONDS", "600"))
+REVALIDATE_SECONDS = float(os.environ.get("CHATDF_CACHE_REVALIDATE_SECONDS", "60"))
 STALE_TEMP_MAX_AGE = 3600  # seconds — remove .download_ temp files older than this
+TRANSCODE_SUFFIX = ".transcoded.parquet"
+META_SUFFIX = ".meta"
+
+_TEMP_PREFIXES = (".download_", ".transcode_")
 
 
 # ---------------------------------------------------------------------------
@@ -68,12 +117,106 @@ def _ensure_cache_dir() -> None:
     os.makedirs(CACHE_DIR, exist_ok=True)
 
 
+# ---------------------------------------------------------------------------
+# Entry metadata and versions
+# ---------------------------------------------------------------------------
+
+def version_id(fingerprint: str | None) -> str | None:
+    """Return a short, stable version id for a dataset *fingerprint*.
+
+    *fingerprint* is ``"etag|last_modified|size"`` for remote files (the
+    format of ``scan_registry.remote_fingerprint``) or ``"size:mtime_ns"``
+    for local ones, so a worker that scanned a URL directly and one that
+    downloaded it agree on the version.
+    """
+    if not fingerprint:
+        return None
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+
+def _read_meta(path: str) -> dict | None:
+    """Return the sidecar metadata of the cached file *path*, if any."""
+    try:
+        with open(path + META_SUFFIX) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(path: str, meta: dict) -> None:
+    """Atomically write the sidecar metadata of the cached file *path*."""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=".download_", suffix=META_SUFFIX)
+        with os.fdopen(fd, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path + META_SUFFIX)
+    except OSError as exc:
+        logger.warning("Could not write cache metadata for %s: %s", path, exc)
+
+
+def _needs_revalidation(meta: dict | None, max_age: float) -> bool:
+    """Whether an entry should be checked upstream before it is served.
+
+    Entries without validators (no ETag or Last-Modified, or written
+    before metadata existed) cannot be checked cheaply and are served as is.
+    """
+    if not meta or not (meta.get("etag") or meta.get("last_modified")):
+        return False
+    return time.time() - meta.get("validated_at", 0) > max_age
+
+
+def _revalidate(url: str, meta: dict) -> bool:
+    """Check the cached copy of *url* with a conditional GET.
+
+    Returns ``True`` if it is still current -- ``304 Not Modified``, or a
+    full response whose validators match the cached copy (servers that
+    ignore conditional headers; the body is not read) -- and also when
+    upstream cannot be reached: a stale copy beats a failed query.
+    Returns ``False`` if upstream changed.
+    """
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    try:
+        req = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status == 304 or _matches_meta(resp.headers, meta)
+    except urllib.error.HTTPError as exc:
+        if exc.code != 304:
+            logger.warning("Revalidation of %s failed (HTTP %d); serving cached copy", url[:80], exc.code)
+        return True
+    except (urllib.error.URLError, OSError, ValueError) as exc:
+        logger.warning("Revalidation of %s failed (%s); serving cached copy", url[:80], exc)
+        return True
+
+
+def _matches_meta(headers, meta: dict) -> bool:
+    """Whether response *headers* describe the same file as the cached *meta*.
+
+    The ETag decides when both sides have one; otherwise Last-Modified
+    must match, and Content-Length too when it is sent.
+    """
+    etag = headers.get("ETag")
+    if etag and meta.get("etag"):
+        return etag == meta["etag"]
+    last_modified = headers.get("Last-Modified")
+    if not last_modified or last_modified != meta.get("last_modified"):
+        return False
+    length = headers.get("Content-Length")
+    try:
+        return length is None or meta.get("size") is None or int(length) == meta["size"]
+    except ValueError:
+        return False
+
+
 # ---------------------------------------------------------------------------
 # Stale temp file cleanup
 # ---------------------------------------------------------------------------
 
 def _cleanup_stale_temps() -> int:
-    """Remove stale .download_ temp files left behind by crashed downloads.
+    """Remove stale temp files left behind by crashed downloads and transcodes.
 
     Returns the number of removed files.
     """
@@ -81,7 +224,7 @@ def _cleanup_stale_temps() -> int:
     try:
         now = time.time()
         for name in os.listdir(CACHE_DIR):
-            if not name.startswith(".download_"):
+            if not name.startswith(_TEMP_PREFIXES):
                 continue
             path = os.path.join(CACHE_DIR, name)
             try:
@@ -96,53 +239,357 @@ def _cleanup_stale_temps() -> int:
                 pass
     except OSError:
         pass
+    _cleanup_stale_locks()
+    _cleanup_stale_progress()
     return removed
 
 
+def _cleanup_stale_locks() -> None:
+    """Remove download lock files that are old and not held by anyone."""
+    if fcntl is None:
+        return
+    lock_dir = os.path.join(CACHE_DIR, LOCKS_SUBDIR)
+    try:
+        names = os.listdir(lock_dir)
+    except OSError:
+        return
+    now = time.time()
+    for name in names:
+        path = os.path.join(lock_dir, name)
+        try:
+            if now - os.path.getmtime(path) <= STALE_TEMP_MAX_AGE:
+                continue
+            fd = os.open(path, os.O_RDWR)
+        except OSError:
+            continue
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            os.unlink(path)
+        except OSError:
+            pass  # held by a live download
+        finally:
+            os.close(fd)
+
+
+def _cleanup_stale_progress() -> None:
+    """Remove progress records left behind by tasks that died."""
+    progress_dir = os.path.join(CACHE_DIR, PROGRESS_SUBDIR)
+    try:
+        names = os.listdir(progress_dir)
+    except OSError:
+        return
+    now = time.time()
+    for name in names:
+        path = os.path.join(progress_dir, name)
+        try:
+            if now - os.path.getmtime(path) > STALE_TEMP_MAX_AGE:
+                os.unlink(path)
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Progress records
+# ---------------------------------------------------------------------------
+
+
+def _progress_path(url: str) -> str:
+    return os.path.join(CACHE_DIR, PROGRESS_SUBDIR, _cache_key(url))
+
+
+def report_progress(url: str, phase: str, done: int | None = None, total: int | None = None) -> None:
+    """Record that the task working on *url* is in *phase* (best effort).
+
+    *done* and *total* count bytes while downloading.  The record is
+    replaced atomically, so :func:`read_progress` never sees half of one.
+    """
+    path = _progress_path(url)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".progress_")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"phase": phase, "done": done, "total": total}, f)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logger.debug("Could not record progress for %s: %s", url[:80], exc)
+
+
+def read_progress(url: str) -> dict | None:
+    """Return the latest progress record for *url*, or ``None``.
+
+    The record is ``{"phase": str, "done": int | None, "total": int | None}``.
+    """
+    try:
+        with open(_progress_path(url)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def clear_progress(url: str) -> None:
+    """Remove the progress record for *url*, if any."""
+    try:
+        os.unlink(_progress_path(url))
+    except OSError:
+        pass
+
+
+class _DownloadProgress:
+    """Counts downloaded bytes and records them at most every ``PROGRESS_INTERVAL``.
+
+    Thread-safe: the ranges of a parallel download share one instance.
+    """
+
+    def __init__(self, url: str, total: int | None) -> None:
+        self._url = url
+        self._total = total
+        self._done = 0
+        self._reported_at = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, nbytes: int) -> None:
+        with self._lock:
+            self._done += nbytes
+            now = time.monotonic()
+            if now - self._reported_at < PROGRESS_INTERVAL:
+                return
+            self._reported_at = now
+            done = self._done
+        report_progress(self._url, "downloading", done, self._total)
+
+
+# ---------------------------------------------------------------------------
+# Entry index
+# ---------------------------------------------------------------------------
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    name        TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    hits        INTEGER NOT NULL DEFAULT 0,
+    score       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_score ON entries(score);
+
+CREATE TABLE IF NOT EXISTS totals (
+    id         INTEGER PRIMARY KEY CHECK (id = 0),
+    file_count INTEGER NOT NULL,
+    total_size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES (0, 0, 0);
+
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET file_count = file_count + 1, total_size = total_size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET file_count = file_count - 1, total_size = total_size - OLD.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_resize AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET total_size = total_size - OLD.size + NEW.size;
+END;
+"""
+
+_UPSERT = (
+    "INSERT INTO entries (name, size, last_access, hits, score) VALUES (?, ?, ?, 0, ?) "
+    "ON CONFLICT(name) DO UPDATE SET size = excluded.size, "
+    "last_access = excluded.last_access, score = hybrid_score(excluded.last_access, hits)"
+)
+
+# One connection per (process, cache dir); guarded by a lock because the
+# API process may call in from several threads.
+_index_conns: dict[tuple[int, str], sqlite3.Connection] = {}
+_index_lock = threading.Lock()
+
+
+def _hybrid_score(last_access: float, hits: int) -> float:
+    return last_access + HIT_BONUS_SECONDS * math.log2(1 + hits)
+
+
+def _is_entry_name(name: str) -> bool:
+    """Whether *name* in ``CACHE_DIR`` is a cached file (not temp/metadata)."""
+    return not name.startswith(".") and not name.endswith(META_SUFFIX)
+
+
+def _index() -> sqlite3.Connection | None:
+    """Return this process's connection to the index of ``CACHE_DIR``.
+
+    The index lives in ``<CACHE_DIR>/.index/`` and is shared by every
+    worker and the API process (SQLite in WAL mode).  Each row is one
+    cached file; the ``totals`` row is kept current by triggers, so stats
+    never scan the directory, and eviction walks ``idx_entries_score``.
+    A newly created index is filled from a directory scan, using file
+    access times as the initial last access.
+
+    Returns ``None`` if the index cannot be opened (e.g. a read-only
+    cache directory); callers then fall back to scanning.
+    """
+    key = (os.getpid(), CACHE_DIR)
+    conn = _index_conns.get(key)
+    if conn is not None:
+        return conn
+    index_dir = os.path.join(CACHE_DIR, INDEX_SUBDIR)
+    path = os.path.join(index_dir, "entries.sqlite")
+    try:
+        os.makedirs(index_dir, exist_ok=True)
+        is_new = not os.path.exists(path)
+        conn = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.create_function("hybrid_score", 2, _hybrid_score, deterministic=True)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_INDEX_SCHEMA)
+        if is_new:
+            _reconcile_index(conn)
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("Cache index unavailable in %s: %s", index_dir, exc)
+        return None
+    _index_conns[key] = conn
+    return conn
+
+
+def _index_execute(sql: str, params: tuple = ()) -> sqlite3.Cursor | None:
+    """Run one statement on the index; ``None`` if it is unavailable."""
+    with _index_lock:
+        conn = _index()
+        if conn is None:
+            return None
+        try:
+            return conn.execute(sql, params)
+        except sqlite3.Error as exc:
+            logger.warning("Cache index error: %s", exc)
+            return None
+
+
+def _reconcile_index(conn: sqlite3.Connection) -> None:
+    """Make the index match the files in ``CACHE_DIR``.
+
+    Adds files the index does not know (written before the index existed,
+    or by a process that could not open it) and drops rows whose files are
+    gone.  Scans the directory, so it only runs when the index is created
+    and at startup.
+    """
+    try:
+        names = [n for n in os.listdir(CACHE_DIR) if _is_entry_name(n)]
+    except OSError:
+        return
+    on_disk = {}
+    for name in names:
+        try:
+            st = os.stat(os.path.join(CACHE_DIR, name))
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            on_disk[name] = st
+    known = {row[0] for row in conn.execute("SELECT name FROM entries")}
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        for name in known - on_disk.keys():
+            conn.execute("DELETE FROM entries WHERE name = ?", (name,))
+        for name in on_disk.keys() - known:
+            st = on_disk[name]
+            conn.execute(
+                "INSERT OR IGNORE INTO entries (name, size, last_access, hits, score) VALUES (?, ?, ?, 0, ?)",
+                (name, st.st_size, st.st_atime, st.st_atime),
+            )
+
+
+def _index_add(path: str, size: int) -> None:
+    """Record the file *path* (just placed in the cache) in the index."""
+    now = time.time()
+    _index_execute(_UPSERT, (os.path.basename(path), size, now, now))
+
+
+def _index_touch(path: str) -> None:
+    """Record a cache hit on *path*."""
+    name = os.path.basename(path)
+    now = time.time()
+    cur = _index_execute(
+        "UPDATE entries SET hits = hits + 1, last_access = ?, score = hybrid_score(?, hits + 1) "
+        "WHERE name = ?",
+        (now, now, name),
+    )
+    if cur is not None and cur.rowcount == 0:
+        try:
+            _index_add(path, os.path.getsize(path))
+        except OSError:
+            pass
+
+
 # ---------------------------------------------------------------------------
-# LRU eviction
+# Eviction
 # ---------------------------------------------------------------------------
 
 def _evict_lru() -> None:
-    """Delete least-recently-used files until total cache size is under the limit.
+    """Delete low-scoring entries until the total cache size is under the limit.
 
-    Uses file *access time* (``os.path.getatime``) as the LRU metric.
-    Falls back to modification time if atime is unavailable.
+    Entries are taken in score order (last access with a bonus for
+    frequently hit entries, see ``HIT_BONUS_SECONDS``).  Removing a row is what entitles a process to
+    unlink the file, so concurrent evictions never double-count.
     """
+    totals = _index_execute("SELECT total_size FROM totals")
+    if totals is None:
+        _evict_by_scan()
+        _cleanup_stale_temps()
+        return
+
+    over = totals.fetchone()[0] - MAX_CACHE_BYTES
+    while over > 0:
+        cur = _index_execute(
+            "SELECT name, size FROM entries ORDER BY score LIMIT 64"
+        )
+        batch = cur.fetchall() if cur is not None else []
+        if not batch:
+            break
+        for name, size in batch:
+            cur = _index_execute("DELETE FROM entries WHERE name = ?", (name,))
+            if cur is None or cur.rowcount == 0:
+                continue  # evicted by another process
+            path = os.path.join(CACHE_DIR, name)
+            for victim in (path, path + META_SUFFIX):
+                try:
+                    os.unlink(victim)
+                except OSError:
+                    pass
+            logger.info("Cache evict: removed %s (%.1f MB)", path, size / 1024 / 1024)
+            over -= size
+            if over <= 0:
+                break
+
+    _cleanup_stale_temps()
+
+
+def _evict_by_scan() -> None:
+    """Evict by file access time; used only when the index is unavailable."""
     try:
         entries = []
         for name in os.listdir(CACHE_DIR):
             path = os.path.join(CACHE_DIR, name)
-            if not os.path.isfile(path):
+            if not _is_entry_name(name) or not os.path.isfile(path):
                 continue
             try:
-                stat = os.stat(path)
-                entries.append((path, stat.st_atime, stat.st_size))
+                st = os.stat(path)
+                entries.append((path, st.st_atime, st.st_size))
             except OSError:
                 continue
 
         total_size = sum(e[2] for e in entries)
-        if total_size <= MAX_CACHE_BYTES:
-            return
-
-        # Sort by access time ascending (oldest first)
         entries.sort(key=lambda e: e[1])
-
         for path, _atime, size in entries:
             if total_size <= MAX_CACHE_BYTES:
                 break
             try:
                 os.unlink(path)
                 total_size -= size
-                logger.info("Cache evict: removed %s (%.1f MB)", path, size / 1024 / 1024)
+            except OSError:
+                continue
+            try:
+                os.unlink(path + META_SUFFIX)
             except OSError:
                 pass
     except OSError:
         # Cache dir might have been removed by another process; ignore.
         pass
 
-    _cleanup_stale_temps()
-
 
 # ---------------------------------------------------------------------------
 # Public API
@@ -151,38 +598,307 @@ def _evict_lru() -> None:
 def get_cached(url: str) -> str | None:
     """Return the cached file path for *url* if it exists, else ``None``.
 
-    Touching the file updates its access time so LRU eviction is correct.
+    A hit is recorded in the index (last access and hit count) for eviction.
     """
     path = _cache_path(url)
     if os.path.isfile(path):
         try:
-            # Touch access time for LRU tracking
             os.utime(path, None)
             logger.debug("Cache hit: %s → %s", url[:80], path)
         except OSError:
             pass
+        _index_touch(path)
         return path
     return None
 
 
-def download_and_cache(url: str) -> str:
+@dataclass(frozen=True)
+class RemoteInfo:
+    """What one request told about a remote file: size, range support, validators.
+
+    Callers that already made such a request (see
+    data_worker.ingest_dataset) pass it to :func:`download_and_cache` and
+    range_cache.open_url so the file is not probed again.
+    """
+
+    size: int | None
+    accepts_ranges: bool
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def fingerprint(self) -> str | None:
+        """``"etag|last_modified|size"``, as scan_registry.remote_fingerprint builds it."""
+        parts = [self.etag or "", self.last_modified or "", "" if self.size is None else str(self.size)]
+        return "|".join(parts) if any(parts) else None
+
+
+def _probe(url: str) -> RemoteInfo:
+    """HEAD *url* once and return what it says about the file.
+
+    A failed HEAD yields an empty :class:`RemoteInfo`: the download then
+    proceeds as a single stream with the size checked per chunk.
+    """
+    try:
+        req = urllib.request.Request(url, method="HEAD")
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            headers = resp.headers
+    except (urllib.error.URLError, OSError, ValueError):
+        return RemoteInfo(size=None, accepts_ranges=False)
+    length = headers.get("Content-Length")
+    return RemoteInfo(
+        size=int(length) if length and str(length).isdigit() else None,
+        accepts_ranges=(headers.get("Accept-Ranges") or "").lower() == "bytes",
+        etag=headers.get("ETag"),
+        last_modified=headers.get("Last-Modified"),
+    )
+
+
+def _check_size(nbytes: int) -> None:
+    if nbytes > MAX_FILE_BYTES:
+        raise ValueError(
+            f"Remote file exceeds size limit "
+            f"({MAX_FILE_BYTES / (1024 ** 2):.0f} MB). "
+            f"Download aborted."
+        )
+
+
+class _RangesIgnored(OSError):
+    """The server answered a range request with something other than 206."""
+
+
+def _download_stream(
+    url: str, fd: int, resumable: bool, progress: _DownloadProgress | None = None
+) -> int:
+    """Download *url* into *fd* over one connection; return the bytes written.
+
+    A failed attempt is retried; if the server supports ranges the retry
+    resumes after the bytes already written instead of starting over.
+    """
+    written = 0
+    for attempt in range(DOWNLOAD_RETRIES):
+        try:
+            headers = {"Range": f"bytes={written}-"} if written and resumable else {}
+            req = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(req, timeout=DOWNLOAD_TIMEOUT) as response:
+                if written and (not headers or response.status != 206):
+                    os.ftruncate(fd, 0)  # no resume: start over
+                    if progress is not None:
+                        progress.add(-written)
+                    written = 0
+                while True:
+                    chunk = response.read(DOWNLOAD_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    _check_size(written + len(chunk))
+                    os.pwrite(fd, chunk, written)
+                    written += len(chunk)
+                    if progress is not None:
+                        progress.add(len(chunk))
+            return written
+        except ValueError:
+            raise  # Size limit — don't retry
+        except (urllib.error.URLError, OSError) as exc:
+            if attempt == DOWNLOAD_RETRIES - 1:
+                raise
+            logger.warning(
+                "Download attempt %d/%d failed for %s after %d bytes: %s — retrying",
+                attempt + 1, DOWNLOAD_RETRIES, url[:80], written, exc,
+            )
+            time.sleep(2 ** attempt)  # 1s, 2s
+    return written
+
+
+def _download_ranges(
+    url: str, fd: int, size: int, etag: str | None, progress: _DownloadProgress | None = None
+) -> int:
+    """Download *url* into *fd* as ``DOWNLOAD_CONNECTIONS`` concurrent ranges.
+
+    The temp file is preallocated (sparse) to *size* and every range is
+    written in place.  Each range retries on its own, resuming after the
+    bytes it already has.  Raises :class:`_RangesIgnored` if the server
+    does not answer with partial content.
+    """
+    os.ftruncate(fd, size)
+    part = -(-size // DOWNLOAD_CONNECTIONS)
+    spans = [(start, min(start + part, size) - 1) for start in range(0, size, part)]
+    if_range = {"If-Range": etag} if etag and not etag.startswith("W/") else {}
+
+    def fetch(span: tuple[int, int]) -> None:
+        pos, end = span
+        for attempt in range(DOWNLOAD_RETRIES):
+            try:
+                req = urllib.request.Request(url, headers={"Range": f"bytes={pos}-{end}", **if_range})
+                with urllib.request.urlopen(req, timeout=DOWNLOAD_TIMEOUT) as response:
+                    if response.status != 206:
+                        raise _RangesIgnored(f"HTTP {response.status} for a range request")
+                    while pos <= end:
+                        chunk = response.read(min(DOWNLOAD_CHUNK_BYTES, end - pos + 1))
+                        if not chunk:
+                            break
+                        os.pwrite(fd, chunk, pos)
+                        pos += len(chunk)
+                        if progress is not None:
+                            progress.add(len(chunk))
+                if pos <= end:
+                    raise OSError(f"Range ended early at byte {pos} of {end}")
+                return
+            except _RangesIgnored:
+                raise
+            except (urllib.error.URLError, OSError) as exc:
+                if attempt == DOWNLOAD_RETRIES - 1:
+                    raise
+                logger.warning(
+                    "Range %d-%d of %s failed at byte %d: %s — retrying",
+                    span[0], end, url[:80], pos, exc,
+                )
+                time.sleep(2 ** attempt)
+
+    with ThreadPoolExecutor(max_workers=len(spans), thread_name_prefix="download") as executor:
+        for future in [executor.submit(fetch, span) for span in spans]:
+            future.result()
+    return size
+
+
+def _acquire_download_lock(url: str, max_age: float) -> int | None:
+    """Become the one process downloading *url*; return the lock fd.
+
+    Each URL has a lock file under ``<CACHE_DIR>/.locks/`` held with an
+    exclusive ``flock`` by the process downloading it (the *leader*).
+    Other processes missing the cache for the same URL (*followers*) poll
+    until either a current cached file appears (validated within *max_age*
+    seconds) -- then ``None`` is returned and nothing is downloaded again
+    -- or they get the lock themselves.
+
+    A leader that dies releases its lock with the process.  A leader that
+    hangs is considered stale once its lock file is older than
+    ``DOWNLOAD_LOCK_TIMEOUT``; the follower then downloads without the
+    lock (the atomic rename keeps the result correct).  Returns ``None``
+    in that case too, and when locking is unavailable.
+    """
+    if fcntl is None:
+        return None
+    lock_dir = os.path.join(CACHE_DIR, LOCKS_SUBDIR)
+    lock_path = os.path.join(lock_dir, _cache_key(url) + ".lock")
+    try:
+        os.makedirs(lock_dir, exist_ok=True)
+    except OSError:
+        return None
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            return None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            if _current_entry(url, max_age) is not None:
+                return None
+            try:
+                held_for = time.time() - os.path.getmtime(lock_path)
+            except OSError:
+                continue  # lock file just removed by cleanup; retry
+            if held_for > DOWNLOAD_LOCK_TIMEOUT:
+                logger.warning(
+                    "Download lock for %s held for %.0fs; taking over",
+                    url[:80], held_for,
+                )
+                return None
+            time.sleep(LOCK_POLL_INTERVAL)
+            continue
+        # The file may have been unlinked by _cleanup_stale_temps between
+        # open() and flock(); a lock on an orphaned inode excludes nobody.
+        try:
+            if os.fstat(fd).st_ino == os.stat(lock_path).st_ino:
+                os.utime(lock_path, None)  # lock age starts now
+                return fd
+        except OSError:
+            pass
+        os.close(fd)
+
+
+def _release_download_lock(fd: int | None) -> None:
+    if fd is None:
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    except OSError:
+        pass
+    os.close(fd)
+
+
+def _current_entry(url: str, max_age: float) -> str | None:
+    """Return the cached path for *url* if it exists and needs no revalidation."""
+    path = _cache_path(url)
+    if not os.path.isfile(path) or _needs_revalidation(_read_meta(path), max_age):
+        return None
+    return path
+
+
+def download_and_cache(
+    url: str, max_age: float | None = None, info: RemoteInfo | None = None
+) -> str:
     """Download *url* to the cache and return the cached file path.
 
-    If the file is already cached, returns immediately.
+    If the file is already cached and was validated within *max_age*
+    seconds (default ``REVALIDATE_SECONDS``), returns immediately.  An
+    older entry is revalidated with a conditional GET (see
+    :func:`_revalidate`) and downloaded again if upstream changed.
+
+    A download starts with one HEAD request that probes the size and range
+    support, unless the caller passes what it already knows as *info*; large files on servers that support ranges are then fetched as ``DOWNLOAD_CONNECTIONS`` concurrent
+    ranges (see :func:`_download_ranges`), everything else over a single
+    connection.  Failed attempts resume where they stopped when the
+    server supports ranges.  Concurrent calls for the same URL, in this
+    or other processes, wait for a single download (see
+    :func:`_acquire_download_lock`).
 
     Raises:
         ValueError: If the downloaded file exceeds ``MAX_FILE_BYTES``.
         urllib.error.URLError / OSError: On network errors.
     """
-    # Fast path: already cached
-    cached = get_cached(url)
-    if cached is not None:
-        return cached
+    if max_age is None:
+        max_age = REVALIDATE_SECONDS
+
+    # Fast path: already cached and fresh enough
+    if _current_entry(url, max_age) is not None:
+        return get_cached(url) or _cache_path(url)
 
     _ensure_cache_dir()
 
+    lock_fd = _acquire_download_lock(url, max_age)
+    try:
+        # Another process may have finished the download while we waited
+        path = _current_entry(url, max_age)
+        if path is not None:
+            return get_cached(url) or path
+        path = _cache_path(url)
+        meta = _read_meta(path)
+        if meta is not None and os.path.isfile(path) and _revalidate(url, meta):
+            meta["validated_at"] = time.time()
+            _write_meta(path, meta)
+            return get_cached(url) or path
+        return _download(url, info)
+    finally:
+        _release_download_lock(lock_fd)
+
+
+def _download(url: str, info: RemoteInfo | None = None) -> str:
+    """Download *url* into the cache unconditionally; see :func:`download_and_cache`."""
     final_path = _cache_path(url)
 
+    # Reject oversized files before downloading anything
+    if info is None:
+        info = _probe(url)
+    size, accepts_ranges, etag, last_modified = info.size, info.accepts_ranges, info.etag, info.last_modified
+    if size is not None and size > MAX_FILE_BYTES:
+        raise ValueError(
+            f"Remote file is {size / (1024 ** 2):.0f} MB, "
+            f"exceeds size limit ({MAX_FILE_BYTES / (1024 ** 2):.0f} MB). "
+            f"Download aborted."
+        )
+
     # Download to a temp file in the *same directory* so os.rename is atomic
     # (same filesystem).
     fd, tmp_path = tempfile.mkstemp(
@@ -191,67 +907,37 @@ def download_and_cache(url: str) -> str:
         suffix=_suffix_for_url(url),
     )
     try:
-        # Pre-check Content-Length with HEAD request to reject oversized files early
-        try:
-            head_req = urllib.request.Request(url, method="HEAD")
-            with urllib.request.urlopen(head_req, timeout=30) as head_resp:
-                content_length = head_resp.headers.get("Content-Length")
-            if content_length and int(content_length) > MAX_FILE_BYTES:
-                raise ValueError(
-                    f"Remote file is {int(content_length) / (1024 ** 2):.0f} MB, "
-                    f"exceeds size limit ({MAX_FILE_BYTES / (1024 ** 2):.0f} MB). "
-                    f"Download aborted."
-                )
-        except (urllib.error.URLError, OSError, ValueError) as exc:
-            if isinstance(exc, ValueError):
-                raise  # Re-raise size limit errors
-            # HEAD request failed — proceed with download (size checked per-chunk)
-            pass
-
-        # Download with retry for transient network errors
-        max_retries = 3
-        last_exc: Exception | None = None
-        for attempt in range(max_retries):
+        total_written = None
+        if accepts_ranges and size is not None and size >= PARALLEL_MIN_BYTES and DOWNLOAD_CONNECTIONS > 1:
             try:
-                total_written = 0
-                with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
-                    with os.fdopen(fd, "wb") as f:
-                        fd = -1  # Prevent double-close
-                        while True:
-                            chunk = response.read(65536)
-                            if not chunk:
-                                break
-                            total_written += len(chunk)
-                            if total_written > MAX_FILE_BYTES:
-                                raise ValueError(
-                                    f"Remote file exceeds size limit "
-                                    f"({MAX_FILE_BYTES / (1024 ** 2):.0f} MB). "
-                                    f"Download aborted."
-                                )
-                            f.write(chunk)
-                break  # Success — exit retry loop
-            except ValueError:
-                raise  # Size limit — don't retry
-            except (urllib.error.URLError, OSError) as exc:
-                last_exc = exc
-                if attempt < max_retries - 1:
-                    logger.warning(
-                        "Download attempt %d/%d failed for %s: %s — retrying",
-                        attempt + 1, max_retries, url[:80], exc,
-                    )
-                    time.sleep(2 ** attempt)  # 1s, 2s
-                    # Re-open temp file for retry (truncate)
-                    if fd < 0:
-                        fd = os.open(tmp_path, os.O_WRONLY | os.O_TRUNC)
-                else:
-                    raise
+                total_written = _download_ranges(url, fd, size, etag, _DownloadProgress(url, size))
+            except _RangesIgnored as exc:
+                logger.info("Ranged download of %s not possible (%s); using one stream", url[:80], exc)
+                os.ftruncate(fd, 0)
+        if total_written is None:
+            total_written = _download_stream(url, fd, accepts_ranges, _DownloadProgress(url, size))
+        os.close(fd)
+        fd = -1
 
-        # Atomic rename into place.  Another process may have written the
-        # same file concurrently -- that's fine, last-writer wins and the
-        # content is identical.
+        # Atomic rename into place.  Another process only writes the same
+        # file concurrently if it took over a stale download lock -- then
+        # last-writer wins and the content is identical.
         os.replace(tmp_path, final_path)
         logger.info("Cached download: %s → %s (%.1f MB)", url[:80], final_path, total_written / 1024 / 1024)
         tmp_path = None  # Prevent cleanup
+        _index_add(final_path, total_written)
+
+        now = time.time()
+        fingerprint = f"{etag or ''}|{last_modified or ''}|{size if size is not None else total_written}"
+        _write_meta(final_path, {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": total_written,
+            "fetched_at": now,
+            "validated_at": now,
+            "version": version_id(fingerprint),
+        })
 
         # Run eviction *after* placing the new file
         _evict_lru()
@@ -259,7 +945,6 @@ def download_and_cache(url: str) -> str:
         return final_path
 
     finally:
-        # Close fd if we haven't already handed it to fdopen
         if fd >= 0:
             try:
                 os.close(fd)
@@ -273,6 +958,49 @@ def download_and_cache(url: str) -> str:
                 pass
 
 
+def transcode(lazy_frame, source_path: str) -> str | None:
+    """Write *lazy_frame*, a scan of the local file *source_path*, to a cached Parquet file.
+
+    Used for CSV-family sources: the Parquet file keeps the schema inferred
+    when the CSV was scanned, and Polars dictionary-encodes its
+    low-cardinality string columns, so later scans neither re-parse nor
+    re-decompress the text.  Returns the existing transcode if the source
+    is unchanged since it was written.
+
+    Returns ``None`` if the source cannot be read or converted (e.g. a
+    value that does not fit the inferred type); callers then scan the
+    source directly.
+    """
+    try:
+        st = os.stat(source_path)
+    except OSError:
+        return None
+    key = _cache_key(f"{os.path.abspath(source_path)}|{st.st_size}:{st.st_mtime_ns}")
+    final_path = os.path.join(CACHE_DIR, key + TRANSCODE_SUFFIX)
+    if os.path.isfile(final_path):
+        _index_touch(final_path)
+        return final_path
+
+    _ensure_cache_dir()
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=".transcode_", suffix=".parquet")
+    os.close(fd)
+    try:
+        lazy_frame.sink_parquet(tmp_path)
+        os.replace(tmp_path, final_path)
+    except Exception as exc:
+        logger.warning("Transcode failed for %s: %s", source_path, exc)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return None
+    size = os.path.getsize(final_path)
+    logger.info("Transcoded %s → %s (%.1f MB)", source_path, final_path, size / 1024 / 1024)
+    _index_add(final_path, size)
+    _evict_lru()
+    return final_path if os.path.isfile(final_path) else None
+
+
 def startup_cleanup() -> int:
     """Run on application startup to clean orphaned temp files and evict stale cache.
 
@@ -283,6 +1011,13 @@ def startup_cleanup() -> int:
     removed = _cleanup_stale_temps()
     if removed > 0:
         logger.info("Startup cleanup: removed %d stale temp files", removed)
+    with _index_lock:
+        conn = _index()
+        if conn is not None:
+            try:
+                _reconcile_index(conn)
+            except sqlite3.Error as exc:
+                logger.warning("Cache index reconcile failed: %s", exc)
     _evict_lru()
     return removed
 
@@ -290,7 +1025,7 @@ def startup_cleanup() -> int:
 def clear_cache() -> int:
     """Remove all files from the cache directory.
 
-    Returns the number of files removed.
+    Returns the number of cached files removed (not counting metadata).
     """
     count = 0
     try:
@@ -299,33 +1034,29 @@ def clear_cache() -> int:
             if os.path.isfile(path):
                 try:
                     os.unlink(path)
-                    count += 1
+                    if not name.endswith(META_SUFFIX):
+                        count += 1
                 except OSError:
                     pass
     except OSError:
         pass
+    if os.path.isdir(os.path.join(CACHE_DIR, INDEX_SUBDIR)):
+        _index_execute("DELETE FROM entries")
     return count
 
 
 def cache_stats() -> dict:
-    """Return basic cache statistics.
+    """Return basic cache statistics, read from the index without a scan.
 
     Returns:
         {"file_count": int, "total_size_bytes": int, "cache_dir": str}
     """
     file_count = 0
     total_size = 0
-    try:
-        for name in os.listdir(CACHE_DIR):
-            path = os.path.join(CACHE_DIR, name)
-            if os.path.isfile(path):
-                try:
-                    total_size += os.path.getsize(path)
-                    file_count += 1
-                except OSError:
-                    pass
-    except OSError:
-        pass
+    if os.path.isdir(CACHE_DIR):
+        cur = _index_execute("SELECT file_count, total_size FROM totals")
+        if cur is not None:
+            file_count, total_size = cur.fetchone()
     return {
         "file_count": file_count,
         "total_size_bytes": total_size,
@@ -0,0 +1,350 @@
+"""Read row counts and column statistics from a Parquet file's footer.
+
+A Parquet file ends with its metadata (a Thrift compact-protocol
+``FileMetaData`` struct), a 4-byte footer length and ``PAR1``.  That
+footer holds the row count of every row group and, per column chunk,
+optional statistics: null count and min / max values.  Reading it takes
+one small read at the end of a local file, or one suffix range request
+for a remote one, instead of a scan of the data.
+
+Only what the schema extractor needs is decoded: row counts per row
+group, and null counts and numeric min / max of top-level columns.
+Min / max of other types (strings, dates, decimals, ...) are left out.
+
+No imports from ``app/`` -- fully self-contained, same as file_cache.py.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+FOOTER_READ_BYTES = 64 * 1024  # first suffix read; most footers fit
+MAX_FOOTER_BYTES = 16 * 1024 ** 2  # refuse absurd footer lengths
+FOOTER_TIMEOUT = 30  # seconds for remote range requests
+
+_MAGIC = b"PAR1"
+
+# Physical types (parquet.thrift ``Type``)
+_INT32, _INT64, _FLOAT, _DOUBLE = 1, 2, 4, 5
+# Converted types marking unsigned integers (UINT_8 .. UINT_64)
+_UNSIGNED_CONVERTED = (11, 12, 13, 14)
+# Converted types that are still plain signed integers (INT_8 .. INT_64)
+_SIGNED_CONVERTED = (15, 16, 17, 18)
+_LOGICAL_INTEGER = 10  # LogicalType union member for IntType
+
+
+# ---------------------------------------------------------------------------
+# Result types
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ColumnStats:
+    """Statistics of one top-level column across all row groups.
+
+    Each field is ``None`` when some row group lacks it.
+    """
+
+    null_count: int | None = None
+    min: int | float | None = None
+    max: int | float | None = None
+
+
+@dataclass
+class FooterStats:
+    """Row counts and column statistics from a Parquet footer."""
+
+    num_rows: int
+    row_group_rows: list[int] = field(default_factory=list)
+    columns: dict[str, ColumnStats] = field(default_factory=dict)
+
+
+# ---------------------------------------------------------------------------
+# Thrift compact protocol
+# ---------------------------------------------------------------------------
+
+_STOP, _TRUE, _FALSE, _BYTE, _I16, _I32, _I64, _DOUBLE_T, _BINARY, _LIST, _SET, _MAP, _STRUCT = range(13)
+
+
+class _Reader:
+    """Decode Thrift compact-protocol structs into ``{field_id: value}`` dicts."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._pos = 0
+
+    def _byte(self) -> int:
+        b = self._data[self._pos]
+        self._pos += 1
+        return b
+
+    def _varint(self) -> int:
+        shift = result = 0
+        while True:
+            b = self._byte()
+            result |= (b & 0x7F) << shift
+            if not b & 0x80:
+                return result
+            shift += 7
+
+    def _zigzag(self) -> int:
+        n = self._varint()
+        return (n >> 1) ^ -(n & 1)
+
+    def _value(self, ttype: int):
+        if ttype == _TRUE:
+            return True
+        if ttype == _FALSE:
+            return False
+        if ttype == _BYTE:
+            b = self._byte()
+            return b - 256 if b > 127 else b
+        if ttype in (_I16, _I32, _I64):
+            return self._zigzag()
+        if ttype == _DOUBLE_T:
+            value = struct.unpack_from("<d", self._data, self._pos)[0]
+            self._pos += 8
+            return value
+        if ttype == _BINARY:
+            n = self._varint()
+            value = self._data[self._pos:self._pos + n]
+            self._pos += n
+            return value
+        if ttype in (_LIST, _SET):
+            header = self._byte()
+            size, etype = header >> 4, header & 0x0F
+            if size == 15:
+                size = self._varint()
+            if etype in (_TRUE, _FALSE):  # bools in lists take one byte each
+                return [self._byte() == 1 for _ in range(size)]
+            return [self._value(etype) for _ in range(size)]
+        if ttype == _MAP:
+            size = self._varint()
+            if size == 0:
+                return {}
+            types = self._byte()
+            ktype, vtype = types >> 4, types & 0x0F
+            return {self._value(ktype): self._value(vtype) for _ in range(size)}
+        if ttype == _STRUCT:
+            return self.struct()
+        raise ValueError(f"Unknown Thrift compact type {ttype}")
+
+    def struct(self) -> dict:
+        fields: dict[int, object] = {}
+        last_id = 0
+        while True:
+            header = self._byte()
+            ttype = header & 0x0F
+            if ttype == _STOP:
+                return fields
+            delta = header >> 4
+            field_id = last_id + delta if delta else self._zigzag()
+            fields[field_id] = self._value(ttype)
+            last_id = field_id
+
+
+# ---------------------------------------------------------------------------
+# Footer bytes
+# ---------------------------------------------------------------------------
+
+
+def _local_footer(path: str) -> bytes | None:
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size < 12:
+            return None
+        f.seek(size - 8)
+        tail = f.read(8)
+        length = _footer_length(tail, size)
+        if length is None:
+            return None
+        f.seek(size - 8 - length)
+        return f.read(length)
+
+
+def _remote_footer(url: str) -> bytes | None:
+    tail, size = _range_get(url, f"bytes=-{FOOTER_READ_BYTES}")
+    if tail is None or len(tail) < 12:
+        return None
+    length = _footer_length(tail[-8:], size)
+    if length is None:
+        return None
+    if length + 8 <= len(tail):
+        return tail[-8 - length:-8]
+    start = size - 8 - length
+    footer, _size = _range_get(url, f"bytes={start}-{size - 9}")
+    return footer if footer is not None and len(footer) == length else None
+
+
+def _range_get(url: str, byte_range: str) -> tuple[bytes | None, int]:
+    """Fetch *byte_range* of *url*; return ``(body, total_size)``.
+
+    Returns ``(None, 0)`` unless the server answers with a partial response,
+    so a server ignoring ranges never streams the whole file here.
+    """
+    req = urllib.request.Request(url, headers={"Range": byte_range})
+    with urllib.request.urlopen(req, timeout=FOOTER_TIMEOUT) as resp:
+        content_range = resp.headers.get("Content-Range") or ""
+        if resp.status != 206 or "/" not in content_range:
+            return None, 0
+        total = content_range.rsplit("/", 1)[1]
+        if not total.isdigit():
+            return None, 0
+        return resp.read(), int(total)
+
+
+def _footer_length(tail: bytes, file_size: int) -> int | None:
+    if tail[4:] != _MAGIC:
+        return None
+    length = struct.unpack("<I", tail[:4])[0]
+    if length == 0 or length > MAX_FOOTER_BYTES or length + 12 > file_size:
+        return None
+    return length
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+
+
+def _numeric_format(element: dict) -> str | None:
+    """Return the struct format of a numeric column's stat values, else ``None``."""
+    physical = element.get(1)
+    if physical == _FLOAT:
+        return "<f"
+    if physical == _DOUBLE:
+        return "<d"
+    if physical not in (_INT32, _INT64):
+        return None
+    converted = element.get(6)
+    logical = element.get(10)
+    if logical is not None:
+        int_type = logical.get(_LOGICAL_INTEGER)
+        if int_type is None:
+            return None  # DATE, TIMESTAMP, DECIMAL, ...
+        signed = int_type.get(2, True)
+    elif converted is None or converted in _SIGNED_CONVERTED:
+        signed = True
+    elif converted in _UNSIGNED_CONVERTED:
+        signed = False
+    else:
+        return None
+    if physical == _INT32:
+        return "<i" if signed else "<I"
+    return "<q" if signed else "<Q"
+
+
+def _decode(raw, fmt: str):
+    if not isinstance(raw, bytes) or len(raw) != struct.calcsize(fmt):
+        return None
+    return struct.unpack(fmt, raw)[0]
+
+
+def _parse(footer: bytes) -> FooterStats:
+    meta = _Reader(footer).struct()
+    schema = meta.get(2) or []
+    # Top-level columns: the root's direct children without children of their own.
+    formats: dict[str, str | None] = {}
+    if schema:
+        i = 1
+        for _ in range(schema[0].get(5, 0)):
+            element = schema[i]
+            if not element.get(5):
+                formats[element[4].decode("utf-8", "replace")] = _numeric_format(element)
+            i = _skip_subtree(schema, i)
+
+    acc = {name: _Accumulator() for name in formats}
+    row_group_rows = []
+    for row_group in meta.get(4) or []:
+        row_group_rows.append(row_group.get(3, 0))
+        for chunk in row_group.get(1) or []:
+            chunk_meta = chunk.get(3) or {}
+            path = chunk_meta.get(3) or []
+            name = path[0].decode("utf-8", "replace") if len(path) == 1 else None
+            if name in acc:
+                acc[name].add(chunk_meta, formats[name])
+
+    return FooterStats(
+        num_rows=meta.get(3, 0),
+        row_group_rows=row_group_rows,
+        columns={name: a.result() for name, a in acc.items()},
+    )
+
+
+class _Accumulator:
+    """Combine one column's chunk statistics across row groups."""
+
+    def __init__(self) -> None:
+        self.nulls: int | None = 0
+        self.min = self.max = None
+        self.has_range = True
+
+    def add(self, chunk_meta: dict, fmt: str | None) -> None:
+        stats = chunk_meta.get(12) or {}
+        null_count = stats.get(3)
+        if null_count is None:
+            self.nulls = None
+        elif self.nulls is not None:
+            self.nulls += null_count
+        if fmt is None:
+            self.has_range = False
+            return
+        raw_min, raw_max = stats.get(6), stats.get(5)
+        if raw_min is None and raw_max is None and fmt not in ("<I", "<Q"):
+            raw_min, raw_max = stats.get(2), stats.get(1)  # legacy fields, signed order
+        lo, hi = _decode(raw_min, fmt), _decode(raw_max, fmt)
+        if lo is None or hi is None:
+            if null_count is None or null_count != chunk_meta.get(5):
+                self.has_range = False
+            return  # an all-null chunk has no range to contribute
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+
+    def result(self) -> ColumnStats:
+        if not self.has_range:
+            return ColumnStats(null_count=self.nulls)
+        return ColumnStats(null_count=self.nulls, min=self.min, max=self.max)
+
+
+def _skip_subtree(schema: list[dict], i: int) -> int:
+    """Return the index just past the schema element at *i* and its descendants."""
+    children = schema[i].get(5, 0)
+    i += 1
+    for _ in range(children):
+        i = _skip_subtree(schema, i)
+    return i
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def read_footer_stats(path_or_url: str) -> FooterStats | None:
+    """Return the footer statistics of a local or remote Parquet file.
+
+    Returns ``None`` if the file is not Parquet, the footer cannot be read
+    (including a server without range support) or it cannot be decoded.
+    """
+    try:
+        if path_or_url.startswith(("http://", "https://")):
+            footer = _remote_footer(path_or_url)
+        else:
+            footer = _local_footer(path_or_url)
+        if footer is None:
+            return None
+        return _parse(footer)
+    except (OSError, urllib.error.URLError, ValueError, IndexError, KeyError, struct.error) as exc:
+        logger.debug("Could not read Parquet footer of %s: %s", path_or_url[:80], exc)
+        return None
@@ -0,0 +1,238 @@
+"""Column profiling in bounded memory.
+
+Profiles every column of a LazyFrame in two fused aggregations instead of
+one pass per column:
+
+1. Null counts, approximate distinct counts (HyperLogLog), min / max /
+   mean of numeric columns, string lengths and top-k values.
+2. Fixed-bin histograms of numeric columns, with bin edges from pass 1.
+
+Both run on Polars' streaming engine over a sample chosen by a
+*sampling strategy*:
+
+- ``prefix``: the first ``sample_rows`` rows.
+- ``row_groups``: whole row groups spread evenly over the file until
+  ``sample_rows`` rows, so a file sorted by time is not profiled from
+  its first day only.  Needs the Parquet row-group sizes; without them
+  it falls back to ``prefix``.
+- ``full``: every row.
+
+No pass materializes the sample: the aggregations stream, so memory
+grows with the number of columns (and, for top-k, distinct values), not
+with the file size.
+
+No imports from ``app/`` -- fully self-contained, same as parquet_footer.py.
+"""
+
+from __future__ import annotations
+
+import math
+
+import polars as pl
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+PREFIX = "prefix"
+ROW_GROUPS = "row_groups"
+FULL = "full"
+SAMPLING_STRATEGIES = (PREFIX, ROW_GROUPS, FULL)
+
+SAMPLE_ROWS = 100_000  # rows profiled by the prefix / row_groups strategies
+TOP_K = 5              # most frequent values reported per column
+HISTOGRAM_BINS = 10
+
+_ROWS = "__rows"
+_COUNT = "__count"
+
+
+def _is_numeric(dtype) -> bool:
+    return str(dtype).startswith(("Int", "UInt", "Float"))
+
+
+def _is_string(dtype) -> bool:
+    return str(dtype) in ("Utf8", "String")
+
+
+def _has_top_values(dtype) -> bool:
+    """Top-k is reported for discrete types: strings, categoricals, booleans, integers."""
+    return _is_string(dtype) or str(dtype).startswith(("Int", "UInt", "Categorical", "Enum", "Boolean"))
+
+
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+
+
+def sample_frame(
+    lf: pl.LazyFrame,
+    sampling: str = PREFIX,
+    sample_rows: int = SAMPLE_ROWS,
+    row_group_rows: list[int] | None = None,
+) -> pl.LazyFrame:
+    """Return the part of *lf* the *sampling* strategy profiles (still lazy).
+
+    *row_group_rows* are the row counts of the file's row groups (see
+    parquet_footer.FooterStats), used by ``row_groups``.
+    """
+    if sampling not in SAMPLING_STRATEGIES:
+        raise ValueError(f"Unknown sampling strategy: {sampling}")
+    if sampling == FULL:
+        return lf
+    if sampling == ROW_GROUPS and row_group_rows and sum(row_group_rows) > sample_rows:
+        return pl.concat(
+            [lf.slice(offset, rows) for offset, rows in _spread_row_groups(row_group_rows, sample_rows)]
+        )
+    return lf.head(sample_rows)
+
+
+def _spread_row_groups(row_group_rows: list[int], sample_rows: int) -> list[tuple[int, int]]:
+    """Pick evenly spaced row groups holding about *sample_rows* rows.
+
+    Returns ``(offset, rows)`` slices in file order, so each reads one row
+    group; the last one is trimmed to the sample size.
+    """
+    offsets = []
+    offset = 0
+    for rows in row_group_rows:
+        offsets.append(offset)
+        offset += rows
+    mean_rows = offset / len(row_group_rows)
+    wanted = min(len(row_group_rows), max(1, math.ceil(sample_rows / mean_rows)))
+    step = len(row_group_rows) / wanted
+    slices = []
+    remaining = sample_rows
+    for i in range(wanted):
+        index = int(i * step)
+        rows = min(row_group_rows[index], remaining)
+        if rows <= 0:
+            break
+        slices.append((offsets[index], rows))
+        remaining -= rows
+    return slices
+
+
+# ---------------------------------------------------------------------------
+# Profiling
+# ---------------------------------------------------------------------------
+
+
+def _stats_exprs(name: str, dtype) -> list[pl.Expr]:
+    col = pl.col(name)
+    exprs = [
+        col.null_count().alias(f"{name}:null_count"),
+        col.approx_n_unique().alias(f"{name}:unique_count"),
+    ]
+    if _is_numeric(dtype):
+        exprs += [
+            col.min().alias(f"{name}:min"),
+            col.max().alias(f"{name}:max"),
+            col.mean().alias(f"{name}:mean"),
+        ]
+    elif _is_string(dtype):
+        exprs += [
+            col.str.len_chars().min().alias(f"{name}:min_length"),
+            col.str.len_chars().max().alias(f"{name}:max_length"),
+        ]
+    if _has_top_values(dtype):
+        exprs.append(
+            col.drop_nulls().value_counts(sort=True, name=_COUNT).head(TOP_K).implode()
+            .alias(f"{name}:top_values")
+        )
+    return exprs
+
+
+def _histogram_expr(name: str, lo: float, hi: float) -> pl.Expr:
+    """Count of the values of *name* in each of ``HISTOGRAM_BINS`` bins over [lo, hi]."""
+    width = (hi - lo) / HISTOGRAM_BINS or 1.0
+    return (
+        ((pl.col(name).cast(pl.Float64) - lo) / width).floor()
+        .clip(0, HISTOGRAM_BINS - 1).cast(pl.UInt32)
+        .drop_nulls().value_counts(name=_COUNT).implode()
+        .alias(f"{name}:histogram")
+    )
+
+
+def _histogram(lo: float, hi: float, bin_counts: list[dict], name: str) -> dict:
+    width = (hi - lo) / HISTOGRAM_BINS
+    counts = [0] * HISTOGRAM_BINS
+    for item in bin_counts:
+        counts[item[name]] = item[_COUNT]
+    return {
+        "edges": [lo + i * width for i in range(HISTOGRAM_BINS)] + [hi],
+        "counts": counts,
+    }
+
+
+def profile_frame(
+    lf: pl.LazyFrame,
+    sampling: str = PREFIX,
+    sample_rows: int = SAMPLE_ROWS,
+    row_group_rows: list[int] | None = None,
+    columns: list[str] | None = None,
+) -> dict:
+    """Profile every column of *lf* -- or only *columns* -- over the sample
+    *sampling* selects.
+
+    Returns:
+        {"profiles": [{"name", "null_count", "null_percent", "unique_count",
+          "top_values"?, "min"?, "max"?, "mean"?, "histogram"?,
+          "min_length"?, "max_length"?}, ...],
+         "row_count": int, "sampling": str}
+
+        ``row_count`` is the number of rows profiled; ``unique_count`` is
+        approximate (HyperLogLog, null counted as a value);
+        ``top_values`` is ``[{"value", "count"}, ...]`` and ``histogram``
+        ``{"edges": [...], "counts": [...]}``.
+    """
+    if columns is not None:
+        lf = lf.select(columns)
+    sample = sample_frame(lf, sampling, sample_rows, row_group_rows)
+    schema = sample.collect_schema()
+
+    exprs = [pl.len().alias(_ROWS)]
+    for name, dtype in schema.items():
+        exprs += _stats_exprs(name, dtype)
+    stats = sample.select(exprs).collect(engine="streaming").row(0, named=True)
+    total = stats[_ROWS]
+
+    ranges = {}
+    for name, dtype in schema.items():
+        if _is_numeric(dtype):
+            lo, hi = stats[f"{name}:min"], stats[f"{name}:max"]
+            if lo is not None and hi is not None and math.isfinite(lo) and math.isfinite(hi):
+                ranges[name] = (float(lo), float(hi))
+    bins = {}
+    if ranges:
+        bins = sample.select(
+            [_histogram_expr(name, lo, hi) for name, (lo, hi) in ranges.items()]
+        ).collect(engine="streaming").row(0, named=True)
+
+    profiles = []
+    for name, dtype in schema.items():
+        null_count = stats[f"{name}:null_count"]
+        profile: dict = {
+            "name": name,
+            "null_count": null_count,
+            "null_percent": round((null_count / total) * 100, 1) if total > 0 else 0.0,
+            "unique_count": stats[f"{name}:unique_count"],
+        }
+        if _has_top_values(dtype):
+            profile["top_values"] = [
+                {"value": item[name], "count": item[_COUNT]}
+                for item in stats[f"{name}:top_values"]
+            ]
+        if _is_numeric(dtype):
+            mean = stats[f"{name}:mean"]
+            profile["min"] = stats[f"{name}:min"]
+            profile["max"] = stats[f"{name}:max"]
+            profile["mean"] = round(mean, 2) if mean is not None else None
+            if name in ranges:
+                profile["histogram"] = _histogram(*ranges[name], bins[f"{name}:histogram"], name)
+        elif _is_string(dtype):
+            profile["min_length"] = stats[f"{name}:min_length"]
+            profile["max_length"] = stats[f"{name}:max_length"]
+        profiles.append(profile)
+
+    return {"profiles": profiles, "row_count": total, "sampling": sampling}
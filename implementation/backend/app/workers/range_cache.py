@@ -0,0 +1,433 @@
+"""Block-level cache of remote Parquet files, served through a local range proxy.
+
+Polars reads a remote Parquet file with HTTP range requests for just the
+footer and the column chunks a query needs -- but it does so again on
+every query, and the only alternative so far was downloading the whole
+file (see file_cache.download_and_cache).  This module sits between the
+two: each worker process runs a small HTTP server on 127.0.0.1 that
+Polars scans instead of the remote URL.  The server answers range
+requests from fixed-size blocks cached on disk, fetching missing blocks
+from upstream with one ranged GET per contiguous run.  A query touching
+two columns of a wide file therefore transfers those columns' chunks
+once, and later queries read them from disk.
+
+Blocks live under ``<CACHE_DIR>/blocks/<key>/`` where *key* hashes the
+URL and its version (ETag, else Last-Modified, else size), so a changed
+upstream object never mixes with old blocks.  Block fetches carry
+``If-Range`` so a change between two fetches fails loudly instead of
+splicing versions.  The blocks holding the footer are fetched when a URL
+is opened and *pinned*: eviction removes them only after every unpinned
+block is gone.
+
+Servers without range support are not proxied; :func:`open_url` returns
+``None`` and callers scan the URL directly as before.
+
+Only imports from ``app.workers.file_cache`` (for ``CACHE_DIR``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.server
+import logging
+import os
+import struct
+import tempfile
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+
+from app.workers import file_cache as _file_cache
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+BLOCK_BYTES = int(os.environ.get("CHATDF_RANGE_BLOCK_BYTES", str(1024 ** 2)))  # 1 MB
+MAX_BLOCK_CACHE_BYTES = int(os.environ.get("CHATDF_MAX_BLOCK_CACHE_BYTES", str(1024 ** 3)))  # 1 GB
+RANGE_TIMEOUT = 60  # seconds per upstream request
+BLOCKS_SUBDIR = "blocks"
+
+_BLOCK_SUFFIX = ".blk"
+_PINNED_SUFFIX = ".pin"
+
+
+# ---------------------------------------------------------------------------
+# Remote objects
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Object:
+    """One version of a remote file, as seen when it was opened."""
+
+    url: str
+    size: int
+    etag: str | None
+    key: str
+
+    @property
+    def directory(self) -> str:
+        return os.path.join(_file_cache.CACHE_DIR, BLOCKS_SUBDIR, self.key)
+
+    @property
+    def last_block(self) -> int:
+        return (self.size - 1) // BLOCK_BYTES
+
+    def block_span(self, index: int) -> tuple[int, int]:
+        """Return the inclusive byte range of block *index*."""
+        start = index * BLOCK_BYTES
+        return start, min(start + BLOCK_BYTES, self.size) - 1
+
+
+_objects: dict[str, _Object] = {}   # key -> object
+_by_url: dict[str, _Object] = {}    # url -> latest opened object
+_lock = threading.Lock()
+_counters = {"blocks_hit": 0, "blocks_fetched": 0, "bytes_fetched": 0}
+_cached_bytes: int | None = None    # block cache size, see _evict_blocks
+
+
+def _count(name: str, n: int = 1) -> None:
+    with _lock:
+        _counters[name] += n
+
+
+# ---------------------------------------------------------------------------
+# Blocks
+# ---------------------------------------------------------------------------
+
+
+def _block_path(obj: _Object, index: int, pinned: bool = False) -> str:
+    suffix = _PINNED_SUFFIX if pinned else _BLOCK_SUFFIX
+    return os.path.join(obj.directory, f"{index:08d}{suffix}")
+
+
+def _read_block(obj: _Object, index: int) -> bytes | None:
+    for pinned in (False, True):
+        path = _block_path(obj, index, pinned)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return data
+    return None
+
+
+def _write_block(obj: _Object, index: int, data: bytes, pinned: bool) -> None:
+    os.makedirs(obj.directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=obj.directory, prefix=".block_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, _block_path(obj, index, pinned))
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _fetch_blocks(obj: _Object, first: int, last: int, pinned: bool = False) -> dict[int, bytes]:
+    """Fetch blocks *first*..*last* with one ranged GET, cache and return them."""
+    start = obj.block_span(first)[0]
+    end = obj.block_span(last)[1]
+    headers = {"Range": f"bytes={start}-{end}"}
+    if obj.etag and not obj.etag.startswith("W/"):
+        headers["If-Range"] = obj.etag
+    req = urllib.request.Request(obj.url, headers=headers)
+    with urllib.request.urlopen(req, timeout=RANGE_TIMEOUT) as resp:
+        if resp.status != 206:
+            raise OSError(f"{obj.url[:80]} did not answer a range request (changed upstream?)")
+        data = resp.read()
+    if len(data) != end - start + 1:
+        raise OSError(f"Short range read from {obj.url[:80]}: {len(data)} of {end - start + 1} bytes")
+    _count("blocks_fetched", last - first + 1)
+    _count("bytes_fetched", len(data))
+
+    blocks = {}
+    written = 0
+    for index in range(first, last + 1):
+        block_start, block_end = obj.block_span(index)
+        block = data[block_start - start:block_end - start + 1]
+        blocks[index] = block
+        try:
+            _write_block(obj, index, block, pinned)
+            written += len(block)
+        except OSError as exc:
+            logger.warning("Could not cache block %d of %s: %s", index, obj.url[:80], exc)
+    _evict_blocks(written)
+    return blocks
+
+
+def read_range(obj: _Object, start: int, end: int) -> bytes:
+    """Return bytes *start*..*end* (inclusive) of *obj*, fetching missing blocks."""
+    first, last = start // BLOCK_BYTES, end // BLOCK_BYTES
+    blocks: dict[int, bytes] = {}
+    missing: list[int] = []
+    for index in range(first, last + 1):
+        block = _read_block(obj, index)
+        if block is None:
+            missing.append(index)
+        else:
+            blocks[index] = block
+            _count("blocks_hit")
+
+    # One upstream request per contiguous run of missing blocks.
+    run: list[int] = []
+    for index in missing + [None]:
+        if run and (index is None or index != run[-1] + 1):
+            blocks.update(_fetch_blocks(obj, run[0], run[-1]))
+            run = []
+        if index is not None:
+            run.append(index)
+
+    data = b"".join(blocks[index] for index in range(first, last + 1))
+    offset = start - first * BLOCK_BYTES
+    return data[offset:offset + end - start + 1]
+
+
+def _scan_blocks() -> list[tuple[bool, float, int, str]]:
+    """Return ``(pinned, atime, size, path)`` of every cached block file."""
+    root = os.path.join(_file_cache.CACHE_DIR, BLOCKS_SUBDIR)
+    entries = []
+    try:
+        keys = os.listdir(root)
+    except OSError:
+        return entries
+    for key in keys:
+        directory = os.path.join(root, key)
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            if not name.endswith((_BLOCK_SUFFIX, _PINNED_SUFFIX)):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((name.endswith(_PINNED_SUFFIX), st.st_atime, st.st_size, path))
+    return entries
+
+
+def _evict_blocks(added: int = 0) -> None:
+    """Count *added* newly cached bytes; if over budget, delete LRU blocks until it fits.
+
+    The cache size is kept in memory (``_cached_bytes``) and measured on
+    disk only on first use and when a fetch pushes it over
+    ``MAX_BLOCK_CACHE_BYTES``; the measurement also picks up blocks other
+    worker processes have written since.  Unpinned blocks go first; pinned
+    footer blocks only once none are left.  Runs under ``_lock``, so proxy
+    threads finishing fetches at once do not evict twice over; a block
+    already deleted by another process counts as freed.
+    """
+    global _cached_bytes
+    with _lock:
+        if _cached_bytes is not None:
+            _cached_bytes += added
+            if _cached_bytes <= MAX_BLOCK_CACHE_BYTES:
+                return
+
+        entries = _scan_blocks()
+        total = sum(e[2] for e in entries)
+        if total > MAX_BLOCK_CACHE_BYTES:
+            entries.sort(key=lambda e: (e[0], e[1]))
+            for _pinned, _atime, size, path in entries:
+                if total <= MAX_BLOCK_CACHE_BYTES:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass  # deleted by another process: freed all the same
+                except OSError:
+                    continue
+                total -= size
+        _cached_bytes = total
+
+
+# ---------------------------------------------------------------------------
+# Opening URLs
+# ---------------------------------------------------------------------------
+
+
+def _object(url: str, size: int, etag: str | None, last_modified: str | None) -> _Object | None:
+    if size < 12:
+        return None
+    version = etag or last_modified or str(size)
+    key = hashlib.sha256(f"{url}|{version}".encode("utf-8")).hexdigest()[:32]
+    return _Object(url=url, size=size, etag=etag, key=key)
+
+
+def _probe(url: str) -> _Object | None:
+    req = urllib.request.Request(url, method="HEAD")
+    with urllib.request.urlopen(req, timeout=RANGE_TIMEOUT) as resp:
+        headers = resp.headers
+    length = headers.get("Content-Length") or ""
+    if not length.isdigit():
+        return None
+    return _object(url, int(length), headers.get("ETag"), headers.get("Last-Modified"))
+
+
+def _pin_footer(obj: _Object) -> None:
+    """Fetch and pin the blocks holding the Parquet footer of *obj*."""
+    last = obj.last_block
+    tail = _read_block(obj, last)
+    if tail is None:
+        tail = _fetch_blocks(obj, last, last, pinned=True)[last]
+    if len(tail) < 8 or tail[-4:] != b"PAR1":
+        return
+    footer_start = obj.size - 8 - struct.unpack("<I", tail[-8:-4])[0]
+    first = max(footer_start, 0) // BLOCK_BYTES
+    for index in range(first, last):
+        if _read_block(obj, index) is None:
+            _fetch_blocks(obj, index, last - 1, pinned=True)
+            break
+
+
+def open_url(url: str, info: _file_cache.RemoteInfo | None = None) -> str | None:
+    """Return a local proxy URL serving *url* from the block cache.
+
+    Probes *url* (a HEAD request) and fetches its footer blocks.  Returns
+    ``None`` if that fails, the server sends no length or it ignores range
+    requests; callers then read *url* directly.  A caller that has already
+    made a ranged request to *url* passes what it learned as *info* and
+    the HEAD is skipped.
+    """
+    try:
+        if info is None:
+            obj = _probe(url)
+        elif info.accepts_ranges and info.size is not None:
+            obj = _object(url, info.size, info.etag, info.last_modified)
+        else:
+            obj = None
+        if obj is None:
+            return None
+        _pin_footer(obj)
+    except (OSError, ValueError) as exc:
+        logger.info("Range cache: not proxying %s: %s", url[:80], exc)
+        return None
+    with _lock:
+        _objects[obj.key] = obj
+        _by_url[url] = obj
+    return _proxy_url(obj)
+
+
+def proxied_url(url: str) -> str | None:
+    """Return the proxy URL of an already opened *url*, without any I/O."""
+    obj = _by_url.get(url)
+    return _proxy_url(obj) if obj is not None else None
+
+
+def forget(url: str) -> None:
+    """Stop proxying *url* (its cached blocks stay on disk until evicted)."""
+    with _lock:
+        obj = _by_url.pop(url, None)
+        if obj is not None:
+            _objects.pop(obj.key, None)
+
+
+def stats() -> dict:
+    """Return block cache counters for this process."""
+    with _lock:
+        return {**_counters, "objects": len(_objects)}
+
+
+# ---------------------------------------------------------------------------
+# Local range proxy
+# ---------------------------------------------------------------------------
+
+
+def _parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse a single-range ``Range`` header into an inclusive byte range."""
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    if not first:
+        if not last.isdigit() or int(last) == 0:
+            return None
+        return max(size - int(last), 0), size - 1
+    if not first.isdigit() or (last and not last.isdigit()):
+        return None
+    start, end = int(first), min(int(last) if last else size - 1, size - 1)
+    return (start, end) if start <= end else None
+
+
+class _ProxyHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body: bool) -> None:
+        key = urllib.parse.urlsplit(self.path).path.strip("/").split("/", 1)[0]
+        obj = _objects.get(key)
+        if obj is None:
+            self.send_error(404)
+            return
+        header = self.headers.get("Range")
+        span = _parse_range(header, obj.size)
+        if header and span is None:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{obj.size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        start, end = span or (0, obj.size - 1)
+        try:
+            # Read before sending headers so an upstream failure is a clean 502.
+            body = read_range(obj, start, end) if send_body and span else b""
+        except (OSError, urllib.error.URLError) as exc:
+            logger.warning("Range cache: upstream read of %s failed: %s", obj.url[:80], exc)
+            self.send_error(502)
+            return
+
+        self.send_response(206 if span else 200)
+        if span:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{obj.size}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", f'"{obj.key}"')
+        self.end_headers()
+        if not send_body:
+            return
+        if span:
+            self.wfile.write(body)
+            return
+        for index in range(obj.last_block + 1):
+            block_start, block_end = obj.block_span(index)
+            self.wfile.write(read_range(obj, block_start, block_end))
+
+
+_server: http.server.ThreadingHTTPServer | None = None
+_server_pid: int | None = None
+
+
+def _proxy_url(obj: _Object) -> str:
+    global _server, _server_pid
+    with _lock:
+        if _server is None or _server_pid != os.getpid():
+            _server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _ProxyHandler)
+            _server.daemon_threads = True
+            _server_pid = os.getpid()
+            threading.Thread(target=_server.serve_forever, name="range-cache-proxy", daemon=True).start()
+        port = _server.server_address[1]
+    name = os.path.basename(urllib.parse.urlsplit(obj.url).path) or "data.parquet"
+    return f"http://127.0.0.1:{port}/{obj.key}/{urllib.parse.quote(name)}"
@@ -0,0 +1,114 @@
+"""Arrow IPC result transport between worker processes and the API process.
+
+Instead of pickling up to 1000 row dicts through ``multiprocessing.Pool``,
+a worker can write its result DataFrame as an Arrow IPC file into a
+shared-memory directory (``/dev/shm`` where available) and return only a
+small handle.  The API process memory-maps the file, so column buffers are
+shared rather than copied, and removes it once the rows are materialized.
+
+What this saves is the pickling of row dicts in the worker and their
+unpickling in the API process.  The API process still turns the mapped
+frame into Python lists for its consumers (response models, the query
+cache, the LLM tool result); it does not stream Arrow to the client.
+
+No imports from ``app/`` -- fully self-contained, same as file_cache.py.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+PICKLE = "pickle"
+ARROW_IPC = "arrow_ipc"
+TRANSPORTS = (PICKLE, ARROW_IPC)
+
+_default_base = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else tempfile.gettempdir()
+RESULT_DIR = os.environ.get("CHATDF_RESULT_DIR", os.path.join(_default_base, "chatdf-results"))
+STALE_RESULT_MAX_AGE = 600  # seconds -- results never picked up by the API process
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+
+def write_result(df) -> dict:
+    """Write *df* as an uncompressed Arrow IPC file and return its handle.
+
+    Returns:
+        {"path": str, "size_bytes": int}
+    """
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=RESULT_DIR, prefix="result_", suffix=".arrow")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            df.write_ipc(f, compression="uncompressed")
+    except BaseException:
+        discard({"path": path})
+        raise
+    return {"path": path, "size_bytes": os.path.getsize(path)}
+
+
+# ---------------------------------------------------------------------------
+# API side
+# ---------------------------------------------------------------------------
+
+
+def read_result(handle: dict):
+    """Memory-map the result behind *handle* and return it as a DataFrame.
+
+    Polars memory-maps uncompressed IPC files by default (the
+    ``memory_map`` keyword is gone in Polars 2).  The file is unlinked
+    straight away; the mapping stays valid until the DataFrame is dropped.
+    """
+    import polars as pl
+
+    path = handle["path"]
+    try:
+        return pl.read_ipc(path)
+    finally:
+        discard(handle)
+
+
+def discard(handle: dict) -> None:
+    """Remove the result file behind *handle* (no-op if already gone)."""
+    try:
+        os.unlink(handle["path"])
+    except OSError:
+        pass
+
+
+def cleanup_stale() -> int:
+    """Remove result files older than ``STALE_RESULT_MAX_AGE``.
+
+    Results are normally removed by :func:`read_result`; this catches files
+    orphaned by a crash between the worker writing and the API reading.
+    Returns the number of removed files.
+    """
+    removed = 0
+    try:
+        now = time.time()
+        for name in os.listdir(RESULT_DIR):
+            if not name.startswith("result_"):
+                continue
+            path = os.path.join(RESULT_DIR, name)
+            try:
+                if now - os.path.getmtime(path) > STALE_RESULT_MAX_AGE:
+                    os.unlink(path)
+                    removed += 1
+            except OSError:
+                pass
+    except OSError:
+        pass
+    if removed:
+        logger.info("Removed %d stale result files from %s", removed, RESULT_DIR)
+    return removed
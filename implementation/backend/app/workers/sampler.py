@@ -0,0 +1,252 @@
+"""Row-group-aware row sampling for dataset previews.
+
+SQL previews such as ``ORDER BY RANDOM() LIMIT n`` or ``ROW_NUMBER() OVER
+()`` read and sort every row of the dataset to return a handful of them.
+The functions here use the Parquet row group sizes from the footer (see
+parquet_footer.py) to read only the rows they return:
+
+- Tail: the last rows are sliced from the end of the file, so only the
+  last row group(s) are read.
+- Random: row indices are drawn up front and each touched row group is
+  read on its own.  If they would touch more than ``MAX_ROW_GROUPS`` row
+  groups, row groups are first picked with probability proportional to
+  their size, and the rows drawn from those.  Without row group sizes the
+  rows are drawn in one streaming pass that keeps the ``n`` rows with the
+  smallest hash of their index (a reservoir sample).
+- Stratified: one streaming pass over the stratum column keeps, per
+  stratum, the ``n`` row indices with the smallest hash; the strata then
+  take turns until ``n`` rows are chosen, and only those rows are read.
+
+Random and stratified samples are deterministic for a given *seed*.
+
+:func:`preview_snapshot` takes the first rows and a fixed random sample at
+load time, so the common previews can be served without a worker.
+
+No imports from ``app/`` -- fully self-contained, same as parquet_footer.py.
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import random
+
+import polars as pl
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+TAIL = "tail"
+RANDOM = "random"
+STRATIFIED = "stratified"
+METHODS = (TAIL, RANDOM, STRATIFIED)
+
+MAX_ROW_GROUPS = 8  # max row groups read for one random sample
+
+SNAPSHOT_ROWS = 100      # rows of each kind in a preview snapshot (max preview size)
+SNAPSHOT_SEED = 0x5EED
+
+_ROW = "__row"
+_KEY = "__key"
+_RANK = "__rank"
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def sample_rows(
+    lf: pl.LazyFrame,
+    method: str,
+    n: int,
+    row_group_rows: list[int] | None = None,
+    column: str | None = None,
+    seed: int | None = None,
+) -> pl.DataFrame:
+    """Return up to *n* rows of *lf* sampled by *method*.
+
+    Args:
+        lf: The dataset.
+        method: ``"tail"``, ``"random"`` or ``"stratified"``.
+        n: Number of rows to return.
+        row_group_rows: Rows per Parquet row group, if known.
+        column: The stratum column (stratified only).
+        seed: Seed for random and stratified samples (``None`` for a fresh
+            sample each call).
+
+    Raises:
+        ValueError: If *method* is unknown, or *column* is missing for a
+            stratified sample.
+    """
+    if method == TAIL:
+        return tail_rows(lf, n, row_group_rows)
+    if method == RANDOM:
+        return random_rows(lf, n, row_group_rows, seed)
+    if method == STRATIFIED:
+        if column is None:
+            raise ValueError("Stratified sampling needs a column")
+        return stratified_rows(lf, n, column, row_group_rows, seed)
+    raise ValueError(f"Unknown sampling method: {method!r}")
+
+
+def tail_rows(lf: pl.LazyFrame, n: int, row_group_rows: list[int] | None = None) -> pl.DataFrame:
+    """Return the last *n* rows of *lf*, last row first."""
+    total = _total_rows(lf, row_group_rows)
+    start = max(total - n, 0)
+    return lf.slice(start, total - start).collect().reverse()
+
+
+def random_rows(
+    lf: pl.LazyFrame,
+    n: int,
+    row_group_rows: list[int] | None = None,
+    seed: int | None = None,
+) -> pl.DataFrame:
+    """Return up to *n* randomly chosen rows of *lf*, in file order."""
+    rng = random.Random(seed)
+    if not row_group_rows:
+        return (
+            lf.with_row_index(_ROW)
+            .with_columns(pl.col(_ROW).hash(_hash_seed(rng)).alias(_KEY))
+            .bottom_k(n, by=_KEY)
+            .sort(_ROW)
+            .drop(_ROW, _KEY)
+            .collect(engine="streaming")
+        )
+
+    starts = _starts(row_group_rows)
+    if n >= starts[-1]:
+        return lf.collect()
+    groups = _pick_row_groups(row_group_rows, n, rng)
+    candidates = list(itertools.accumulate(row_group_rows[g] for g in groups))
+    rows = []
+    for pick in rng.sample(range(candidates[-1]), n):
+        i = bisect.bisect_right(candidates, pick)
+        offset = pick - (candidates[i - 1] if i else 0)
+        rows.append(starts[groups[i]] + offset)
+    return _gather(lf, rows, row_group_rows)
+
+
+def stratified_rows(
+    lf: pl.LazyFrame,
+    n: int,
+    column: str,
+    row_group_rows: list[int] | None = None,
+    seed: int | None = None,
+) -> pl.DataFrame:
+    """Return up to *n* rows of *lf* spread evenly over the values of *column*.
+
+    Every stratum (null included) gets one row before any gets a second,
+    and so on; rows are returned in file order.
+    """
+    key = pl.col(_ROW).hash(_hash_seed(random.Random(seed)))
+    chosen = (
+        lf.with_row_index(_ROW)
+        .select(pl.col(column), pl.col(_ROW))
+        .group_by(column)
+        .agg(pl.col(_ROW).bottom_k_by(key, n))
+        .explode(_ROW)
+        .with_columns(key.alias(_KEY))
+        .with_columns(pl.col(_KEY).rank("ordinal").over(column).alias(_RANK))
+        .sort(_RANK, _KEY)
+        .head(n)
+        .collect(engine="streaming")
+    )
+    return _gather(lf, chosen[_ROW].to_list(), row_group_rows)
+
+
+def preview_snapshot(
+    lf: pl.LazyFrame,
+    row_group_rows: list[int] | None = None,
+    n: int = SNAPSHOT_ROWS,
+    seed: int = SNAPSHOT_SEED,
+) -> dict:
+    """Return the first *n* rows of *lf* and a fixed random sample of *n* rows.
+
+    Returns:
+        {"columns": list[str], "dtypes": list[str], "head": list[list],
+        "random": list[list]} with rows as value lists in column order and
+        the Polars dtype of each column; the random rows are in file order.
+    """
+    head = lf.head(n).collect()
+    sample = random_rows(lf, n, row_group_rows, seed)
+    return {
+        "columns": head.columns,
+        "dtypes": [str(dtype) for dtype in head.dtypes],
+        "head": head.rows(),
+        "random": sample.rows(),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------------
+
+
+def _hash_seed(rng: random.Random) -> int:
+    return rng.getrandbits(32)
+
+
+def _total_rows(lf: pl.LazyFrame, row_group_rows: list[int] | None) -> int:
+    if row_group_rows:
+        return sum(row_group_rows)
+    return lf.select(pl.len()).collect().item()
+
+
+def _starts(row_group_rows: list[int]) -> list[int]:
+    """Return the first row of every row group, then the total row count."""
+    return [0, *itertools.accumulate(row_group_rows)]
+
+
+def _pick_row_groups(row_group_rows: list[int], n: int, rng: random.Random) -> list[int]:
+    """Pick row groups to draw *n* rows from, in file order.
+
+    All row groups if there are at most ``MAX_ROW_GROUPS``; otherwise a
+    weighted sample without replacement (Efraimidis-Spirakis keys), with
+    probability proportional to size, of ``MAX_ROW_GROUPS`` row groups or
+    as many more as it takes to hold *n* rows.
+    """
+    groups = [g for g, rows in enumerate(row_group_rows) if rows > 0]
+    if len(groups) <= MAX_ROW_GROUPS:
+        return groups
+    keyed = sorted(groups, key=lambda g: rng.random() ** (1 / row_group_rows[g]), reverse=True)
+    picked: list[int] = []
+    held = 0
+    for g in keyed:
+        if len(picked) >= MAX_ROW_GROUPS and held >= n:
+            break
+        picked.append(g)
+        held += row_group_rows[g]
+    return sorted(picked)
+
+
+def _gather(lf: pl.LazyFrame, rows: list[int], row_group_rows: list[int] | None) -> pl.DataFrame:
+    """Return the rows of *lf* at indices *rows*, in file order.
+
+    With row group sizes, each touched row group is sliced and read on its
+    own; otherwise one pass filters the whole file.
+    """
+    rows = sorted(rows)
+    if not row_group_rows:
+        return (
+            lf.with_row_index(_ROW)
+            .filter(pl.col(_ROW).is_in(rows))
+            .drop(_ROW)
+            .collect(engine="streaming")
+        )
+    if not rows:
+        return lf.head(0).collect()
+
+    starts = _starts(row_group_rows)
+    frames = []
+    for g, group_rows in itertools.groupby(rows, key=lambda r: bisect.bisect_right(starts, r) - 1):
+        local = [r - starts[g] for r in group_rows]
+        frames.append(
+            lf.slice(starts[g], row_group_rows[g])
+            .with_row_index(_ROW)
+            .filter(pl.col(_ROW).is_in(local))
+            .drop(_ROW)
+        )
+    return pl.concat(pl.collect_all(frames))
@@ -0,0 +1,213 @@
+"""Per-worker registry of scanned LazyFrames.
+
+Each worker process keeps an LRU of scanned LazyFrames, their resolved
+schemas and (for remote files that needed the download fallback) the cached
+local path, keyed by dataset URL plus a version fingerprint.  Repeated
+queries against the same datasets -- every LLM turn -- reuse the registered
+LazyFrame instead of re-scanning and re-reading metadata over the network.
+
+Fingerprints:
+- Local files: ``(st_size, st_mtime_ns)`` from ``os.stat`` (no network I/O).
+- Remote URLs: ETag / Last-Modified / Content-Length from a HEAD request,
+  taken on registration (unless the caller already knows it) and
+  re-checked at most every ``REVALIDATE_SECONDS``.  Between revalidations a hit does no I/O at all.
+
+No imports from ``app/`` -- fully self-contained, same as file_cache.py.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+# An entry is a LazyFrame plan plus its schema -- a few KB even for wide
+# tables -- so a plain entry cap bounds memory well enough.
+MAX_ENTRIES = int(os.environ.get("CHATDF_SCAN_REGISTRY_MAX_ENTRIES", "64"))
+REVALIDATE_SECONDS = float(os.environ.get("CHATDF_SCAN_REVALIDATE_SECONDS", "60"))
+FINGERPRINT_TIMEOUT = 10  # seconds for the HEAD request behind a remote fingerprint
+
+
+# ---------------------------------------------------------------------------
+# Fingerprints
+# ---------------------------------------------------------------------------
+
+
+def local_fingerprint(path: str) -> str | None:
+    """Return a version fingerprint for a local file, or ``None`` if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def remote_fingerprint(url: str) -> str | None:
+    """Return a version fingerprint for a remote URL via a HEAD request.
+
+    Prefers the ETag, then Last-Modified, then Content-Length.  Returns
+    ``None`` when the server cannot be reached or sends none of them.
+    """
+    try:
+        req = urllib.request.Request(url, method="HEAD")
+        with urllib.request.urlopen(req, timeout=FINGERPRINT_TIMEOUT) as resp:
+            headers = resp.headers
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+    parts = [
+        headers.get("ETag") or "",
+        headers.get("Last-Modified") or "",
+        headers.get("Content-Length") or "",
+    ]
+    if not any(parts):
+        return None
+    return "|".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ScanEntry:
+    """A registered scan of one dataset URL."""
+
+    url: str
+    fingerprint: str | None
+    lazy_frame: object
+    schema: dict[str, str]
+    local_path: str | None
+    validated_at: float
+
+
+class ScanRegistry:
+    """LRU registry of scanned LazyFrames, capped at ``max_entries``.
+
+    Not thread-safe: each worker process runs one task at a time.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        revalidate_seconds: float = REVALIDATE_SECONDS,
+    ) -> None:
+        self._entries: OrderedDict[str, ScanEntry] = OrderedDict()
+        self._max_entries = max_entries
+        self._revalidate_seconds = revalidate_seconds
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, url: str, is_local: bool) -> ScanEntry | None:
+        """Return the live entry for *url*, or ``None`` if absent or stale.
+
+        A stale entry (changed fingerprint, or a cached download that was
+        evicted from disk) is dropped so the caller re-registers it.
+        """
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+
+        if entry.local_path is not None and not os.path.isfile(entry.local_path):
+            self._entries.pop(url, None)
+            return None
+
+        if is_local:
+            if local_fingerprint(url) != entry.fingerprint:
+                self._entries.pop(url, None)
+                return None
+        elif time.monotonic() - entry.validated_at > self._revalidate_seconds:
+            current = remote_fingerprint(url)
+            if current is not None and current != entry.fingerprint:
+                logger.info("Scan registry: %s changed upstream, re-scanning", url[:80])
+                self._entries.pop(url, None)
+                return None
+            entry.validated_at = time.monotonic()
+
+        self._entries.move_to_end(url)
+        return entry
+
+    def get_or_register(
+        self,
+        url: str,
+        is_local: bool,
+        scan: Callable[[], tuple[object, str | None]],
+        fingerprint: str | None = None,
+    ) -> ScanEntry:
+        """Return the entry for *url*, calling *scan* on a miss.
+
+        *scan* returns ``(lazy_frame, local_path)`` where ``local_path`` is
+        the cached download used when direct access failed (or ``None``).
+        Its schema is resolved once here and kept with the entry.  A remote
+        *fingerprint* the caller has just read from the server is used as
+        is instead of sending another HEAD.
+        """
+        entry = self.get(url, is_local)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        if is_local:
+            fingerprint = local_fingerprint(url)
+        elif fingerprint is None:
+            fingerprint = remote_fingerprint(url)
+        lazy_frame, local_path = scan()
+        schema = {name: str(dtype) for name, dtype in lazy_frame.collect_schema().items()}
+        entry = ScanEntry(
+            url=url,
+            fingerprint=fingerprint,
+            lazy_frame=lazy_frame,
+            schema=schema,
+            local_path=local_path,
+            validated_at=time.monotonic(),
+        )
+        self._put(entry)
+        return entry
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def invalidate(self, url: str) -> None:
+        """Forget any entry for *url* (e.g. after a failed query on it)."""
+        self._entries.pop(url, None)
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> dict:
+        """Return registry statistics for this process."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _put(self, entry: ScanEntry) -> None:
+        self._entries.pop(entry.url, None)
+        self._entries[entry.url] = entry
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+# Process-wide registry used by the worker functions in data_worker.py.
+registry = ScanRegistry()
@@ -0,0 +1,390 @@
+"""Mergeable column sketches for approximate statistics.
+
+Exact distinct counts, medians and top values need the whole column in
+memory at once.  A :class:`ColumnSketch` summarizes one chunk of rows in
+fixed space instead.  Chunks follow the Parquet row groups, and two
+sketches merge into a sketch of both chunks, so a column is sketched one
+row group at a time and the result can be stored and merged later.
+
+- Distinct count: HyperLogLog with 2**``HLL_PRECISION`` registers.  The
+  hashes come from Polars' ``Expr.hash``, which is stable for a given
+  Polars version only, so sketches record it (``hash_version``).
+- Median / quantiles: a weighted quantile summary, in the spirit of a
+  t-digest.  A chunk is reduced to ``QUANTILE_POINTS`` values at evenly
+  spaced ranks; merging concatenates summaries and re-samples them when
+  they grow past ``MAX_QUANTILE_POINTS``.  ``rank_error`` bounds how far,
+  in rows, a reported quantile can be from the true one.
+- Top values: Misra-Gries counters (``TOP_K_COUNTERS`` of them).  Counts
+  are lower bounds, each at most ``heavy_error`` below the true count.
+
+Null counts, min / max, sums and string lengths merge exactly.
+
+No imports from ``app/`` -- fully self-contained, same as parquet_footer.py.
+"""
+
+from __future__ import annotations
+
+import base64
+import math
+from dataclasses import dataclass, field
+
+import polars as pl
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+HLL_PRECISION = 12             # 4096 registers, ~1.6% standard error
+HLL_REGISTERS = 1 << HLL_PRECISION
+HLL_SEED = 0x51ED
+
+QUANTILE_POINTS = 256          # points kept per chunk
+MAX_QUANTILE_POINTS = 4096     # points kept per merged sketch
+
+TOP_K_COUNTERS = 64
+TOP_VALUES = 5
+
+CHUNK_ROWS = 1_000_000         # max rows sketched at once
+
+NUMERIC = "numeric"
+STRING = "string"
+DATETIME = "datetime"
+OTHER = "other"
+
+HASH_VERSION = pl.__version__
+
+_COUNT = "__count"
+
+
+def column_kind(column_type: str) -> str:
+    """Return the sketch kind of a Polars dtype string."""
+    if column_type.startswith(("Int", "UInt", "Float")):
+        return NUMERIC
+    if column_type in ("Utf8", "String"):
+        return STRING
+    if column_type in ("Date", "Datetime", "Time") or column_type.startswith("Datetime"):
+        return DATETIME
+    return OTHER
+
+
+# ---------------------------------------------------------------------------
+# Sketch
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ColumnSketch:
+    """Mergeable summary of the values of one column."""
+
+    kind: str
+    rows: int = 0
+    null_count: int = 0
+    min: object = None
+    max: object = None
+    total: float = 0.0                      # sum of numeric values
+    min_length: int | None = None
+    max_length: int | None = None
+    registers: bytearray = field(default_factory=lambda: bytearray(HLL_REGISTERS))
+    points: list[tuple[object, float]] = field(default_factory=list)  # sorted (value, weight)
+    rank_error: float = 0.0
+    heavy: dict[str, int] = field(default_factory=dict)
+    heavy_error: int = 0
+
+    @property
+    def count(self) -> int:
+        """Number of non-null values."""
+        return self.rows - self.null_count
+
+
+def _merge_bound(a, b, pick):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return pick(a, b)
+
+
+def _compress(points: list[tuple[object, float]], budget: int) -> list[tuple[object, float]]:
+    """Re-sample weighted *points* to *budget* points at evenly spaced ranks."""
+    weight = sum(w for _, w in points)
+    step = weight / budget
+    out = []
+    cumulative = 0.0
+    target = step / 2
+    for value, w in points:
+        cumulative += w
+        while cumulative >= target and len(out) < budget:
+            out.append((value, step))
+            target += step
+    return out
+
+
+def _reduce_counters(counters: dict[str, int]) -> tuple[dict[str, int], int]:
+    """Misra-Gries reduction to ``TOP_K_COUNTERS`` counters.
+
+    Returns the kept counters and the amount subtracted from each.
+    """
+    if len(counters) <= TOP_K_COUNTERS:
+        return counters, 0
+    cut = sorted(counters.values(), reverse=True)[TOP_K_COUNTERS]
+    return {v: c - cut for v, c in counters.items() if c > cut}, cut
+
+
+def merge(a: ColumnSketch, b: ColumnSketch) -> ColumnSketch:
+    """Return a sketch of the rows of both *a* and *b*."""
+    points = sorted(a.points + b.points, key=lambda p: p[0])
+    rank_error = a.rank_error + b.rank_error
+    if len(points) > MAX_QUANTILE_POINTS:
+        budget = MAX_QUANTILE_POINTS // 2
+        rank_error += sum(w for _, w in points) / budget
+        points = _compress(points, budget)
+
+    counters = dict(a.heavy)
+    for value, count in b.heavy.items():
+        counters[value] = counters.get(value, 0) + count
+    heavy, cut = _reduce_counters(counters)
+
+    return ColumnSketch(
+        kind=a.kind,
+        rows=a.rows + b.rows,
+        null_count=a.null_count + b.null_count,
+        min=_merge_bound(a.min, b.min, min),
+        max=_merge_bound(a.max, b.max, max),
+        total=a.total + b.total,
+        min_length=_merge_bound(a.min_length, b.min_length, min),
+        max_length=_merge_bound(a.max_length, b.max_length, max),
+        registers=bytearray(max(x, y) for x, y in zip(a.registers, b.registers)),
+        points=points,
+        rank_error=rank_error,
+        heavy=heavy,
+        heavy_error=a.heavy_error + b.heavy_error + cut,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Building
+# ---------------------------------------------------------------------------
+
+
+def row_group_chunks(row_group_rows: list[int], total_rows: int | None = None) -> list[tuple[int, int]]:
+    """Split a file into ``(offset, rows)`` chunks along row-group boundaries.
+
+    Small consecutive row groups are joined and large ones split, so each
+    chunk holds at most ``CHUNK_ROWS`` rows.  Without row groups the
+    *total_rows* are split evenly.
+    """
+    sizes = row_group_rows or ([total_rows] if total_rows else [])
+    chunks = []
+    start = offset = 0
+    for rows in sizes:
+        if offset > start and offset + rows - start > CHUNK_ROWS:
+            chunks.append((start, offset - start))
+            start = offset
+        offset += rows
+        while offset - start > CHUNK_ROWS:
+            chunks.append((start, CHUNK_ROWS))
+            start += CHUNK_ROWS
+    if offset > start:
+        chunks.append((start, offset - start))
+    return chunks
+
+
+def _json_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def sketch_chunk(lf: pl.LazyFrame, column: str, kind: str) -> ColumnSketch:
+    """Sketch *column* over all rows of *lf* (one chunk, see row_group_chunks)."""
+    col = pl.col(column)
+    exprs = [pl.len().alias("rows"), col.null_count().alias("nulls")]
+    if kind in (NUMERIC, DATETIME):
+        exprs += [col.min().alias("min"), col.max().alias("max")]
+    if kind == NUMERIC:
+        exprs.append(col.cast(pl.Float64).sum().alias("total"))
+    if kind == STRING:
+        exprs += [
+            col.str.len_chars().min().alias("min_length"),
+            col.str.len_chars().max().alias("max_length"),
+        ]
+    stats = lf.select(exprs).collect(engine="streaming").row(0, named=True)
+    sketch = ColumnSketch(
+        kind=kind,
+        rows=stats["rows"],
+        null_count=stats["nulls"],
+        min=_json_value(stats.get("min")),
+        max=_json_value(stats.get("max")),
+        total=stats.get("total") or 0.0,
+        min_length=stats.get("min_length"),
+        max_length=stats.get("max_length"),
+    )
+
+    # HyperLogLog: the top bits of a hash pick a register, the position of
+    # the first 1 bit in the rest is the rank kept (as the register's max).
+    hashed = col.drop_nulls().hash(HLL_SEED)
+    low_bits = 64 - HLL_PRECISION
+    ranks = lf.select(
+        (hashed // (1 << low_bits)).alias("register"),
+        ((hashed & ((1 << low_bits) - 1)).bitwise_leading_zeros().cast(pl.Int64)
+         - (HLL_PRECISION - 1)).alias("rank"),
+    ).group_by("register").agg(pl.col("rank").max()).collect(engine="streaming")
+    for register, rank in ranks.iter_rows():
+        sketch.registers[register] = rank
+
+    if kind == NUMERIC:
+        values = lf.select(col.drop_nulls().sort()).collect(engine="streaming")[column]
+        n = len(values)
+        if n <= QUANTILE_POINTS:
+            sketch.points = [(v, 1.0) for v in values.to_list()]
+        else:
+            step = n / QUANTILE_POINTS
+            picks = values.gather([int((i + 0.5) * step) for i in range(QUANTILE_POINTS)])
+            sketch.points = [(v, step) for v in picks.to_list()]
+            sketch.rank_error = step
+
+    if kind == STRING:
+        top = (
+            lf.select(col.drop_nulls()).group_by(column).agg(pl.len().alias(_COUNT))
+            .sort(_COUNT, descending=True).head(TOP_K_COUNTERS + 1)
+            .collect(engine="streaming")
+        )
+        sketch.heavy, sketch.heavy_error = _reduce_counters(
+            {str(value): count for value, count in top.iter_rows()}
+        )
+
+    return sketch
+
+
+def sketch_column(
+    lf: pl.LazyFrame, column: str, column_type: str, row_group_rows: list[int] | None = None
+) -> ColumnSketch:
+    """Sketch *column* of *lf* one row group at a time.
+
+    *row_group_rows* are the row counts of the file's row groups (see
+    parquet_footer.FooterStats); without them the rows are counted first
+    and split into ``CHUNK_ROWS`` chunks.  Memory is bounded by one chunk.
+    """
+    kind = column_kind(column_type)
+    lf = lf.select(column)
+    total = None
+    if not row_group_rows:
+        total = lf.select(pl.len()).collect(engine="streaming").item()
+    sketch = ColumnSketch(kind=kind)
+    for offset, rows in row_group_chunks(row_group_rows or [], total):
+        sketch = merge(sketch, sketch_chunk(lf.slice(offset, rows), column, kind))
+    return sketch
+
+
+# ---------------------------------------------------------------------------
+# Estimates
+# ---------------------------------------------------------------------------
+
+
+def distinct_count(sketch: ColumnSketch) -> int:
+    """HyperLogLog estimate of the number of distinct non-null values."""
+    m = HLL_REGISTERS
+    estimate = (0.7213 / (1 + 1.079 / m)) * m * m / sum(2.0 ** -r for r in sketch.registers)
+    zeros = sketch.registers.count(0)
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * math.log(m / zeros)  # small-range correction
+    return min(round(estimate), sketch.count)
+
+
+def quantile(sketch: ColumnSketch, q: float):
+    """Approximate *q*-quantile of a numeric sketch, or None if it has no values."""
+    if not sketch.points:
+        return None
+    target = q * sum(w for _, w in sketch.points)
+    cumulative = 0.0
+    for value, weight in sketch.points:
+        cumulative += weight
+        if cumulative >= target:
+            return value
+    return sketch.points[-1][0]
+
+
+def summarize(sketch: ColumnSketch) -> dict:
+    """Return the statistics profile_column reports, estimated from *sketch*.
+
+    Returns:
+        {"stats": {...}} with the same keys as an exact profile, plus
+        ``"error_bounds"``: ``distinct_count`` as a relative standard
+        error, ``median`` as a fraction of the values (rank error) and
+        ``top_5_values`` as the most each count can be below the truth.
+    """
+    count = sketch.count
+    stats: dict = {"null_count": sketch.null_count, "distinct_count": distinct_count(sketch)}
+    bounds: dict = {"distinct_count": round(1.04 / math.sqrt(HLL_REGISTERS), 4)}
+
+    if sketch.kind == NUMERIC:
+        stats.update({
+            "min": sketch.min,
+            "max": sketch.max,
+            "mean": round(sketch.total / count, 4) if count else None,
+            "median": quantile(sketch, 0.5),
+        })
+        bounds["median"] = round(sketch.rank_error / count, 4) if count else 0.0
+    elif sketch.kind == STRING:
+        top = sorted(sketch.heavy.items(), key=lambda item: -item[1])[:TOP_VALUES]
+        stats.update({
+            "min_length": sketch.min_length,
+            "max_length": sketch.max_length,
+            "top_5_values": [{"value": value, "count": c} for value, c in top],
+        })
+        bounds["top_5_values"] = sketch.heavy_error
+    elif sketch.kind == DATETIME:
+        stats.update({"min": sketch.min, "max": sketch.max})
+
+    stats["error_bounds"] = bounds
+    return {"stats": stats}
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+
+def to_dict(sketch: ColumnSketch) -> dict:
+    """Return a JSON-safe form of *sketch* (see :func:`from_dict`)."""
+    return {
+        "hash_version": HASH_VERSION,
+        "kind": sketch.kind,
+        "rows": sketch.rows,
+        "null_count": sketch.null_count,
+        "min": sketch.min,
+        "max": sketch.max,
+        "total": sketch.total,
+        "min_length": sketch.min_length,
+        "max_length": sketch.max_length,
+        "registers": base64.b64encode(bytes(sketch.registers)).decode("ascii"),
+        "points": [list(p) for p in sketch.points],
+        "rank_error": sketch.rank_error,
+        "heavy": sketch.heavy,
+        "heavy_error": sketch.heavy_error,
+    }
+
+
+def from_dict(data: dict) -> ColumnSketch | None:
+    """Rebuild a sketch stored by :func:`to_dict`.
+
+    Returns None for a sketch hashed by another Polars version, whose
+    registers would not merge with new ones.
+    """
+    if data.get("hash_version") != HASH_VERSION:
+        return None
+    return ColumnSketch(
+        kind=data["kind"],
+        rows=data["rows"],
+        null_count=data["null_count"],
+        min=data["min"],
+        max=data["max"],
+        total=data["total"],
+        min_length=data["min_length"],
+        max_length=data["max_length"],
+        registers=bytearray(base64.b64decode(data["registers"])),
+        points=[(value, weight) for value, weight in data["points"]],
+        rank_error=data["rank_error"],
+        heavy=data["heavy"],
+        heavy_error=data["heavy_error"],
+    )
@@ -0,0 +1,307 @@
+"""Per-task worker process tracking so running tasks can be killed.
+
+``multiprocessing.Pool`` has no way to cancel a task once a worker picked
+it up.  To get one, every tracked task is given a *slot* in a shared
+``multiprocessing.Array``.  A slot holds one of:
+
+- ``QUEUED`` (0): submitted, not yet picked up by a worker
+- a pid: running in that worker
+- ``CANCELLED``: abandoned before it started; the worker skips it
+- ``FINISHED``: done, result on its way back
+- ``RETIRED``: picked up by a worker that exited instead of running it
+- ``OUT_OF_MEMORY``: its worker passed its memory limit and killed itself
+
+Workers and the API process only touch a slot under the array's lock, and
+the API signals a worker while still holding it, so a kill never hits a
+worker that already moved on to another task.  SIGTERM keeps its default
+action (a worker stuck in C code, or in a lock after fork, must still
+die); because the signal is sent with the lock held by the API process,
+the target is never inside the lock when it dies.  The Pool notices a
+killed worker and starts a replacement.
+
+The initializer also bounds each worker's resources: a watchdog thread
+checks the worker's resident size every ``RSS_CHECK_INTERVAL`` and, once
+it passes the memory limit, marks the running task's slot
+``OUT_OF_MEMORY`` and SIGKILLs the worker, which the API side reports as
+``"memory"``.  An address-space rlimit would be the simpler mechanism,
+but Polars' thread pool reserves stacks and allocator arenas far beyond
+what it touches, so a cap near the working set makes multi-threaded
+queries fail to start at all.  ``POLARS_MAX_THREADS`` splits the
+machine's cores between the workers instead of every worker starting
+one compute thread per core.  The thread budget only applies if Polars'
+thread pool was not already started in the process the worker was
+forked from; the forkserver never runs Polars work, so it has not.
+
+Workers start warm: the initializer imports ``PRELOAD_MODULES`` (the
+forkserver has normally imported them already, so this is free), and a
+worker lives until its resident memory has grown ``MAX_RSS_GROWTH_MB``
+past what it was after start-up, rather than for a fixed number of tasks.
+A worker cannot leave the Pool between tasks without risking the Pool's
+task-queue lock, so it retires at the start of its next tracked task:
+it marks the slot ``RETIRED`` and exits, and the API side resubmits the
+task to a fresh worker.  Shared counters record how many tracked tasks
+ran and how many of them were the first task of a fresh worker.
+
+No imports from ``app/`` -- fully self-contained, same as file_cache.py.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+MAX_TASK_SLOTS = 256  # tracked tasks in flight (running + queued); more run untracked
+MAX_RSS_GROWTH_MB = int(os.environ.get("CHATDF_WORKER_MAX_RSS_GROWTH_MB", "256"))  # 0 disables
+RSS_CHECK_INTERVAL = 0.1  # seconds between checks of a worker's resident size
+
+# Imported by the forkserver and by every worker before its first task.
+PRELOAD_MODULES = ("polars", "app.workers.error_translator", "app.workers.data_worker")
+
+QUEUED = 0
+CANCELLED = -1
+FINISHED = -2
+RETIRED = -3
+OUT_OF_MEMORY = -4
+
+# Indexes into the shared counter array
+TASKS_RUN = 0
+COLD_TASKS = 1
+
+# Shared slot and counter arrays, set in each worker by init_worker().
+_worker_slots = None
+_worker_counters = None
+
+# This worker's resident size after start-up, its tracked task count and
+# the slot of the tracked task it is running.
+_baseline_rss: int | None = None
+_tasks_run = 0
+_current_slot: int | None = None
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+
+def init_worker(
+    slots,
+    memory_limit_mb: int | None = None,
+    max_threads: int | None = None,
+    counters=None,
+) -> None:
+    """Pool initializer: remember the shared arrays, apply limits, preload.
+
+    Args:
+        slots: The shared slot array (``TaskSlots.array``).
+        memory_limit_mb: Resident-memory limit for this worker, if any.
+        max_threads: Polars compute threads for this worker, if set.
+        counters: The shared counter array (``TaskSlots.counters``).
+    """
+    global _worker_slots, _worker_counters, _baseline_rss, _tasks_run
+    _worker_slots = slots
+    _worker_counters = counters
+    _tasks_run = 0
+    if max_threads:
+        os.environ["POLARS_MAX_THREADS"] = str(max_threads)
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            logger.warning("Could not preload %s in worker", name)
+    _baseline_rss = _rss_bytes()
+    if memory_limit_mb and _baseline_rss is not None:
+        threading.Thread(
+            target=_watch_memory, args=(memory_limit_mb * 1024 * 1024,),
+            name="memory-watchdog", daemon=True,
+        ).start()
+
+
+def _watch_memory(limit: int) -> None:
+    """Watchdog thread: kill this worker once its resident size passes *limit*.
+
+    The running tracked task's slot is marked ``OUT_OF_MEMORY`` first so
+    the API side can tell this exit from a crash.  The slot lock is
+    released before the kill; a worker must never die holding it.
+    """
+    while True:
+        time.sleep(RSS_CHECK_INTERVAL)
+        rss = _rss_bytes()
+        if rss is None or rss <= limit:
+            continue
+        slot = _current_slot
+        if slot is not None:
+            with _worker_slots.get_lock():
+                if _worker_slots[slot] == os.getpid():
+                    _worker_slots[slot] = OUT_OF_MEMORY
+        logger.warning(
+            "Worker %d exceeded its memory limit (%d MB resident); killing it",
+            os.getpid(), rss // (1024 * 1024),
+        )
+        os.kill(os.getpid(), signal.SIGKILL)
+
+
+def threads_per_worker(pool_size: int) -> int:
+    """Split the cores available to this process evenly between workers."""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS / Windows
+        cores = os.cpu_count() or 1
+    return max(1, cores // max(1, pool_size))
+
+
+def _rss_bytes() -> int | None:
+    """Return this process's resident set size, or ``None`` off Linux."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _outgrown() -> bool:
+    """True if this worker grew more than ``MAX_RSS_GROWTH_MB`` since start-up."""
+    if MAX_RSS_GROWTH_MB <= 0 or _baseline_rss is None:
+        return False
+    rss = _rss_bytes()
+    return rss is not None and rss - _baseline_rss > MAX_RSS_GROWTH_MB * 1024 * 1024
+
+
+def run_tracked(slot: int, fn, args: tuple):
+    """Run ``fn(*args)`` with this worker's pid recorded in *slot*.
+
+    Returns ``None`` without running *fn* if the task was cancelled while
+    it was still queued.  A worker that has outgrown its memory budget
+    marks the slot ``RETIRED`` and exits instead of running the task.
+    """
+    global _tasks_run, _current_slot
+    with _worker_slots.get_lock():
+        if _worker_slots[slot] == CANCELLED:
+            return None
+        retire = _tasks_run > 0 and _outgrown()
+        _worker_slots[slot] = RETIRED if retire else os.getpid()
+    if retire:
+        logger.info("Worker %d outgrew its memory budget; retiring", os.getpid())
+        os._exit(0)
+    if _worker_counters is not None:
+        with _worker_counters.get_lock():
+            _worker_counters[TASKS_RUN] += 1
+            if _tasks_run == 0:
+                _worker_counters[COLD_TASKS] += 1
+    _tasks_run += 1
+    _current_slot = slot
+    try:
+        return fn(*args)
+    finally:
+        _current_slot = None
+        with _worker_slots.get_lock():
+            if _worker_slots[slot] == os.getpid():  # not marked OUT_OF_MEMORY
+                _worker_slots[slot] = FINISHED
+
+
+# ---------------------------------------------------------------------------
+# API side
+# ---------------------------------------------------------------------------
+
+
+class TaskSlots:
+    """API-side allocator for the shared slot array.
+
+    Allocation happens on the event loop thread only, so the free list
+    needs no lock of its own.
+    """
+
+    def __init__(self, size: int = MAX_TASK_SLOTS, ctx=None) -> None:
+        ctx = ctx or multiprocessing
+        self.array = ctx.Array("q", size)
+        self.counters = ctx.Array("q", 2)
+        self._free = list(range(size - 1, -1, -1))
+        self.killed = 0
+        self.crashed = 0
+        self.retired = 0
+
+    def acquire(self) -> int | None:
+        """Reserve a slot, or return ``None`` if all are in use."""
+        if not self._free:
+            return None
+        slot = self._free.pop()
+        with self.array.get_lock():
+            self.array[slot] = QUEUED
+        return slot
+
+    def release(self, slot: int) -> None:
+        self._free.append(slot)
+
+    def requeue(self, slot: int) -> None:
+        """Mark *slot* queued again for a task being resubmitted."""
+        with self.array.get_lock():
+            self.array[slot] = QUEUED
+
+    def is_retired(self, slot: int) -> bool:
+        """True if the worker that picked up the task in *slot* retired instead."""
+        return self.array[slot] == RETIRED
+
+    def cancel(self, slot: int) -> int | None:
+        """Stop the task in *slot* wherever it is.
+
+        A queued task is marked so the worker skips it.  A running task's
+        worker gets SIGTERM; its pid is returned so the caller can escalate
+        with :meth:`kill`.  Returns ``None`` unless a worker was signalled.
+        """
+        with self.array.get_lock():
+            state = self.array[slot]
+            if state == QUEUED:
+                self.array[slot] = CANCELLED
+                return None
+            if state <= 0:
+                return None  # already cancelled or finished
+            try:
+                os.kill(state, signal.SIGTERM)
+            except ProcessLookupError:
+                return None
+        self.killed += 1
+        logger.warning("Terminated worker %d running an abandoned task", state)
+        return state
+
+    def kill(self, slot: int, pid: int) -> bool:
+        """SIGKILL *pid* if it is still running the task in *slot*."""
+        with self.array.get_lock():
+            if self.array[slot] != pid:
+                return False
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                return False
+        logger.warning("Killed worker %d that ignored SIGTERM", pid)
+        return True
+
+    def is_out_of_memory(self, slot: int) -> bool:
+        """True if the worker running the task in *slot* passed its memory limit."""
+        return self.array[slot] == OUT_OF_MEMORY
+
+    def running_pid(self, slot: int) -> int | None:
+        """Return the pid of the worker running the task in *slot*, if any."""
+        state = self.array[slot]
+        return state if state > 0 else None
+
+    @property
+    def in_use(self) -> int:
+        return len(self.array) - len(self._free)
+
+    @property
+    def tasks_run(self) -> int:
+        return self.counters[TASKS_RUN]
+
+    @property
+    def cold_tasks(self) -> int:
+        return self.counters[COLD_TASKS]
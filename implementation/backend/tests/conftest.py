@@ -6,6 +6,9 @@ Provides:
 - ``test_session``: a valid session for ``test_user``
 - ``authed_client``: httpx.AsyncClient with session cookie set
 - ``mock_worker_pool``: AsyncMock standing in for the worker pool
+- ``mock_process_pool``: MagicMock ``multiprocessing.pool.Pool`` whose
+  ``apply_async`` settles the caller's callbacks
+- ``make_mock_process_pool``: factory of such mocks
 """
 
 from __future__ import annotations
@@ -26,7 +29,8 @@ try:
 except ImportError:
     pass
 
-from unittest.mock import AsyncMock
+import multiprocessing.pool
+from unittest.mock import DEFAULT, AsyncMock, MagicMock
 
 import aiosqlite
 import pytest
@@ -100,7 +104,9 @@ CREATE TABLE IF NOT EXISTS datasets (
     error_message   TEXT,
     loaded_at       TEXT NOT NULL,
     file_size_bytes INTEGER,
-    column_descriptions TEXT NOT NULL DEFAULT '{}'
+    column_descriptions TEXT NOT NULL DEFAULT '{}',
+    version         TEXT,
+    preview_json    TEXT
 );
 
 CREATE TABLE IF NOT EXISTS token_usage (
@@ -164,6 +170,17 @@ CREATE TABLE IF NOT EXISTS query_results_cache (
     expires_at      TEXT NOT NULL
 );
 
+CREATE TABLE IF NOT EXISTS dataset_profiles (
+    url             TEXT NOT NULL,
+    version         TEXT NOT NULL,
+    column_name     TEXT NOT NULL,
+    variant         TEXT NOT NULL,
+    profile_json    TEXT NOT NULL,
+    row_count       INTEGER,
+    created_at      TEXT NOT NULL,
+    PRIMARY KEY (url, version, column_name, variant)
+);
+
 CREATE INDEX IF NOT EXISTS idx_query_cache_expires ON query_results_cache(expires_at);
 CREATE INDEX IF NOT EXISTS idx_saved_queries_user_id ON saved_queries(user_id);
 CREATE INDEX IF NOT EXISTS idx_query_history_user_id ON query_history(user_id, created_at);
@@ -266,7 +283,7 @@ async def authed_client(fresh_db, test_session):
 def mock_worker_pool():
     """AsyncMock standing in for the worker pool.
 
-    Pre-configured with sensible return values for the three main pool methods.
+    Pre-configured with sensible return values for the main pool methods.
     """
     pool = AsyncMock()
     pool.validate_url = AsyncMock(return_value={"valid": True})
@@ -276,6 +293,15 @@ def mock_worker_pool():
             "row_count": 100,
         },
     )
+    pool.ingest_dataset = AsyncMock(
+        return_value={
+            "valid": True,
+            "columns": [{"name": "id", "type": "INTEGER"}, {"name": "value", "type": "TEXT"}],
+            "row_count": 100,
+        },
+    )
+    pool.dataset_version = AsyncMock(return_value={"version": None})
+    pool.profile_columns = AsyncMock(return_value={"profiles": []})
     pool.run_query = AsyncMock(
         return_value={
             "rows": [{"id": 1, "value": "a"}],
@@ -284,3 +310,47 @@ def mock_worker_pool():
         },
     )
     return pool
+
+
+@pytest.fixture
+def mock_process_pool(make_mock_process_pool):
+    """MagicMock standing in for ``multiprocessing.pool.Pool``.
+
+    ``apply_async`` settles the caller's callbacks from the AsyncResult mock
+    at ``pool.apply_async.return_value``: the value of ``ar.get()`` goes to
+    ``callback``, an exception it raises to ``error_callback``.  Every
+    submission's ``(callback, error_callback)`` is appended to
+    ``pool.callbacks``; set ``pool.settle = False`` to leave them unanswered
+    (e.g. to deliver a result after a timeout).
+    """
+    return make_mock_process_pool()
+
+
+@pytest.fixture
+def make_mock_process_pool():
+    """Factory of ``mock_process_pool`` mocks, e.g. for several worker lanes."""
+    return _make_mock_process_pool
+
+
+def _make_mock_process_pool():
+    pool = MagicMock(spec=multiprocessing.pool.Pool)
+    pool.settle = True
+    pool.callbacks = []
+
+    def apply_async(func, args=(), kwds=None, callback=None, error_callback=None):
+        pool.callbacks.append((callback, error_callback))
+        if not pool.settle:
+            return DEFAULT
+        ar = pool.apply_async.return_value
+        try:
+            value = ar.get()
+        except BaseException as exc:
+            if error_callback is not None:
+                error_callback(exc)
+        else:
+            if callback is not None:
+                callback(value)
+        return DEFAULT
+
+    pool.apply_async.side_effect = apply_async
+    return pool
@@ -24,6 +24,7 @@ EXPECTED_TABLES = {
     "query_history",
     "user_settings",
     "query_results_cache",
+    "dataset_profiles",
 }
 
 
@@ -162,7 +163,7 @@ async def test_messages_table_structure(fresh_db):
 async def test_datasets_table_structure(fresh_db):
     """SCHEMA-7: Datasets table has correct columns."""
     cols = await _get_columns(fresh_db, "datasets")
-    assert len(cols) == 12
+    assert len(cols) == 14
     _assert_column(cols, "id", "TEXT", notnull=0, pk=1)
     _assert_column(cols, "conversation_id", "TEXT", notnull=1)
     _assert_column(cols, "url", "TEXT", notnull=1)
@@ -175,6 +176,8 @@ async def test_datasets_table_structure(fresh_db):
     _assert_column(cols, "loaded_at", "TEXT", notnull=1)
     _assert_column(cols, "file_size_bytes", "INTEGER", notnull=0)
     _assert_column(cols, "column_descriptions", "TEXT", notnull=1)
+    _assert_column(cols, "version", "TEXT", notnull=0)
+    _assert_column(cols, "preview_json", "TEXT", notnull=0)
 
 
 # ---------------------------------------------------------------------------
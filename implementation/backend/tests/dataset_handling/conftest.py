@@ -113,7 +113,8 @@ async def test_conversation(fresh_db, test_user):
 def mock_worker_pool():
     """AsyncMock standing in for the worker pool.
 
-    Pre-configured with sensible return values for validate_url and get_schema.
+    Pre-configured with sensible return values for validate_url, get_schema
+    and ingest_dataset.
     """
     pool = AsyncMock()
     pool.validate_url = AsyncMock(return_value={"valid": True})
@@ -126,6 +127,17 @@ def mock_worker_pool():
             "row_count": 100,
         },
     )
+    pool.ingest_dataset = AsyncMock(
+        return_value={
+            "valid": True,
+            "columns": [
+                {"name": "id", "type": "Int64"},
+                {"name": "name", "type": "Utf8"},
+            ],
+            "row_count": 100,
+        },
+    )
+    pool.dataset_version = AsyncMock(return_value={"version": None})
     return pool
 
 
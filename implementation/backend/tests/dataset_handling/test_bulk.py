@@ -0,0 +1,211 @@
+"""Bulk add / refresh tests.
+
+Tests: start_datasets starts one row per distinct URL; a load waits out
+a full worker queue; refresh_datasets refreshes datasets concurrently and
+skips those whose version is unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.exceptions import QueueFullError
+from app.services import dataset_service
+from app.services.dataset_service import (
+    add_dataset,
+    load_dataset,
+    refresh_datasets,
+    start_dataset,
+    start_datasets,
+)
+
+
+# ---------------------------------------------------------------------------
+# start_datasets
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_start_datasets_dedupes_urls(fresh_db, test_conversation):
+    """Each distinct URL gets one loading row, in request order."""
+    urls = [
+        "https://example.com/a.parquet",
+        "https://example.com/b.parquet",
+        "https://example.com/a.parquet",
+    ]
+
+    items = await start_datasets(fresh_db, test_conversation["id"], urls)
+
+    assert [item["url"] for item in items] == urls[:2]
+    assert [item["dataset"]["name"] for item in items] == ["table1", "table2"]
+    assert all(item["dataset"]["status"] == "loading" for item in items)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_start_datasets_reports_rejections_per_url(fresh_db, test_conversation, mock_worker_pool):
+    """A rejected URL does not stop the others."""
+    loaded = "https://example.com/loaded.parquet"
+    await add_dataset(fresh_db, test_conversation["id"], loaded, mock_worker_pool)
+
+    items = await start_datasets(
+        fresh_db, test_conversation["id"],
+        ["ftp://bad", loaded, "https://example.com/new.parquet"],
+    )
+
+    assert items[0] == {"url": "ftp://bad", "error": "Invalid URL format"}
+    assert items[1] == {"url": loaded, "error": "This dataset is already loaded"}
+    assert items[2]["dataset"]["status"] == "loading"
+
+
+# ---------------------------------------------------------------------------
+# load_dataset
+# ---------------------------------------------------------------------------
+
+
+def _queue_full() -> QueueFullError:
+    return QueueFullError("Server busy; try again shortly", status_code=503, retry_after_seconds=0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_load_retries_while_queue_is_full(fresh_db, test_conversation, mock_worker_pool):
+    """A full worker queue delays the load instead of failing it."""
+    ds = await start_dataset(fresh_db, test_conversation["id"], "https://example.com/a.parquet")
+    ok = mock_worker_pool.ingest_dataset.return_value
+    mock_worker_pool.ingest_dataset.side_effect = [_queue_full(), _queue_full(), ok]
+
+    loaded = await load_dataset(fresh_db, ds["id"], ds["url"], mock_worker_pool)
+
+    assert loaded["status"] == "ready"
+    assert mock_worker_pool.ingest_dataset.await_count == 3
+    assert all(call.kwargs["context"].internal for call in mock_worker_pool.ingest_dataset.await_args_list)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_load_fails_when_queue_stays_full(fresh_db, test_conversation, mock_worker_pool, monkeypatch):
+    monkeypatch.setattr(dataset_service, "LOAD_QUEUE_ATTEMPTS", 2)
+    ds = await start_dataset(fresh_db, test_conversation["id"], "https://example.com/a.parquet")
+    mock_worker_pool.ingest_dataset.side_effect = _queue_full()
+
+    with pytest.raises(ValueError, match="Server busy"):
+        await load_dataset(fresh_db, ds["id"], ds["url"], mock_worker_pool)
+    assert mock_worker_pool.ingest_dataset.await_count == 2
+
+
+# ---------------------------------------------------------------------------
+# refresh_datasets
+# ---------------------------------------------------------------------------
+
+
+async def _add_versioned(db, conversation_id, pool, url, version):
+    pool.ingest_dataset.return_value = {**pool.ingest_dataset.return_value, "version": version}
+    return await add_dataset(db, conversation_id, url, pool)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_refresh_skips_unchanged_datasets(fresh_db, test_conversation, mock_worker_pool):
+    """Datasets whose version still matches are not re-read."""
+    conv_id = test_conversation["id"]
+    same = await _add_versioned(fresh_db, conv_id, mock_worker_pool, "https://example.com/same.parquet", "v1")
+    changed = await _add_versioned(fresh_db, conv_id, mock_worker_pool, "https://example.com/new.parquet", "v1")
+    mock_worker_pool.dataset_version = AsyncMock(
+        side_effect=lambda url, context=None: {"version": "v2" if url == changed["url"] else "v1"}
+    )
+    mock_worker_pool.ingest_dataset.reset_mock()
+
+    results = await refresh_datasets(fresh_db, conv_id, mock_worker_pool)
+
+    assert results == [
+        {"dataset_id": same["id"], "url": same["url"], "status": "unchanged"},
+        {"dataset_id": changed["id"], "url": changed["url"], "status": "refreshed"},
+    ]
+    mock_worker_pool.ingest_dataset.assert_awaited_once()
+    assert mock_worker_pool.ingest_dataset.call_args.args[0] == changed["url"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_refresh_force_rereads_unchanged(fresh_db, test_conversation, mock_worker_pool):
+    """force=True refreshes without checking versions."""
+    ds = await _add_versioned(
+        fresh_db, test_conversation["id"], mock_worker_pool, "https://example.com/a.parquet", "v1"
+    )
+    mock_worker_pool.dataset_version = AsyncMock(return_value={"version": "v1"})
+
+    results = await refresh_datasets(fresh_db, test_conversation["id"], mock_worker_pool, force=True)
+
+    assert results[0]["status"] == "refreshed"
+    assert results[0]["dataset_id"] == ds["id"]
+    mock_worker_pool.dataset_version.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_refresh_without_stored_version_rereads(fresh_db, test_conversation, mock_worker_pool):
+    """A dataset loaded without a version cannot be proven unchanged."""
+    await add_dataset(fresh_db, test_conversation["id"], "https://example.com/a.parquet", mock_worker_pool)
+
+    results = await refresh_datasets(fresh_db, test_conversation["id"], mock_worker_pool)
+
+    assert results[0]["status"] == "refreshed"
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_refresh_reports_errors_per_dataset(fresh_db, test_conversation, mock_worker_pool):
+    """Unknown ids and failed refreshes are reported; the rest still refresh."""
+    conv_id = test_conversation["id"]
+    good = await add_dataset(fresh_db, conv_id, "https://example.com/good.parquet", mock_worker_pool)
+    bad = await add_dataset(fresh_db, conv_id, "https://example.com/bad.parquet", mock_worker_pool)
+
+    async def ingest(url, context=None):
+        if url == bad["url"]:
+            return {"valid": False, "error": "Could not access URL"}
+        return {"valid": True, "columns": [], "row_count": 0}
+
+    mock_worker_pool.ingest_dataset = AsyncMock(side_effect=ingest)
+
+    results = await refresh_datasets(
+        fresh_db, conv_id, mock_worker_pool, dataset_ids=[good["id"], bad["id"], "nope"],
+    )
+
+    assert [r["status"] for r in results] == ["refreshed", "error", "error"]
+    assert results[1]["error"] == "Could not access URL"
+    assert results[2] == {"dataset_id": "nope", "status": "error", "error": "Dataset not found"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_refresh_runs_datasets_concurrently(fresh_db, test_conversation, mock_worker_pool, monkeypatch):
+    """Refreshes overlap, up to MAX_CONCURRENT_LOADS at a time."""
+    conv_id = test_conversation["id"]
+    for i in range(5):
+        await add_dataset(fresh_db, conv_id, f"https://example.com/{i}.parquet", mock_worker_pool)
+    monkeypatch.setattr(dataset_service, "MAX_CONCURRENT_LOADS", 3)
+    dataset_service._load_semaphores.clear()
+
+    running = 0
+    peak = 0
+
+    async def ingest(url, context=None):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return {"valid": True, "columns": [], "row_count": 0}
+
+    mock_worker_pool.ingest_dataset = AsyncMock(side_effect=ingest)
+
+    results = await refresh_datasets(fresh_db, conv_id, mock_worker_pool)
+    dataset_service._load_semaphores.clear()
+
+    assert [r["status"] for r in results] == ["refreshed"] * 5
+    assert peak == 3
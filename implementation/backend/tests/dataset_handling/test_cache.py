@@ -70,8 +70,9 @@ async def test_refresh_schema_updates_row(
     original_loaded_at = result["loaded_at"]
 
     # Update mock to return a different schema
-    mock_worker_pool.get_schema = AsyncMock(
+    mock_worker_pool.ingest_dataset = AsyncMock(
         return_value={
+            "valid": True,
             "columns": [
                 {"name": "id", "type": "Int64"},
                 {"name": "name", "type": "Utf8"},
@@ -115,8 +116,8 @@ async def test_refresh_schema_failure_preserves_old_schema(
         mock_worker_pool,
     )
 
-    # Mock worker failure on validate_url
-    mock_worker_pool.validate_url = AsyncMock(
+    # Mock worker failure on ingest
+    mock_worker_pool.ingest_dataset = AsyncMock(
         return_value={"valid": False, "error": "Could not access URL"}
     )
 
@@ -0,0 +1,116 @@
+"""Preview snapshot tests.
+
+Tests: loading or refreshing a dataset stores the preview snapshot from
+the worker's schema result; snapshot_preview serves head and random
+previews from it, and returns None when there is no usable snapshot.
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.services import dataset_service
+from app.services.dataset_service import add_dataset, refresh_schema, snapshot_preview
+
+URL = "https://example.com/data.parquet"
+
+SNAPSHOT = {
+    "columns": ["id", "name"],
+    "head": [[i, f"n{i}"] for i in range(20)],
+    "random": [[i, f"n{i}"] for i in range(50, 70)],
+}
+
+
+@pytest.fixture
+def snapshot_pool(mock_worker_pool):
+    mock_worker_pool.ingest_dataset.return_value = {
+        **mock_worker_pool.ingest_dataset.return_value, "preview": SNAPSHOT,
+    }
+    return mock_worker_pool
+
+
+async def _preview_json(db, dataset_id: str) -> str | None:
+    cursor = await db.execute("SELECT preview_json FROM datasets WHERE id = ?", (dataset_id,))
+    return (await cursor.fetchone())[0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_load_stores_snapshot(fresh_db, test_conversation, snapshot_pool):
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, snapshot_pool)
+
+    assert json.loads(await _preview_json(fresh_db, ds["id"])) == SNAPSHOT
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_head_and_random_previews(fresh_db, test_conversation, snapshot_pool):
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, snapshot_pool)
+
+    head = await snapshot_preview(fresh_db, ds["id"], "head", 3)
+    sample = await snapshot_preview(fresh_db, ds["id"], "random", 5)
+
+    assert head["columns"] == ["id", "name"]
+    assert head["rows"] == [[0, "n0"], [1, "n1"], [2, "n2"]]
+    ids = [row[0] for row in sample["rows"]]
+    assert len(set(ids)) == 5
+    assert ids == sorted(ids)
+    assert all(50 <= i < 70 for i in ids)
+    assert await snapshot_preview(fresh_db, ds["id"], "tail", 3) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_no_snapshot(fresh_db, test_conversation, mock_worker_pool):
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, mock_worker_pool)
+
+    assert await _preview_json(fresh_db, ds["id"]) is None
+    assert await snapshot_preview(fresh_db, ds["id"], "head", 3) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_oversized_snapshot_is_not_stored(fresh_db, test_conversation, snapshot_pool, monkeypatch):
+    monkeypatch.setattr(dataset_service, "MAX_PREVIEW_BYTES", 100)
+
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, snapshot_pool)
+
+    assert await _preview_json(fresh_db, ds["id"]) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_refresh_replaces_snapshot(fresh_db, test_conversation, snapshot_pool):
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, snapshot_pool)
+    refreshed = {**SNAPSHOT, "head": [[99, "new"]]}
+    snapshot_pool.ingest_dataset.return_value = {
+        **snapshot_pool.ingest_dataset.return_value, "preview": refreshed,
+    }
+
+    await refresh_schema(fresh_db, ds["id"], snapshot_pool)
+
+    head = await snapshot_preview(fresh_db, ds["id"], "head", 10)
+    assert head["rows"] == [[99, "new"]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_unencodable_snapshot_is_not_stored(fresh_db, test_conversation, mock_worker_pool):
+    """A Binary column with non-UTF-8 bytes falls back to live previews."""
+    import polars as pl
+
+    from app.workers.sampler import preview_snapshot
+
+    binary = pl.LazyFrame({"id": [1, 2], "blob": [b"\xff\x00", b"ok"]})
+    mock_worker_pool.ingest_dataset.return_value = {
+        **mock_worker_pool.ingest_dataset.return_value, "preview": preview_snapshot(binary),
+    }
+
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, mock_worker_pool)
+
+    assert ds["status"] == "ready"
+    assert await _preview_json(fresh_db, ds["id"]) is None
+    await refresh_schema(fresh_db, ds["id"], mock_worker_pool)
+    assert await _preview_json(fresh_db, ds["id"]) is None
@@ -0,0 +1,280 @@
+"""Stored profile tests.
+
+Tests: profile_store keeps column profiles per URL, version and variant;
+profile_dataset / profile_dataset_column serve stored profiles and compute
+only missing columns, or estimate a column's statistics from a stored
+sketch; refresh_schema drops profiles of other versions.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+import polars as pl
+import pytest
+
+from app.services import profile_store
+from app.services.dataset_service import (
+    add_dataset,
+    profile_dataset,
+    profile_dataset_column,
+    refresh_schema,
+)
+from app.workers import sketches
+
+from ..factories import make_conversation
+from .conftest import _insert_conversation
+
+URL = "https://example.com/data.parquet"
+
+
+def _profile(name: str) -> dict:
+    return {"name": name, "null_count": 0, "null_percent": 0.0, "unique_count": 3}
+
+
+def _worker_profiles(url, context=None, sampling="prefix", columns=None):
+    names = columns if columns is not None else ["id", "name"]
+    return {"profiles": [_profile(n) for n in names], "row_count": 100, "sampling": sampling}
+
+
+@pytest.fixture
+def versioned_pool(mock_worker_pool):
+    mock_worker_pool.ingest_dataset.return_value = {
+        **mock_worker_pool.ingest_dataset.return_value, "version": "v1",
+    }
+    mock_worker_pool.profile_columns = AsyncMock(side_effect=_worker_profiles)
+    return mock_worker_pool
+
+
+# ---------------------------------------------------------------------------
+# profile_store
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_store_round_trip(fresh_db):
+    await profile_store.put(fresh_db, URL, "v1", "prefix", {"id": _profile("id")}, row_count=10)
+
+    stored = await profile_store.get(fresh_db, URL, "v1", "prefix")
+
+    assert stored == {"id": {"profile": _profile("id"), "row_count": 10}}
+    assert await profile_store.get(fresh_db, URL, "v2", "prefix") == {}
+    assert await profile_store.get(fresh_db, URL, "v1", "full") == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_store_filters_columns(fresh_db):
+    await profile_store.put(
+        fresh_db, URL, "v1", "prefix", {"id": _profile("id"), "name": _profile("name")},
+    )
+
+    stored = await profile_store.get(fresh_db, URL, "v1", "prefix", ["name", "missing"])
+
+    assert list(stored) == ["name"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_store_skips_unversioned(fresh_db):
+    await profile_store.put(fresh_db, URL, None, "prefix", {"id": _profile("id")})
+
+    cursor = await fresh_db.execute("SELECT COUNT(*) FROM dataset_profiles")
+    assert (await cursor.fetchone())[0] == 0
+    assert await profile_store.get(fresh_db, URL, None, "prefix") == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_store_invalidate_keeps_one_version(fresh_db):
+    for version in ("v1", "v2"):
+        await profile_store.put(fresh_db, URL, version, "prefix", {"id": _profile("id")})
+
+    removed = await profile_store.invalidate(fresh_db, URL, keep_version="v2")
+
+    assert removed == 1
+    assert await profile_store.get(fresh_db, URL, "v1", "prefix") == {}
+    assert list(await profile_store.get(fresh_db, URL, "v2", "prefix")) == ["id"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_store_evicts_oldest(fresh_db, monkeypatch):
+    monkeypatch.setattr(profile_store, "MAX_STORED_PROFILES", 2)
+    for version in ("v1", "v2", "v3"):
+        await profile_store.put(fresh_db, URL, version, "prefix", {"id": _profile("id")})
+
+    cursor = await fresh_db.execute("SELECT version FROM dataset_profiles ORDER BY version")
+    assert [row[0] for row in await cursor.fetchall()] == ["v2", "v3"]
+
+
+# ---------------------------------------------------------------------------
+# profile_dataset
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_profile_is_shared_across_conversations(
+    fresh_db, test_user, test_conversation, versioned_pool,
+):
+    """A second conversation loading the same URL and version gets the stored profiles."""
+    other = make_conversation(user_id=test_user["id"])
+    await _insert_conversation(fresh_db, other)
+    first = await add_dataset(fresh_db, test_conversation["id"], URL, versioned_pool)
+    second = await add_dataset(fresh_db, other["id"], URL, versioned_pool)
+
+    await profile_dataset(fresh_db, first, versioned_pool)
+    result = await profile_dataset(fresh_db, second, versioned_pool)
+
+    versioned_pool.profile_columns.assert_awaited_once()
+    assert [p["name"] for p in result["profiles"]] == ["id", "name"]
+    assert result["row_count"] == 100
+    assert result["sampling"] == "prefix"
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_profile_computes_only_missing_columns(fresh_db, test_conversation, versioned_pool):
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, versioned_pool)
+    await profile_store.put(fresh_db, URL, "v1", "prefix", {"id": _profile("id")}, row_count=100)
+
+    result = await profile_dataset(fresh_db, ds, versioned_pool)
+
+    assert versioned_pool.profile_columns.call_args.kwargs["columns"] == ["name"]
+    assert [p["name"] for p in result["profiles"]] == ["id", "name"]
+    assert list(await profile_store.get(fresh_db, URL, "v1", "prefix")) == ["id", "name"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_profile_variants_are_stored_apart(fresh_db, test_conversation, versioned_pool):
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, versioned_pool)
+
+    await profile_dataset(fresh_db, ds, versioned_pool)
+    await profile_dataset(fresh_db, ds, versioned_pool, sampling="full")
+
+    assert versioned_pool.profile_columns.await_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_unversioned_dataset_is_always_profiled(fresh_db, test_conversation, mock_worker_pool):
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, mock_worker_pool)
+
+    await profile_dataset(fresh_db, ds, mock_worker_pool)
+    await profile_dataset(fresh_db, ds, mock_worker_pool)
+
+    assert mock_worker_pool.profile_columns.await_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_profile_errors_are_not_stored(fresh_db, test_conversation, versioned_pool):
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, versioned_pool)
+    versioned_pool.profile_columns = AsyncMock(return_value={"error": "boom"})
+
+    assert await profile_dataset(fresh_db, ds, versioned_pool) == {"error": "boom"}
+    assert await profile_store.get(fresh_db, URL, "v1", "prefix") == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_profile_column_is_stored(fresh_db, test_conversation, versioned_pool):
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, versioned_pool)
+    versioned_pool.profile_column = AsyncMock(return_value={"stats": {"min": 1}})
+
+    first = await profile_dataset_column(fresh_db, ds, "id", "Int64", versioned_pool)
+    second = await profile_dataset_column(fresh_db, ds, "id", "Int64", versioned_pool)
+
+    assert first == second == {"stats": {"min": 1}}
+    versioned_pool.profile_column.assert_awaited_once()
+
+
+# ---------------------------------------------------------------------------
+# Invalidation
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_refresh_drops_profiles_of_old_versions(fresh_db, test_conversation, versioned_pool):
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, versioned_pool)
+    await profile_dataset(fresh_db, ds, versioned_pool)
+    versioned_pool.ingest_dataset.return_value = {
+        **versioned_pool.ingest_dataset.return_value, "version": "v2",
+    }
+
+    refreshed = await refresh_schema(fresh_db, ds["id"], versioned_pool)
+    await profile_dataset(fresh_db, refreshed, versioned_pool)
+
+    assert await profile_store.get(fresh_db, URL, "v1", "prefix") == {}
+    assert versioned_pool.profile_columns.await_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_refresh_to_same_version_keeps_profiles(fresh_db, test_conversation, versioned_pool):
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, versioned_pool)
+    await profile_dataset(fresh_db, ds, versioned_pool)
+
+    await refresh_schema(fresh_db, ds["id"], versioned_pool)
+
+    assert list(await profile_store.get(fresh_db, URL, "v1", "prefix")) == ["id", "name"]
+
+
+# ---------------------------------------------------------------------------
+# Approximate mode
+# ---------------------------------------------------------------------------
+
+
+def _stored_sketch() -> dict:
+    lf = pl.LazyFrame({"id": [1, 2, 3, 3]})
+    return sketches.to_dict(sketches.sketch_column(lf, "id", "Int64"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_approximate_profile_stores_the_sketch(fresh_db, test_conversation, versioned_pool):
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, versioned_pool)
+    versioned_pool.sketch_column = AsyncMock(return_value={"sketch": _stored_sketch()})
+
+    first = await profile_dataset_column(fresh_db, ds, "id", "Int64", versioned_pool, mode="approximate")
+    second = await profile_dataset_column(fresh_db, ds, "id", "Int64", versioned_pool, mode="approximate")
+
+    assert first == second
+    assert first["stats"]["distinct_count"] == 3
+    assert first["stats"]["max"] == 3
+    assert "median" in first["stats"]["error_bounds"]
+    versioned_pool.sketch_column.assert_awaited_once()
+    versioned_pool.profile_column.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_approximate_profile_rebuilds_unusable_sketch(fresh_db, test_conversation, versioned_pool):
+    """A sketch hashed by another Polars version is rebuilt, not merged."""
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, versioned_pool)
+    stale = {**_stored_sketch(), "hash_version": "0.0.0"}
+    await profile_store.put(fresh_db, URL, "v1", profile_store.sketch_variant("Int64"), {"id": stale})
+    versioned_pool.sketch_column = AsyncMock(return_value={"sketch": _stored_sketch()})
+
+    result = await profile_dataset_column(fresh_db, ds, "id", "Int64", versioned_pool, mode="approximate")
+
+    assert result["stats"]["distinct_count"] == 3
+    versioned_pool.sketch_column.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_approximate_profile_errors(fresh_db, test_conversation, versioned_pool):
+    ds = await add_dataset(fresh_db, test_conversation["id"], URL, versioned_pool)
+    versioned_pool.sketch_column = AsyncMock(
+        return_value={"error_type": "timeout", "message": "Column sketch timed out"}
+    )
+
+    result = await profile_dataset_column(fresh_db, ds, "id", "Int64", versioned_pool, mode="approximate")
+
+    assert result["error_type"] == "timeout"
+    assert await profile_store.get(fresh_db, URL, "v1", profile_store.sketch_variant("Int64")) == {}
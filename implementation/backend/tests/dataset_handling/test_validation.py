@@ -98,8 +98,8 @@ async def test_validate_url_rejects_gs_scheme():
 async def test_add_dataset_worker_validate_url_failure(
     fresh_db, test_conversation, mock_worker_pool
 ):
-    """When worker_pool.validate_url returns error, add_dataset raises."""
-    mock_worker_pool.validate_url = AsyncMock(
+    """When worker_pool.ingest_dataset fails validation, add_dataset raises."""
+    mock_worker_pool.ingest_dataset = AsyncMock(
         return_value={"valid": False, "error": "Could not access URL"}
     )
 
@@ -117,8 +117,8 @@ async def test_add_dataset_worker_validate_url_failure(
 async def test_add_dataset_worker_not_parquet(
     fresh_db, test_conversation, mock_worker_pool
 ):
-    """When worker_pool.validate_url says not parquet, add_dataset raises."""
-    mock_worker_pool.validate_url = AsyncMock(
+    """When worker_pool.ingest_dataset says not parquet, add_dataset raises."""
+    mock_worker_pool.ingest_dataset = AsyncMock(
         return_value={"valid": False, "error": "Not a valid parquet file"}
     )
 
@@ -136,9 +136,13 @@ async def test_add_dataset_worker_not_parquet(
 async def test_add_dataset_worker_schema_extraction_failure(
     fresh_db, test_conversation, mock_worker_pool
 ):
-    """When worker_pool.get_schema returns error, add_dataset raises."""
-    mock_worker_pool.get_schema = AsyncMock(
-        return_value={"error": "Could not read parquet schema"}
+    """When worker_pool.ingest_dataset fails schema extraction, add_dataset raises."""
+    mock_worker_pool.ingest_dataset = AsyncMock(
+        return_value={
+            "valid": False,
+            "error": "Could not read parquet schema",
+            "error_type": "validation",
+        }
     )
 
     with pytest.raises(ValueError, match="Could not read parquet schema"):
@@ -190,7 +194,7 @@ async def test_add_dataset_caches_schema_in_db(
 async def test_invalid_url_format_skips_worker_calls(
     fresh_db, test_conversation, mock_worker_pool
 ):
-    """If URL format is invalid, worker_pool.validate_url is never called."""
+    """If URL format is invalid, no worker task is run."""
     with pytest.raises(ValueError, match="Invalid URL format"):
         await add_dataset(
             fresh_db,
@@ -199,17 +203,16 @@ async def test_invalid_url_format_skips_worker_calls(
             mock_worker_pool,
         )
 
-    mock_worker_pool.validate_url.assert_not_called()
-    mock_worker_pool.get_schema.assert_not_called()
+    mock_worker_pool.ingest_dataset.assert_not_called()
 
 
 @pytest.mark.asyncio
 @pytest.mark.unit
-async def test_worker_validate_failure_skips_get_schema(
+async def test_worker_ingest_failure_persists_nothing(
     fresh_db, test_conversation, mock_worker_pool
 ):
-    """If worker_pool.validate_url fails, get_schema is never called."""
-    mock_worker_pool.validate_url = AsyncMock(
+    """If worker_pool.ingest_dataset fails, no dataset row is written."""
+    mock_worker_pool.ingest_dataset = AsyncMock(
         return_value={"valid": False, "error": "Could not access URL"}
     )
 
@@ -221,4 +224,8 @@ async def test_worker_validate_failure_skips_get_schema(
             mock_worker_pool,
         )
 
-    mock_worker_pool.get_schema.assert_not_called()
+    cursor = await fresh_db.execute(
+        "SELECT COUNT(*) AS cnt FROM datasets WHERE conversation_id = ?",
+        (test_conversation["id"],),
+    )
+    assert (await cursor.fetchone())["cnt"] == 0
@@ -189,6 +189,24 @@ class TestColumnStatsInPrompt:
         prompt = build_system_prompt(datasets)
         assert "150 unique values" in prompt
 
+    def test_approximate_unique_count_in_prompt(self):
+        """Estimated cardinality is marked as approximate in the prompt."""
+        datasets = [
+            {
+                "name": "geo",
+                "schema_json": json.dumps([
+                    {
+                        "name": "city",
+                        "type": "Utf8",
+                        "column_stats": {"unique_count": 150, "unique_count_approximate": True},
+                    }
+                ]),
+                "row_count": 5000,
+            }
+        ]
+        prompt = build_system_prompt(datasets)
+        assert "~150 unique values" in prompt
+
     def test_null_count_in_prompt(self):
         """Columns with nulls show null count in the prompt."""
         datasets = [
@@ -5,6 +5,7 @@ Tests: spec/backend/llm/test.md#TOOL-1 through TOOL-4
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -35,9 +36,14 @@ def mock_run_query():
 
 @pytest.fixture
 def mock_dataset_service():
-    """Mock dataset_service.add_dataset."""
+    """Mock dataset_service.start_dataset and load_dataset."""
     with patch("app.services.llm_service.dataset_service") as mock_ds:
-        mock_ds.add_dataset = AsyncMock(return_value={
+        mock_ds.start_dataset = AsyncMock(return_value={
+            "id": "ds-123",
+            "name": "table1",
+            "status": "loading",
+        })
+        mock_ds.load_dataset = AsyncMock(return_value={
             "id": "ds-123",
             "name": "table1",
             "row_count": 100,
@@ -117,10 +123,10 @@ class TestExecuteSqlToolCall:
 
 
 class TestLoadDatasetToolCall:
-    """TOOL-2: load_dataset tool call dispatches to dataset_service.add_dataset."""
+    """TOOL-2: load_dataset tool call starts and loads a dataset via dataset_service."""
 
     @pytest.mark.asyncio
-    async def test_load_dataset_dispatches_to_add_dataset(
+    async def test_load_dataset_dispatches_to_dataset_service(
         self,
         mock_gemini_client,
         mock_ws_send,
@@ -128,7 +134,7 @@ class TestLoadDatasetToolCall:
         mock_run_query,
         mock_dataset_service,
     ):
-        """LLM calls load_dataset -> dataset_service.add_dataset is invoked."""
+        """LLM calls load_dataset -> dataset_service.start_dataset/load_dataset are invoked."""
         tool_stream = make_tool_call_stream(
             "load_dataset", {"url": "https://example.com/data.parquet"}
         )
@@ -141,9 +147,10 @@ class TestLoadDatasetToolCall:
         messages = [{"role": "user", "content": "Load this data"}]
         result = await stream_chat(messages, sample_datasets, mock_ws_send, pool=mock_run_query)
 
-        mock_dataset_service.add_dataset.assert_awaited_once()
-        call_args = mock_dataset_service.add_dataset.call_args
-        assert "https://example.com/data.parquet" in str(call_args)
+        mock_dataset_service.start_dataset.assert_awaited_once()
+        assert "https://example.com/data.parquet" in str(mock_dataset_service.start_dataset.call_args)
+        mock_dataset_service.load_dataset.assert_awaited_once()
+        assert mock_dataset_service.load_dataset.call_args.args[1] == "ds-123"
 
     @pytest.mark.asyncio
     async def test_load_dataset_result_returned_to_gemini(
@@ -169,6 +176,39 @@ class TestLoadDatasetToolCall:
 
         assert mock_gemini_client.aio.models.generate_content_stream.call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_slow_load_does_not_block_generation(
+        self,
+        mock_gemini_client,
+        mock_ws_send,
+        sample_datasets,
+        mock_run_query,
+        mock_dataset_service,
+    ):
+        """A load still running after the wait is left in the background."""
+        release = asyncio.Event()
+
+        async def slow_load(*args, **kwargs):
+            await release.wait()
+            return {"id": "ds-123", "name": "table1", "row_count": 1, "column_count": 1}
+
+        mock_dataset_service.load_dataset = AsyncMock(side_effect=slow_load)
+        tool_stream = make_tool_call_stream(
+            "load_dataset", {"url": "https://example.com/big.parquet"}
+        )
+        text_stream = make_text_stream(["It is loading."])
+        mock_gemini_client.aio.models.generate_content_stream = AsyncMock(
+            side_effect=[tool_stream, text_stream]
+        )
+
+        messages = [{"role": "user", "content": "Load this"}]
+        with patch("app.services.llm_service.LOAD_DATASET_WAIT_SECONDS", 0.01):
+            result = await stream_chat(messages, sample_datasets, mock_ws_send, pool=mock_run_query)
+
+        assert "still loading" in result.tool_call_trace[0]["result"]
+        assert "table1" in result.tool_call_trace[0]["result"]
+        release.set()
+
 
 class TestMaxToolCalls:
     """TOOL-4: Maximum 5 tool calls per turn."""
@@ -16,6 +16,8 @@ os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test-google-client-secret")
 from app.config import get_settings  # noqa: E402
 get_settings.cache_clear()
 
+import asyncio  # noqa: E402
+
 import aiosqlite  # noqa: E402
 import pytest  # noqa: E402
 import pytest_asyncio  # noqa: E402
@@ -90,6 +92,18 @@ def assert_success_response(response, status_code=200):
     return response.json()
 
 
+async def wait_for_dataset(db, dataset_id, timeout=2.0):
+    """Wait for a background dataset load to leave ``loading``; return its row."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        cursor = await db.execute("SELECT * FROM datasets WHERE id = ?", (dataset_id,))
+        row = await cursor.fetchone()
+        if row is None or row["status"] != "loading":
+            return row
+        assert asyncio.get_running_loop().time() < deadline, "dataset still loading"
+        await asyncio.sleep(0.01)
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
@@ -16,6 +16,7 @@ from uuid import uuid4
 import pytest
 import pytest_asyncio
 
+from app.services.task_scheduler import INTERACTIVE, TaskContext
 from tests.factories import make_conversation, make_dataset
 from tests.rest_api.conftest import (
     assert_error_response,
@@ -352,6 +353,25 @@ async def test_profile_dataset_success(
     assert body["profiles"][0]["column"] == "id"
 
 
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_profile_dataset_sampling(
+    authed_client, fresh_db, conversation_owned, dataset_in_conversation, mock_worker_pool
+):
+    """POST profile passes the sampling strategy to the worker and rejects unknown ones."""
+    from app.main import app
+
+    app.state.worker_pool = mock_worker_pool
+    url = f"/conversations/{conversation_owned['id']}/datasets/{dataset_in_conversation['id']}/profile"
+
+    response = await authed_client.post(url, params={"sampling": "row_groups"})
+    assert response.status_code == 200
+    assert mock_worker_pool.profile_columns.call_args.kwargs["sampling"] == "row_groups"
+
+    response = await authed_client.post(url, params={"sampling": "everything"})
+    assert response.status_code == 422
+
+
 # ---------------------------------------------------------------------------
 # PROF-2: Profile dataset error - worker returns error
 # ---------------------------------------------------------------------------
@@ -442,9 +462,38 @@ async def test_profile_column_success(
         dataset_in_conversation["name"],
         "id",
         "Int64",
+        context=TaskContext(
+            conversation_owned["user_id"], conversation_owned["id"], INTERACTIVE
+        ),
     )
 
 
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_profile_column_approximate(
+    authed_client, fresh_db, conversation_owned, dataset_in_conversation, mock_worker_pool
+):
+    """POST profile-column with mode=approximate estimates stats from a column sketch."""
+    import polars as pl
+
+    from app.main import app
+    from app.workers import sketches
+
+    sketch = sketches.sketch_column(pl.LazyFrame({"id": [1, 2, 2]}), "id", "Int64")
+    mock_worker_pool.sketch_column.return_value = {"sketch": sketches.to_dict(sketch)}
+    app.state.worker_pool = mock_worker_pool
+
+    response = await authed_client.post(
+        f"/conversations/{conversation_owned['id']}/datasets/{dataset_in_conversation['id']}/profile-column",
+        json={"column_name": "id", "column_type": "Int64", "mode": "approximate"},
+    )
+
+    body = assert_success_response(response, status_code=200)
+    assert body["stats"]["distinct_count"] == 2
+    assert "error_bounds" in body["stats"]
+    mock_worker_pool.profile_column.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # PROF-COL-2: Profile single column error - worker returns error
 # ---------------------------------------------------------------------------
@@ -231,6 +231,29 @@ async def test_fork_copies_datasets(authed_client, fresh_db, conversation_with_d
     }
 
 
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_fork_copies_preview_snapshot(authed_client, fresh_db, conversation_with_datasets):
+    """Forked datasets keep the preview snapshot stored at load time."""
+    conv = conversation_with_datasets["conversation"]
+    snapshot = json.dumps({"columns": ["id"], "dtypes": ["Int64"], "head": [[1]], "random": [[1]]})
+    await fresh_db.execute(
+        "UPDATE datasets SET preview_json = ? WHERE conversation_id = ?", (snapshot, conv["id"]),
+    )
+    await fresh_db.commit()
+
+    response = await authed_client.post(
+        f"/conversations/{conv['id']}/fork",
+        json={"message_id": conversation_with_datasets["message"]["id"]},
+    )
+
+    fork_id = assert_success_response(response, status_code=201)["id"]
+    cursor = await fresh_db.execute(
+        "SELECT preview_json FROM datasets WHERE conversation_id = ?", (fork_id,)
+    )
+    assert [row["preview_json"] for row in await cursor.fetchall()] == [snapshot, snapshot]
+
+
 @pytest.mark.asyncio
 @pytest.mark.integration
 async def test_fork_with_invalid_message_id_returns_404(
@@ -14,6 +14,7 @@ from tests.rest_api.conftest import (
     assert_success_response,
     insert_user,
     insert_session,
+    wait_for_dataset,
 )
 from tests.factories import make_user, make_session
 
@@ -269,13 +270,12 @@ async def test_profile_column_with_invalid_column_returns_500(
 async def test_preview_tail_sampling(
     authed_client, fresh_db, conversation_owned, dataset_in_conversation, mock_worker_pool
 ):
-    """POST preview with sample_method=tail should use DESC ordering in SQL."""
+    """POST preview with sample_method=tail should sample the tail in the worker."""
     from app.main import app
 
-    mock_worker_pool.run_query.return_value = {
+    mock_worker_pool.sample_dataset.return_value = {
         "columns": ["id", "value"],
         "rows": [{"id": 100, "value": "z"}, {"id": 99, "value": "y"}],
-        "total_rows": 2,
     }
     app.state.worker_pool = mock_worker_pool
 
@@ -286,14 +286,12 @@ async def test_preview_tail_sampling(
 
     body = assert_success_response(response, status_code=200)
     assert body["sample_method"] == "tail"
-    # The _rn internal column should be filtered out
-    assert "_rn" not in body["columns"]
+    assert body["rows"] == [[100, "z"], [99, "y"]]
 
-    # Verify SQL uses DESC ordering
-    call_args = mock_worker_pool.run_query.call_args
-    sql_arg = call_args[0][0]
-    assert "DESC" in sql_arg
-    assert "ROW_NUMBER()" in sql_arg
+    # Verify no full-scan query is run
+    call_args = mock_worker_pool.sample_dataset.call_args
+    assert call_args[0][1:] == ("tail", 10)
+    mock_worker_pool.run_query.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -322,10 +320,9 @@ async def test_preview_percentage_sampling(
     """POST preview with method=percentage and sample_percentage=10 should compute row count from total."""
     from app.main import app
 
-    mock_worker_pool.run_query.return_value = {
+    mock_worker_pool.sample_dataset.return_value = {
         "columns": ["id", "value"],
         "rows": [{"id": i, "value": f"v{i}"} for i in range(10)],
-        "total_rows": 10,
     }
     app.state.worker_pool = mock_worker_pool
 
@@ -338,11 +335,9 @@ async def test_preview_percentage_sampling(
     body = assert_success_response(response, status_code=200)
     assert body["sample_method"] == "percentage"
 
-    # 10% of 100 rows = 10 rows limit
-    call_args = mock_worker_pool.run_query.call_args
-    sql_arg = call_args[0][0]
-    assert "LIMIT 10" in sql_arg
-    assert "ORDER BY RANDOM()" in sql_arg
+    # 10% of 100 rows = 10 random rows
+    call_args = mock_worker_pool.sample_dataset.call_args
+    assert call_args[0][1:] == ("random", 10)
 
 
 # ===========================================================================
@@ -443,12 +438,12 @@ async def test_add_dataset_private_ip_ssrf_rejected(
 ):
     """POST dataset with private IP URL should be rejected when worker validates.
 
-    The SSRF check happens in the worker pool's validate_url step (step 4).
-    The service raises ValueError which the router converts to 400.
+    The SSRF check happens in the worker pool's ingest_dataset task (step 4),
+    which runs after the response; the dataset row ends up in ``error``.
     """
     from app.main import app
 
-    mock_worker_pool.validate_url = AsyncMock(
+    mock_worker_pool.ingest_dataset = AsyncMock(
         return_value={
             "valid": False,
             "error": "URLs pointing to internal/private networks are not allowed.",
@@ -462,7 +457,10 @@ async def test_add_dataset_private_ip_ssrf_rejected(
         json={"url": "https://192.168.1.1/data.parquet"},
     )
 
-    assert_error_response(response, 400, "internal/private")
+    body = assert_success_response(response, status_code=201)
+    row = await wait_for_dataset(fresh_db, body["dataset_id"])
+    assert row["status"] == "error"
+    assert "internal/private" in row["error_message"]
 
 
 @pytest.mark.asyncio
@@ -473,7 +471,7 @@ async def test_add_dataset_localhost_ssrf_rejected(
     """POST dataset with localhost URL should be rejected by SSRF protection."""
     from app.main import app
 
-    mock_worker_pool.validate_url = AsyncMock(
+    mock_worker_pool.ingest_dataset = AsyncMock(
         return_value={
             "valid": False,
             "error": "URLs pointing to internal/private networks are not allowed.",
@@ -487,7 +485,10 @@ async def test_add_dataset_localhost_ssrf_rejected(
         json={"url": "https://127.0.0.1/data.parquet"},
     )
 
-    assert_error_response(response, 400, "internal/private")
+    body = assert_success_response(response, status_code=201)
+    row = await wait_for_dataset(fresh_db, body["dataset_id"])
+    assert row["status"] == "error"
+    assert "internal/private" in row["error_message"]
 
 
 @pytest.mark.asyncio
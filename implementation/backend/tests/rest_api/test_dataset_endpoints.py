@@ -5,8 +5,10 @@ Tests: spec/backend/rest_api/test.md#DS-EP-1 through DS-EP-10
 
 from __future__ import annotations
 
+import asyncio
 import json
 from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
@@ -18,6 +20,7 @@ from tests.rest_api.conftest import (
     assert_success_response,
     insert_session,
     insert_user,
+    wait_for_dataset,
 )
 
 
@@ -123,6 +126,43 @@ async def test_add_dataset_returns_201(authed_client, fresh_db, conversation_own
     assert row["url"] == "https://example.com/data.parquet"
 
 
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_add_dataset_loads_in_background(authed_client, fresh_db, conversation_owned, mock_worker_pool):
+    """POST dataset responds before the load finishes; the row turns ready and WS events follow."""
+    from app.main import app
+
+    release = asyncio.Event()
+    ingest_result = await mock_worker_pool.ingest_dataset("u")
+
+    async def slow_ingest(url, context=None):
+        await release.wait()
+        return ingest_result
+
+    mock_worker_pool.ingest_dataset = AsyncMock(side_effect=slow_ingest)
+    app.state.worker_pool = mock_worker_pool
+    connection_manager = MagicMock()
+    connection_manager.send_to_user = AsyncMock()
+    app.state.connection_manager = connection_manager
+
+    response = await authed_client.post(
+        f"/conversations/{conversation_owned['id']}/datasets",
+        json={"url": "https://example.com/data.parquet"},
+    )
+
+    body = assert_success_response(response, status_code=201)
+    cursor = await fresh_db.execute("SELECT status FROM datasets WHERE id = ?", (body["dataset_id"],))
+    assert (await cursor.fetchone())["status"] == "loading"
+
+    release.set()
+    row = await wait_for_dataset(fresh_db, body["dataset_id"])
+    assert row["status"] == "ready"
+    assert row["row_count"] == ingest_result["row_count"]
+    types = [c.args[1]["type"] for c in connection_manager.send_to_user.await_args_list]
+    assert types[0] == "dl"
+    assert "dld" in types
+
+
 # ---------------------------------------------------------------------------
 # DS-EP-2: POST /conversations/:id/datasets - Invalid URL (400)
 # ---------------------------------------------------------------------------
@@ -324,7 +364,8 @@ async def test_refresh_schema_returns_updated_dataset(
     from app.main import app
 
     # Configure mock to return refreshed schema
-    mock_worker_pool.get_schema.return_value = {
+    mock_worker_pool.ingest_dataset.return_value = {
+        "valid": True,
         "columns": [
             {"name": "id", "type": "INTEGER"},
             {"name": "value", "type": "TEXT"},
@@ -369,6 +410,159 @@ async def test_refresh_nonexistent_dataset_returns_404(
     assert_error_response(response, 404)
 
 
+# ---------------------------------------------------------------------------
+# POST /conversations/:id/datasets/bulk-add and /bulk-refresh
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_bulk_add_returns_per_url_results(authed_client, fresh_db, conversation_owned, mock_worker_pool):
+    """POST bulk-add starts each distinct URL and reports rejected ones."""
+    from app.main import app
+
+    app.state.worker_pool = mock_worker_pool
+
+    response = await authed_client.post(
+        f"/conversations/{conversation_owned['id']}/datasets/bulk-add",
+        json={"urls": [
+            "https://example.com/a.parquet",
+            "https://example.com/b.parquet",
+            "https://example.com/a.parquet",
+            "not-a-url",
+        ]},
+    )
+
+    body = assert_success_response(response, status_code=201)
+    results = body["results"]
+    assert [r["url"] for r in results] == [
+        "https://example.com/a.parquet", "https://example.com/b.parquet", "not-a-url",
+    ]
+    assert [r["status"] for r in results] == ["loading", "loading", "error"]
+    assert results[2]["error"] == "Invalid URL format"
+    for result in results[:2]:
+        row = await wait_for_dataset(fresh_db, result["dataset_id"])
+        assert row["status"] == "ready"
+
+
+class _ScheduledPool:
+    """Worker pool stand-in whose tasks are admitted by a real TaskScheduler."""
+
+    def __init__(self, scheduler) -> None:
+        self.scheduler = scheduler
+        self.profiled: list[str] = []
+
+    async def _task(self, context, result: dict) -> dict:
+        async with self.scheduler.reserve(context):
+            await asyncio.sleep(0.01)
+        return result
+
+    async def ingest_dataset(self, url, context=None):
+        return await self._task(context, {
+            "valid": True, "columns": [{"name": "id", "type": "INTEGER"}], "row_count": 1,
+        })
+
+    async def profile_columns(self, url, context=None, **kwargs):
+        self.profiled.append(url)
+        return await self._task(context, {"profiles": []})
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_bulk_add_many_urls_leaves_room_for_queries(
+    authed_client, fresh_db, conversation_owned,
+):
+    """Bulk-adding more URLs than the user's pending cap loads them all, and
+    a query issued meanwhile is still admitted."""
+    from app.main import app
+    from app.services.task_scheduler import TaskContext, TaskScheduler
+
+    pool = _ScheduledPool(TaskScheduler(capacity=1, max_pending_per_user=2))
+    app.state.worker_pool = pool
+    urls = [f"https://example.com/bulk{i}.parquet" for i in range(8)]
+
+    response = await authed_client.post(
+        f"/conversations/{conversation_owned['id']}/datasets/bulk-add", json={"urls": urls},
+    )
+    results = assert_success_response(response, status_code=201)["results"]
+    await asyncio.sleep(0.005)
+    query = await pool._task(
+        TaskContext(conversation_owned["user_id"], conversation_owned["id"]), {"rows": []},
+    )
+
+    assert query == {"rows": []}
+    for result in results:
+        row = await wait_for_dataset(fresh_db, result["dataset_id"], timeout=5.0)
+        assert row["status"] == "ready"
+    for _ in range(100):
+        if len(pool.profiled) == len(urls):
+            break
+        await asyncio.sleep(0.01)
+    assert sorted(pool.profiled) == sorted(urls)
+    assert pool.scheduler.stats["rejected"] == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_bulk_add_requires_urls(authed_client, conversation_owned, mock_worker_pool):
+    """POST bulk-add with an empty list returns 422."""
+    response = await authed_client.post(
+        f"/conversations/{conversation_owned['id']}/datasets/bulk-add",
+        json={"urls": []},
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_bulk_refresh_skips_unchanged(
+    authed_client, fresh_db, conversation_owned, dataset_in_conversation, mock_worker_pool
+):
+    """POST bulk-refresh reports a dataset whose version still matches as unchanged."""
+    from app.main import app
+
+    await fresh_db.execute(
+        "UPDATE datasets SET version = ? WHERE id = ?", ("v1", dataset_in_conversation["id"]),
+    )
+    await fresh_db.commit()
+    mock_worker_pool.dataset_version = AsyncMock(return_value={"version": "v1"})
+    app.state.worker_pool = mock_worker_pool
+
+    response = await authed_client.post(
+        f"/conversations/{conversation_owned['id']}/datasets/bulk-refresh", json={},
+    )
+
+    body = assert_success_response(response, status_code=200)
+    assert body["results"] == [{
+        "url": dataset_in_conversation["url"],
+        "dataset_id": dataset_in_conversation["id"],
+        "status": "unchanged",
+        "error": None,
+    }]
+    mock_worker_pool.ingest_dataset.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_bulk_refresh_force(
+    authed_client, fresh_db, conversation_owned, dataset_in_conversation, mock_worker_pool
+):
+    """POST bulk-refresh with force re-reads the listed datasets."""
+    from app.main import app
+
+    app.state.worker_pool = mock_worker_pool
+
+    response = await authed_client.post(
+        f"/conversations/{conversation_owned['id']}/datasets/bulk-refresh",
+        json={"dataset_ids": [dataset_in_conversation["id"]], "force": True},
+    )
+
+    body = assert_success_response(response, status_code=200)
+    assert body["results"][0]["status"] == "refreshed"
+    mock_worker_pool.ingest_dataset.assert_awaited_once()
+
+
 # ---------------------------------------------------------------------------
 # DS-EP-11: POST /conversations/:id/datasets/:dataset_id/preview - Success
 # ---------------------------------------------------------------------------
@@ -502,13 +696,12 @@ async def test_preview_custom_sample_size(
 async def test_preview_random_sample(
     authed_client, fresh_db, conversation_owned, dataset_in_conversation, mock_worker_pool
 ):
-    """POST preview with random_sample=true includes ORDER BY RANDOM() in SQL."""
+    """POST preview with random_sample=true draws a random sample in the worker."""
     from app.main import app
 
-    mock_worker_pool.run_query.return_value = {
+    mock_worker_pool.sample_dataset.return_value = {
         "columns": ["id", "value"],
         "rows": [{"id": 5, "value": "e"}, {"id": 2, "value": "b"}],
-        "total_rows": 2,
     }
     app.state.worker_pool = mock_worker_pool
 
@@ -520,11 +713,9 @@ async def test_preview_random_sample(
     body = assert_success_response(response, status_code=200)
     assert body["columns"] == ["id", "value"]
 
-    # Verify the SQL query includes ORDER BY RANDOM()
-    call_args = mock_worker_pool.run_query.call_args
-    sql_arg = call_args[0][0]
-    assert "ORDER BY RANDOM()" in sql_arg
-    assert "LIMIT 10" in sql_arg
+    # Verify the worker samples 10 random rows
+    call_args = mock_worker_pool.sample_dataset.call_args
+    assert call_args[0][1:] == ("random", 10)
 
 
 # ---------------------------------------------------------------------------
@@ -537,13 +728,12 @@ async def test_preview_random_sample(
 async def test_preview_random_sample_with_custom_size(
     authed_client, fresh_db, conversation_owned, dataset_in_conversation, mock_worker_pool
 ):
-    """POST preview with sample_size=50 and random_sample=true uses both in SQL."""
+    """POST preview with sample_size=50 and random_sample=true uses both."""
     from app.main import app
 
-    mock_worker_pool.run_query.return_value = {
+    mock_worker_pool.sample_dataset.return_value = {
         "columns": ["id"],
         "rows": [{"id": i} for i in range(50)],
-        "total_rows": 50,
     }
     app.state.worker_pool = mock_worker_pool
 
@@ -556,11 +746,9 @@ async def test_preview_random_sample_with_custom_size(
     body = assert_success_response(response, status_code=200)
     assert len(body["rows"]) == 50
 
-    # Verify the SQL query
-    call_args = mock_worker_pool.run_query.call_args
-    sql_arg = call_args[0][0]
-    assert "ORDER BY RANDOM()" in sql_arg
-    assert "LIMIT 50" in sql_arg
+    # Verify the sample request
+    call_args = mock_worker_pool.sample_dataset.call_args
+    assert call_args[0][1:] == ("random", 50)
 
 
 # ---------------------------------------------------------------------------
@@ -15,9 +15,11 @@ Covers POST /conversations/{conversation_id}/datasets/{dataset_id}/preview with:
 from __future__ import annotations
 
 import json
+from datetime import date, datetime
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
+import polars as pl
 import pytest
 import pytest_asyncio
 
@@ -181,14 +183,13 @@ class TestDatasetPreviewSampling:
         authed_client_with_pool,
         mock_worker_pool,
     ):
-        """sample_method=tail returns data ordered by descending row number."""
-        mock_worker_pool.run_query.return_value = {
+        """sample_method=tail returns the last rows, sampled in the worker."""
+        mock_worker_pool.sample_dataset.return_value = {
             "rows": [
-                {"id": 200, "category": "Z", "value": 99.0, "_rn": 200},
-                {"id": 199, "category": "Y", "value": 98.0, "_rn": 199},
+                {"id": 200, "category": "Z", "value": 99.0},
+                {"id": 199, "category": "Y", "value": 98.0},
             ],
-            "columns": ["id", "category", "value", "_rn"],
-            "total_rows": 2,
+            "columns": ["id", "category", "value"],
         }
 
         url = _preview_url(conversation_owned["id"], ready_dataset["id"])
@@ -198,17 +199,12 @@ class TestDatasetPreviewSampling:
 
         body = assert_success_response(response, 200)
         assert body["sample_method"] == "tail"
-        # _rn column should be filtered out from display
-        assert "_rn" not in body["columns"]
         assert body["columns"] == ["id", "category", "value"]
-        # Rows should not contain _rn values
-        assert len(body["rows"][0]) == 3
+        assert body["rows"][0] == [200, "Z", 99.0]
 
-        # Verify the SQL uses ROW_NUMBER and DESC ordering
-        sql = mock_worker_pool.run_query.call_args[0][0]
-        assert "ROW_NUMBER" in sql
-        assert "DESC" in sql
-        assert "LIMIT 5" in sql
+        # Verify the worker samples the tail instead of a full-scan query
+        assert mock_worker_pool.sample_dataset.call_args[0][1:] == ("tail", 5)
+        mock_worker_pool.run_query.assert_not_called()
 
     # -----------------------------------------------------------------------
     # 3. Random sampling
@@ -225,11 +221,10 @@ class TestDatasetPreviewSampling:
         authed_client_with_pool,
         mock_worker_pool,
     ):
-        """sample_method=random returns data with ORDER BY RANDOM()."""
-        mock_worker_pool.run_query.return_value = {
+        """sample_method=random returns randomly sampled rows from the worker."""
+        mock_worker_pool.sample_dataset.return_value = {
             "rows": [{"id": 42, "category": "B", "value": 55.5}],
             "columns": ["id", "category", "value"],
-            "total_rows": 1,
         }
 
         url = _preview_url(conversation_owned["id"], ready_dataset["id"])
@@ -242,10 +237,9 @@ class TestDatasetPreviewSampling:
         assert body["columns"] == ["id", "category", "value"]
         assert len(body["rows"]) == 1
 
-        # Verify SQL uses RANDOM()
-        sql = mock_worker_pool.run_query.call_args[0][0]
-        assert "RANDOM()" in sql
-        assert "LIMIT 3" in sql
+        # Verify the worker draws the random sample
+        assert mock_worker_pool.sample_dataset.call_args[0][1:] == ("random", 3)
+        mock_worker_pool.run_query.assert_not_called()
 
     # -----------------------------------------------------------------------
     # 4. Stratified without sample_column -> 400
@@ -316,13 +310,12 @@ class TestDatasetPreviewSampling:
         mock_worker_pool,
     ):
         """sample_method=percentage computes row count from percentage and total rows."""
-        mock_worker_pool.run_query.return_value = {
+        mock_worker_pool.sample_dataset.return_value = {
             "rows": [
                 {"id": 10, "category": "A", "value": 1.0},
                 {"id": 20, "category": "B", "value": 2.0},
             ],
             "columns": ["id", "category", "value"],
-            "total_rows": 2,
         }
 
         url = _preview_url(conversation_owned["id"], ready_dataset["id"])
@@ -336,9 +329,7 @@ class TestDatasetPreviewSampling:
         assert body["columns"] == ["id", "category", "value"]
 
         # With 200 rows at 5%, computed_count = round(200 * 5.0 / 100) = 10
-        sql = mock_worker_pool.run_query.call_args[0][0]
-        assert "RANDOM()" in sql
-        assert "LIMIT 10" in sql
+        assert mock_worker_pool.sample_dataset.call_args[0][1:] == ("random", 10)
 
     # -----------------------------------------------------------------------
     # 7. Invalid sample_method -> 422 (regex validation)
@@ -378,10 +369,9 @@ class TestDatasetPreviewSampling:
         mock_worker_pool,
     ):
         """random_sample=true with default sample_method overrides to random."""
-        mock_worker_pool.run_query.return_value = {
+        mock_worker_pool.sample_dataset.return_value = {
             "rows": [{"id": 7, "category": "C", "value": 77.7}],
             "columns": ["id", "category", "value"],
-            "total_rows": 1,
         }
 
         url = _preview_url(conversation_owned["id"], ready_dataset["id"])
@@ -392,9 +382,8 @@ class TestDatasetPreviewSampling:
         body = assert_success_response(response, 200)
         assert body["sample_method"] == "random"
 
-        # Verify SQL uses RANDOM()
-        sql = mock_worker_pool.run_query.call_args[0][0]
-        assert "RANDOM()" in sql
+        # Verify the worker draws a random sample
+        assert mock_worker_pool.sample_dataset.call_args[0][1] == "random"
 
     # -----------------------------------------------------------------------
     # 9. Dataset not found -> 404
@@ -417,3 +406,104 @@ class TestDatasetPreviewSampling:
         assert response.status_code == 404
         body = response.json()
         assert "not found" in body["error"].lower()
+
+
+# ---------------------------------------------------------------------------
+# Previews served from the stored snapshot
+# ---------------------------------------------------------------------------
+
+_SNAPSHOT = {
+    "columns": ["id", "category", "value"],
+    "head": [[i, "A", float(i)] for i in range(1, 101)],
+    "random": [[i, "B", float(i)] for i in range(101, 201)],
+}
+
+
+@pytest_asyncio.fixture
+async def snapshot_dataset(fresh_db, ready_dataset):
+    """The ready dataset with a preview snapshot stored at load time."""
+    await fresh_db.execute(
+        "UPDATE datasets SET preview_json = ? WHERE id = ?",
+        (json.dumps(_SNAPSHOT), ready_dataset["id"]),
+    )
+    await fresh_db.commit()
+    return ready_dataset
+
+
+class TestPreviewSnapshot:
+    """Head and random previews are answered from SQLite, without a worker."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_head_from_snapshot(
+        self, conversation_owned, snapshot_dataset, authed_client_with_pool, mock_worker_pool,
+    ):
+        url = _preview_url(conversation_owned["id"], snapshot_dataset["id"])
+        response = await authed_client_with_pool.post(url, params={"sample_size": 3})
+
+        body = assert_success_response(response, 200)
+        assert body["columns"] == ["id", "category", "value"]
+        assert body["rows"] == [[1, "A", 1.0], [2, "A", 2.0], [3, "A", 3.0]]
+        assert body["total_rows"] == 200
+        mock_worker_pool.run_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    @pytest.mark.parametrize("params", [
+        {"sample_method": "random", "sample_size": 5},
+        {"sample_method": "percentage", "sample_percentage": 2.5},
+    ])
+    async def test_random_from_snapshot(
+        self, conversation_owned, snapshot_dataset, authed_client_with_pool, mock_worker_pool, params,
+    ):
+        url = _preview_url(conversation_owned["id"], snapshot_dataset["id"])
+        response = await authed_client_with_pool.post(url, params=params)
+
+        body = assert_success_response(response, 200)
+        ids = [row[0] for row in body["rows"]]
+        assert len(ids) == 5
+        assert ids == sorted(ids)
+        assert all(101 <= i <= 200 for i in ids)
+        mock_worker_pool.sample_dataset.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_tail_still_uses_worker(
+        self, conversation_owned, snapshot_dataset, authed_client_with_pool, mock_worker_pool,
+    ):
+        mock_worker_pool.sample_dataset.return_value = {"columns": ["id"], "rows": [{"id": 200}]}
+
+        url = _preview_url(conversation_owned["id"], snapshot_dataset["id"])
+        response = await authed_client_with_pool.post(url, params={"sample_method": "tail"})
+
+        body = assert_success_response(response, 200)
+        assert body["rows"] == [[200]]
+        mock_worker_pool.sample_dataset.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_snapshot_matches_live_preview_for_dates(
+        self, fresh_db, conversation_owned, ready_dataset, authed_client_with_pool, mock_worker_pool,
+    ):
+        from app.services.dataset_service import serialize_preview
+        from app.workers.sampler import preview_snapshot
+
+        df = pl.DataFrame({
+            "id": [1, 2, 3],
+            "day": [date(2024, 1, i) for i in (1, 2, 3)],
+            "at": [datetime(2024, 1, i, 12, 30) for i in (1, 2, 3)],
+        })
+        mock_worker_pool.run_query.return_value = {"columns": df.columns, "rows": df.to_dicts()}
+        url = _preview_url(conversation_owned["id"], ready_dataset["id"])
+        live = assert_success_response(await authed_client_with_pool.post(url), 200)
+
+        await fresh_db.execute(
+            "UPDATE datasets SET preview_json = ? WHERE id = ?",
+            (serialize_preview({"preview": preview_snapshot(df.lazy())}), ready_dataset["id"]),
+        )
+        await fresh_db.commit()
+        snapshot = assert_success_response(await authed_client_with_pool.post(url), 200)
+
+        mock_worker_pool.run_query.assert_awaited_once()
+        assert snapshot == live
+        assert live["rows"][0] == [1, "2024-01-01", "2024-01-01T12:30:00"]
@@ -5,6 +5,7 @@ Covers:
 - GET /health/cache/stats — in-memory and persistent cache stats
 - POST /health/cache/clear — clear query cache
 - POST /health/cache/cleanup — remove expired persistent cache entries
+- GET /health/workers — worker pool statistics
 
 Uses the same httpx + ASGITransport pattern as other REST API tests.
 """
@@ -205,6 +206,44 @@ class TestCacheStats:
         assert body["persistent"]["newest_entry"] is None
 
 
+# ===========================================================================
+# GET /health/workers
+# ===========================================================================
+
+
+class TestWorkerStats:
+    """GET /health/workers endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_returns_scan_registry_stats(self, fresh_db, unauthed_client):
+        from app.main import app
+
+        mock_pool = MagicMock()
+        mock_pool.scan_registry_stats = {"hits": 3, "misses": 1, "hit_rate": 75.0}
+        mock_pool.task_stats = {"in_flight": 2, "workers_killed": 1}
+        mock_pool.scheduler_stats = {"running": 2, "queued": 1, "rejected": 0, "capacity": 4}
+        mock_pool.routing_stats = {"lanes": 4, "load": [1, 1, 0, 0], "affine": 5, "spilled": 1}
+        app.state.worker_pool = mock_pool
+
+        response = await unauthed_client.get("/health/workers")
+
+        body = assert_success_response(response, 200)
+        assert body["scan_registry"] == {"hits": 3, "misses": 1, "hit_rate": 75.0}
+        assert body["tasks"] == {"in_flight": 2, "workers_killed": 1}
+        assert body["scheduler"]["queued"] == 1
+        assert body["routing"]["affine"] == 5
+
+    @pytest.mark.asyncio
+    async def test_returns_503_when_worker_pool_none(self, fresh_db, unauthed_client):
+        from app.main import app
+
+        app.state.worker_pool = None
+
+        response = await unauthed_client.get("/health/workers")
+
+        assert_error_response(response, 503, "Worker pool unavailable")
+
+
 # ===========================================================================
 # 4. POST /health/cache/clear
 # ===========================================================================
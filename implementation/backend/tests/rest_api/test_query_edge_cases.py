@@ -60,6 +60,9 @@ async def dataset_in_conversation(fresh_db, conversation_owned):
     return ds
 
 
+_TABLE1 = {"url": "https://example.com/data.parquet", "table_name": "table1"}
+
+
 # ===========================================================================
 # POST /conversations/{id}/query -- error paths
 # ===========================================================================
@@ -445,3 +448,130 @@ async def test_generate_sql_empty_question_returns_422(authed_client, fresh_db,
     )
 
     assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_query_pages_past_worker_rows_via_cursor(
+    authed_client, fresh_db, conversation_owned, dataset_in_conversation, mock_worker_pool,
+    tmp_path, monkeypatch,
+):
+    """Pages beyond the worker's 1000 rows, and sorts, are served from the cursor."""
+    import polars as pl
+
+    from app.main import app
+    from app.workers import cursor_store
+
+    monkeypatch.setattr(cursor_store, "CURSOR_DIR", str(tmp_path))
+    key = cursor_store.query_key("SELECT n FROM table1", [_TABLE1])
+    cursor_id = cursor_store.write_cursor(
+        pl.DataFrame({"n": list(range(2500))}), key, limit_applied=True
+    )
+    mock_worker_pool.run_query.return_value = {
+        "columns": ["n"],
+        "rows": [{"n": i} for i in range(1000)],
+        "total_rows": 2500,
+        "cursor_id": cursor_id,
+    }
+    app.state.worker_pool = mock_worker_pool
+    url = f"/conversations/{conversation_owned['id']}/query"
+
+    body = assert_success_response(
+        await authed_client.post(url, json={"sql": "SELECT n FROM table1", "page": 25, "page_size": 100}),
+        200,
+    )
+    assert body["cursor_id"] == cursor_id
+    assert body["total_pages"] == 25
+    assert body["rows"][0] == [2400]
+
+    body = assert_success_response(
+        await authed_client.post(
+            url,
+            json={"sql": "SELECT n FROM table1", "cursor_id": cursor_id, "sort_by": "n", "sort_desc": True},
+        ),
+        200,
+    )
+    assert body["rows"][0] == [2499]
+    assert body["cached"] is True
+    assert body["limit_applied"] is True
+    assert mock_worker_pool.run_query.call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_query_cursor_not_served_for_other_sql_or_conversation(
+    authed_client, fresh_db, conversation_owned, dataset_in_conversation,
+    mock_worker_pool, tmp_path, monkeypatch,
+):
+    """A cursor is only served for the SQL it came from, to conversations it was handed to."""
+    import polars as pl
+
+    from app.main import app
+    from app.workers import cursor_store
+
+    monkeypatch.setattr(cursor_store, "CURSOR_DIR", str(tmp_path))
+    key = cursor_store.query_key("SELECT n FROM table1", [_TABLE1])
+    cursor_id = cursor_store.write_cursor(pl.DataFrame({"n": [1, 2]}), key)
+    app.state.worker_pool = mock_worker_pool
+    url = f"/conversations/{conversation_owned['id']}/query"
+
+    # Never bound to this conversation: re-executed, then bound.
+    await authed_client.post(url, json={"sql": "SELECT n FROM table1", "cursor_id": cursor_id})
+    assert mock_worker_pool.run_query.call_count == 1
+
+    # Different SQL with a cursor id this conversation does own: re-executed.
+    cursor_store.bind(cursor_id, conversation_owned["id"])
+    await authed_client.post(url, json={"sql": "SELECT id FROM table1", "cursor_id": cursor_id})
+    assert mock_worker_pool.run_query.call_count == 2
+
+    # Same SQL, owned: served from the cursor.
+    body = assert_success_response(
+        await authed_client.post(url, json={"sql": "SELECT n FROM table1", "cursor_id": cursor_id}),
+        200,
+    )
+    assert body["rows"] == [[1], [2]]
+    assert mock_worker_pool.run_query.call_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_query_expired_cursor_reruns_sql(
+    authed_client, fresh_db, conversation_owned, dataset_in_conversation, mock_worker_pool
+):
+    """An unknown cursor id falls back to executing the SQL."""
+    from app.main import app
+
+    app.state.worker_pool = mock_worker_pool
+
+    response = await authed_client.post(
+        f"/conversations/{conversation_owned['id']}/query",
+        json={"sql": "SELECT id, value FROM table1", "cursor_id": "0" * 32},
+    )
+
+    body = assert_success_response(response, 200)
+    assert body["rows"] == [[1, "a"]]
+    assert body["cursor_id"] is None
+    mock_worker_pool.run_query.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_query_rejected_when_worker_queue_full(
+    authed_client, fresh_db, conversation_owned, dataset_in_conversation, mock_worker_pool
+):
+    """A full worker queue answers 503 with Retry-After."""
+    from app.exceptions import QueueFullError
+    from app.main import app
+
+    mock_worker_pool.run_query.side_effect = QueueFullError(
+        "Server busy; try again shortly", status_code=503, retry_after_seconds=5
+    )
+    app.state.worker_pool = mock_worker_pool
+
+    response = await authed_client.post(
+        f"/conversations/{conversation_owned['id']}/query",
+        json={"sql": "SELECT id FROM table1"},
+    )
+
+    assert_error_response(response, 503, "Server busy")
+    assert response.headers["retry-after"] == "5"
@@ -0,0 +1,152 @@
+"""Tests for dataset-affinity routing of worker tasks.
+
+Covers: the same datasets always picking the same lane, spilling to an
+idle lane when the dataset's lane is busy, bounded loads once every lane
+is busy, least-loaded routing of dataset-less tasks, and WorkerPool
+sending a table's queries to one worker lane.
+"""
+
+from __future__ import annotations
+
+from app.services.affinity_router import AffinityRouter
+from app.services.worker_pool import WorkerPool, _referenced_urls
+
+_URLS = [f"https://example.com/data{i}.parquet" for i in range(50)]
+
+
+class TestAffinity:
+    def test_same_urls_pick_same_lane(self):
+        router = AffinityRouter(4)
+        for url in _URLS[:10]:
+            with router.route([url]) as first:
+                pass
+            with router.route([url]) as second:
+                pass
+            assert first == second
+        assert router.stats["affine"] == 20
+        assert router.stats["spilled"] == 0
+
+    def test_url_order_does_not_matter(self):
+        router = AffinityRouter(4)
+        with router.route(_URLS[:3]) as first:
+            pass
+        with router.route(list(reversed(_URLS[:3]))) as second:
+            pass
+        assert first == second
+
+    def test_urls_spread_over_lanes(self):
+        router = AffinityRouter(4)
+        lanes = set()
+        for url in _URLS:
+            with router.route([url]) as lane:
+                lanes.add(lane)
+        assert lanes == {0, 1, 2, 3}
+
+    def test_adding_a_lane_moves_few_datasets(self):
+        def lanes(router):
+            picked = []
+            for url in _URLS:
+                with router.route([url]) as lane:
+                    picked.append(lane)
+            return picked
+
+        before, after = lanes(AffinityRouter(4)), lanes(AffinityRouter(5))
+        moved = sum(1 for a, b in zip(before, after) if a != b)
+        assert moved < len(_URLS) / 2
+
+
+class TestBoundedLoad:
+    def test_hot_dataset_spills_to_other_lanes(self):
+        router = AffinityRouter(4)
+        with router.route([_URLS[0]]) as home:
+            with router.route([_URLS[0]]) as spill:
+                assert spill != home
+                assert router.stats["load"][home] == 1
+        assert router.stats["spilled"] == 1
+        assert router.stats["load"] == [0, 0, 0, 0]
+
+    def test_busy_lane_spills_to_idle_lane(self):
+        router = AffinityRouter(2)
+        with router.route([_URLS[0]]) as home:
+            # ceil(1.25 * 2 / 2) == 2 would still admit the busy lane.
+            with router.route([_URLS[0]]) as lane:
+                assert lane != home
+        assert router.stats["spilled"] == 1
+
+    def test_stays_affine_within_cap_when_all_lanes_busy(self):
+        router = AffinityRouter(2)
+        with router.route([_URLS[0]]) as home:
+            with router.route([_URLS[0]]):
+                with router.route([_URLS[0]]) as lane:
+                    assert lane == home
+                    assert router.stats["load"][home] == 2
+
+    def test_no_lane_exceeds_cap(self):
+        router = AffinityRouter(4)
+        contexts = [router.route([_URLS[0]]) for _ in range(8)]
+        for ctx in contexts:
+            ctx.__enter__()
+        assert max(router.stats["load"]) <= 3  # ceil(1.25 * 8 / 4)
+        assert sum(router.stats["load"]) == 8
+        for ctx in contexts:
+            ctx.__exit__(None, None, None)
+
+    def test_no_urls_goes_to_least_loaded(self):
+        router = AffinityRouter(2)
+        with router.route([_URLS[0]]) as busy:
+            with router.route([]) as lane:
+                assert lane != busy
+
+
+class TestReferencedUrls:
+    def test_only_tables_named_in_sql(self):
+        datasets = [
+            {"url": "u1", "table_name": "orders"},
+            {"url": "u2", "table_name": "customers"},
+        ]
+        assert _referenced_urls("SELECT * FROM Orders LIMIT 5", datasets) == ["u1"]
+
+    def test_quoted_table_name(self):
+        datasets = [
+            {"url": "u1", "table_name": "Sales 2024"},
+            {"url": "u2", "table_name": "sales"},
+        ]
+        assert _referenced_urls('SELECT * FROM "Sales 2024"', datasets) == ["u1"]
+
+    def test_string_literals_do_not_count(self):
+        datasets = [
+            {"url": "u1", "table_name": "orders"},
+            {"url": "u2", "table_name": "customers"},
+        ]
+        assert _referenced_urls("SELECT 'orders' FROM customers", datasets) == ["u2"]
+
+    def test_falls_back_to_all_datasets(self):
+        datasets = [{"url": "u1", "table_name": "orders"}]
+        assert _referenced_urls("SELECT 1", datasets) == ["u1"]
+
+
+class TestWorkerPoolRouting:
+    async def test_queries_on_one_table_share_a_lane(self, make_mock_process_pool):
+        lanes = [make_mock_process_pool() for _ in range(4)]
+        for lane in lanes:
+            lane.apply_async.return_value.get.return_value = {
+                "rows": [], "columns": [], "total_rows": 0,
+            }
+        wp = WorkerPool(lanes, pool_size=4)
+        datasets = [
+            {"url": _URLS[0], "table_name": "orders"},
+            {"url": _URLS[1], "table_name": "customers"},
+        ]
+        for i in range(5):
+            await wp.run_query(f"SELECT * FROM orders LIMIT {i + 1}", datasets)
+
+        calls = [lane.apply_async.call_count for lane in lanes]
+        assert sorted(calls) == [0, 0, 0, 5]
+        assert wp.routing_stats["affine"] == 5
+
+    def test_shutdown_stops_every_lane(self, make_mock_process_pool):
+        lanes = [make_mock_process_pool() for _ in range(3)]
+        WorkerPool(lanes, pool_size=3).shutdown()
+        for lane in lanes:
+            lane.terminate.assert_called_once()
+            lane.join.assert_called_once()
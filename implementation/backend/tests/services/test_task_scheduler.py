@@ -0,0 +1,248 @@
+"""Tests for the worker task admission queue.
+
+Covers: capacity gating, weighted fair queuing across users, priority
+classes, per-user and per-conversation running caps, 429/503 rejection
+(background and internal tasks exempt from the per-user cap),
+cancellation while queued, queue-position notifications, and
+WorkerPool.run_query going through the scheduler.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.exceptions import QueueFullError
+from app.services.task_scheduler import (
+    BACKGROUND,
+    INTERACTIVE,
+    LLM,
+    TaskCancelledError,
+    TaskContext,
+    TaskScheduler,
+)
+from app.services.worker_pool import WorkerPool
+
+
+class _Runner:
+    """Start tasks that hold their scheduler slot until released."""
+
+    def __init__(self, scheduler: TaskScheduler) -> None:
+        self.scheduler = scheduler
+        self.started: list[str] = []
+        self._gates: dict[str, asyncio.Event] = {}
+
+    def submit(self, name: str, context: TaskContext | None = None, cancel_event=None):
+        gate = self._gates[name] = asyncio.Event()
+
+        async def task():
+            async with self.scheduler.reserve(context, cancel_event):
+                self.started.append(name)
+                await gate.wait()
+
+        return asyncio.ensure_future(task())
+
+    async def finish(self, name: str) -> None:
+        self._gates[name].set()
+        await _settle()
+
+
+def _ctx(user: str, conv: str | None = None, priority: int = INTERACTIVE) -> TaskContext:
+    return TaskContext(user, conv, priority)
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestCapacity:
+    async def test_runs_up_to_capacity_then_queues(self):
+        runner = _Runner(TaskScheduler(capacity=2))
+        tasks = [runner.submit(n, _ctx(n)) for n in ("a", "b", "c")]
+        await _settle()
+        assert runner.started == ["a", "b"]
+        assert runner.scheduler.stats["queued"] == 1
+
+        await runner.finish("a")
+        assert runner.started == ["a", "b", "c"]
+        for name in ("b", "c"):
+            await runner.finish(name)
+        await asyncio.gather(*tasks)
+        assert runner.scheduler.stats["running"] == 0
+
+
+class TestFairness:
+    async def test_other_user_is_not_stuck_behind_a_burst(self):
+        runner = _Runner(TaskScheduler(capacity=1, max_running_per_user=5))
+        tasks = [runner.submit("a0", _ctx("alice"))]
+        await _settle()
+        tasks += [runner.submit(f"a{i}", _ctx("alice")) for i in range(1, 4)]
+        await _settle()
+        tasks.append(runner.submit("b0", _ctx("bob")))
+        await _settle()
+
+        for name in ("a0", "a1", "b0", "a2", "a3"):
+            await runner.finish(name)
+        await asyncio.gather(*tasks)
+        assert runner.started.index("b0") < runner.started.index("a2")
+
+    async def test_priority_classes_go_first(self):
+        runner = _Runner(TaskScheduler(capacity=1))
+        tasks = [runner.submit("busy", _ctx("u0"))]
+        await _settle()
+        tasks.append(runner.submit("profile", _ctx("u1", priority=BACKGROUND)))
+        tasks.append(runner.submit("tool", _ctx("u2", priority=LLM)))
+        tasks.append(runner.submit("panel", _ctx("u3", priority=INTERACTIVE)))
+        await _settle()
+
+        for name in ("busy", "panel", "tool", "profile"):
+            await runner.finish(name)
+        await asyncio.gather(*tasks)
+        assert runner.started == ["busy", "panel", "tool", "profile"]
+
+
+class TestRunningCaps:
+    async def test_per_user_cap_leaves_worker_for_others(self):
+        runner = _Runner(TaskScheduler(capacity=4, max_running_per_user=1))
+        tasks = [runner.submit("a0", _ctx("alice")), runner.submit("a1", _ctx("alice"))]
+        tasks.append(runner.submit("b0", _ctx("bob")))
+        await _settle()
+        assert runner.started == ["a0", "b0"]
+
+        await runner.finish("a0")
+        assert "a1" in runner.started
+        for name in ("a1", "b0"):
+            await runner.finish(name)
+        await asyncio.gather(*tasks)
+
+    async def test_per_conversation_cap(self):
+        runner = _Runner(TaskScheduler(capacity=4, max_running_per_conversation=1))
+        tasks = [runner.submit("c1", _ctx("alice", "conv")), runner.submit("c2", _ctx("alice", "conv"))]
+        tasks.append(runner.submit("other", _ctx("alice", "other")))
+        await _settle()
+        assert runner.started == ["c1", "other"]
+        for name in ("c1", "c2", "other"):
+            await runner.finish(name)
+        await asyncio.gather(*tasks)
+
+
+class TestRejection:
+    async def test_full_queue_is_503(self):
+        runner = _Runner(TaskScheduler(capacity=1, max_pending=1))
+        tasks = [runner.submit("busy", _ctx("u0")), runner.submit("queued", _ctx("u1"))]
+        await _settle()
+
+        with pytest.raises(QueueFullError) as exc_info:
+            async with runner.scheduler.reserve(_ctx("u2")):
+                pass
+        assert exc_info.value.status_code == 503
+        assert runner.scheduler.stats == {"running": 1, "queued": 1, "rejected": 1, "capacity": 1}
+
+        for name in ("busy", "queued"):
+            await runner.finish(name)
+        await asyncio.gather(*tasks)
+
+    async def test_user_over_pending_cap_is_429(self):
+        runner = _Runner(TaskScheduler(capacity=1, max_pending_per_user=1))
+        tasks = [runner.submit("busy", _ctx("u0")), runner.submit("q", _ctx("alice"))]
+        await _settle()
+
+        with pytest.raises(QueueFullError) as exc_info:
+            async with runner.scheduler.reserve(_ctx("alice")):
+                pass
+        assert exc_info.value.status_code == 429
+
+        for name in ("busy", "q"):
+            await runner.finish(name)
+        await asyncio.gather(*tasks)
+
+    async def test_background_and_internal_tasks_skip_user_pending_cap(self):
+        runner = _Runner(TaskScheduler(capacity=1, max_pending_per_user=1))
+        tasks = [runner.submit("busy", _ctx("u0"))]
+        tasks += [runner.submit(f"load{i}", TaskContext("alice", internal=True)) for i in range(3)]
+        tasks += [runner.submit(f"profile{i}", _ctx("alice", priority=BACKGROUND)) for i in range(3)]
+        await _settle()
+        assert runner.scheduler.stats["rejected"] == 0
+
+        tasks.append(runner.submit("query", _ctx("alice")))
+        await _settle()
+        assert runner.scheduler.stats == {"running": 1, "queued": 7, "rejected": 0, "capacity": 1}
+
+        for name in ["busy", "query", "load0", "load1", "load2", "profile0", "profile1", "profile2"]:
+            await runner.finish(name)
+        await asyncio.gather(*tasks)
+
+
+class TestCancellation:
+    async def test_cancel_event_while_queued(self):
+        runner = _Runner(TaskScheduler(capacity=1))
+        busy = runner.submit("busy", _ctx("u0"))
+        cancel = asyncio.Event()
+        queued = runner.submit("queued", _ctx("u1"), cancel_event=cancel)
+        await _settle()
+
+        cancel.set()
+        with pytest.raises(TaskCancelledError):
+            await queued
+        assert runner.scheduler.stats["queued"] == 0
+
+        await runner.finish("busy")
+        await busy
+        assert runner.started == ["busy"]
+        assert runner.scheduler.stats["running"] == 0
+
+    async def test_cancelled_coroutine_leaves_queue(self):
+        runner = _Runner(TaskScheduler(capacity=1))
+        busy = runner.submit("busy", _ctx("u0"))
+        queued = runner.submit("queued", _ctx("u1"))
+        await _settle()
+
+        queued.cancel()
+        await _settle()
+        assert runner.scheduler.stats["queued"] == 0
+        await runner.finish("busy")
+        await busy
+        assert runner.scheduler.stats["running"] == 0
+
+
+class TestNotifications:
+    async def test_queued_user_is_told_position_and_start(self):
+        sent = []
+
+        async def notify(user_id, message):
+            sent.append((user_id, message))
+
+        scheduler = TaskScheduler(capacity=1)
+        scheduler.set_notifier(notify)
+        runner = _Runner(scheduler)
+        tasks = [runner.submit("busy", _ctx("u0"))]
+        await _settle()
+        tasks.append(runner.submit("queued", _ctx("alice", "conv-1")))
+        await _settle()
+
+        assert sent == [("alice", {"type": "tq", "pos": 1, "len": 1, "cid": "conv-1"})]
+        await runner.finish("busy")
+        await _settle()
+        assert sent[-1] == ("alice", {"type": "tq", "pos": 0, "len": 0, "cid": "conv-1"})
+        await runner.finish("queued")
+        await asyncio.gather(*tasks)
+
+
+class TestWorkerPoolIntegration:
+    async def test_cancel_while_queued_returns_cancelled_error(self, mock_process_pool):
+        wp = WorkerPool(mock_process_pool, pool_size=1)
+        mock_process_pool.settle = False
+        first = asyncio.ensure_future(wp.run_query("SELECT 1", []))
+        await _settle()
+
+        cancel = asyncio.Event()
+        cancel.set()
+        result = await wp.run_query("SELECT 2", [], cancel_event=cancel)
+
+        assert result["error_type"] == "cancelled"
+        assert mock_process_pool.apply_async.call_count == 1
+        first.cancel()
+        await _settle()
+        assert wp.scheduler_stats["running"] == 0
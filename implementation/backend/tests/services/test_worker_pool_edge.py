@@ -8,8 +8,6 @@ Covers scenarios not fully exercised by existing test suites:
 
 from __future__ import annotations
 
-import multiprocessing
-import multiprocessing.pool
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -23,19 +21,6 @@ from app.services.worker_pool import WorkerPool, shutdown
 # ---------------------------------------------------------------------------
 
 
-def _make_mock_pool():
-    """Create a MagicMock that looks like multiprocessing.pool.Pool."""
-    pool = MagicMock(spec=multiprocessing.pool.Pool)
-    return pool
-
-
-def _make_worker_pool(pool=None):
-    """Create a WorkerPool with a mock inner pool."""
-    if pool is None:
-        pool = _make_mock_pool()
-    return WorkerPool(pool)
-
-
 def _make_async_result(return_value=None, side_effect=None):
     """Create a mock AsyncResult whose .get() returns a value or raises."""
     ar = MagicMock()
@@ -70,9 +55,9 @@ def _make_mock_db_pool(*, persistent_get_result=None, persistent_get_error=None)
 class TestPersistentCacheHit:
     """When the persistent (SQLite) cache has a result, run_query returns it."""
 
-    async def test_persistent_cache_hit_returns_with_cached_flag(self):
+    async def test_persistent_cache_hit_returns_with_cached_flag(self, mock_process_pool):
         """Persistent cache hit returns result with cached=True."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT * FROM sales"
         datasets = [{"url": "http://example.com/sales.parquet", "table_name": "sales"}]
         persistent_result = {"rows": [[1, "widget"]], "columns": ["id", "name"], "total_rows": 1}
@@ -91,9 +76,9 @@ class TestPersistentCacheHit:
         # The worker pool should never have been called
         wp._pool.apply_async.assert_not_called()
 
-    async def test_persistent_cache_hit_promotes_to_memory_cache(self):
+    async def test_persistent_cache_hit_promotes_to_memory_cache(self, mock_process_pool):
         """A persistent cache hit should be promoted to the in-memory cache."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT COUNT(*) FROM t"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         persistent_result = {"rows": [[42]], "columns": ["count"], "total_rows": 1}
@@ -111,9 +96,9 @@ class TestPersistentCacheHit:
         assert mem_cached is not None
         assert mem_cached["rows"] == [[42]]
 
-    async def test_persistent_cache_hit_skips_when_memory_cache_hits_first(self):
+    async def test_persistent_cache_hit_skips_when_memory_cache_hits_first(self, mock_process_pool):
         """In-memory cache is checked before persistent cache; persistent is skipped."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT 1"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         memory_result = {"rows": [[1]], "columns": ["1"], "total_rows": 1}
@@ -133,9 +118,9 @@ class TestPersistentCacheHit:
         mock_db_pool.acquire_read.assert_not_awaited()
         wp._pool.apply_async.assert_not_called()
 
-    async def test_persistent_cache_hit_with_complex_result(self):
+    async def test_persistent_cache_hit_with_complex_result(self, mock_process_pool):
         """Persistent cache returns a complex result with multiple rows and metadata."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT id, name, score FROM students ORDER BY score DESC"
         datasets = [{"url": "http://example.com/students.parquet", "table_name": "students"}]
         persistent_result = {
@@ -165,9 +150,9 @@ class TestPersistentCacheHit:
 class TestCacheMissFallthrough:
     """When both caches miss, run_query delegates to the worker pool."""
 
-    async def test_both_caches_miss_executes_in_worker(self):
+    async def test_both_caches_miss_executes_in_worker(self, mock_process_pool):
         """When both in-memory and persistent cache miss, query runs in worker."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT * FROM t LIMIT 5"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         worker_result = {"rows": [[1], [2], [3], [4], [5]], "columns": ["id"], "total_rows": 5}
@@ -188,9 +173,9 @@ class TestCacheMissFallthrough:
         assert "cached" not in result
         wp._pool.apply_async.assert_called_once()
 
-    async def test_cache_miss_stores_result_in_both_caches(self):
+    async def test_cache_miss_stores_result_in_both_caches(self, mock_process_pool):
         """After a worker execution, the result is stored in both in-memory and persistent caches."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT SUM(val) FROM t"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         worker_result = {"rows": [[100]], "columns": ["sum"], "total_rows": 1}
@@ -216,9 +201,9 @@ class TestCacheMissFallthrough:
         # Verify persistent cache put was called
         mock_pc.put.assert_awaited_once_with(sql, datasets, worker_result, mock_write_conn)
 
-    async def test_cache_miss_no_db_pool_skips_persistent_cache(self):
+    async def test_cache_miss_no_db_pool_skips_persistent_cache(self, mock_process_pool):
         """When db_pool is None, persistent cache is skipped entirely."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         assert wp._db_pool is None  # default
 
         sql = "SELECT 1"
@@ -233,9 +218,9 @@ class TestCacheMissFallthrough:
         assert result == worker_result
         wp._pool.apply_async.assert_called_once()
 
-    async def test_persistent_cache_error_falls_through_to_worker(self):
+    async def test_persistent_cache_error_falls_through_to_worker(self, mock_process_pool):
         """When persistent cache raises an exception, query still executes in worker."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT 1"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         worker_result = {"rows": [[1]], "columns": ["1"], "total_rows": 1}
@@ -254,9 +239,9 @@ class TestCacheMissFallthrough:
 
         assert result["rows"] == [[1]]
 
-    async def test_worker_result_cached_subsequent_call_returns_cached(self):
+    async def test_worker_result_cached_subsequent_call_returns_cached(self, mock_process_pool):
         """After a worker execution, a subsequent call with the same args returns cached."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT * FROM t"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         worker_result = {"rows": [[1, "a"]], "columns": ["id", "name"], "total_rows": 1}
@@ -285,9 +270,9 @@ class TestCacheMissFallthrough:
 class TestShutdownCleanup:
     """Verify that shutdown terminates workers and joins the pool."""
 
-    def test_worker_pool_shutdown_calls_terminate_and_join(self):
+    def test_worker_pool_shutdown_calls_terminate_and_join(self, mock_process_pool):
         """WorkerPool.shutdown() calls terminate() then join() on the inner pool."""
-        mock_pool = _make_mock_pool()
+        mock_pool = mock_process_pool
         wp = WorkerPool(mock_pool)
 
         wp.shutdown()
@@ -295,9 +280,9 @@ class TestShutdownCleanup:
         mock_pool.terminate.assert_called_once()
         mock_pool.join.assert_called_once()
 
-    def test_module_level_shutdown_delegates_to_worker_pool(self):
+    def test_module_level_shutdown_delegates_to_worker_pool(self, mock_process_pool):
         """The module-level shutdown() function delegates to WorkerPool.shutdown()."""
-        mock_pool = _make_mock_pool()
+        mock_pool = mock_process_pool
         wp = WorkerPool(mock_pool)
 
         shutdown(wp)
@@ -305,18 +290,18 @@ class TestShutdownCleanup:
         mock_pool.terminate.assert_called_once()
         mock_pool.join.assert_called_once()
 
-    def test_module_level_shutdown_on_raw_pool(self):
+    def test_module_level_shutdown_on_raw_pool(self, mock_process_pool):
         """The module-level shutdown() works on a raw multiprocessing.Pool mock."""
-        mock_pool = _make_mock_pool()
+        mock_pool = mock_process_pool
 
         shutdown(mock_pool)
 
         mock_pool.terminate.assert_called_once()
         mock_pool.join.assert_called_once()
 
-    def test_shutdown_order_terminate_before_join(self):
+    def test_shutdown_order_terminate_before_join(self, mock_process_pool):
         """terminate() is called before join() -- enforced by call ordering."""
-        mock_pool = _make_mock_pool()
+        mock_pool = mock_process_pool
         call_order = []
         mock_pool.terminate.side_effect = lambda: call_order.append("terminate")
         mock_pool.join.side_effect = lambda: call_order.append("join")
@@ -326,9 +311,9 @@ class TestShutdownCleanup:
 
         assert call_order == ["terminate", "join"]
 
-    def test_shutdown_idempotent_mock(self):
+    def test_shutdown_idempotent_mock(self, mock_process_pool):
         """Calling shutdown twice on a mock pool does not raise (both calls go through)."""
-        mock_pool = _make_mock_pool()
+        mock_pool = mock_process_pool
         wp = WorkerPool(mock_pool)
 
         wp.shutdown()
@@ -338,9 +323,9 @@ class TestShutdownCleanup:
         assert mock_pool.terminate.call_count == 2
         assert mock_pool.join.call_count == 2
 
-    def test_shutdown_with_query_cache_intact(self):
+    def test_shutdown_with_query_cache_intact(self, mock_process_pool):
         """Shutdown does not clear the in-memory query cache (it just stops workers)."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT 1"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         result = {"rows": [[1]], "columns": ["1"], "total_rows": 1}
@@ -24,6 +24,7 @@ from app.services.ws_messages import (
     rate_limit_warning,
     reasoning_complete,
     reasoning_token,
+    task_queued,
     tool_call_start,
     usage_update,
 )
@@ -265,6 +266,24 @@ class TestDatasetLoading:
         result = dataset_loading(dataset_id="x", url="u")
         assert set(result.keys()) == {"type", "did", "u", "s"}
 
+    def test_progress_fields(self):
+        result = dataset_loading(
+            dataset_id="x", url="u", phase="downloading", bytes_done=512, bytes_total=1024
+        )
+        assert result == {
+            "type": "dl",
+            "did": "x",
+            "u": "u",
+            "s": "loading",
+            "ph": "downloading",
+            "bd": 512,
+            "bt": 1024,
+        }
+
+    def test_phase_without_bytes(self):
+        result = dataset_loading(dataset_id="x", url="u", phase="reading")
+        assert set(result.keys()) == {"type", "did", "u", "s", "ph"}
+
     def test_keyword_only_enforcement(self):
         try:
             dataset_loading("ds-1", "u")  # type: ignore[misc]
@@ -317,6 +336,21 @@ class TestDatasetLoaded:
         )
         assert set(result.keys()) == {"type", "did", "n", "rc", "cc", "sc"}
 
+    def test_optional_fields(self):
+        result = dataset_loaded(
+            dataset_id="x",
+            name="n",
+            row_count=0,
+            column_count=0,
+            schema=[],
+            conversation_id="c",
+            url="u",
+            file_size_bytes=0,
+        )
+        assert result["cid"] == "c"
+        assert result["u"] == "u"
+        assert result["fs"] == 0
+
     def test_keyword_only_enforcement(self):
         try:
             dataset_loaded("ds", "n", 0, 0, [])  # type: ignore[misc]
@@ -637,6 +671,19 @@ class TestFollowupSuggestions:
             pass
 
 
+# ---------------------------------------------------------------------------
+# task_queued
+# ---------------------------------------------------------------------------
+class TestTaskQueued:
+    def test_returns_compressed_format(self):
+        result = task_queued(position=2, queue_length=5, conversation_id="conv-1")
+        assert result == {"type": "tq", "pos": 2, "len": 5, "cid": "conv-1"}
+
+    def test_omits_null_conversation(self):
+        result = task_queued(position=0, queue_length=0, conversation_id=None)
+        assert set(result.keys()) == {"type", "pos", "len"}
+
+
 # ---------------------------------------------------------------------------
 # Cross-cutting: every function returns a plain dict
 # ---------------------------------------------------------------------------
@@ -707,7 +754,7 @@ class TestAllHaveTypeField:
 # Cross-cutting: unique type discriminators
 # ---------------------------------------------------------------------------
 class TestUniqueTypeDiscriminators:
-    """All 17 message types must have unique ``type`` values."""
+    """All 18 message types must have unique ``type`` values."""
 
     def test_no_duplicate_type_values(self):
         type_values = [
@@ -730,6 +777,7 @@ class TestUniqueTypeDiscriminators:
             query_progress(query_number=0)["type"],
             chart_spec(execution_index=0, spec={})["type"],
             followup_suggestions(suggestions=[])["type"],
+            task_queued(position=0, queue_length=0, conversation_id=None)["type"],
         ]
-        assert len(type_values) == 17
-        assert len(set(type_values)) == 17
+        assert len(type_values) == 18
+        assert len(set(type_values)) == 18
@@ -7,6 +7,7 @@ Verifies: spec/backend/dataset_handling/plan.md
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import tempfile
@@ -294,14 +295,15 @@ class TestAddDataset:
             fresh_db, conv["id"], "https://example.com/schema.csv", mock_worker_pool
         )
 
-        # mock_worker_pool.get_schema returns columns with id and value
+        # mock_worker_pool.ingest_dataset returns columns with id and value
         schema = json.loads(result["schema_json"])
         assert len(schema) == 2
         assert result["column_count"] == 2
         assert result["row_count"] == 100
 
-    async def test_calls_worker_validate_url(self, fresh_db, test_user, mock_worker_pool):
+    async def test_calls_worker_ingest_dataset(self, fresh_db, test_user, mock_worker_pool):
         from app.services.dataset_service import add_dataset
+        from app.services.task_scheduler import TaskContext
 
         conv = make_conversation(user_id=test_user["id"])
         await _insert_conversation(fresh_db, conv)
@@ -310,9 +312,12 @@ class TestAddDataset:
             fresh_db, conv["id"], "https://example.com/validated.csv", mock_worker_pool
         )
 
-        mock_worker_pool.validate_url.assert_called_once_with("https://example.com/validated.csv")
+        # Loads run as internal tasks, exempt from the user's pending cap.
+        mock_worker_pool.ingest_dataset.assert_called_once_with(
+            "https://example.com/validated.csv", context=TaskContext(internal=True),
+        )
 
-    async def test_calls_worker_get_schema(self, fresh_db, test_user, mock_worker_pool):
+    async def test_validates_and_extracts_schema_in_one_task(self, fresh_db, test_user, mock_worker_pool):
         from app.services.dataset_service import add_dataset
 
         conv = make_conversation(user_id=test_user["id"])
@@ -322,7 +327,8 @@ class TestAddDataset:
             fresh_db, conv["id"], "https://example.com/schemaed.csv", mock_worker_pool
         )
 
-        mock_worker_pool.get_schema.assert_called_once_with("https://example.com/schemaed.csv")
+        mock_worker_pool.validate_url.assert_not_called()
+        mock_worker_pool.get_schema.assert_not_called()
 
     async def test_raises_for_invalid_url_format(self, fresh_db, test_user, mock_worker_pool):
         from app.services.dataset_service import add_dataset
@@ -372,7 +378,7 @@ class TestAddDataset:
         await _insert_conversation(fresh_db, conv)
 
         pool = AsyncMock()
-        pool.validate_url = AsyncMock(return_value={"valid": False, "error": "404 Not Found"})
+        pool.ingest_dataset = AsyncMock(return_value={"valid": False, "error": "404 Not Found"})
 
         with pytest.raises(ValueError, match="404 Not Found"):
             await add_dataset(fresh_db, conv["id"], "https://example.com/missing.csv", pool)
@@ -384,7 +390,7 @@ class TestAddDataset:
         await _insert_conversation(fresh_db, conv)
 
         pool = AsyncMock()
-        pool.validate_url = AsyncMock(return_value={"valid": False})
+        pool.ingest_dataset = AsyncMock(return_value={"valid": False})
 
         with pytest.raises(ValueError, match="Could not access URL"):
             await add_dataset(fresh_db, conv["id"], "https://example.com/unreachable.csv", pool)
@@ -396,8 +402,9 @@ class TestAddDataset:
         await _insert_conversation(fresh_db, conv)
 
         pool = AsyncMock()
-        pool.validate_url = AsyncMock(return_value={"valid": True})
-        pool.get_schema = AsyncMock(return_value={"error": "Unsupported file format"})
+        pool.ingest_dataset = AsyncMock(
+            return_value={"valid": False, "error": "Unsupported file format", "error_type": "validation"}
+        )
 
         with pytest.raises(ValueError, match="Unsupported file format"):
             await add_dataset(fresh_db, conv["id"], "https://example.com/bad.xyz", pool)
@@ -442,15 +449,142 @@ class TestAddDataset:
         await _insert_conversation(fresh_db, conv)
 
         pool = AsyncMock()
-        pool.validate_url = AsyncMock(return_value={"valid": True, "file_size_bytes": 12345})
-        pool.get_schema = AsyncMock(
-            return_value={"columns": [{"name": "id", "type": "INTEGER"}], "row_count": 10}
+        pool.ingest_dataset = AsyncMock(
+            return_value={
+                "valid": True,
+                "file_size_bytes": 12345,
+                "columns": [{"name": "id", "type": "INTEGER"}],
+                "row_count": 10,
+            }
         )
 
         result = await add_dataset(fresh_db, conv["id"], "https://example.com/sized.csv", pool)
         assert result["file_size_bytes"] == 12345
 
 
+# ---------------------------------------------------------------------------
+# start_dataset / load_dataset
+# ---------------------------------------------------------------------------
+
+
+class TestLoadDataset:
+    """Tests for dataset_service.start_dataset and load_dataset (background loading)."""
+
+    async def test_start_inserts_loading_row(self, fresh_db, test_user):
+        from app.services.dataset_service import start_dataset
+
+        conv = make_conversation(user_id=test_user["id"])
+        await _insert_conversation(fresh_db, conv)
+
+        result = await start_dataset(fresh_db, conv["id"], "https://example.com/data.parquet")
+
+        row = await _get_dataset(fresh_db, result["id"])
+        assert row["status"] == "loading"
+        assert row["name"] == "table1"
+        assert json.loads(row["schema_json"]) == []
+
+    async def test_start_rejects_a_dataset_still_loading(self, fresh_db, test_user):
+        from app.services.dataset_service import start_dataset
+
+        conv = make_conversation(user_id=test_user["id"])
+        await _insert_conversation(fresh_db, conv)
+        url = "https://example.com/data.parquet"
+        await start_dataset(fresh_db, conv["id"], url)
+
+        with pytest.raises(ValueError, match="already loaded"):
+            await start_dataset(fresh_db, conv["id"], url)
+
+    async def test_start_replaces_a_failed_load(self, fresh_db, test_user):
+        from app.services.dataset_service import start_dataset
+
+        conv = make_conversation(user_id=test_user["id"])
+        await _insert_conversation(fresh_db, conv)
+        url = "https://example.com/data.parquet"
+        failed = make_dataset(conversation_id=conv["id"], url=url, status="error")
+        await _insert_dataset(fresh_db, failed)
+
+        result = await start_dataset(fresh_db, conv["id"], url)
+
+        assert await _get_dataset(fresh_db, failed["id"]) is None
+        assert (await _get_dataset(fresh_db, result["id"]))["status"] == "loading"
+
+    async def test_load_marks_row_ready_and_notifies(self, fresh_db, test_user, mock_worker_pool):
+        from app.services.dataset_service import load_dataset, start_dataset
+
+        conv = make_conversation(user_id=test_user["id"])
+        await _insert_conversation(fresh_db, conv)
+        url = "https://example.com/data.parquet"
+        started = await start_dataset(fresh_db, conv["id"], url)
+        notify = AsyncMock()
+
+        result = await load_dataset(fresh_db, started["id"], url, mock_worker_pool, notify=notify)
+
+        assert result["status"] == "ready"
+        row = await _get_dataset(fresh_db, started["id"])
+        assert row["status"] == "ready"
+        assert row["column_count"] == len(json.loads(row["schema_json"]))
+        types = [c.args[0]["type"] for c in notify.await_args_list]
+        assert types[0] == "dl"
+        assert types[-1] == "dld"
+        assert notify.await_args_list[-1].args[0]["cid"] == conv["id"]
+
+    async def test_load_failure_marks_row_error(self, fresh_db, test_user):
+        from app.services.dataset_service import load_dataset, start_dataset
+
+        conv = make_conversation(user_id=test_user["id"])
+        await _insert_conversation(fresh_db, conv)
+        url = "https://example.com/missing.parquet"
+        started = await start_dataset(fresh_db, conv["id"], url)
+        pool = AsyncMock()
+        pool.ingest_dataset = AsyncMock(return_value={"valid": False, "error": "Could not access URL"})
+        notify = AsyncMock()
+
+        with pytest.raises(ValueError, match="Could not access URL"):
+            await load_dataset(fresh_db, started["id"], url, pool, notify=notify)
+
+        row = await _get_dataset(fresh_db, started["id"])
+        assert row["status"] == "error"
+        assert row["error_message"] == "Could not access URL"
+        notify.assert_awaited_with({"type": "de", "did": started["id"], "e": "Could not access URL"})
+
+    async def test_load_relays_worker_progress(self, fresh_db, test_user, tmp_path):
+        from app.services import dataset_service
+        from app.workers import file_cache
+
+        conv = make_conversation(user_id=test_user["id"])
+        await _insert_conversation(fresh_db, conv)
+        url = "https://example.com/big.parquet"
+        started = await dataset_service.start_dataset(fresh_db, conv["id"], url)
+
+        async def ingest(url, context=None):
+            file_cache.report_progress(url, "downloading", 512, 1024)
+            await asyncio.sleep(0.05)
+            return {"valid": True, "columns": [], "row_count": 0}
+
+        pool = AsyncMock()
+        pool.ingest_dataset = AsyncMock(side_effect=ingest)
+        notify = AsyncMock()
+
+        with patch.object(file_cache, "CACHE_DIR", str(tmp_path)), \
+                patch.object(dataset_service, "PROGRESS_POLL_SECONDS", 0.01):
+            await dataset_service.load_dataset(fresh_db, started["id"], url, pool, notify=notify)
+
+        messages = [c.args[0] for c in notify.await_args_list]
+        assert {"ph": "downloading", "bd": 512, "bt": 1024}.items() <= messages[1].items()
+
+    async def test_load_of_removed_row_raises(self, fresh_db, test_user, mock_worker_pool):
+        from app.services.dataset_service import load_dataset, remove_dataset, start_dataset
+
+        conv = make_conversation(user_id=test_user["id"])
+        await _insert_conversation(fresh_db, conv)
+        url = "https://example.com/data.parquet"
+        started = await start_dataset(fresh_db, conv["id"], url)
+        await remove_dataset(fresh_db, started["id"])
+
+        with pytest.raises(ValueError, match="removed"):
+            await load_dataset(fresh_db, started["id"], url, mock_worker_pool)
+
+
 # ---------------------------------------------------------------------------
 # remove_dataset
 # ---------------------------------------------------------------------------
@@ -623,7 +757,7 @@ class TestRefreshSchema:
         with pytest.raises(ValueError, match="Dataset not found"):
             await refresh_schema(fresh_db, "no-such-dataset", mock_worker_pool)
 
-    async def test_calls_worker_validate_url_with_dataset_url(self, fresh_db, test_user, mock_worker_pool):
+    async def test_calls_worker_ingest_dataset_with_dataset_url(self, fresh_db, test_user, mock_worker_pool):
         from app.services.dataset_service import refresh_schema
 
         conv = make_conversation(user_id=test_user["id"])
@@ -634,7 +768,7 @@ class TestRefreshSchema:
         await _insert_dataset(fresh_db, ds)
 
         await refresh_schema(fresh_db, ds["id"], mock_worker_pool)
-        mock_worker_pool.validate_url.assert_called_with(url)
+        mock_worker_pool.ingest_dataset.assert_called_with(url, context=None)
 
     async def test_raises_when_validation_fails(self, fresh_db, test_user):
         from app.services.dataset_service import refresh_schema
@@ -646,7 +780,7 @@ class TestRefreshSchema:
         await _insert_dataset(fresh_db, ds)
 
         pool = AsyncMock()
-        pool.validate_url = AsyncMock(return_value={"valid": False, "error": "URL no longer accessible"})
+        pool.ingest_dataset = AsyncMock(return_value={"valid": False, "error": "URL no longer accessible"})
 
         with pytest.raises(ValueError, match="URL no longer accessible"):
             await refresh_schema(fresh_db, ds["id"], pool)
@@ -661,8 +795,9 @@ class TestRefreshSchema:
         await _insert_dataset(fresh_db, ds)
 
         pool = AsyncMock()
-        pool.validate_url = AsyncMock(return_value={"valid": True})
-        pool.get_schema = AsyncMock(return_value={"error": "Corrupt file"})
+        pool.ingest_dataset = AsyncMock(
+            return_value={"valid": False, "error": "Corrupt file", "error_type": "validation"}
+        )
 
         with pytest.raises(ValueError, match="Corrupt file"):
             await refresh_schema(fresh_db, ds["id"], pool)
@@ -796,7 +931,7 @@ class TestGetDatasets:
         expected_keys = {
             "id", "conversation_id", "url", "name", "row_count",
             "column_count", "schema_json", "status", "error_message",
-            "loaded_at", "file_size_bytes", "column_descriptions",
+            "loaded_at", "file_size_bytes", "column_descriptions", "version",
         }
         assert set(row.keys()) == expected_keys
 
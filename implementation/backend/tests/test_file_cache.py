@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import json
 import os
+import threading
 import time
-from unittest.mock import patch
+import urllib.error
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -13,9 +16,12 @@ from app.workers.file_cache import (
     CACHE_DIR,
     _cleanup_stale_temps,
     _cache_path,
+    _acquire_download_lock,
     _ensure_cache_dir,
+    _release_download_lock,
     cache_stats,
     clear_cache,
+    download_and_cache,
     get_cached,
 )
 
@@ -128,3 +134,229 @@ class TestClearCache:
     def test_clear_empty(self, isolated_cache):
         count = clear_cache()
         assert count == 0
+
+
+class TestDownloadSingleFlight:
+    """Verify concurrent misses for one URL share a single download."""
+
+    def test_follower_waits_for_leader(self, isolated_cache, monkeypatch):
+        monkeypatch.setattr(file_cache, "LOCK_POLL_INTERVAL", 0.01)
+        url = "https://example.com/shared.parquet"
+        leader = _acquire_download_lock(url, 60)
+        assert leader is not None
+
+        result = {}
+        with patch.object(file_cache, "_download") as mock_download:
+            follower = threading.Thread(target=lambda: result.update(path=download_and_cache(url)))
+            follower.start()
+            time.sleep(0.05)
+            assert follower.is_alive()  # still waiting on the leader
+            with open(_cache_path(url), "w") as f:
+                f.write("data")
+            _release_download_lock(leader)
+            follower.join(timeout=5)
+
+        assert result["path"] == _cache_path(url)
+        mock_download.assert_not_called()
+
+    def test_follower_downloads_when_leader_fails(self, isolated_cache, monkeypatch):
+        monkeypatch.setattr(file_cache, "LOCK_POLL_INTERVAL", 0.01)
+        url = "https://example.com/failed.parquet"
+        leader = _acquire_download_lock(url, 60)
+
+        with patch.object(file_cache, "_download", return_value="/cached") as mock_download:
+            follower = threading.Thread(target=download_and_cache, args=(url,))
+            follower.start()
+            time.sleep(0.05)
+            _release_download_lock(leader)  # leader gave up without a file
+            follower.join(timeout=5)
+
+        mock_download.assert_called_once_with(url, None)
+
+    def test_stale_leader_is_taken_over(self, isolated_cache, monkeypatch):
+        monkeypatch.setattr(file_cache, "DOWNLOAD_LOCK_TIMEOUT", 60)
+        url = "https://example.com/hung.parquet"
+        leader = _acquire_download_lock(url, 60)
+        lock_path = os.path.join(isolated_cache, file_cache.LOCKS_SUBDIR, file_cache._cache_key(url) + ".lock")
+        old = time.time() - 120
+        os.utime(lock_path, (old, old))
+
+        try:
+            with patch.object(file_cache, "_download", return_value="/cached") as mock_download:
+                assert download_and_cache(url) == "/cached"
+            mock_download.assert_called_once_with(url, None)
+        finally:
+            _release_download_lock(leader)
+
+    def test_cleanup_removes_old_unheld_locks(self, isolated_cache):
+        held = _acquire_download_lock("https://example.com/held.parquet", 60)
+        free = _acquire_download_lock("https://example.com/free.parquet", 60)
+        _release_download_lock(free)
+        lock_dir = os.path.join(isolated_cache, file_cache.LOCKS_SUBDIR)
+        old = time.time() - 7200
+        for name in os.listdir(lock_dir):
+            os.utime(os.path.join(lock_dir, name), (old, old))
+
+        _cleanup_stale_temps()
+
+        assert os.listdir(lock_dir) == [file_cache._cache_key("https://example.com/held.parquet") + ".lock"]
+        _release_download_lock(held)
+
+
+def _write_entry(url: str, meta: dict | None) -> str:
+    path = _cache_path(url)
+    with open(path, "w") as f:
+        f.write("data")
+    if meta is not None:
+        with open(path + file_cache.META_SUFFIX, "w") as f:
+            json.dump(meta, f)
+    return path
+
+
+def _response(status: int = 200, headers: dict | None = None, body: bytes = b"") -> MagicMock:
+    resp = MagicMock()
+    resp.__enter__ = MagicMock(return_value=resp)
+    resp.__exit__ = MagicMock(return_value=False)
+    resp.status = status
+    resp.headers = headers or {}
+    resp.read = MagicMock(side_effect=[body, b""])
+    return resp
+
+
+class TestRevalidation:
+    """Verify entry metadata, versions and conditional GET revalidation."""
+
+    URL = "https://example.com/versioned.parquet"
+
+    def test_download_records_metadata_and_version(self, isolated_cache):
+        headers = {"Content-Length": "4", "ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        responses = [_response(headers=headers), _response(headers=headers, body=b"PAR1")]
+        with patch("app.workers.file_cache.urllib.request.urlopen", side_effect=responses):
+            path = download_and_cache(self.URL)
+
+        with open(path + file_cache.META_SUFFIX) as f:
+            meta = json.load(f)
+        assert meta["etag"] == '"v1"'
+        assert meta["size"] == 4
+        assert meta["version"] == file_cache.version_id('"v1"|Mon, 01 Jan 2024 00:00:00 GMT|4')
+        assert cache_stats()["file_count"] == 1
+
+    def test_fresh_entry_served_without_network(self, isolated_cache):
+        path = _write_entry(self.URL, {"etag": '"v1"', "validated_at": time.time()})
+        with patch("app.workers.file_cache.urllib.request.urlopen") as mock_open:
+            assert download_and_cache(self.URL) == path
+        mock_open.assert_not_called()
+
+    def test_not_modified_keeps_entry(self, isolated_cache):
+        path = _write_entry(self.URL, {"etag": '"v1"', "validated_at": 0, "version": "abc"})
+        not_modified = urllib.error.HTTPError(self.URL, 304, "Not Modified", {}, None)
+        with patch("app.workers.file_cache.urllib.request.urlopen", side_effect=not_modified) as mock_open:
+            with patch.object(file_cache, "_download") as mock_download:
+                assert download_and_cache(self.URL) == path
+        mock_download.assert_not_called()
+        assert mock_open.call_args[0][0].get_header("If-none-match") == '"v1"'
+        assert file_cache._read_meta(path)["validated_at"] > 0
+        assert file_cache._read_meta(path)["version"] == "abc"
+
+    def test_changed_upstream_is_downloaded_again(self, isolated_cache):
+        _write_entry(self.URL, {"etag": '"v1"', "validated_at": 0})
+        with patch("app.workers.file_cache.urllib.request.urlopen", return_value=_response(200)):
+            with patch.object(file_cache, "_download", return_value="/new") as mock_download:
+                assert download_and_cache(self.URL) == "/new"
+        mock_download.assert_called_once_with(self.URL, None)
+
+    @pytest.mark.parametrize("meta, headers", [
+        ({"etag": '"v1"'}, {"ETag": '"v1"'}),
+        (
+            {"last_modified": "Mon, 01 Jan 2024 00:00:00 GMT", "size": 4},
+            {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT", "Content-Length": "4"},
+        ),
+    ])
+    def test_full_response_with_same_validators_keeps_entry(self, isolated_cache, meta, headers):
+        # A server that ignores If-None-Match / If-Modified-Since answers 200.
+        path = _write_entry(self.URL, {**meta, "validated_at": 0})
+        with patch("app.workers.file_cache.urllib.request.urlopen", return_value=_response(200, headers)):
+            with patch.object(file_cache, "_download") as mock_download:
+                assert download_and_cache(self.URL) == path
+        mock_download.assert_not_called()
+
+    @pytest.mark.parametrize("headers", [
+        {"ETag": '"v2"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT", "Content-Length": "5"},
+    ])
+    def test_full_response_with_new_validators_downloads(self, isolated_cache, headers):
+        _write_entry(self.URL, {
+            "etag": '"v1"' if "ETag" in headers else None,
+            "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT", "size": 4, "validated_at": 0,
+        })
+        with patch("app.workers.file_cache.urllib.request.urlopen", return_value=_response(200, headers)):
+            with patch.object(file_cache, "_download", return_value="/new") as mock_download:
+                assert download_and_cache(self.URL) == "/new"
+        mock_download.assert_called_once()
+
+    def test_unreachable_upstream_serves_cached_copy(self, isolated_cache):
+        path = _write_entry(self.URL, {"etag": '"v1"', "validated_at": 0})
+        error = urllib.error.URLError("Connection refused")
+        with patch("app.workers.file_cache.urllib.request.urlopen", side_effect=error):
+            assert download_and_cache(self.URL) == path
+
+    def test_entry_without_validators_is_not_revalidated(self, isolated_cache):
+        path = _write_entry(self.URL, None)
+        with patch("app.workers.file_cache.urllib.request.urlopen") as mock_open:
+            assert download_and_cache(self.URL, max_age=0) == path
+        mock_open.assert_not_called()
+
+
+class TestEntryIndex:
+    """Verify index-driven stats and hybrid LRU/LFU eviction."""
+
+    def _add(self, name: str, size: int, last_access: float) -> str:
+        path = os.path.join(file_cache.CACHE_DIR, name)
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        file_cache._index_add(path, size)
+        file_cache._index_execute(
+            "UPDATE entries SET last_access = ?, score = ? WHERE name = ?",
+            (last_access, last_access, name),
+        )
+        return path
+
+    def test_stats_track_added_and_evicted_entries(self, isolated_cache, monkeypatch):
+        monkeypatch.setattr(file_cache, "MAX_CACHE_BYTES", 250)
+        now = time.time()
+        for i in range(3):
+            self._add(f"f{i}.parquet", 100, now - 100 + i)
+        assert cache_stats()["file_count"] == 3
+
+        file_cache._evict_lru()
+
+        assert cache_stats()["file_count"] == 2
+        assert cache_stats()["total_size_bytes"] == 200
+        assert not os.path.exists(os.path.join(isolated_cache, "f0.parquet"))
+
+    def test_frequently_hit_entry_outlives_recent_one(self, isolated_cache, monkeypatch):
+        monkeypatch.setattr(file_cache, "MAX_CACHE_BYTES", 100)
+        now = time.time()
+        popular = self._add("popular.parquet", 100, now - 300)
+        for _ in range(7):  # 3 doublings of hits: +1800s of recency
+            file_cache._index_execute(
+                "UPDATE entries SET hits = hits + 1, score = hybrid_score(last_access, hits + 1) WHERE name = ?",
+                ("popular.parquet",),
+            )
+        recent = self._add("recent.parquet", 100, now - 60)
+
+        file_cache._evict_lru()
+
+        assert os.path.exists(popular)
+        assert not os.path.exists(recent)
+
+    def test_startup_reconciles_index_with_disk(self, isolated_cache):
+        gone = self._add("gone.parquet", 10, time.time())
+        os.unlink(gone)
+        with open(os.path.join(isolated_cache, "unindexed.parquet"), "wb") as f:
+            f.write(b"x" * 20)
+
+        file_cache.startup_cleanup()
+
+        assert cache_stats()["file_count"] == 1
+        assert cache_stats()["total_size_bytes"] == 20
@@ -117,3 +117,91 @@ class TestDownloadRetry:
             with patch("time.sleep"):
                 with pytest.raises(urllib.error.URLError):
                     download_and_cache("https://example.com/fail.parquet")
+
+
+def _range_server(content: bytes, fail_first_at: int | None = None):
+    """Return a fake ``urlopen`` that serves *content* with byte-range support.
+
+    If *fail_first_at* is set, the first full-body GET raises after sending
+    that many bytes.
+    """
+    calls = []
+
+    def urlopen(req, **kwargs):
+        method = req.get_method()
+        range_header = req.get_header("Range")
+        calls.append((method, range_header))
+        resp = MagicMock()
+        resp.__enter__ = MagicMock(return_value=resp)
+        resp.__exit__ = MagicMock(return_value=False)
+        resp.headers = {"Content-Length": str(len(content)), "Accept-Ranges": "bytes"}
+        if method == "HEAD":
+            return resp
+        if range_header:
+            start, _, end = range_header[len("bytes="):].partition("-")
+            body = content[int(start):int(end) + 1 if end else len(content)]
+            resp.status = 206
+        else:
+            body = content
+            resp.status = 200
+        sent = [0]
+        failing = fail_first_at is not None and not range_header and len(calls) == 2
+
+        def read(n=-1):
+            if failing and sent[0] >= fail_first_at:
+                raise urllib.error.URLError("Connection reset")
+            limit = fail_first_at - sent[0] if failing else n
+            n = limit if n < 0 else min(n, limit)
+            chunk = body[sent[0]:sent[0] + n]
+            sent[0] += len(chunk)
+            return chunk
+
+        resp.read = read
+        return resp
+
+    return urlopen, calls
+
+
+class TestRangedDownload:
+    """Tests for concurrent ranged downloads and resumed retries."""
+
+    def test_large_file_downloaded_in_parallel_ranges(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.workers.file_cache.PARALLEL_MIN_BYTES", 1024)
+        monkeypatch.setattr("app.workers.file_cache.DOWNLOAD_CONNECTIONS", 4)
+        content = os.urandom(10_000)
+        urlopen, calls = _range_server(content)
+
+        with patch("app.workers.file_cache.urllib.request.urlopen", side_effect=urlopen):
+            result = download_and_cache("https://example.com/big.parquet")
+
+        with open(result, "rb") as f:
+            assert f.read() == content
+        ranges = sorted(r for m, r in calls if m == "GET")
+        assert ranges == [
+            "bytes=0-2499", "bytes=2500-4999", "bytes=5000-7499", "bytes=7500-9999",
+        ]
+
+    def test_small_file_uses_single_connection(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.workers.file_cache.PARALLEL_MIN_BYTES", 1024 ** 2)
+        content = os.urandom(1000)
+        urlopen, calls = _range_server(content)
+
+        with patch("app.workers.file_cache.urllib.request.urlopen", side_effect=urlopen):
+            result = download_and_cache("https://example.com/small.parquet")
+
+        with open(result, "rb") as f:
+            assert f.read() == content
+        assert calls == [("HEAD", None), ("GET", None)]
+
+    def test_retry_resumes_after_partial_download(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.workers.file_cache.PARALLEL_MIN_BYTES", 1024 ** 2)
+        content = os.urandom(1000)
+        urlopen, calls = _range_server(content, fail_first_at=400)
+
+        with patch("app.workers.file_cache.urllib.request.urlopen", side_effect=urlopen):
+            with patch("time.sleep"):
+                result = download_and_cache("https://example.com/resume.parquet")
+
+        with open(result, "rb") as f:
+            assert f.read() == content
+        assert calls[-1] == ("GET", "bytes=400-")
@@ -310,6 +310,7 @@ class TestAppLifecycleDb:
         tables = [row[0] for row in await cursor.fetchall()]
         expected_tables = sorted([
             "conversations",
+            "dataset_profiles",
             "datasets",
             "messages",
             "query_history",
@@ -64,6 +64,20 @@ class TestCacheHitMiss:
         other_datasets = [{"url": "https://other.com/x.parquet", "table_name": "x"}]
         assert cache.get("SELECT 1", other_datasets) is None
 
+    def test_different_dataset_version_is_miss(self):
+        cache = QueryCache()
+        v1 = [{**d, "version": "v1"} for d in SAMPLE_DATASETS]
+        v2 = [{**d, "version": "v2"} for d in SAMPLE_DATASETS]
+        cache.put("SELECT 1", v1, SAMPLE_RESULT)
+        assert cache.get("SELECT 1", v1) == SAMPLE_RESULT
+        assert cache.get("SELECT 1", v2) is None
+
+    def test_missing_version_matches_unversioned_key(self):
+        cache = QueryCache()
+        cache.put("SELECT 1", SAMPLE_DATASETS, SAMPLE_RESULT)
+        unknown = [{**d, "version": None} for d in SAMPLE_DATASETS]
+        assert cache.get("SELECT 1", unknown) == SAMPLE_RESULT
+
 
 # ---------------------------------------------------------------------------
 # TTL expiration
@@ -108,7 +108,7 @@ def _make_mock_pool(query_cache: QueryCache | None = None):
 
     call_count = 0
 
-    async def mock_run_query(sql, datasets):
+    async def mock_run_query(sql, datasets, cursor=False, context=None):
         nonlocal call_count
         # Check cache first (mirrors WorkerPool.run_query logic)
         cached = cache.get(sql, datasets)
@@ -219,13 +219,12 @@ async def test_preview_head_sampling_default(
 async def test_preview_tail_sampling(
     authed_client, fresh_db, conversation_owned, dataset_in_conversation, mock_worker_pool
 ):
-    """POST preview with sample_method=tail uses ROW_NUMBER DESC query."""
+    """POST preview with sample_method=tail samples in the worker, not via SQL."""
     from app.main import app
 
-    mock_worker_pool.run_query.return_value = {
-        "columns": ["id", "value", "category", "_rn"],
-        "rows": [{"id": 100, "value": "z", "category": "y", "_rn": 1000}],
-        "total_rows": 1,
+    mock_worker_pool.sample_dataset.return_value = {
+        "columns": ["id", "value", "category"],
+        "rows": [{"id": 100, "value": "z", "category": "y"}],
     }
     app.state.worker_pool = mock_worker_pool
 
@@ -237,15 +236,12 @@ async def test_preview_tail_sampling(
 
     body = assert_success_response(response, status_code=200)
     assert body["sample_method"] == "tail"
-    # _rn column should be filtered out of the response
-    assert "_rn" not in body["columns"]
     assert body["columns"] == ["id", "value", "category"]
+    assert body["rows"] == [[100, "z", "y"]]
 
-    call_args = mock_worker_pool.run_query.call_args
-    sql_arg = call_args[0][0]
-    assert "ROW_NUMBER() OVER ()" in sql_arg
-    assert "ORDER BY _rn DESC" in sql_arg
-    assert "LIMIT 25" in sql_arg
+    call_args = mock_worker_pool.sample_dataset.call_args
+    assert call_args[0] == ("https://example.com/data.parquet", "tail", 25)
+    mock_worker_pool.run_query.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
@@ -258,13 +254,12 @@ async def test_preview_tail_sampling(
 async def test_preview_random_sampling(
     authed_client, fresh_db, conversation_owned, dataset_in_conversation, mock_worker_pool
 ):
-    """POST preview with sample_method=random uses ORDER BY RANDOM() query."""
+    """POST preview with sample_method=random samples row groups in the worker."""
     from app.main import app
 
-    mock_worker_pool.run_query.return_value = {
+    mock_worker_pool.sample_dataset.return_value = {
         "columns": ["id", "value", "category"],
         "rows": [{"id": 42, "value": "rand", "category": "r"}],
-        "total_rows": 1,
     }
     app.state.worker_pool = mock_worker_pool
 
@@ -277,10 +272,9 @@ async def test_preview_random_sampling(
     body = assert_success_response(response, status_code=200)
     assert body["sample_method"] == "random"
 
-    call_args = mock_worker_pool.run_query.call_args
-    sql_arg = call_args[0][0]
-    assert "ORDER BY RANDOM()" in sql_arg
-    assert "LIMIT 50" in sql_arg
+    call_args = mock_worker_pool.sample_dataset.call_args
+    assert call_args[0][1:] == ("random", 50)
+    assert call_args.kwargs["column"] is None
 
 
 # ---------------------------------------------------------------------------
@@ -293,26 +287,16 @@ async def test_preview_random_sampling(
 async def test_preview_stratified_sampling(
     authed_client, fresh_db, conversation_owned, dataset_in_conversation, mock_worker_pool
 ):
-    """POST preview with sample_method=stratified partitions by the given column."""
+    """POST preview with sample_method=stratified samples by the given column in one worker call."""
     from app.main import app
 
-    # First call: COUNT(DISTINCT ...) returns 5 categories
-    # Second call: the actual stratified query
-    mock_worker_pool.run_query.side_effect = [
-        {
-            "columns": ["cnt"],
-            "rows": [{"cnt": 5}],
-            "total_rows": 1,
-        },
-        {
-            "columns": ["id", "value", "category", "_rn"],
-            "rows": [
-                {"id": 1, "value": "a", "category": "x", "_rn": 1},
-                {"id": 2, "value": "b", "category": "y", "_rn": 1},
-            ],
-            "total_rows": 2,
-        },
-    ]
+    mock_worker_pool.sample_dataset.return_value = {
+        "columns": ["id", "value", "category"],
+        "rows": [
+            {"id": 1, "value": "a", "category": "x"},
+            {"id": 2, "value": "b", "category": "y"},
+        ],
+    }
     app.state.worker_pool = mock_worker_pool
 
     dataset_id = dataset_in_conversation["id"]
@@ -323,22 +307,13 @@ async def test_preview_stratified_sampling(
 
     body = assert_success_response(response, status_code=200)
     assert body["sample_method"] == "stratified"
-    # _rn column should be filtered out
-    assert "_rn" not in body["columns"]
+    assert len(body["rows"]) == 2
 
-    # The second run_query call should have PARTITION BY
-    calls = mock_worker_pool.run_query.call_args_list
-    assert len(calls) == 2
-
-    # First call: count distinct
-    count_sql = calls[0][0][0]
-    assert 'COUNT(DISTINCT "category")' in count_sql
-
-    # Second call: stratified query
-    stratified_sql = calls[1][0][0]
-    assert 'PARTITION BY "category"' in stratified_sql
-    assert "ORDER BY RANDOM()" in stratified_sql
-    assert "LIMIT 10" in stratified_sql
+    mock_worker_pool.sample_dataset.assert_awaited_once()
+    call_args = mock_worker_pool.sample_dataset.call_args
+    assert call_args[0][1:] == ("stratified", 10)
+    assert call_args.kwargs["column"] == "category"
+    mock_worker_pool.run_query.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
@@ -406,10 +381,9 @@ async def test_preview_percentage_sampling(
     """POST preview with sample_method=percentage computes count from total rows."""
     from app.main import app
 
-    mock_worker_pool.run_query.return_value = {
+    mock_worker_pool.sample_dataset.return_value = {
         "columns": ["id", "value", "category"],
         "rows": [{"id": i, "value": f"v{i}", "category": "c"} for i in range(10)],
-        "total_rows": 10,
     }
     app.state.worker_pool = mock_worker_pool
 
@@ -423,11 +397,9 @@ async def test_preview_percentage_sampling(
     body = assert_success_response(response, status_code=200)
     assert body["sample_method"] == "percentage"
 
-    call_args = mock_worker_pool.run_query.call_args
-    sql_arg = call_args[0][0]
-    assert "ORDER BY RANDOM()" in sql_arg
-    # 1% of 1000 = 10
-    assert "LIMIT 10" in sql_arg
+    call_args = mock_worker_pool.sample_dataset.call_args
+    # 1% of 1000 = 10, drawn as a random sample
+    assert call_args[0][1:] == ("random", 10)
 
 
 # ---------------------------------------------------------------------------
@@ -443,10 +415,9 @@ async def test_preview_percentage_sampling_caps_at_100(
     """POST preview with percentage that would exceed 100 rows caps at 100."""
     from app.main import app
 
-    mock_worker_pool.run_query.return_value = {
+    mock_worker_pool.sample_dataset.return_value = {
         "columns": ["id"],
         "rows": [{"id": i} for i in range(100)],
-        "total_rows": 100,
     }
     app.state.worker_pool = mock_worker_pool
 
@@ -457,10 +428,9 @@ async def test_preview_percentage_sampling_caps_at_100(
         "?sample_method=percentage&sample_percentage=50.0",
     )
 
-    body = assert_success_response(response, status_code=200)
-    call_args = mock_worker_pool.run_query.call_args
-    sql_arg = call_args[0][0]
-    assert "LIMIT 100" in sql_arg
+    assert_success_response(response, status_code=200)
+    call_args = mock_worker_pool.sample_dataset.call_args
+    assert call_args[0][2] == 100
 
 
 # ---------------------------------------------------------------------------
@@ -524,10 +494,9 @@ async def test_preview_backward_compat_random_sample(
     """POST preview with random_sample=true (old param) treats as sample_method=random."""
     from app.main import app
 
-    mock_worker_pool.run_query.return_value = {
+    mock_worker_pool.sample_dataset.return_value = {
         "columns": ["id", "value", "category"],
         "rows": [{"id": 5, "value": "e", "category": "c"}],
-        "total_rows": 1,
     }
     app.state.worker_pool = mock_worker_pool
 
@@ -541,9 +510,8 @@ async def test_preview_backward_compat_random_sample(
     body = assert_success_response(response, status_code=200)
     assert body["sample_method"] == "random"
 
-    call_args = mock_worker_pool.run_query.call_args
-    sql_arg = call_args[0][0]
-    assert "ORDER BY RANDOM()" in sql_arg
+    call_args = mock_worker_pool.sample_dataset.call_args
+    assert call_args[0][1] == "random"
 
 
 # ---------------------------------------------------------------------------
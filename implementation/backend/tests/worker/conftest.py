@@ -8,6 +8,7 @@ Provides:
 - ``empty_parquet_url``: URL to empty.parquet (0 rows)
 - ``wide_parquet_url``: URL to wide.parquet (100 cols)
 - ``not_parquet_url``: URL to not_parquet.csv (invalid parquet)
+- ``range_server``: factory of local HTTP servers with byte-range support
 - ``sample_datasets``: Dataset dicts for SQL execution tests
 - ``worker_pool``: Real multiprocessing pool with 2 workers
 """
@@ -86,6 +87,55 @@ class _QuietHandler(http.server.SimpleHTTPRequestHandler):
         pass
 
 
+class _RangeHandler(_QuietHandler):
+    """Serves single byte ranges (``206``) with an ETag and ``If-Range``.
+
+    Every GET is appended to ``self.server.requests`` as its Range header.
+    """
+
+    def _etag(self, path: str) -> str:
+        st = os.stat(path)
+        return f'"{st.st_size}-{st.st_mtime_ns}"'
+
+    def do_HEAD(self):
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(os.path.getsize(path)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", self._etag(path))
+        self.end_headers()
+
+    def do_GET(self):
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, "rb") as f:
+            data = f.read()
+        byte_range = self.headers.get("Range")
+        self.server.requests.append(byte_range)
+        if_range = self.headers.get("If-Range")
+        if byte_range and (if_range is None or if_range == self._etag(path)):
+            first, _, last = byte_range[len("bytes="):].partition("-")
+            if not first:
+                start, end = max(len(data) - int(last), 0), len(data) - 1
+            else:
+                start, end = int(first), min(int(last or len(data) - 1), len(data) - 1)
+            body = data[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        else:
+            body = data
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", self._etag(path))
+        self.end_headers()
+        self.wfile.write(body)
+
+
 @pytest.fixture(scope="session", autouse=True)
 def _generate_parquet_files():
     """Ensure test parquet fixture files exist."""
@@ -119,6 +169,28 @@ def parquet_server(parquet_dir):
     server.shutdown()
 
 
+@pytest.fixture
+def range_server():
+    """Factory ``range_server(directory)`` -> ``(base_url, server)``.
+
+    The server supports byte ranges; ``server.requests`` lists the Range
+    header of every GET it answered.
+    """
+    servers = []
+
+    def start(directory) -> tuple[str, http.server.HTTPServer]:
+        handler = functools.partial(_RangeHandler, directory=str(directory))
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        server.requests = []
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}", server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
 @pytest.fixture
 def simple_parquet_url(parquet_server):
     return f"{parquet_server}/simple.parquet"
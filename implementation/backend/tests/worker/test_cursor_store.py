@@ -0,0 +1,162 @@
+"""Tests for the on-disk query result cursor store.
+
+Covers: write_cursor / read_page paging and sorting, query key and owner
+checks, expiry and malformed ids, byte-budget eviction, execute_query
+(cursor=True) and its row cap, and WorkerPool re-executing cached results
+whose cursor has expired.
+"""
+
+from __future__ import annotations
+
+import os
+
+import polars as pl
+import pytest
+
+from app.services.worker_pool import WorkerPool
+from app.workers import cursor_store
+from app.workers.cursor_store import bind, exists, query_key, read_page, write_cursor
+from app.workers.data_worker import execute_query
+
+
+KEY = query_key("SELECT * FROM t", [{"url": "file:///t.parquet", "table_name": "t"}])
+
+
+@pytest.fixture(autouse=True)
+def cursor_dir(tmp_path, monkeypatch):
+    path = tmp_path / "cursors"
+    monkeypatch.setattr(cursor_store, "CURSOR_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def numbers():
+    return pl.DataFrame({"n": list(range(2500)), "label": [f"r{i}" for i in range(2500)]})
+
+
+class TestReadPage:
+    def test_pages_beyond_first_thousand_rows(self, numbers):
+        cursor_id = write_cursor(numbers, KEY)
+        page = read_page(cursor_id, offset=2000, limit=100)
+        assert page["total_rows"] == 2500
+        assert page["columns"] == ["n", "label"]
+        assert page["rows"][0] == [2000, "r2000"]
+        assert len(page["rows"]) == 100
+
+    def test_sorted_page(self, numbers):
+        cursor_id = write_cursor(numbers, KEY)
+        page = read_page(cursor_id, offset=0, limit=2, sort_by="n", descending=True)
+        assert page["rows"] == [[2499, "r2499"], [2498, "r2498"]]
+
+    def test_unknown_sort_column_raises(self, numbers):
+        cursor_id = write_cursor(numbers, KEY)
+        with pytest.raises(ValueError):
+            read_page(cursor_id, 0, 10, sort_by="nope")
+
+    def test_unknown_cursor_returns_none(self):
+        assert read_page("0" * 32, 0, 10) is None
+
+    def test_sidecar_metadata_is_returned(self, numbers):
+        cursor_id = write_cursor(numbers, KEY, limit_applied=True, total_rows=9000)
+        page = read_page(cursor_id, 0, 10)
+        assert page["limit_applied"] is True
+        assert page["total_rows"] == 2500
+        assert page["result_total_rows"] == 9000
+
+    def test_malformed_cursor_id_rejected(self):
+        assert read_page("../../etc/passwd", 0, 10) is None
+        assert not exists("../secret")
+
+
+class TestOwnership:
+    def test_other_query_key_is_refused(self, numbers):
+        cursor_id = write_cursor(numbers, KEY)
+        other = query_key("SELECT n FROM t", [{"url": "file:///t.parquet", "table_name": "t"}])
+        assert read_page(cursor_id, 0, 10, key=other) is None
+        assert read_page(cursor_id, 0, 10, key=KEY) is not None
+
+    def test_only_bound_owners_are_served(self, numbers):
+        cursor_id = write_cursor(numbers, KEY)
+        assert read_page(cursor_id, 0, 10, owner="conv-a") is None
+        assert bind(cursor_id, "conv-a")
+        assert bind(cursor_id, "conv-b")
+        assert read_page(cursor_id, 0, 10, owner="conv-a") is not None
+        assert read_page(cursor_id, 0, 10, owner="conv-b") is not None
+        assert read_page(cursor_id, 0, 10, owner="conv-c") is None
+
+    def test_bind_unknown_cursor_fails(self):
+        assert not bind("0" * 32, "conv-a")
+
+    def test_dataset_order_does_not_change_key(self):
+        a = {"url": "file:///a", "table_name": "a"}
+        b = {"url": "file:///b", "table_name": "b"}
+        assert query_key("SELECT 1", [a, b]) == query_key("SELECT 1", [b, a])
+
+
+class TestExpiry:
+    def test_expired_cursor_is_gone(self, numbers):
+        cursor_id = write_cursor(numbers, KEY)
+        path = os.path.join(cursor_store.CURSOR_DIR, cursor_id + ".arrow")
+        os.utime(path, (0, 0))
+        assert read_page(cursor_id, 0, 10) is None
+        assert not os.path.exists(path)
+        assert not os.path.exists(path[: -len(".arrow")] + ".json")
+
+    def test_byte_budget_evicts_oldest(self, numbers, monkeypatch):
+        first = write_cursor(numbers, KEY)
+        first_path = os.path.join(cursor_store.CURSOR_DIR, first + ".arrow")
+        older = os.path.getmtime(first_path) - 100
+        os.utime(first_path, (older, older))
+        monkeypatch.setattr(cursor_store, "MAX_CURSOR_BYTES", os.path.getsize(first_path))
+
+        second = write_cursor(numbers, KEY)
+
+        assert not exists(first)
+        assert exists(second)
+        assert not os.path.exists(first_path[: -len(".arrow")] + ".json")
+
+    def test_frame_over_budget_gets_no_cursor(self, numbers, monkeypatch, cursor_dir):
+        monkeypatch.setattr(cursor_store, "MAX_CURSOR_BYTES", 100)
+        assert write_cursor(numbers, KEY) is None
+        assert not cursor_dir.exists() or not os.listdir(cursor_dir)
+
+
+class TestExecuteQueryCursor:
+    def test_cursor_holds_full_result(self, tmp_path, numbers):
+        path = str(tmp_path / "numbers.parquet")
+        numbers.write_parquet(path)
+        datasets = [{"url": f"file://{path}", "table_name": "t"}]
+
+        result = execute_query("SELECT * FROM t", datasets, cursor=True)
+
+        assert len(result["rows"]) == 1000
+        key = query_key("SELECT * FROM t", datasets)
+        page = read_page(result["cursor_id"], offset=2400, limit=1000, key=key)
+        assert page["total_rows"] == 2500
+        assert len(page["rows"]) == 100
+
+    def test_cursor_capped_at_max_query_rows(self, tmp_path, numbers, monkeypatch):
+        from app.workers import data_worker
+
+        monkeypatch.setattr(data_worker, "MAX_QUERY_ROWS", 2000)
+        path = str(tmp_path / "numbers.parquet")
+        numbers.write_parquet(path)
+        datasets = [{"url": f"file://{path}", "table_name": "t"}]
+
+        result = execute_query("SELECT * FROM t LIMIT 100000000", datasets, cursor=True)
+
+        page = read_page(result["cursor_id"], offset=0, limit=10)
+        assert page["total_rows"] == 2000
+        assert page["result_total_rows"] == 2500
+
+    async def test_cached_result_with_expired_cursor_is_reexecuted(self, mock_process_pool):
+        pool = mock_process_pool
+        wp = WorkerPool(pool)
+        sql, datasets = "SELECT 1", [{"url": "http://x/d.parquet", "table_name": "t"}]
+        wp.query_cache.put(sql, datasets, {"rows": [], "columns": [], "total_rows": 0, "cursor_id": "0" * 32})
+        pool.apply_async.return_value.get.return_value = {"rows": [], "columns": [], "total_rows": 0}
+
+        cached = await wp.run_query(sql, datasets)
+        assert cached["cached"] is True
+        await wp.run_query(sql, datasets, cursor=True)
+        assert pool.apply_async.call_args[0][1] == (sql, datasets, "pickle", True)
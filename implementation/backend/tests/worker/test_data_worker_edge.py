@@ -3,7 +3,8 @@
 Covers:
 - extract_schema() with empty parquet (0 rows)
 - extract_schema() with a URL that returns 404
-- execute_query() with empty SQL, non-existent table, syntax errors, very long SQL
+- execute_query() with empty SQL, non-existent table, syntax errors, very long SQL,
+  running out of memory
 - _has_limit() and _is_select() helper edge cases
 - _collect_sample_values() with binary and null columns
 """
@@ -13,6 +14,7 @@ from __future__ import annotations
 import os
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import polars as pl
 import pytest
@@ -174,6 +176,31 @@ class TestExecuteQuerySyntaxError:
         assert result["error_type"] == "sql"
 
 
+class TestExecuteQueryMemoryError:
+    """execute_query() when the worker runs out of memory or Polars panics."""
+
+    def test_memory_error_returns_memory_error_type(self, sample_datasets):
+        """A MemoryError (worker address-space limit hit) is reported as 'memory'."""
+        with patch.object(pl.SQLContext, "execute", side_effect=MemoryError("boom")):
+            result = execute_query("SELECT * FROM table1", sample_datasets)
+
+        assert result["error_type"] == "memory"
+        assert "out of memory" in result["message"]
+
+    def test_polars_panic_returns_internal_error(self, sample_datasets):
+        """A Polars panic (a BaseException) is reported, not left to kill the worker."""
+        with patch.object(pl.SQLContext, "execute", side_effect=pl.exceptions.PanicException("boom")):
+            result = execute_query("SELECT * FROM table1", sample_datasets)
+
+        assert result["error_type"] == "internal"
+        assert result["details"] == "boom"
+
+    def test_keyboard_interrupt_propagates(self, sample_datasets):
+        with patch.object(pl.SQLContext, "execute", side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                execute_query("SELECT * FROM table1", sample_datasets)
+
+
 class TestExecuteQueryLongSQL:
     """execute_query() with moderately long SQL.
 
@@ -1,6 +1,7 @@
 """Tests for data_worker helper functions.
 
-Covers: _is_csv_file, _is_tsv_file, _is_select, _has_limit, _collect_sample_values
+Covers: _is_csv_file, _is_tsv_file, _is_select, _has_limit, _collect_sample_values,
+        _referenced_tables
 """
 from __future__ import annotations
 
@@ -13,6 +14,8 @@ from app.workers.data_worker import (
     _is_csv_file,
     _is_select,
     _is_tsv_file,
+    _referenced_tables,
+    execute_query,
 )
 
 
@@ -599,3 +602,71 @@ class TestCollectSampleValues:
 
         assert result is columns
         assert "sample_values" in columns[0]
+
+
+# ---------------------------------------------------------------------------
+# _referenced_tables
+# ---------------------------------------------------------------------------
+
+
+class TestReferencedTables:
+    """Tests for the SQL table-reference extractor."""
+
+    TABLES = ["table1", "table2", "Sales", "my table"]
+
+    def test_single_from(self):
+        assert _referenced_tables("SELECT * FROM table1", self.TABLES) == {"table1"}
+
+    def test_join(self):
+        sql = "SELECT * FROM table1 a JOIN table2 b ON a.id = b.id"
+        assert _referenced_tables(sql, self.TABLES) == {"table1", "table2"}
+
+    def test_subquery(self):
+        sql = "SELECT * FROM (SELECT id FROM table2 WHERE x > 1) sub"
+        assert _referenced_tables(sql, self.TABLES) == {"table2"}
+
+    def test_cte_body(self):
+        sql = "WITH recent AS (SELECT * FROM table2) SELECT * FROM recent"
+        assert _referenced_tables(sql, self.TABLES) == {"table2"}
+
+    def test_quoted_identifier_with_space(self):
+        sql = 'SELECT * FROM "my table"'
+        assert _referenced_tables(sql, self.TABLES) == {"my table"}
+
+    def test_bare_identifier_case_insensitive(self):
+        assert _referenced_tables("SELECT * FROM sales", self.TABLES) == {"Sales"}
+
+    def test_string_literal_not_a_reference(self):
+        sql = "SELECT 'table2' AS name FROM table1"
+        assert _referenced_tables(sql, self.TABLES) == {"table1"}
+
+    def test_comments_not_references(self):
+        sql = "-- uses table2\nSELECT * FROM table1 /* not table2 either */"
+        assert _referenced_tables(sql, self.TABLES) == {"table1"}
+
+    def test_escaped_quote_in_literal(self):
+        sql = "SELECT * FROM table1 WHERE name = 'it''s table2'"
+        assert _referenced_tables(sql, self.TABLES) == {"table1"}
+
+    def test_unterminated_quote_falls_back(self):
+        assert _referenced_tables("SELECT * FROM table1 WHERE x = 'oops", self.TABLES) is None
+
+    def test_no_known_table_falls_back(self):
+        assert _referenced_tables("SELECT 1", self.TABLES) is None
+
+
+class TestExecuteQueryRegistersReferencedTables:
+    """execute_query only scans the tables a statement references."""
+
+    def test_unreferenced_broken_dataset_is_not_scanned(self, tmp_path):
+        good = tmp_path / "good.parquet"
+        pl.DataFrame({"a": [1, 2]}).write_parquet(good)
+        datasets = [
+            {"url": f"file://{good}", "table_name": "good"},
+            {"url": f"file://{tmp_path / 'missing.parquet'}", "table_name": "broken"},
+        ]
+
+        result = execute_query("SELECT SUM(a) AS s FROM good", datasets)
+
+        assert "error_type" not in result
+        assert result["rows"] == [{"s": 3}]
@@ -28,20 +28,14 @@ class TestFetchSizeLimit(unittest.TestCase):
     @patch("app.workers.data_worker.urllib.request.urlopen")
     @patch("app.workers.data_worker.urllib.request.Request")
     def test_accepts_file_under_500mb(self, mock_req_cls, mock_urlopen, _mock_safety):
-        """Files under 500 MB should pass size check and proceed to magic bytes."""
-        # HEAD response
-        mock_head_resp = MagicMock()
-        mock_head_resp.headers.get.return_value = str(100 * 1024 * 1024)  # 100 MB
-        mock_head_resp.__enter__ = lambda s: s
-        mock_head_resp.__exit__ = MagicMock(return_value=False)
-
-        # GET response for magic bytes
-        mock_get_resp = MagicMock()
-        mock_get_resp.read.return_value = b"PAR1"
-        mock_get_resp.__enter__ = lambda s: s
-        mock_get_resp.__exit__ = MagicMock(return_value=False)
-
-        mock_urlopen.side_effect = [mock_head_resp, mock_get_resp]
+        """Files under 500 MB should pass the size check and the magic bytes check."""
+        # Ranged GET response: size header and the magic bytes
+        mock_resp = MagicMock()
+        mock_resp.headers.get.return_value = str(100 * 1024 * 1024)  # 100 MB
+        mock_resp.__enter__ = lambda s: s
+        mock_resp.__exit__ = MagicMock(return_value=False)
+        mock_resp.read.return_value = b"PAR1"
+        mock_urlopen.return_value = mock_resp
 
         result = fetch_and_validate("https://example.com/small.parquet")
         assert result["valid"] is True
@@ -51,19 +45,13 @@ class TestFetchSizeLimit(unittest.TestCase):
     @patch("app.workers.data_worker.urllib.request.Request")
     def test_allows_unknown_size(self, mock_req_cls, mock_urlopen, _mock_safety):
         """If Content-Length is missing, should proceed (size unknown)."""
-        # HEAD response with no Content-Length
-        mock_head_resp = MagicMock()
-        mock_head_resp.headers.get.return_value = None
-        mock_head_resp.__enter__ = lambda s: s
-        mock_head_resp.__exit__ = MagicMock(return_value=False)
-
-        # GET response for magic bytes
-        mock_get_resp = MagicMock()
-        mock_get_resp.read.return_value = b"PAR1"
-        mock_get_resp.__enter__ = lambda s: s
-        mock_get_resp.__exit__ = MagicMock(return_value=False)
-
-        mock_urlopen.side_effect = [mock_head_resp, mock_get_resp]
+        # Ranged GET response: size header and the magic bytes
+        mock_resp = MagicMock()
+        mock_resp.headers.get.return_value = None
+        mock_resp.__enter__ = lambda s: s
+        mock_resp.__exit__ = MagicMock(return_value=False)
+        mock_resp.read.return_value = b"PAR1"
+        mock_urlopen.return_value = mock_resp
 
         result = fetch_and_validate("https://example.com/unknown.parquet")
         assert result["valid"] is True
@@ -73,18 +61,12 @@ class TestFetchSizeLimit(unittest.TestCase):
     @patch("app.workers.data_worker.urllib.request.Request")
     def test_rejects_exactly_500mb(self, mock_req_cls, mock_urlopen, _mock_safety):
         """Files exactly at the 500 MB boundary should still pass (only > 500 MB rejected)."""
-        mock_head_resp = MagicMock()
-        mock_head_resp.headers.get.return_value = str(500 * 1024 * 1024)  # Exactly 500 MB
-        mock_head_resp.__enter__ = lambda s: s
-        mock_head_resp.__exit__ = MagicMock(return_value=False)
-
-        # GET response for magic bytes
-        mock_get_resp = MagicMock()
-        mock_get_resp.read.return_value = b"PAR1"
-        mock_get_resp.__enter__ = lambda s: s
-        mock_get_resp.__exit__ = MagicMock(return_value=False)
-
-        mock_urlopen.side_effect = [mock_head_resp, mock_get_resp]
+        mock_resp = MagicMock()
+        mock_resp.headers.get.return_value = str(500 * 1024 * 1024)  # Exactly 500 MB
+        mock_resp.__enter__ = lambda s: s
+        mock_resp.__exit__ = MagicMock(return_value=False)
+        mock_resp.read.return_value = b"PAR1"
+        mock_urlopen.return_value = mock_resp
 
         result = fetch_and_validate("https://example.com/exact500.parquet")
         assert result["valid"] is True
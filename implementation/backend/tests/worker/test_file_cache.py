@@ -1,7 +1,8 @@
 """Tests for file_cache module.
 
 Covers: _suffix_for_url, _cache_key, _cache_path, _ensure_cache_dir,
-        get_cached, clear_cache, cache_stats, _cleanup_stale_temps, _evict_lru
+        get_cached, clear_cache, cache_stats, _cleanup_stale_temps, _evict_lru,
+        transcode
 
 All tests use a temporary directory patched as CACHE_DIR to avoid
 touching the real cache on disk.
@@ -14,6 +15,7 @@ import os
 import time
 from unittest.mock import patch
 
+import polars as pl
 import pytest
 
 from app.workers import file_cache
@@ -26,8 +28,12 @@ from app.workers.file_cache import (
     _suffix_for_url,
     cache_stats,
     clear_cache,
+    clear_progress,
     get_cached,
+    read_progress,
+    report_progress,
     startup_cleanup,
+    transcode,
 )
 
 
@@ -489,6 +495,40 @@ class TestCleanupStaleTempsKeepsRecent:
         assert os.path.exists(regular_file)
 
 
+class TestProgressRecords:
+    """report_progress / read_progress / clear_progress round-trip per URL."""
+
+    URL = "https://example.com/data.parquet"
+
+    def test_round_trip(self):
+        report_progress(self.URL, "downloading", 10, 100)
+        assert read_progress(self.URL) == {"phase": "downloading", "done": 10, "total": 100}
+
+    def test_latest_record_wins(self):
+        report_progress(self.URL, "validating")
+        report_progress(self.URL, "reading")
+        assert read_progress(self.URL)["phase"] == "reading"
+
+    def test_missing_and_cleared(self):
+        assert read_progress(self.URL) is None
+        report_progress(self.URL, "validating")
+        clear_progress(self.URL)
+        assert read_progress(self.URL) is None
+
+    def test_records_are_per_url(self):
+        report_progress(self.URL, "reading")
+        assert read_progress("https://example.com/other.parquet") is None
+
+    def test_stale_records_are_cleaned_up(self, cache_dir):
+        report_progress(self.URL, "downloading", 1, 2)
+        path = os.path.join(cache_dir, file_cache.PROGRESS_SUBDIR, _cache_key(self.URL))
+        os.utime(path, (time.time() - 7200, time.time() - 7200))
+
+        _cleanup_stale_temps()
+
+        assert read_progress(self.URL) is None
+
+
 # ---------------------------------------------------------------------------
 # 14. _evict_lru: evicts oldest files when over size limit
 # ---------------------------------------------------------------------------
@@ -534,7 +574,7 @@ class TestEvictLru:
             _evict_lru()
 
             # All files should remain
-            remaining = os.listdir(cache_dir)
+            remaining = [f for f in os.listdir(cache_dir) if not f.startswith(".")]
             assert len(remaining) == 3
 
     def test_eviction_stops_at_limit(self, cache_dir):
@@ -551,14 +591,14 @@ class TestEvictLru:
             _evict_lru()
 
             # Need to evict 200 bytes = 2 files, keeping 2
-            remaining = [f for f in os.listdir(cache_dir) if not f.startswith(".download_")]
+            remaining = [f for f in os.listdir(cache_dir) if not f.startswith(".")]
             assert len(remaining) == 2
 
     def test_eviction_with_empty_dir(self, cache_dir):
         """Eviction on an empty directory does nothing."""
         with patch.object(file_cache, "MAX_CACHE_BYTES", 0):
             _evict_lru()  # Should not raise
-            assert len(os.listdir(cache_dir)) == 0
+            assert [f for f in os.listdir(cache_dir) if not f.startswith(".")] == []
 
     def test_eviction_when_dir_missing(self):
         """Eviction when cache directory doesn't exist does not raise."""
@@ -613,7 +653,7 @@ class TestStartupCleanup:
 
             startup_cleanup()
 
-            remaining = [f for f in os.listdir(cache_dir) if not f.startswith(".download_")]
+            remaining = [f for f in os.listdir(cache_dir) if not f.startswith(".")]
             assert len(remaining) == 2
 
     def test_returns_zero_on_clean_cache(self, cache_dir):
@@ -632,3 +672,75 @@ class TestStartupCleanup:
         startup_cleanup()
         startup_cleanup()
         assert os.path.isdir(file_cache.CACHE_DIR)
+
+
+# ---------------------------------------------------------------------------
+# 16. transcode: CSV-family sources to cached Parquet
+# ---------------------------------------------------------------------------
+
+
+def _write_csv(path, rows: int = 50) -> str:
+    pl.DataFrame({
+        "id": list(range(rows)),
+        "kind": ["a", "b"] * (rows // 2),
+        "day": ["2024-01-02"] * rows,
+    }).write_csv(path)
+    return str(path)
+
+
+def _scan(path: str):
+    return pl.scan_csv(path, try_parse_dates=True, infer_schema_length=10000)
+
+
+class TestTranscode:
+    """Tests for transcode()."""
+
+    def test_writes_parquet_with_inferred_schema(self, cache_dir, tmp_path):
+        source = _write_csv(tmp_path / "data.csv")
+        out = transcode(_scan(source), source)
+
+        assert out.startswith(cache_dir)
+        assert out.endswith(file_cache.TRANSCODE_SUFFIX)
+        schema = pl.read_parquet_schema(out)
+        assert schema["id"] == pl.Int64
+        assert schema["day"] == pl.Date
+        assert pl.read_parquet(out).height == 50
+
+    def test_reuses_transcode_of_unchanged_source(self, cache_dir, tmp_path):
+        source = _write_csv(tmp_path / "data.csv")
+        first = transcode(_scan(source), source)
+        mtime = os.path.getmtime(first)
+
+        assert transcode(_scan(source), source) == first
+        assert os.path.getmtime(first) >= mtime
+
+    def test_changed_source_gets_new_transcode(self, cache_dir, tmp_path):
+        source = _write_csv(tmp_path / "data.csv")
+        first = transcode(_scan(source), source)
+        _write_csv(tmp_path / "data.csv", rows=20)
+        os.utime(source, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+
+        second = transcode(_scan(source), source)
+        assert second != first
+        assert pl.read_parquet(second).height == 20
+
+    def test_unparseable_source_returns_none(self, cache_dir, tmp_path):
+        source = tmp_path / "bad.csv"
+        source.write_text("n\n" + "1\n" * 10 + "not-a-number\n")
+        lazy_frame = pl.scan_csv(str(source), infer_schema_length=5)
+
+        assert transcode(lazy_frame, str(source)) is None
+        assert not [n for n in os.listdir(cache_dir) if n.startswith(".transcode_")]
+
+    def test_missing_source_returns_none(self, cache_dir, tmp_path):
+        assert transcode(None, str(tmp_path / "missing.csv")) is None
+
+    def test_stale_transcode_temp_is_cleaned(self, cache_dir):
+        stale = os.path.join(cache_dir, ".transcode_old.parquet")
+        with open(stale, "wb") as f:
+            f.write(b"partial")
+        old = time.time() - file_cache.STALE_TEMP_MAX_AGE - 10
+        os.utime(stale, (old, old))
+
+        assert _cleanup_stale_temps() == 1
+        assert not os.path.exists(stale)
@@ -244,14 +244,14 @@ class TestCacheStatsEdgeCases:
         assert stats["total_size_bytes"] == 0
 
     def test_counts_all_file_types(self, cache_dir):
-        """Files of any extension are counted."""
+        """Files of any extension are counted; in-progress temp files are not."""
         for name in ["a.parquet", "b.csv", "c.tsv", "d.csv.gz", ".download_tmp"]:
             with open(os.path.join(cache_dir, name), "wb") as f:
                 f.write(b"x" * 50)
 
         stats = cache_stats()
-        assert stats["file_count"] == 5
-        assert stats["total_size_bytes"] == 250
+        assert stats["file_count"] == 4
+        assert stats["total_size_bytes"] == 200
 
     def test_zero_byte_files_counted(self, cache_dir):
         """Zero-byte files are counted in file_count but add nothing to size."""
@@ -359,9 +359,7 @@ class TestStartupCleanupEdgeCases:
             assert not os.path.exists(stale)
 
             # LRU eviction should have removed some cached files
-            remaining = [
-                f for f in os.listdir(cache_dir) if not f.startswith(".download_")
-            ]
+            remaining = [f for f in os.listdir(cache_dir) if not f.startswith(".")]
             assert len(remaining) <= 2
 
     def test_empty_cache_dir_returns_zero(self, cache_dir):
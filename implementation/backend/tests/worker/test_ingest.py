@@ -0,0 +1,154 @@
+"""Dataset ingest tests.
+
+Tests: ingest_dataset validates a URL and extracts its schema in one task,
+reusing the validation request's answer instead of probing the URL again;
+dataset_version reports the same version without reading the data.
+"""
+
+from __future__ import annotations
+
+import urllib.request
+from unittest.mock import patch
+
+import polars as pl
+import pytest
+
+from app.workers import data_worker, file_cache, range_cache
+from app.workers.data_worker import dataset_version, ingest_dataset
+from app.workers.scan_registry import registry, remote_fingerprint
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path):
+    """Fresh cache dir and empty per-process scan state for each test."""
+    registry.clear()
+    with patch.object(file_cache, "CACHE_DIR", str(tmp_path / "cache")), \
+            patch.dict(range_cache._objects, clear=True), \
+            patch.dict(range_cache._by_url, clear=True):
+        yield
+    registry.clear()
+
+
+@pytest.fixture
+def remote(tmp_path, range_server):
+    """A small Parquet file and a CSV behind a range-capable server."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    df = pl.DataFrame({"id": list(range(50)), "name": [f"n{i}" for i in range(50)]})
+    df.write_parquet(data_dir / "data.parquet")
+    df.write_csv(data_dir / "data.csv")
+    (data_dir / "bad.parquet").write_bytes(b"not parquet at all")
+    base_url, _server = range_server(data_dir)
+    return base_url
+
+
+@pytest.fixture
+def methods():
+    """Record the HTTP method of every urllib request made during the test."""
+    seen: list[str] = []
+    real = urllib.request.urlopen
+
+    def urlopen(req, *args, **kwargs):
+        seen.append(req.get_method() if isinstance(req, urllib.request.Request) else "GET")
+        return real(req, *args, **kwargs)
+
+    with patch.object(urllib.request, "urlopen", urlopen):
+        yield seen
+
+
+class TestIngestDataset:
+    def test_remote_parquet(self, remote):
+        result = ingest_dataset(f"{remote}/data.parquet")
+
+        assert result["valid"] is True
+        assert result["row_count"] == 50
+        assert [c["name"] for c in result["columns"]] == ["id", "name"]
+        assert result["file_size_bytes"] > 0
+        assert result["version"] is not None
+
+    def test_remote_parquet_is_probed_once(self, remote, methods):
+        ingest_dataset(f"{remote}/data.parquet")
+
+        assert "HEAD" not in methods
+
+    def test_version_matches_a_head_fingerprint(self, remote):
+        url = f"{remote}/data.parquet"
+        result = ingest_dataset(url)
+
+        assert result["version"] == file_cache.version_id(remote_fingerprint(url))
+
+    def test_remote_csv_is_probed_once(self, remote, methods):
+        result = ingest_dataset(f"{remote}/data.csv")
+
+        assert result["valid"] is True
+        assert result["row_count"] == 50
+        assert methods.count("HEAD") == 1
+
+    def test_local_file(self, tmp_path):
+        path = tmp_path / "local.parquet"
+        pl.DataFrame({"x": [1, 2, 3]}).write_parquet(path)
+
+        result = ingest_dataset(f"file://{path}")
+
+        assert result["valid"] is True
+        assert result["row_count"] == 3
+        assert result["file_size_bytes"] == path.stat().st_size
+
+    def test_progress_is_recorded_then_cleared(self, remote):
+        url = f"{remote}/data.csv"
+        phases: list[str] = []
+        real = file_cache.report_progress
+
+        def record(u, phase, done=None, total=None):
+            phases.append(phase)
+            real(u, phase, done, total)
+
+        with patch.object(data_worker, "_report_progress", record), \
+                patch.object(file_cache, "report_progress", record):
+            ingest_dataset(url)
+
+        assert phases[:2] == ["validating", "reading"]
+        assert "downloading" in phases
+        assert file_cache.read_progress(url) is None
+
+    def test_validation_failure(self, remote):
+        result = ingest_dataset(f"{remote}/bad.parquet")
+
+        assert result["valid"] is False
+        assert result["error"] == "Not a valid parquet file"
+        assert result["error_type"] == "validation"
+
+    def test_schema_failure_is_reported_as_invalid(self, remote):
+        failure = {"error_type": "validation", "message": "Failed to extract schema: boom", "details": "boom"}
+        with patch.object(data_worker, "_extract_schema", return_value=failure):
+            result = ingest_dataset(f"{remote}/data.parquet")
+
+        assert result == {
+            "valid": False,
+            "error": "Failed to extract schema: boom",
+            "error_type": "validation",
+            "details": "boom",
+        }
+
+
+class TestDatasetVersion:
+    def test_remote_matches_ingest(self, remote, methods):
+        url = f"{remote}/data.parquet"
+        loaded = ingest_dataset(url)
+        methods.clear()
+
+        assert dataset_version(url) == {"version": loaded["version"]}
+        assert methods == ["HEAD"]
+
+    def test_local_changes_with_the_file(self, tmp_path):
+        path = tmp_path / "local.parquet"
+        pl.DataFrame({"x": [1, 2, 3]}).write_parquet(path)
+        url = f"file://{path}"
+        loaded = ingest_dataset(url)
+
+        assert dataset_version(url) == {"version": loaded["version"]}
+        pl.DataFrame({"x": [1, 2, 3, 4]}).write_parquet(path)
+        assert dataset_version(url)["version"] != loaded["version"]
+
+    def test_missing_local_file(self, tmp_path):
+        assert dataset_version(f"file://{tmp_path}/missing.parquet") == {"version": None}
@@ -0,0 +1,133 @@
+"""Parquet footer statistics tests.
+
+Tests: row counts and column statistics read from the footer, the local
+and ranged remote reads, and the schema extractor using them.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+import polars as pl
+import pytest
+
+from app.workers.data_worker import extract_schema
+from app.workers.parquet_footer import read_footer_stats
+
+
+@pytest.fixture
+def multi_group_parquet(tmp_path):
+    path = tmp_path / "groups.parquet"
+    pl.DataFrame(
+        {
+            "i8": pl.Series([-5, 3, None, 7, -1, 0], dtype=pl.Int8),
+            "u32": pl.Series([1, 4_000_000_000, 2, 3, None, 5], dtype=pl.UInt32),
+            "f32": pl.Series([1.5, -2.5, 0.0, None, 3.25, 1.0], dtype=pl.Float32),
+            "all_null_first": pl.Series([None, None, 4, 9, 2, None], dtype=pl.Int64),
+            "s": ["b", "a", "c", None, "e", "d"],
+            "d": [date(2020, 1, i + 1) for i in range(6)],
+        }
+    ).write_parquet(path, row_group_size=2)
+    return path
+
+
+class TestReadFooterStats:
+    def test_row_counts_per_row_group(self, multi_group_parquet):
+        stats = read_footer_stats(str(multi_group_parquet))
+
+        assert stats.num_rows == 6
+        assert stats.row_group_rows == [2, 2, 2]
+
+    def test_numeric_ranges_across_row_groups(self, multi_group_parquet):
+        columns = read_footer_stats(str(multi_group_parquet)).columns
+
+        assert (columns["i8"].min, columns["i8"].max) == (-5, 7)
+        assert (columns["u32"].min, columns["u32"].max) == (1, 4_000_000_000)
+        assert (columns["f32"].min, columns["f32"].max) == (-2.5, 3.25)
+
+    def test_null_counts_summed(self, multi_group_parquet):
+        columns = read_footer_stats(str(multi_group_parquet)).columns
+
+        assert columns["i8"].null_count == 1
+        assert columns["s"].null_count == 1
+        assert columns["all_null_first"].null_count == 3
+
+    def test_all_null_row_group_does_not_hide_range(self, multi_group_parquet):
+        column = read_footer_stats(str(multi_group_parquet)).columns["all_null_first"]
+
+        assert (column.min, column.max) == (2, 9)
+
+    def test_non_numeric_columns_have_no_range(self, multi_group_parquet):
+        columns = read_footer_stats(str(multi_group_parquet)).columns
+
+        assert columns["s"].min is None and columns["s"].max is None
+        assert columns["d"].min is None and columns["d"].max is None
+
+    def test_not_parquet_returns_none(self, parquet_dir):
+        assert read_footer_stats(str(parquet_dir / "not_parquet.csv")) is None
+
+    def test_missing_file_returns_none(self, tmp_path):
+        assert read_footer_stats(str(tmp_path / "missing.parquet")) is None
+
+    def test_remote_footer_via_range_request(self, multi_group_parquet, range_server):
+        base_url, server = range_server(multi_group_parquet.parent)
+
+        stats = read_footer_stats(f"{base_url}/groups.parquet")
+
+        assert stats.num_rows == 6
+        assert (stats.columns["i8"].min, stats.columns["i8"].max) == (-5, 7)
+        assert all(r.startswith("bytes=") for r in server.requests)
+
+    def test_server_without_ranges_returns_none(self, simple_parquet_url):
+        # The fixture server answers ranged requests with a full 200.
+        assert read_footer_stats(simple_parquet_url) is None
+
+
+class TestSchemaFromFooter:
+    def test_stats_match_footer(self, multi_group_parquet):
+        result = extract_schema(str(multi_group_parquet))
+
+        assert result["row_count"] == 6
+        stats = {c["name"]: c["column_stats"] for c in result["columns"]}
+        assert stats["i8"] == {"null_count": 1, "min": -5, "max": 7}
+        assert stats["s"] == {"null_count": 1, "unique_count": 6}  # n_unique counts null
+
+    def test_large_file_reads_no_rows_for_stats(self, tmp_path, monkeypatch):
+        import app.workers.data_worker as dw
+
+        path = tmp_path / "numeric.parquet"
+        pl.DataFrame({"a": range(1000), "b": [0.5] * 1000}).write_parquet(path, row_group_size=100)
+        monkeypatch.setattr(dw, "EXACT_UNIQUE_MAX_ROWS", 10)
+        selects = []
+        real_select = pl.LazyFrame.select
+        monkeypatch.setattr(
+            pl.LazyFrame, "select",
+            lambda self, *a, **kw: selects.append(a) or real_select(self, *a, **kw),
+        )
+
+        result = extract_schema(str(path))
+
+        assert result["row_count"] == 1000
+        assert {c["name"]: c["column_stats"] for c in result["columns"]}["a"] == {"min": 0, "max": 999}
+        assert selects == []
+
+    def test_samples_come_from_first_row_group(self, tmp_path):
+        path = tmp_path / "samples.parquet"
+        pl.DataFrame({"g": ["first"] * 10 + ["second"] * 10}).write_parquet(path, row_group_size=10)
+
+        result = extract_schema(str(path))
+
+        assert result["columns"][0]["sample_values"] == ["first"]
+
+    def test_string_cardinality_estimated_above_threshold(self, tmp_path, monkeypatch):
+        import app.workers.data_worker as dw
+
+        path = tmp_path / "strings.parquet"
+        pl.DataFrame({"s": [f"v{i % 7}" for i in range(50)]}).write_parquet(path)
+        monkeypatch.setattr(dw, "EXACT_UNIQUE_MAX_ROWS", 10)
+
+        result = extract_schema(str(path))
+
+        stats = result["columns"][0]["column_stats"]
+        assert stats["unique_count"] == 7
+        assert stats["unique_count_approximate"] is True
@@ -21,9 +21,11 @@ class TestPoolLifecycle:
         """POOL-1: Pool starts with default 4 workers."""
         pool = start(pool_size=4)
         try:
-            # start() returns a WorkerPool wrapper; check the inner pool
+            # start() returns a WorkerPool wrapper with one single-worker
+            # Pool ("lane") per worker
             assert isinstance(pool, WorkerPool)
-            assert pool._pool._processes == 4
+            assert len(pool._lanes) == 4
+            assert all(lane._processes == 1 for lane in pool._lanes)
         finally:
             pool.shutdown()
 
@@ -31,7 +33,7 @@ class TestPoolLifecycle:
         """POOL-2: Pool size is configurable."""
         pool = start(pool_size=2)
         try:
-            assert pool._pool._processes == 2
+            assert len(pool._lanes) == 2
         finally:
             pool.shutdown()
 
@@ -71,3 +73,38 @@ class TestPoolLifecycle:
 
         # The join should have completed (not hung indefinitely)
         # If we got here, shutdown worked properly
+
+
+@pytest.mark.slow
+class TestAsyncTaskBridge:
+    """Worker tasks are awaited through asyncio futures, not executor threads."""
+
+    async def test_concurrent_tasks_use_no_executor_threads(self, monkeypatch):
+        import asyncio
+
+        from app.services.worker_pool import _apply
+
+        loop = asyncio.get_running_loop()
+
+        def _no_executor(*args, **kwargs):
+            raise AssertionError("run_in_executor should not be used")
+
+        monkeypatch.setattr(loop, "run_in_executor", _no_executor)
+        pool = start(pool_size=2)
+        try:
+            results = await asyncio.gather(
+                *(_apply(pool._pool, pow, (2, n)) for n in range(8))
+            )
+            assert results == [2 ** n for n in range(8)]
+        finally:
+            pool.shutdown()
+
+    async def test_worker_exception_is_raised(self):
+        from app.services.worker_pool import _apply
+
+        pool = start(pool_size=1)
+        try:
+            with pytest.raises(ZeroDivisionError):
+                await _apply(pool._pool, divmod, (1, 0))
+        finally:
+            pool.shutdown()
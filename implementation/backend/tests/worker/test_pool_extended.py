@@ -19,7 +19,6 @@ import pytest
 
 from app.services.worker_pool import (
     DEFAULT_POOL_SIZE,
-    MAX_TASKS_PER_CHILD,
     QUERY_TIMEOUT,
     WorkerPool,
     shutdown,
@@ -27,8 +26,12 @@ from app.services.worker_pool import (
     _run_query,
     _validate_url,
     _get_schema,
+    _ingest_dataset,
+    _dataset_version,
     _profile_column,
     _profile_columns,
+    _sample_dataset,
+    _sketch_column,
 )
 
 
@@ -37,19 +40,6 @@ from app.services.worker_pool import (
 # ---------------------------------------------------------------------------
 
 
-def _make_mock_pool():
-    """Create a MagicMock that looks like multiprocessing.pool.Pool."""
-    pool = MagicMock(spec=multiprocessing.pool.Pool)
-    return pool
-
-
-def _make_worker_pool(pool=None):
-    """Create a WorkerPool with a mock inner pool."""
-    if pool is None:
-        pool = _make_mock_pool()
-    return WorkerPool(pool)
-
-
 def _make_async_result(return_value=None, side_effect=None):
     """Create a mock AsyncResult whose .get() returns a value or raises."""
     ar = MagicMock()
@@ -68,9 +58,9 @@ def _make_async_result(return_value=None, side_effect=None):
 class TestCacheIntegration:
     """Tests for in-memory and persistent cache interplay in run_query."""
 
-    async def test_in_memory_cache_hit_returns_cached_flag(self):
+    async def test_in_memory_cache_hit_returns_cached_flag(self, mock_process_pool):
         """When the in-memory cache has a result, return it with cached=True."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT 1"
         datasets = [{"url": "http://example.com/data.parquet", "table_name": "t"}]
         cached_result = {"rows": [[1]], "columns": ["1"], "total_rows": 1}
@@ -84,9 +74,9 @@ class TestCacheIntegration:
         # The actual pool should never be called
         wp._pool.apply_async.assert_not_called()
 
-    async def test_persistent_cache_hit_promotes_to_memory(self):
+    async def test_persistent_cache_hit_promotes_to_memory(self, mock_process_pool):
         """When persistent cache has a result, promote it to in-memory and return cached=True."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT * FROM t"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         persistent_result = {"rows": [[42]], "columns": ["val"], "total_rows": 1}
@@ -112,9 +102,9 @@ class TestCacheIntegration:
         # Pool should not have been called
         wp._pool.apply_async.assert_not_called()
 
-    async def test_persistent_cache_miss_falls_through_to_worker(self):
+    async def test_persistent_cache_miss_falls_through_to_worker(self, mock_process_pool):
         """When persistent cache returns None, execute query in the pool."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT 1"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         worker_result = {"rows": [[1]], "columns": ["1"], "total_rows": 1}
@@ -139,9 +129,9 @@ class TestCacheIntegration:
         assert "cached" not in result
         wp._pool.apply_async.assert_called_once()
 
-    async def test_persistent_cache_error_falls_back_to_worker(self):
+    async def test_persistent_cache_error_falls_back_to_worker(self, mock_process_pool):
         """When persistent cache raises, log warning and execute query anyway."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT 1"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         worker_result = {"rows": [[1]], "columns": ["1"], "total_rows": 1}
@@ -161,9 +151,9 @@ class TestCacheIntegration:
         # Should still succeed via the worker
         assert result["rows"] == [[1]]
 
-    async def test_persistent_cache_store_failure_does_not_break_response(self):
+    async def test_persistent_cache_store_failure_does_not_break_response(self, mock_process_pool):
         """When storing to persistent cache fails, the query result is still returned."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT 1"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         worker_result = {"rows": [[1]], "columns": ["1"], "total_rows": 1}
@@ -185,9 +175,9 @@ class TestCacheIntegration:
 
         assert result == worker_result
 
-    async def test_no_db_pool_skips_persistent_cache(self):
+    async def test_no_db_pool_skips_persistent_cache(self, mock_process_pool):
         """When db_pool is None, skip persistent cache entirely."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         assert wp._db_pool is None  # default
 
         sql = "SELECT 1"
@@ -209,9 +199,9 @@ class TestCacheIntegration:
 class TestTimeoutBehavior:
     """Tests for timeout handling across all async wrappers."""
 
-    async def test_validate_url_timeout_returns_error_dict(self):
+    async def test_validate_url_timeout_returns_error_dict(self, mock_process_pool):
         """validate_url returns a timeout error dict on TimeoutError."""
-        pool = _make_mock_pool()
+        pool = mock_process_pool
         ar = _make_async_result(side_effect=multiprocessing.TimeoutError())
         pool.apply_async.return_value = ar
 
@@ -219,9 +209,9 @@ class TestTimeoutBehavior:
         assert result["error_type"] == "timeout"
         assert "URL validation timed out" in result["message"]
 
-    async def test_get_schema_timeout_returns_error_dict(self):
+    async def test_get_schema_timeout_returns_error_dict(self, mock_process_pool):
         """get_schema returns a timeout error dict on TimeoutError."""
-        pool = _make_mock_pool()
+        pool = mock_process_pool
         ar = _make_async_result(side_effect=multiprocessing.TimeoutError())
         pool.apply_async.return_value = ar
 
@@ -229,9 +219,29 @@ class TestTimeoutBehavior:
         assert result["error_type"] == "timeout"
         assert "Schema extraction timed out" in result["message"]
 
-    async def test_run_query_timeout_returns_error_dict(self):
+    async def test_ingest_dataset_timeout_returns_error_dict(self, mock_process_pool):
+        """ingest_dataset returns a timeout error dict on TimeoutError."""
+        pool = mock_process_pool
+        ar = _make_async_result(side_effect=multiprocessing.TimeoutError())
+        pool.apply_async.return_value = ar
+
+        result = await _ingest_dataset(pool, "http://example.com/data.parquet")
+        assert result["error_type"] == "timeout"
+        assert "Dataset loading timed out" in result["message"]
+
+    async def test_dataset_version_timeout_returns_error_dict(self, mock_process_pool):
+        """dataset_version returns a timeout error dict on TimeoutError."""
+        pool = mock_process_pool
+        ar = _make_async_result(side_effect=multiprocessing.TimeoutError())
+        pool.apply_async.return_value = ar
+
+        result = await _dataset_version(pool, "http://example.com/data.parquet")
+        assert result["error_type"] == "timeout"
+        assert "Version check timed out" in result["message"]
+
+    async def test_run_query_timeout_returns_error_dict(self, mock_process_pool):
         """run_query returns a timeout error dict on TimeoutError."""
-        pool = _make_mock_pool()
+        pool = mock_process_pool
         ar = _make_async_result(side_effect=multiprocessing.TimeoutError())
         pool.apply_async.return_value = ar
 
@@ -240,9 +250,9 @@ class TestTimeoutBehavior:
         assert "Query execution timed out" in result["message"]
         assert str(QUERY_TIMEOUT) in result["details"]
 
-    async def test_profile_columns_timeout_returns_error_dict(self):
+    async def test_profile_columns_timeout_returns_error_dict(self, mock_process_pool):
         """profile_columns returns a timeout error dict on TimeoutError."""
-        pool = _make_mock_pool()
+        pool = mock_process_pool
         ar = _make_async_result(side_effect=multiprocessing.TimeoutError())
         pool.apply_async.return_value = ar
 
@@ -250,9 +260,9 @@ class TestTimeoutBehavior:
         assert result["error_type"] == "timeout"
         assert "Column profiling timed out" in result["message"]
 
-    async def test_profile_column_timeout_returns_error_dict(self):
+    async def test_profile_column_timeout_returns_error_dict(self, mock_process_pool):
         """profile_column returns a timeout error dict on TimeoutError."""
-        pool = _make_mock_pool()
+        pool = mock_process_pool
         ar = _make_async_result(side_effect=multiprocessing.TimeoutError())
         pool.apply_async.return_value = ar
 
@@ -260,6 +270,26 @@ class TestTimeoutBehavior:
         assert result["error_type"] == "timeout"
         assert "col1" in result["details"]
 
+    async def test_sketch_column_timeout_returns_error_dict(self, mock_process_pool):
+        """sketch_column returns a timeout error dict on TimeoutError."""
+        pool = mock_process_pool
+        ar = _make_async_result(side_effect=multiprocessing.TimeoutError())
+        pool.apply_async.return_value = ar
+
+        result = await _sketch_column(pool, "http://x.com/d.parquet", "col1", "Int64")
+        assert result["error_type"] == "timeout"
+        assert "Column sketch timed out" in result["message"]
+
+    async def test_sample_dataset_timeout_returns_error_dict(self, mock_process_pool):
+        """sample_dataset returns a timeout error dict on TimeoutError."""
+        pool = mock_process_pool
+        ar = _make_async_result(side_effect=multiprocessing.TimeoutError())
+        pool.apply_async.return_value = ar
+
+        result = await _sample_dataset(pool, "http://x.com/d.parquet", "tail", 10)
+        assert result["error_type"] == "timeout"
+        assert "Preview sampling timed out" in result["message"]
+
 
 # ---------------------------------------------------------------------------
 # 3. Error handling during pool operations
@@ -269,9 +299,9 @@ class TestTimeoutBehavior:
 class TestPoolErrorHandling:
     """Tests for unexpected exceptions during pool operations."""
 
-    async def test_validate_url_unexpected_exception(self):
+    async def test_validate_url_unexpected_exception(self, mock_process_pool):
         """validate_url wraps unexpected exceptions into an internal error dict."""
-        pool = _make_mock_pool()
+        pool = mock_process_pool
         ar = _make_async_result(side_effect=ValueError("bad url"))
         pool.apply_async.return_value = ar
 
@@ -279,9 +309,9 @@ class TestPoolErrorHandling:
         assert result["error_type"] == "internal"
         assert "bad url" in result["details"]
 
-    async def test_get_schema_unexpected_exception(self):
+    async def test_get_schema_unexpected_exception(self, mock_process_pool):
         """get_schema wraps unexpected exceptions into an internal error dict."""
-        pool = _make_mock_pool()
+        pool = mock_process_pool
         ar = _make_async_result(side_effect=OSError("disk error"))
         pool.apply_async.return_value = ar
 
@@ -289,9 +319,19 @@ class TestPoolErrorHandling:
         assert result["error_type"] == "internal"
         assert "disk error" in result["details"]
 
-    async def test_run_query_unexpected_exception(self):
+    async def test_ingest_dataset_unexpected_exception(self, mock_process_pool):
+        """ingest_dataset wraps unexpected exceptions into an internal error dict."""
+        pool = mock_process_pool
+        ar = _make_async_result(side_effect=OSError("disk error"))
+        pool.apply_async.return_value = ar
+
+        result = await _ingest_dataset(pool, "http://example.com/data.parquet")
+        assert result["error_type"] == "internal"
+        assert "disk error" in result["details"]
+
+    async def test_run_query_unexpected_exception(self, mock_process_pool):
         """run_query wraps unexpected exceptions into an internal error dict."""
-        pool = _make_mock_pool()
+        pool = mock_process_pool
         ar = _make_async_result(side_effect=RuntimeError("worker crashed"))
         pool.apply_async.return_value = ar
 
@@ -299,19 +339,40 @@ class TestPoolErrorHandling:
         assert result["error_type"] == "internal"
         assert "worker crashed" in result["details"]
 
-    async def test_profile_columns_unexpected_exception(self):
-        """profile_columns wraps unexpected exceptions into an internal error dict."""
-        pool = _make_mock_pool()
+    async def test_profile_columns_memory_error(self, mock_process_pool):
+        """profile_columns reports a MemoryError as a memory error dict."""
+        pool = mock_process_pool
         ar = _make_async_result(side_effect=MemoryError("out of memory"))
         pool.apply_async.return_value = ar
 
         result = await _profile_columns(pool, "http://example.com/data.parquet")
-        assert result["error_type"] == "internal"
+        assert result["error_type"] == "memory"
         assert "out of memory" in result["details"]
 
-    async def test_profile_column_unexpected_exception(self):
+    async def test_worker_killed_at_memory_limit_is_memory_error(self, mock_process_pool):
+        from app.services.worker_pool import WorkerCrashedError
+
+        pool = mock_process_pool
+        pool.apply_async.return_value = _make_async_result(
+            side_effect=WorkerCrashedError(-9, out_of_memory=True),
+        )
+
+        result = await _profile_columns(pool, "http://example.com/data.parquet")
+        assert result["error_type"] == "memory"
+
+    async def test_other_worker_death_is_a_crash(self, mock_process_pool):
+        from app.services.worker_pool import WorkerCrashedError
+
+        pool = mock_process_pool
+        pool.apply_async.return_value = _make_async_result(side_effect=WorkerCrashedError(-11))
+
+        result = await _profile_columns(pool, "http://example.com/data.parquet")
+        assert result["error_type"] == "internal"
+        assert "crashed" in result["message"]
+
+    async def test_profile_column_unexpected_exception(self, mock_process_pool):
         """profile_column wraps unexpected exceptions into an internal error dict."""
-        pool = _make_mock_pool()
+        pool = mock_process_pool
         ar = _make_async_result(side_effect=KeyError("missing_col"))
         pool.apply_async.return_value = ar
 
@@ -319,18 +380,18 @@ class TestPoolErrorHandling:
         assert result["error_type"] == "internal"
         assert "missing_col" in result["details"]
 
-    async def test_pool_apply_async_raises_immediately(self):
+    async def test_pool_apply_async_raises_immediately(self, mock_process_pool):
         """If apply_async itself raises (e.g., pool terminated), error is caught."""
-        pool = _make_mock_pool()
+        pool = mock_process_pool
         pool.apply_async.side_effect = ValueError("Pool not running")
 
         result = await _validate_url(pool, "http://example.com/data.parquet")
         assert result["error_type"] == "internal"
         assert "Pool not running" in result["details"]
 
-    async def test_run_query_pool_apply_async_raises(self):
+    async def test_run_query_pool_apply_async_raises(self, mock_process_pool):
         """If apply_async raises on run_query (e.g., pool terminated), error is caught."""
-        pool = _make_mock_pool()
+        pool = mock_process_pool
         pool.apply_async.side_effect = OSError("Pool terminated")
 
         result = await _run_query(pool, "SELECT 1", [])
@@ -346,9 +407,9 @@ class TestPoolErrorHandling:
 class TestRunQueryEdgeCases:
     """Edge cases for run_query via WorkerPool."""
 
-    async def test_run_query_empty_result(self):
+    async def test_run_query_empty_result(self, mock_process_pool):
         """A query returning zero rows still caches and returns normally."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT * FROM t WHERE 1=0"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         empty_result = {"rows": [], "columns": ["id", "val"], "total_rows": 0}
@@ -365,9 +426,9 @@ class TestRunQueryEdgeCases:
         assert cached is not None
         assert cached["total_rows"] == 0
 
-    async def test_run_query_large_result(self):
+    async def test_run_query_large_result(self, mock_process_pool):
         """A query returning many rows caches and returns successfully."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT * FROM big_table"
         datasets = [{"url": "http://example.com/big.parquet", "table_name": "big_table"}]
         big_rows = [{"id": i, "val": f"row_{i}"} for i in range(1000)]
@@ -384,9 +445,9 @@ class TestRunQueryEdgeCases:
         assert result["total_rows"] == 1000
         assert len(result["rows"]) == 1000
 
-    async def test_run_query_error_result_not_cached(self):
+    async def test_run_query_error_result_not_cached(self, mock_process_pool):
         """Error results from the worker should not be stored in in-memory cache."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "INVALID SQL"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         error_result = {"error_type": "sql_error", "message": "syntax error"}
@@ -401,9 +462,9 @@ class TestRunQueryEdgeCases:
         cached = wp._query_cache.get(sql, datasets)
         assert cached is None
 
-    async def test_run_query_same_sql_different_datasets(self):
+    async def test_run_query_same_sql_different_datasets(self, mock_process_pool):
         """Same SQL with different datasets should produce separate cache entries."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT COUNT(*) FROM t"
         ds1 = [{"url": "http://example.com/a.parquet", "table_name": "t"}]
         ds2 = [{"url": "http://example.com/b.parquet", "table_name": "t"}]
@@ -428,9 +489,9 @@ class TestRunQueryEdgeCases:
         assert c1["rows"] == [[10]]
         assert c2["rows"] == [[20]]
 
-    async def test_run_query_empty_datasets_list(self):
+    async def test_run_query_empty_datasets_list(self, mock_process_pool):
         """run_query with an empty datasets list still works."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT 1"
         datasets = []
         worker_result = {"rows": [[1]], "columns": ["1"], "total_rows": 1}
@@ -450,9 +511,9 @@ class TestRunQueryEdgeCases:
 class TestProfileEdgeCases:
     """Edge cases for profile_column and profile_columns wrappers."""
 
-    async def test_profile_columns_success(self):
+    async def test_profile_columns_success(self, mock_process_pool):
         """profile_columns delegates to the pool and returns the result."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         expected = {
             "columns": [
                 {"name": "id", "type": "Int64", "null_count": 0},
@@ -465,9 +526,9 @@ class TestProfileEdgeCases:
         result = await wp.profile_columns("http://example.com/d.parquet")
         assert result == expected
 
-    async def test_profile_column_success(self):
+    async def test_profile_column_success(self, mock_process_pool):
         """profile_column delegates to the pool with correct arguments."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         expected = {
             "column": "score",
             "type": "Float64",
@@ -491,9 +552,9 @@ class TestProfileEdgeCases:
             "Float64",
         )
 
-    async def test_profile_column_empty_column_name(self):
+    async def test_profile_column_empty_column_name(self, mock_process_pool):
         """profile_column with empty string column name still delegates to pool."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         expected = {"error_type": "validation", "message": "Column not found"}
         ar = _make_async_result(return_value=expected)
         wp._pool.apply_async.return_value = ar
@@ -501,9 +562,9 @@ class TestProfileEdgeCases:
         result = await wp.profile_column("http://example.com/d.parquet", "t", "", "Utf8")
         assert result["error_type"] == "validation"
 
-    async def test_profile_columns_with_special_url_characters(self):
+    async def test_profile_columns_with_special_url_characters(self, mock_process_pool):
         """profile_columns handles URLs with special characters."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         expected = {"columns": []}
         ar = _make_async_result(return_value=expected)
         wp._pool.apply_async.return_value = ar
@@ -521,53 +582,53 @@ class TestProfileEdgeCases:
 class TestWorkerPoolMisc:
     """Miscellaneous tests for WorkerPool API surface."""
 
-    def test_query_cache_property(self):
+    def test_query_cache_property(self, mock_process_pool):
         """query_cache property exposes the QueryCache instance."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         cache = wp.query_cache
         from app.services.query_cache import QueryCache
 
         assert isinstance(cache, QueryCache)
 
-    def test_db_pool_property_initially_none(self):
+    def test_db_pool_property_initially_none(self, mock_process_pool):
         """db_pool property is None when not set."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         assert wp.db_pool is None
 
-    def test_set_db_pool(self):
+    def test_set_db_pool(self, mock_process_pool):
         """set_db_pool stores the db pool reference."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         mock_db = MagicMock()
         wp.set_db_pool(mock_db)
         assert wp.db_pool is mock_db
 
-    def test_shutdown_calls_terminate_and_join(self):
+    def test_shutdown_calls_terminate_and_join(self, mock_process_pool):
         """WorkerPool.shutdown() terminates and joins the inner pool."""
-        mock_pool = _make_mock_pool()
+        mock_pool = mock_process_pool
         wp = WorkerPool(mock_pool)
         wp.shutdown()
         mock_pool.terminate.assert_called_once()
         mock_pool.join.assert_called_once()
 
-    def test_module_shutdown_on_worker_pool_wrapper(self):
+    def test_module_shutdown_on_worker_pool_wrapper(self, mock_process_pool):
         """Module-level shutdown() delegates to WorkerPool.shutdown()."""
-        mock_pool = _make_mock_pool()
+        mock_pool = mock_process_pool
         wp = WorkerPool(mock_pool)
         shutdown(wp)
         mock_pool.terminate.assert_called_once()
         mock_pool.join.assert_called_once()
 
-    def test_module_shutdown_on_raw_pool(self):
+    def test_module_shutdown_on_raw_pool(self, mock_process_pool):
         """Module-level shutdown() works on a raw multiprocessing.Pool too."""
-        mock_pool = _make_mock_pool()
+        mock_pool = mock_process_pool
         # Make it NOT a WorkerPool instance
         shutdown(mock_pool)
         mock_pool.terminate.assert_called_once()
         mock_pool.join.assert_called_once()
 
-    async def test_run_query_stores_to_persistent_cache_on_success(self):
+    async def test_run_query_stores_to_persistent_cache_on_success(self, mock_process_pool):
         """On successful query, result is stored in persistent cache."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT 1"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         worker_result = {"rows": [[1]], "columns": ["1"], "total_rows": 1}
@@ -592,9 +653,9 @@ class TestWorkerPoolMisc:
         assert result == worker_result
         mock_pc.put.assert_awaited_once_with(sql, datasets, worker_result, mock_write_conn)
 
-    async def test_run_query_releases_read_conn_even_on_persistent_cache_get_error(self):
+    async def test_run_query_releases_read_conn_even_on_persistent_cache_get_error(self, mock_process_pool):
         """Read connection is always released even if persistent_cache.get fails."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         sql = "SELECT 1"
         datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
         worker_result = {"rows": [[1]], "columns": ["1"], "total_rows": 1}
@@ -619,9 +680,9 @@ class TestWorkerPoolMisc:
         mock_db_pool.release_read.assert_awaited_once_with(mock_read_conn)
         assert result == worker_result
 
-    async def test_validate_url_delegates_correctly(self):
+    async def test_validate_url_delegates_correctly(self, mock_process_pool):
         """WorkerPool.validate_url calls _validate_url with correct arguments."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         expected = {"valid": True, "url": "http://example.com/data.parquet"}
         ar = _make_async_result(return_value=expected)
         wp._pool.apply_async.return_value = ar
@@ -629,12 +690,59 @@ class TestWorkerPoolMisc:
         result = await wp.validate_url("http://example.com/data.parquet")
         assert result == expected
 
-    async def test_get_schema_delegates_correctly(self):
+    async def test_get_schema_delegates_correctly(self, mock_process_pool):
         """WorkerPool.get_schema calls _get_schema with correct arguments."""
-        wp = _make_worker_pool()
+        wp = WorkerPool(mock_process_pool)
         expected = {"columns": [{"name": "id", "type": "Int64"}], "row_count": 5}
         ar = _make_async_result(return_value=expected)
         wp._pool.apply_async.return_value = ar
 
         result = await wp.get_schema("http://example.com/data.parquet")
         assert result == expected
+
+
+# ---------------------------------------------------------------------------
+# Scan registry statistics
+# ---------------------------------------------------------------------------
+
+
+class TestScanRegistryStats:
+    """WorkerPool aggregates the per-query scan registry counters."""
+
+    async def test_counters_accumulate_across_queries(self, mock_process_pool):
+        wp = WorkerPool(mock_process_pool)
+        datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
+        for i, delta in enumerate([{"hits": 0, "misses": 1}, {"hits": 1, "misses": 0}]):
+            ar = _make_async_result(return_value={
+                "rows": [], "columns": [], "total_rows": 0, "scan_registry": delta,
+            })
+            wp._pool.apply_async.return_value = ar
+            await wp.run_query(f"SELECT {i}", datasets)
+
+        assert wp.scan_registry_stats == {"hits": 1, "misses": 1, "hit_rate": 50.0}
+
+    async def test_registry_counters_not_cached_or_returned(self, mock_process_pool):
+        wp = WorkerPool(mock_process_pool)
+        datasets = [{"url": "http://example.com/d.parquet", "table_name": "t"}]
+        ar = _make_async_result(return_value={
+            "rows": [], "columns": [], "total_rows": 0,
+            "scan_registry": {"hits": 2, "misses": 0},
+        })
+        wp._pool.apply_async.return_value = ar
+
+        result = await wp.run_query("SELECT 1", datasets)
+        cached = await wp.run_query("SELECT 1", datasets)
+
+        assert "scan_registry" not in result
+        assert "scan_registry" not in cached
+        assert wp.scan_registry_stats["hits"] == 2
+
+
+class TestAsyncTaskTimeout:
+    """The asyncio-side timeout maps to the usual timeout error dict."""
+
+    async def test_unanswered_task_times_out(self, mock_process_pool):
+        mock_process_pool.settle = False
+        with patch("app.services.worker_pool.QUERY_TIMEOUT", 0.01):
+            result = await _run_query(mock_process_pool, "SELECT 1", [])
+        assert result["error_type"] == "timeout"
@@ -5,6 +5,7 @@ Tests profile_columns worker function for correct stats computation.
 
 from __future__ import annotations
 
+import polars as pl
 import pytest
 
 from app.workers.data_worker import profile_columns
@@ -98,3 +99,34 @@ class TestProfileColumns:
 
         assert "error" in result
         assert isinstance(result["error"], str)
+
+    def test_profile_reports_top_values_and_histograms(self, simple_parquet_url):
+        """Discrete columns get top values and numeric columns a histogram."""
+        result = profile_columns(simple_parquet_url)
+
+        by_name = {p["name"]: p for p in result["profiles"]}
+        assert result["row_count"] == 10
+        assert len(by_name["name"]["top_values"]) == 5
+        assert sum(by_name["value"]["histogram"]["counts"]) == 10
+
+    def test_profile_row_group_sampling(self, tmp_path):
+        """row_groups sampling reads row groups from across the file."""
+        path = tmp_path / "groups.parquet"
+        pl.DataFrame({"x": list(range(300_000))}).write_parquet(path, row_group_size=50_000)
+
+        result = profile_columns(f"file://{path}", sampling="row_groups")
+
+        profile = result["profiles"][0]
+        assert result["row_count"] == 100_000
+        assert result["sampling"] == "row_groups"
+        assert profile["max"] > 100_000
+
+    def test_profile_full_sampling(self, tmp_path):
+        """full sampling profiles every row."""
+        path = tmp_path / "full.parquet"
+        pl.DataFrame({"x": list(range(150_000))}).write_parquet(path)
+
+        result = profile_columns(f"file://{path}", sampling="full")
+
+        assert result["row_count"] == 150_000
+        assert result["profiles"][0]["max"] == 149_999
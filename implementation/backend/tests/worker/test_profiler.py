@@ -0,0 +1,129 @@
+"""Column profiler tests.
+
+Tests: profile_frame computes every statistic in fused streaming
+aggregations over the sample its sampling strategy selects.
+"""
+
+from __future__ import annotations
+
+import polars as pl
+import pytest
+
+from app.workers import profiler
+from app.workers.profiler import profile_frame, sample_frame
+
+
+@pytest.fixture
+def frame():
+    return pl.LazyFrame({
+        "n": [1, 2, None, 4, 5, 6, 7, 8, 9, 10],
+        "s": ["a", "bb", None, "dddd", "a", "a", "b", "b", "c", "d"],
+        "f": [1.5] * 10,
+    })
+
+
+def _by_name(result: dict) -> dict:
+    return {p["name"]: p for p in result["profiles"]}
+
+
+class TestProfileFrame:
+    def test_basic_stats(self, frame):
+        result = profile_frame(frame)
+        by_name = _by_name(result)
+
+        assert result["row_count"] == 10
+        assert result["sampling"] == "prefix"
+        assert by_name["n"]["null_count"] == 1
+        assert by_name["n"]["null_percent"] == 10.0
+        assert (by_name["n"]["min"], by_name["n"]["max"]) == (1, 10)
+        assert by_name["n"]["mean"] == 5.78
+        assert (by_name["s"]["min_length"], by_name["s"]["max_length"]) == (1, 4)
+
+    def test_top_values(self, frame):
+        top = _by_name(profile_frame(frame))["s"]["top_values"]
+
+        assert len(top) == profiler.TOP_K
+        assert top[:2] == [{"value": "a", "count": 3}, {"value": "b", "count": 2}]
+
+    def test_floats_have_no_top_values(self, frame):
+        assert "top_values" not in _by_name(profile_frame(frame))["f"]
+
+    def test_histogram(self, frame):
+        histogram = _by_name(profile_frame(frame))["n"]["histogram"]
+
+        assert len(histogram["edges"]) == profiler.HISTOGRAM_BINS + 1
+        assert histogram["edges"][0] == 1.0
+        assert histogram["edges"][-1] == 10.0
+        assert sum(histogram["counts"]) == 9  # non-null values
+        assert histogram["counts"][-1] == 1   # the maximum lands in the last bin
+
+    def test_constant_column_histogram(self, frame):
+        histogram = _by_name(profile_frame(frame))["f"]["histogram"]
+
+        assert histogram["counts"][0] == 10
+        assert sum(histogram["counts"]) == 10
+
+    def test_all_null_numeric_column_has_no_histogram(self):
+        lf = pl.LazyFrame({"x": pl.Series([None, None], dtype=pl.Int64)})
+
+        profile = _by_name(profile_frame(lf))["x"]
+
+        assert profile["min"] is None
+        assert "histogram" not in profile
+
+    def test_column_named_like_the_count_field(self):
+        lf = pl.LazyFrame({"count": [1, 1, 2]})
+
+        top = _by_name(profile_frame(lf))["count"]["top_values"]
+
+        assert top[0] == {"value": 1, "count": 2}
+
+    def test_prefix_sample_is_bounded(self):
+        lf = pl.LazyFrame({"x": list(range(1000))})
+
+        result = profile_frame(lf, sample_rows=100)
+
+        assert result["row_count"] == 100
+        assert _by_name(result)["x"]["max"] == 99
+
+    def test_full_profiles_every_row(self):
+        lf = pl.LazyFrame({"x": list(range(1000))})
+
+        result = profile_frame(lf, "full", sample_rows=100)
+
+        assert result["row_count"] == 1000
+        assert _by_name(result)["x"]["max"] == 999
+
+    def test_unknown_strategy(self, frame):
+        with pytest.raises(ValueError, match="Unknown sampling strategy"):
+            profile_frame(frame, "everything")
+
+
+class TestSampleFrame:
+    def test_row_groups_spread_over_the_file(self):
+        lf = pl.LazyFrame({"x": list(range(1000))})
+
+        sample = sample_frame(lf, "row_groups", 200, [100] * 10).collect()["x"].to_list()
+
+        assert len(sample) == 200
+        assert sample[:100] == list(range(100))
+        assert sample[100:] == list(range(500, 600))
+
+    def test_row_groups_trim_the_last_group(self):
+        lf = pl.LazyFrame({"x": list(range(1000))})
+
+        sample = sample_frame(lf, "row_groups", 150, [100] * 10).collect()
+
+        assert sample.height == 150
+
+    def test_row_groups_without_footer_falls_back_to_prefix(self):
+        lf = pl.LazyFrame({"x": list(range(1000))})
+
+        sample = sample_frame(lf, "row_groups", 100).collect()["x"].to_list()
+
+        assert sample == list(range(100))
+
+    def test_small_file_is_read_whole(self):
+        lf = pl.LazyFrame({"x": list(range(10))})
+
+        assert sample_frame(lf, "row_groups", 100, [5, 5]).collect().height == 10
@@ -0,0 +1,228 @@
+"""Block range cache tests.
+
+Tests: remote Parquet reads served from cached blocks through the local
+range proxy -- projection-sized fetches, reuse, pinned footers, eviction
+and upstream changes.
+"""
+
+from __future__ import annotations
+
+import os
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+import polars as pl
+import pytest
+
+from app.workers import file_cache, range_cache
+from app.workers.data_worker import execute_query
+
+BLOCK = 64 * 1024
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path):
+    """Fresh cache dir, small blocks and empty per-process state for each test."""
+    cache_dir = str(tmp_path / "cache")
+    with patch.object(file_cache, "CACHE_DIR", cache_dir), \
+            patch.object(range_cache, "BLOCK_BYTES", BLOCK), \
+            patch.object(range_cache, "_cached_bytes", None), \
+            patch.dict(range_cache._objects, clear=True), \
+            patch.dict(range_cache._by_url, clear=True), \
+            patch.dict(range_cache._counters, {k: 0 for k in range_cache._counters}):
+        yield cache_dir
+
+
+@pytest.fixture
+def wide_remote(tmp_path, range_server):
+    """A 40-column, 4-row-group Parquet file behind a range-capable server."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    path = data_dir / "wide.parquet"
+    pl.DataFrame(
+        {f"c{i}": pl.int_range(0, 100_000, eager=True) * (i + 1) for i in range(40)}
+    ).write_parquet(path, row_group_size=25_000, compression="uncompressed")
+    base_url, server = range_server(data_dir)
+    return f"{base_url}/wide.parquet", path, server
+
+
+def _blocks(cache_dir: str, suffix: str) -> list[str]:
+    root = os.path.join(cache_dir, range_cache.BLOCKS_SUBDIR)
+    return [
+        name
+        for key in os.listdir(root)
+        for name in os.listdir(os.path.join(root, key))
+        if name.endswith(suffix)
+    ]
+
+
+class TestProxyReads:
+    def test_projection_fetches_only_its_columns(self, wide_remote):
+        url, path, _server = wide_remote
+        proxy = range_cache.open_url(url)
+
+        result = pl.scan_parquet(proxy).select(pl.col("c1").sum(), pl.col("c2").max()).collect()
+
+        expected = pl.read_parquet(path).select(pl.col("c1").sum(), pl.col("c2").max())
+        assert result.equals(expected)
+        assert range_cache.stats()["bytes_fetched"] < os.path.getsize(path) / 5
+
+    def test_repeated_query_is_served_from_blocks(self, wide_remote):
+        url, _path, server = wide_remote
+        proxy = range_cache.open_url(url)
+        query = pl.scan_parquet(proxy).select(pl.col("c5").sum())
+        first = query.collect()
+        requests = len(server.requests)
+
+        second = pl.scan_parquet(proxy).select(pl.col("c5").sum()).collect()
+
+        assert second.equals(first)
+        assert len(server.requests) == requests
+        assert range_cache.stats()["blocks_hit"] > 0
+
+    def test_contiguous_missing_blocks_use_one_request(self, wide_remote):
+        url, path, server = wide_remote
+        range_cache.open_url(url)
+        obj = range_cache._by_url[url]
+        before = len(server.requests)
+
+        data = range_cache.read_range(obj, 10, 5 * BLOCK)
+
+        assert data == path.read_bytes()[10:5 * BLOCK + 1]
+        assert len(server.requests) == before + 1
+
+    def test_footer_blocks_are_pinned(self, wide_remote, _isolated_cache):
+        url, _path, _server = wide_remote
+
+        range_cache.open_url(url)
+
+        assert _blocks(_isolated_cache, ".pin")
+        assert not _blocks(_isolated_cache, ".blk")
+
+    def test_proxied_url_needs_open(self, wide_remote):
+        url, _path, _server = wide_remote
+        assert range_cache.proxied_url(url) is None
+
+        proxy = range_cache.open_url(url)
+
+        assert range_cache.proxied_url(url) == proxy
+        range_cache.forget(url)
+        assert range_cache.proxied_url(url) is None
+
+    def test_server_without_ranges_is_not_proxied(self, simple_parquet_url):
+        assert range_cache.open_url(simple_parquet_url) is None
+
+    def test_unreachable_url_is_not_proxied(self):
+        assert range_cache.open_url("http://127.0.0.1:9/missing.parquet") is None
+
+
+class TestEviction:
+    def test_unpinned_blocks_evicted_before_footer(self, wide_remote, _isolated_cache):
+        url, _path, _server = wide_remote
+        proxy = range_cache.open_url(url)
+        with patch.object(range_cache, "MAX_BLOCK_CACHE_BYTES", 4 * BLOCK):
+            pl.scan_parquet(proxy).select(pl.col("c0", "c1", "c2")).collect()
+
+        total = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _dirs, names in os.walk(_isolated_cache)
+            for name in names
+        )
+        assert total <= 4 * BLOCK
+        assert _blocks(_isolated_cache, ".pin")
+
+    def test_concurrent_fetches_keep_pinned_footer(self, wide_remote, _isolated_cache):
+        from concurrent.futures import ThreadPoolExecutor
+
+        url, _path, _server = wide_remote
+        proxy = range_cache.open_url(url)
+        with patch.object(range_cache, "MAX_BLOCK_CACHE_BYTES", 4 * BLOCK):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(
+                    lambda i: pl.scan_parquet(proxy).select(pl.col(f"c{i}")).collect(),
+                    range(8),
+                ))
+
+        assert _blocks(_isolated_cache, ".pin")
+        assert range_cache._cached_bytes <= 4 * BLOCK
+
+    def test_disk_is_scanned_only_when_over_budget(self, wide_remote):
+        url, _path, _server = wide_remote
+        proxy = range_cache.open_url(url)
+
+        with patch.object(range_cache, "_scan_blocks", wraps=range_cache._scan_blocks) as scan:
+            pl.scan_parquet(proxy).select(pl.col("c0")).collect()
+
+        assert scan.call_count == 0
+
+    def test_block_deleted_elsewhere_counts_as_freed(self, wide_remote, _isolated_cache):
+        url, _path, _server = wide_remote
+        range_cache.open_url(url)
+        pinned = len(_blocks(_isolated_cache, ".pin")) * BLOCK
+        entries = range_cache._scan_blocks()
+        gone = next(e for e in entries if e[0])  # a pinned block another process removed
+        os.unlink(gone[3])
+
+        with patch.object(range_cache, "_scan_blocks", return_value=entries), \
+                patch.object(range_cache, "MAX_BLOCK_CACHE_BYTES", pinned - 1):
+            range_cache._evict_blocks(1)
+
+        assert len(_blocks(_isolated_cache, ".pin")) == len(entries) - 1
+
+
+class TestUpstreamChanges:
+    def test_changed_object_gets_new_key(self, wide_remote):
+        url, path, _server = wide_remote
+        old = range_cache.open_url(url)
+
+        pl.DataFrame({"x": [1, 2, 3]}).write_parquet(path)
+        new = range_cache.open_url(url)
+
+        assert new != old
+        assert pl.read_parquet(new)["x"].to_list() == [1, 2, 3]
+
+    def test_change_after_open_fails_instead_of_mixing(self, wide_remote):
+        url, path, _server = wide_remote
+        proxy = range_cache.open_url(url)
+
+        pl.DataFrame({"x": [1, 2, 3]}).write_parquet(path)
+        req = urllib.request.Request(proxy, headers={"Range": "bytes=0-99"})
+
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            urllib.request.urlopen(req, timeout=10)
+        assert exc_info.value.code == 502
+
+
+class TestParseRange:
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("bytes=0-9", (0, 9)),
+            ("bytes=5-", (5, 99)),
+            ("bytes=-10", (90, 99)),
+            ("bytes=90-500", (90, 99)),
+            ("bytes=-500", (0, 99)),
+            ("bytes=50-10", None),
+            ("bytes=0-1,5-6", None),
+            ("items=0-1", None),
+            (None, None),
+        ],
+    )
+    def test_parse(self, header, expected):
+        assert range_cache._parse_range(header, 100) == expected
+
+
+class TestDataWorkerUsesProxy:
+    def test_remote_query_goes_through_block_cache(self, wide_remote):
+        url, _path, _server = wide_remote
+
+        result = execute_query(
+            "SELECT SUM(c3) AS s FROM t",
+            [{"url": url, "table_name": "t"}],
+        )
+
+        assert "error_type" not in result
+        assert result["rows"][0]["s"] == sum(range(100_000)) * 4
+        assert range_cache.proxied_url(url) is not None
+        assert range_cache.stats()["blocks_fetched"] > 0
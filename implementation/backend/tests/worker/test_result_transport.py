@@ -0,0 +1,119 @@
+"""Tests for the Arrow IPC result transport.
+
+Covers: write_result / read_result round trip and cleanup, stale file
+removal, execute_query(transport="arrow_ipc"), materialization in
+_run_query, and the rows_as_lists / rows_as_dicts accessors.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from unittest.mock import patch
+
+import polars as pl
+import pytest
+
+from app.services.worker_pool import _run_query, rows_as_dicts, rows_as_lists, start
+from app.workers import result_transport
+from app.workers.data_worker import execute_query
+from app.workers.result_transport import cleanup_stale, read_result, write_result
+
+
+@pytest.fixture(autouse=True)
+def result_dir(tmp_path, monkeypatch):
+    path = tmp_path / "results"
+    monkeypatch.setattr(result_transport, "RESULT_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def parquet_file(tmp_path):
+    path = tmp_path / "data.parquet"
+    pl.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}).write_parquet(path)
+    return str(path)
+
+
+class TestRoundTrip:
+    def test_read_returns_written_frame(self):
+        df = pl.DataFrame({"a": [1, 2], "b": ["x", None]})
+        handle = write_result(df)
+        assert handle["size_bytes"] > 0
+        assert read_result(handle).equals(df)
+
+    def test_read_removes_file(self):
+        handle = write_result(pl.DataFrame({"a": [1]}))
+        read_result(handle)
+        assert not os.path.exists(handle["path"])
+
+
+class TestCleanupStale:
+    def test_removes_only_old_results(self, result_dir):
+        old = write_result(pl.DataFrame({"a": [1]}))
+        new = write_result(pl.DataFrame({"a": [2]}))
+        os.utime(old["path"], (0, 0))
+
+        assert cleanup_stale() == 1
+        assert not os.path.exists(old["path"])
+        assert os.path.exists(new["path"])
+
+    def test_missing_directory_is_noop(self):
+        assert cleanup_stale() == 0
+
+
+class TestExecuteQueryArrowTransport:
+    def test_returns_handle_instead_of_rows(self, parquet_file):
+        datasets = [{"url": f"file://{parquet_file}", "table_name": "t"}]
+        result = execute_query("SELECT a, b FROM t ORDER BY a", datasets, "arrow_ipc")
+
+        assert "rows" not in result
+        assert result["total_rows"] == 3
+        df = read_result(result["result_ipc"])
+        assert df.rows() == [(1, "x"), (2, "y"), (3, "z")]
+
+    async def test_run_query_materializes_list_rows(self, parquet_file, mock_process_pool):
+        datasets = [{"url": f"file://{parquet_file}", "table_name": "t"}]
+        worker_result = execute_query("SELECT a, b FROM t ORDER BY a", datasets, "arrow_ipc")
+        path = worker_result["result_ipc"]["path"]
+        pool = mock_process_pool
+        pool.apply_async.return_value.get.return_value = worker_result
+
+        result = await _run_query(pool, "SELECT a, b FROM t", datasets, "arrow_ipc")
+
+        assert pool.apply_async.call_args[0][1][2] == "arrow_ipc"
+        assert result["row_format"] == "list"
+        assert result["rows"] == [[1, "x"], [2, "y"], [3, "z"]]
+        assert not os.path.exists(path)
+
+    def test_start_rejects_unknown_transport(self):
+        with pytest.raises(ValueError):
+            start(1, "carrier_pigeon")
+
+
+class TestRowAccessors:
+    DICT_RESULT = {"columns": ["a", "b"], "rows": [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}]}
+    LIST_RESULT = {"columns": ["a", "b"], "rows": [[1, "x"], [2, "y"]], "row_format": "list"}
+
+    @pytest.mark.parametrize("result", [DICT_RESULT, LIST_RESULT])
+    def test_rows_as_lists(self, result):
+        assert rows_as_lists(result) == [[1, "x"], [2, "y"]]
+        assert rows_as_lists(result, ["b"]) == [["x"], ["y"]]
+
+    @pytest.mark.parametrize("result", [DICT_RESULT, LIST_RESULT])
+    def test_rows_as_dicts(self, result):
+        assert rows_as_dicts(result, limit=1) == [{"a": 1, "b": "x"}]
+
+
+class TestLateResults:
+    async def test_late_result_after_timeout_is_discarded(self, mock_process_pool):
+        handle = write_result(pl.DataFrame({"a": [1]}))
+        mock_process_pool.settle = False
+
+        with patch("app.services.worker_pool.QUERY_TIMEOUT", 0.01):
+            result = await _run_query(mock_process_pool, "SELECT 1", [], "arrow_ipc")
+        assert result["error_type"] == "timeout"
+
+        callback, _error_callback = mock_process_pool.callbacks[-1]
+        callback({"result_ipc": handle, "columns": ["a"], "total_rows": 1})
+        await asyncio.sleep(0.01)  # let the loop run the settle callback
+        assert not os.path.exists(handle["path"])
@@ -0,0 +1,163 @@
+"""Preview sampling tests.
+
+Tests: tail, random and stratified samples return the right rows, are
+deterministic for a seed, read only a few row groups of a large file and
+fall back to a streaming reservoir sample without row group sizes; the
+preview snapshot stored at load time holds the first rows and a fixed
+random sample.
+"""
+
+from __future__ import annotations
+
+import polars as pl
+import pytest
+
+from app.workers import sampler
+from app.workers.data_worker import extract_schema, sample_dataset
+from app.workers.sampler import (
+    preview_snapshot,
+    random_rows,
+    sample_rows,
+    stratified_rows,
+    tail_rows,
+)
+
+ROWS = 1_000
+ROW_GROUP_ROWS = [100] * 10
+
+
+@pytest.fixture(scope="module")
+def lf(tmp_path_factory):
+    path = tmp_path_factory.mktemp("sampler") / "data.parquet"
+    pl.DataFrame({
+        "x": list(range(ROWS)),
+        "g": [None if i % 7 == 0 else f"g{i % 3}" for i in range(ROWS)],
+    }).write_parquet(path, row_group_size=100)
+    return pl.scan_parquet(path)
+
+
+class TestTail:
+    @pytest.mark.parametrize("row_group_rows", [ROW_GROUP_ROWS, None])
+    def test_last_rows_last_first(self, lf, row_group_rows):
+        assert tail_rows(lf, 3, row_group_rows)["x"].to_list() == [999, 998, 997]
+
+    def test_more_than_all_rows(self, lf):
+        assert tail_rows(lf, 5_000, ROW_GROUP_ROWS).height == ROWS
+
+
+class TestRandom:
+    @pytest.mark.parametrize("row_group_rows", [ROW_GROUP_ROWS, None])
+    def test_seeded_sample_is_deterministic(self, lf, row_group_rows):
+        first = random_rows(lf, 20, row_group_rows, seed=3)["x"].to_list()
+        second = random_rows(lf, 20, row_group_rows, seed=3)["x"].to_list()
+
+        assert first == second
+        assert len(set(first)) == 20
+        assert first == sorted(first)
+
+    def test_samples_differ_by_seed(self, lf):
+        assert random_rows(lf, 20, ROW_GROUP_ROWS, seed=1)["x"].to_list() != (
+            random_rows(lf, 20, ROW_GROUP_ROWS, seed=2)["x"].to_list()
+        )
+
+    def test_reads_at_most_max_row_groups(self, lf, monkeypatch):
+        monkeypatch.setattr(sampler, "MAX_ROW_GROUPS", 2)
+
+        rows = random_rows(lf, 50, ROW_GROUP_ROWS, seed=5)["x"].to_list()
+
+        assert len(rows) == 50
+        assert len({r // 100 for r in rows}) <= 2
+
+    def test_picks_enough_row_groups_for_the_sample(self, lf, monkeypatch):
+        monkeypatch.setattr(sampler, "MAX_ROW_GROUPS", 2)
+
+        rows = random_rows(lf, 350, ROW_GROUP_ROWS, seed=5)["x"].to_list()
+
+        assert len(set(rows)) == 350
+        assert len({r // 100 for r in rows}) == 4
+
+    def test_more_than_all_rows(self, lf):
+        assert random_rows(lf, 5_000, ROW_GROUP_ROWS).height == ROWS
+        assert random_rows(lf, 5_000, None).height == ROWS
+
+
+class TestStratified:
+    def test_every_stratum_is_represented(self, lf):
+        df = stratified_rows(lf, 8, "g", ROW_GROUP_ROWS, seed=1)
+
+        counts = dict(df["g"].value_counts().iter_rows())
+        assert df.height == 8
+        assert set(counts) == {"g0", "g1", "g2", None}
+        assert all(count == 2 for count in counts.values())
+        assert df["x"].to_list() == sorted(df["x"].to_list())
+
+    def test_same_sample_with_and_without_row_groups(self, lf):
+        assert stratified_rows(lf, 6, "g", ROW_GROUP_ROWS, seed=4).equals(
+            stratified_rows(lf, 6, "g", None, seed=4)
+        )
+
+    def test_small_strata_are_exhausted(self):
+        small = pl.LazyFrame({"g": ["a"] * 10 + ["b"], "x": list(range(11))})
+
+        df = stratified_rows(small, 5, "g", seed=0)
+
+        assert df.height == 5
+        assert df.filter(pl.col("g") == "b")["x"].to_list() == [10]
+
+
+class TestPreviewSnapshot:
+    def test_head_and_fixed_random_sample(self, lf):
+        snapshot = preview_snapshot(lf, ROW_GROUP_ROWS, n=10)
+
+        assert snapshot["columns"] == ["x", "g"]
+        assert snapshot["dtypes"] == ["Int64", "String"]
+        assert [row[0] for row in snapshot["head"]] == list(range(10))
+        random_ids = [row[0] for row in snapshot["random"]]
+        assert len(set(random_ids)) == 10
+        assert random_ids == sorted(random_ids)
+        assert preview_snapshot(lf, ROW_GROUP_ROWS, n=10) == snapshot
+
+    def test_small_dataset(self):
+        small = pl.LazyFrame({"x": [1, 2, 3]})
+
+        snapshot = preview_snapshot(small)
+
+        assert snapshot["head"] == [(1,), (2,), (3,)]
+        assert snapshot["random"] == [(1,), (2,), (3,)]
+
+    def test_stored_by_extract_schema(self, tmp_path):
+        path = tmp_path / "data.parquet"
+        pl.DataFrame({"x": list(range(500))}).write_parquet(path, row_group_size=50)
+
+        preview = extract_schema(f"file://{path}")["preview"]
+
+        assert len(preview["head"]) == sampler.SNAPSHOT_ROWS
+        assert len(preview["random"]) == sampler.SNAPSHOT_ROWS
+
+
+class TestSampleRows:
+    def test_unknown_method(self, lf):
+        with pytest.raises(ValueError, match="Unknown sampling method"):
+            sample_rows(lf, "bogus", 5)
+
+    def test_stratified_needs_column(self, lf):
+        with pytest.raises(ValueError, match="needs a column"):
+            sample_rows(lf, "stratified", 5)
+
+
+class TestSampleDataset:
+    def test_parquet(self, tmp_path):
+        path = tmp_path / "data.parquet"
+        pl.DataFrame({"x": list(range(500))}).write_parquet(path, row_group_size=50)
+
+        result = sample_dataset(f"file://{path}", "tail", 2)
+
+        assert result == {"columns": ["x"], "rows": [{"x": 499}, {"x": 498}]}
+
+    def test_missing_column(self, tmp_path):
+        path = tmp_path / "data.parquet"
+        pl.DataFrame({"x": [1]}).write_parquet(path)
+
+        result = sample_dataset(f"file://{path}", "stratified", 2, column="nope")
+
+        assert result["error_type"] == "internal"
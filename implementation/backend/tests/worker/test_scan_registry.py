@@ -0,0 +1,221 @@
+"""Tests for the per-worker scan registry.
+
+Covers: ScanRegistry LRU / budget behaviour, local and remote fingerprint
+invalidation, execute_query() reporting registry hits and misses, and CSV
+datasets being read through their Parquet transcode.
+"""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+import polars as pl
+import pytest
+
+from app.workers import file_cache, scan_registry
+from app.workers.data_worker import execute_query
+from app.workers.scan_registry import ScanRegistry, local_fingerprint
+
+
+def _scan_of(path: str):
+    """Return a scan callable for ScanRegistry.get_or_register."""
+    return lambda: (pl.scan_parquet(path), None)
+
+
+@pytest.fixture
+def parquet_file(tmp_path):
+    path = tmp_path / "data.parquet"
+    pl.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}).write_parquet(path)
+    return str(path)
+
+
+class TestScanRegistryLookup:
+    """Hits, misses and schema resolution."""
+
+    def test_first_lookup_is_miss_then_hit(self, parquet_file):
+        reg = ScanRegistry()
+        reg.get_or_register(parquet_file, True, _scan_of(parquet_file))
+        reg.get_or_register(parquet_file, True, _scan_of(parquet_file))
+        assert reg.misses == 1
+        assert reg.hits == 1
+
+    def test_schema_resolved_on_registration(self, parquet_file):
+        reg = ScanRegistry()
+        entry = reg.get_or_register(parquet_file, True, _scan_of(parquet_file))
+        assert entry.schema == {"a": "Int64", "b": "String"}
+
+    def test_hit_does_not_rescan(self, parquet_file):
+        reg = ScanRegistry()
+        calls = []
+
+        def scan():
+            calls.append(1)
+            return pl.scan_parquet(parquet_file), None
+
+        reg.get_or_register(parquet_file, True, scan)
+        reg.get_or_register(parquet_file, True, scan)
+        assert len(calls) == 1
+
+    def test_modified_local_file_is_rescanned(self, parquet_file):
+        reg = ScanRegistry()
+        reg.get_or_register(parquet_file, True, _scan_of(parquet_file))
+
+        pl.DataFrame({"a": [1], "c": [2.5]}).write_parquet(parquet_file)
+        os.utime(parquet_file, ns=(1, 1))
+
+        entry = reg.get_or_register(parquet_file, True, _scan_of(parquet_file))
+        assert reg.misses == 2
+        assert entry.schema == {"a": "Int64", "c": "Float64"}
+
+    def test_evicted_local_download_is_rescanned(self, parquet_file, tmp_path):
+        reg = ScanRegistry()
+        cached = tmp_path / "cached.parquet"
+        cached.write_bytes(open(parquet_file, "rb").read())
+        url = "https://example.com/data.parquet"
+
+        with patch.object(scan_registry, "remote_fingerprint", return_value="etag-1"):
+            reg.get_or_register(url, False, lambda: (pl.scan_parquet(str(cached)), str(cached)))
+            cached.unlink()
+            assert reg.get(url, False) is None
+
+
+class TestScanRegistryRemoteRevalidation:
+    """Remote entries are only re-fingerprinted after the revalidation window."""
+
+    def test_no_head_request_within_window(self, parquet_file):
+        reg = ScanRegistry(revalidate_seconds=3600)
+        url = "https://example.com/data.parquet"
+        with patch.object(scan_registry, "remote_fingerprint", return_value="etag-1") as fp:
+            reg.get_or_register(url, False, _scan_of(parquet_file))
+            reg.get_or_register(url, False, _scan_of(parquet_file))
+        assert fp.call_count == 1
+        assert reg.hits == 1
+
+    def test_changed_etag_drops_entry(self, parquet_file):
+        reg = ScanRegistry(revalidate_seconds=0)
+        url = "https://example.com/data.parquet"
+        with patch.object(scan_registry, "remote_fingerprint", return_value="etag-1"):
+            reg.get_or_register(url, False, _scan_of(parquet_file))
+        with patch.object(scan_registry, "remote_fingerprint", return_value="etag-2"):
+            reg.get_or_register(url, False, _scan_of(parquet_file))
+        assert reg.misses == 2
+
+    def test_unreachable_server_keeps_entry(self, parquet_file):
+        reg = ScanRegistry(revalidate_seconds=0)
+        url = "https://example.com/data.parquet"
+        with patch.object(scan_registry, "remote_fingerprint", return_value="etag-1"):
+            reg.get_or_register(url, False, _scan_of(parquet_file))
+        with patch.object(scan_registry, "remote_fingerprint", return_value=None):
+            reg.get_or_register(url, False, _scan_of(parquet_file))
+        assert reg.hits == 1
+
+
+class TestScanRegistryBudget:
+    """The entry cap evicts least-recently-used scans."""
+
+    def test_entry_budget_evicts_lru(self, tmp_path):
+        reg = ScanRegistry(max_entries=2)
+        paths = []
+        for i in range(3):
+            path = str(tmp_path / f"d{i}.parquet")
+            pl.DataFrame({"a": [i]}).write_parquet(path)
+            paths.append(path)
+
+        reg.get_or_register(paths[0], True, _scan_of(paths[0]))
+        reg.get_or_register(paths[1], True, _scan_of(paths[1]))
+        reg.get_or_register(paths[0], True, _scan_of(paths[0]))  # touch d0
+        reg.get_or_register(paths[2], True, _scan_of(paths[2]))
+
+        assert reg.get(paths[1], True) is None
+        assert reg.get(paths[0], True) is not None
+        assert reg.stats["entries"] == 2
+
+
+class TestLocalFingerprint:
+    def test_missing_file_has_no_fingerprint(self, tmp_path):
+        assert local_fingerprint(str(tmp_path / "nope.parquet")) is None
+
+    def test_fingerprint_includes_size(self, parquet_file):
+        size = os.path.getsize(parquet_file)
+        assert local_fingerprint(parquet_file).startswith(f"{size}:")
+
+
+class TestExecuteQueryUsesRegistry:
+    """execute_query() reports per-call registry hits and misses."""
+
+    def test_repeat_query_hits_registry(self, parquet_file):
+        scan_registry.registry.invalidate(parquet_file)
+        datasets = [{"url": f"file://{parquet_file}", "table_name": "t"}]
+
+        first = execute_query("SELECT * FROM t", datasets)
+        second = execute_query("SELECT COUNT(*) AS n FROM t", datasets)
+
+        assert first["scan_registry"] == {"hits": 0, "misses": 1}
+        assert second["scan_registry"] == {"hits": 1, "misses": 0}
+        assert second["rows"] == [{"n": 3}]
+
+    def test_statement_error_keeps_registered_scan(self, parquet_file):
+        scan_registry.registry.invalidate(parquet_file)
+        datasets = [{"url": f"file://{parquet_file}", "table_name": "t"}]
+        execute_query("SELECT * FROM t", datasets)
+
+        result = execute_query("SELECT no_such_column FROM t", datasets)
+
+        assert result["error_type"] == "sql"
+        assert scan_registry.registry.get(parquet_file, True) is not None
+
+    def test_read_failure_drops_registered_scan(self, parquet_file):
+        scan_registry.registry.invalidate(parquet_file)
+        datasets = [{"url": f"file://{parquet_file}", "table_name": "t"}]
+        execute_query("SELECT * FROM t", datasets)
+
+        # Corrupt the file behind an unchanged (size, mtime) fingerprint.
+        st = os.stat(parquet_file)
+        with open(parquet_file, "wb") as f:
+            f.write(b"x" * st.st_size)
+        os.utime(parquet_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        result = execute_query("SELECT * FROM t", datasets)
+
+        assert result["error_type"] == "sql"
+        assert scan_registry.registry.get(parquet_file, True) is None
+
+    def test_error_result_still_reports_registry(self, parquet_file):
+        datasets = [{"url": f"file://{parquet_file}", "table_name": "t"}]
+        result = execute_query("SELEC nonsense", datasets)
+        assert result["error_type"] == "sql"
+        assert "scan_registry" in result
+
+
+class TestCsvTranscode:
+    """CSV datasets are registered as a scan of their Parquet transcode."""
+
+    def test_csv_query_reads_transcode(self, tmp_path):
+        csv_path = tmp_path / "data.csv"
+        pl.DataFrame({"a": [1, 2, 3], "d": ["2024-01-01"] * 3}).write_csv(csv_path)
+        datasets = [{"url": f"file://{csv_path}", "table_name": "t"}]
+
+        with patch.object(file_cache, "CACHE_DIR", str(tmp_path / "cache")):
+            result = execute_query("SELECT SUM(a) AS s FROM t", datasets)
+            entry = scan_registry.registry.get(str(csv_path), True)
+
+        assert result["rows"] == [{"s": 6}]
+        assert entry.local_path.endswith(file_cache.TRANSCODE_SUFFIX)
+        assert entry.schema == {"a": "Int64", "d": "Date"}
+        assert os.path.isfile(entry.local_path)
+        scan_registry.registry.invalidate(str(csv_path))
+
+    def test_evicted_transcode_is_rebuilt(self, tmp_path):
+        csv_path = tmp_path / "data.csv"
+        pl.DataFrame({"a": [1, 2, 3]}).write_csv(csv_path)
+        datasets = [{"url": f"file://{csv_path}", "table_name": "t"}]
+
+        with patch.object(file_cache, "CACHE_DIR", str(tmp_path / "cache")):
+            execute_query("SELECT * FROM t", datasets)
+            file_cache.clear_cache()
+            result = execute_query("SELECT COUNT(*) AS n FROM t", datasets)
+
+        assert result["rows"] == [{"n": 3}]
+        assert result["scan_registry"] == {"hits": 0, "misses": 1}
+        scan_registry.registry.invalidate(str(csv_path))
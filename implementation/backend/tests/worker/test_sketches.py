@@ -0,0 +1,161 @@
+"""Column sketch tests.
+
+Tests: sketches built one chunk at a time estimate distinct counts,
+quantiles and top values within their reported error bounds, merge like a
+sketch of all rows, and survive a round trip through to_dict / from_dict.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+
+import polars as pl
+import pytest
+
+from app.workers import sketches
+from app.workers.data_worker import sketch_column
+from app.workers.sketches import (
+    distinct_count,
+    from_dict,
+    merge,
+    quantile,
+    row_group_chunks,
+    sketch_chunk,
+    summarize,
+    to_dict,
+)
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = random.Random(7)
+    n = 60_000
+    return pl.DataFrame({
+        "x": [rng.gauss(0, 1) for _ in range(n)],
+        "s": [f"k{int(rng.paretovariate(1.2))}" if i % 10 else None for i in range(n)],
+        "d": pl.date_range(pl.date(2020, 1, 1), pl.date(2020, 1, 1), eager=True).extend_constant(
+            pl.date(2021, 6, 1), n - 1
+        ),
+    })
+
+
+def _sketch(df: pl.DataFrame, column: str, column_type: str, chunk_rows: int = 10_000):
+    lf = df.lazy()
+    return sketches.sketch_column(lf, column, column_type, [chunk_rows] * (df.height // chunk_rows))
+
+
+class TestRowGroupChunks:
+    def test_joins_small_groups(self, monkeypatch):
+        monkeypatch.setattr(sketches, "CHUNK_ROWS", 100)
+        assert row_group_chunks([40, 40, 40, 40]) == [(0, 80), (80, 80)]
+
+    def test_splits_large_groups(self, monkeypatch):
+        monkeypatch.setattr(sketches, "CHUNK_ROWS", 100)
+        assert row_group_chunks([250, 10]) == [(0, 100), (100, 100), (200, 60)]
+
+    def test_without_row_groups(self, monkeypatch):
+        monkeypatch.setattr(sketches, "CHUNK_ROWS", 100)
+        assert row_group_chunks([], 150) == [(0, 100), (100, 50)]
+        assert row_group_chunks([], 0) == []
+
+
+class TestEstimates:
+    def test_numeric(self, frame):
+        result = summarize(_sketch(frame, "x", "Float64"))["stats"]
+
+        true_rank = (frame["x"] <= result["median"]).mean()
+        assert abs(true_rank - 0.5) <= result["error_bounds"]["median"]
+        assert result["min"] == frame["x"].min()
+        assert result["max"] == frame["x"].max()
+        assert result["mean"] == round(frame["x"].mean(), 4)
+        relative = abs(result["distinct_count"] - frame.height) / frame.height
+        assert relative <= 4 * result["error_bounds"]["distinct_count"]
+
+    def test_string_top_values_within_bounds(self, frame):
+        result = summarize(_sketch(frame, "s", "Utf8"))["stats"]
+        exact = dict(frame["s"].drop_nulls().value_counts().iter_rows())
+        bound = result["error_bounds"]["top_5_values"]
+
+        assert result["null_count"] == frame["s"].null_count()
+        assert [v["value"] for v in result["top_5_values"]][:2] == ["k1", "k2"]
+        for item in result["top_5_values"]:
+            assert item["count"] <= exact[item["value"]] <= item["count"] + bound
+
+    def test_string_distinct_count(self, frame):
+        result = summarize(_sketch(frame, "s", "Utf8"))["stats"]
+        exact = frame["s"].drop_nulls().n_unique()
+
+        relative = abs(result["distinct_count"] - exact) / exact
+        assert relative <= 3 * result["error_bounds"]["distinct_count"]
+
+    def test_datetime(self, frame):
+        result = summarize(_sketch(frame, "d", "Date"))["stats"]
+
+        assert result["min"] == "2020-01-01"
+        assert result["max"] == "2021-06-01"
+        assert result["distinct_count"] == 2
+
+    def test_empty_column(self):
+        lf = pl.LazyFrame({"x": pl.Series([], dtype=pl.Int64)})
+
+        result = summarize(sketches.sketch_column(lf, "x", "Int64"))["stats"]
+
+        assert result["distinct_count"] == 0
+        assert result["median"] is None
+        assert result["mean"] is None
+
+
+class TestMerge:
+    def test_merge_of_halves_matches_whole(self, frame):
+        a = sketch_chunk(frame.lazy().slice(0, 30_000), "s", "string")
+        b = sketch_chunk(frame.lazy().slice(30_000), "s", "string")
+        whole = sketch_chunk(frame.lazy(), "s", "string")
+
+        merged = merge(a, b)
+
+        assert merged.registers == whole.registers
+        assert distinct_count(merged) == distinct_count(whole)
+        assert merged.null_count == whole.null_count
+
+    def test_quantile_summary_is_compressed(self, monkeypatch):
+        monkeypatch.setattr(sketches, "MAX_QUANTILE_POINTS", 600)
+        df = pl.DataFrame({"x": list(range(10_000))})
+
+        sketch = _sketch(df, "x", "Int64", chunk_rows=1_000)
+
+        assert len(sketch.points) <= 600
+        assert abs(quantile(sketch, 0.5) - 5_000) <= sketch.rank_error
+
+
+class TestPersistence:
+    def test_round_trip(self, frame):
+        sketch = _sketch(frame, "s", "Utf8")
+
+        restored = from_dict(json.loads(json.dumps(to_dict(sketch))))
+
+        assert summarize(restored) == summarize(sketch)
+
+    def test_other_hash_version_is_rejected(self, frame):
+        data = to_dict(_sketch(frame, "s", "Utf8"))
+        data["hash_version"] = "0.0.0"
+
+        assert from_dict(data) is None
+
+
+class TestSketchColumn:
+    def test_parquet_row_groups(self, tmp_path):
+        path = tmp_path / "groups.parquet"
+        pl.DataFrame({"x": list(range(5_000))}).write_parquet(path, row_group_size=1_000)
+
+        result = sketch_column(f"file://{path}", "x", "Int64")
+
+        stats = summarize(from_dict(result["sketch"]))["stats"]
+        assert abs(stats["median"] - 2_500) <= 5_000 * stats["error_bounds"]["median"] + 1
+        assert stats["max"] == 4_999
+
+    def test_missing_column(self, tmp_path):
+        path = tmp_path / "data.parquet"
+        pl.DataFrame({"x": [1]}).write_parquet(path)
+
+        assert "error" in sketch_column(f"file://{path}", "nope", "Int64")
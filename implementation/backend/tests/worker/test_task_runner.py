@@ -0,0 +1,237 @@
+"""Tests for cancellable worker tasks.
+
+Covers: killing the worker running a cancelled or timed-out task on a real
+Pool (and the Pool replacing it), skipping tasks cancelled while queued,
+task slots being released exactly once on every path, and per-worker
+memory and thread limits (a worker killed for passing its limit reports
+"memory", any other worker death a crash; a multi-threaded query runs
+under the default limit),
+warm forkserver workers and recycling by memory growth.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import polars as pl
+import pytest
+
+from app.config import Settings
+from app.services import worker_pool
+from app.services.worker_pool import TaskCancelledError, _apply, _run_query, start
+from app.workers import task_runner
+from app.workers.task_runner import MAX_TASK_SLOTS, threads_per_worker
+
+
+_DEFAULT_MEMORY_LIMIT = Settings.model_fields["worker_memory_limit"].default
+
+
+def _slow(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def _slow_query(sql, datasets, *args):
+    time.sleep(30)
+    return {"rows": [], "columns": [], "total_rows": 0}
+
+
+def _touch(path: str) -> None:
+    open(path, "w").close()
+
+
+async def _settled(slots) -> None:
+    """Wait for kill escalations and late callbacks to release all slots."""
+    await asyncio.gather(*list(worker_pool._kill_tasks))
+    for _ in range(100):
+        if slots.in_use == 0:
+            break
+        await asyncio.sleep(0.05)
+    assert slots.in_use == 0
+    # Each slot is back on the free list exactly once.
+    assert sorted(slots._free) == list(range(MAX_TASK_SLOTS))
+
+
+@pytest.fixture
+def pool():
+    wp = start(pool_size=1)
+    yield wp
+    wp.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def short_grace():
+    with patch.object(worker_pool, "KILL_GRACE_SECONDS", 0.1):
+        yield
+
+
+@pytest.mark.slow
+class TestCancelRunningTask:
+    async def test_cancel_kills_worker_and_pool_recovers(self, pool):
+        slots = pool._slots
+        cancel = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.5, cancel.set)
+
+        started = time.monotonic()
+        with pytest.raises(TaskCancelledError):
+            await _apply(pool._pool, _slow, (30,), slots, cancel)
+        assert time.monotonic() - started < 5
+        await _settled(slots)
+        assert slots.killed == 1
+        assert not pool._pool._cache  # the killed job's entry was dropped
+
+        # The Pool replaced the killed worker and keeps serving tasks.
+        assert await _apply(pool._pool, pow, (2, 10), slots) == 1024
+        await _settled(slots)
+
+    async def test_run_query_returns_cancelled_error(self, pool):
+        cancel = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.5, cancel.set)
+        with patch.object(worker_pool, "_execute_query", _slow_query):
+            result = await _run_query(
+                pool._pool, "SELECT 1", [], slots=pool._slots, cancel_event=cancel
+            )
+        assert result["error_type"] == "cancelled"
+        await _settled(pool._slots)
+        assert pool._slots.killed == 1
+
+    async def test_timeout_kills_worker(self, pool):
+        with patch.object(worker_pool, "QUERY_TIMEOUT", 0.5), \
+                patch.object(worker_pool, "_execute_query", _slow_query):
+            result = await _run_query(pool._pool, "SELECT 1", [], slots=pool._slots)
+        assert result["error_type"] == "timeout"
+        await _settled(pool._slots)
+        assert pool._slots.killed == 1
+
+
+@pytest.mark.slow
+class TestCancelQueuedTask:
+    async def test_queued_task_is_skipped_without_killing(self, pool, tmp_path):
+        slots = pool._slots
+        marker = str(tmp_path / "ran")
+        busy = asyncio.ensure_future(_apply(pool._pool, _slow, (1,), slots))
+        await asyncio.sleep(0.2)  # let the single worker pick up the busy task
+
+        cancel = asyncio.Event()
+        cancel.set()
+        with pytest.raises(TaskCancelledError):
+            await _apply(pool._pool, _touch, (marker,), slots, cancel)
+
+        assert await busy == 1
+        await _settled(slots)
+        assert slots.killed == 0
+        assert not os.path.exists(marker)
+
+    async def test_completed_task_releases_slot(self, pool):
+        assert await _apply(pool._pool, pow, (3, 2), pool._slots) == 9
+        await _settled(pool._slots)
+
+
+@pytest.mark.slow
+class TestWorkerLimits:
+    async def test_crashed_worker_reports_crash(self, pool):
+        slots = pool._slots
+        with patch.object(worker_pool, "WORKER_CHECK_INTERVAL", 0.05), \
+                patch.object(worker_pool, "_execute_query", _abort_query):
+            started = time.monotonic()
+            result = await _run_query(pool._pool, "SELECT 1", [], slots=slots)
+        assert result["error_type"] == "internal"
+        assert "crashed" in result["message"]
+        assert time.monotonic() - started < 5
+        await _settled(slots)
+        assert slots.crashed == 1
+        assert not pool._pool._cache
+
+        # The Pool replaced the dead worker.
+        assert await _apply(pool._pool, pow, (2, 3), slots) == 8
+        await _settled(slots)
+
+    async def test_worker_over_memory_limit_reports_memory_error(self):
+        wp = start(pool_size=1, memory_limit_mb=_DEFAULT_MEMORY_LIMIT)
+        slots = wp._slots
+        try:
+            with patch.object(worker_pool, "WORKER_CHECK_INTERVAL", 0.05), \
+                    patch.object(worker_pool, "_execute_query", _hog_query):
+                started = time.monotonic()
+                result = await _run_query(wp._pool, "SELECT 1", [], slots=slots)
+            assert result["error_type"] == "memory"
+            assert time.monotonic() - started < 10
+            await _settled(slots)
+            assert slots.crashed == 1
+        finally:
+            wp.shutdown()
+
+    async def test_multithreaded_query_runs_under_default_limit(self, tmp_path):
+        path = tmp_path / "data.parquet"
+        pl.DataFrame({"g": [i % 10 for i in range(1_000_000)], "v": range(1_000_000)}).write_parquet(path)
+        with patch.object(worker_pool, "threads_per_worker", return_value=4):
+            wp = start(pool_size=1, memory_limit_mb=_DEFAULT_MEMORY_LIMIT)
+        try:
+            threads = await _apply(wp._pool, os.getenv, ("POLARS_MAX_THREADS",), wp._slots)
+            result = await wp.run_query(
+                "SELECT g, SUM(v) AS total FROM t GROUP BY g",
+                [{"url": str(path), "table_name": "t"}],
+            )
+        finally:
+            wp.shutdown()
+        assert threads == "4"
+        assert "error_type" not in result, result
+        assert result["total_rows"] == 10
+
+
+def _inflate_rss() -> None:
+    # Make this worker look like it outgrew its memory budget.
+    task_runner._baseline_rss = -(1 << 50)
+
+
+def _polars_loaded() -> bool:
+    return "polars" in sys.modules
+
+
+@pytest.mark.slow
+class TestWorkerRecycling:
+    async def test_workers_start_warm_from_forkserver(self, pool):
+        assert pool._pool._ctx.get_start_method() == "forkserver"
+        assert await _apply(pool._pool, _polars_loaded, (), pool._slots) is True
+        await _settled(pool._slots)
+        assert pool.task_stats["cold_tasks"] == 1
+
+    async def test_outgrown_worker_retires_and_task_is_resubmitted(self, pool):
+        slots = pool._slots
+        with patch.object(worker_pool, "WORKER_CHECK_INTERVAL", 0.05):
+            await _apply(pool._pool, _inflate_rss, (), slots)
+            assert await _apply(pool._pool, pow, (2, 5), slots) == 32
+        await _settled(slots)
+        assert pool.task_stats["workers_retired"] == 1
+        assert pool.task_stats["tasks_run"] == 2
+        # Both tasks ran on a fresh worker.
+        assert pool.task_stats["cold_tasks"] == 2
+        assert not pool._pool._cache
+
+    async def test_worker_runs_many_tasks_without_recycling(self, pool):
+        for n in range(60):
+            assert await _apply(pool._pool, pow, (n, 1), pool._slots) == n
+        await _settled(pool._slots)
+        assert pool.task_stats["cold_tasks"] == 1
+        assert pool.task_stats["workers_retired"] == 0
+
+
+def _abort_query(sql, datasets, *args):
+    os.abort()
+
+
+def _hog_query(sql, datasets, *args):
+    hog = b"x" * ((_DEFAULT_MEMORY_LIMIT + 256) << 20)  # touched, so resident
+    time.sleep(30)
+    return {"rows": [], "columns": [], "total_rows": len(hog)}
+
+
+class TestThreadsPerWorker:
+    def test_splits_cores_between_workers(self):
+        with patch("os.sched_getaffinity", return_value=set(range(8)), create=True):
+            assert threads_per_worker(4) == 2
+            assert threads_per_worker(16) == 1
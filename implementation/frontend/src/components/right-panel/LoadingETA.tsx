@@ -1,8 +1,10 @@
 // Elapsed time display for datasets in loading state.
-// Shows incrementing seconds with reassuring messages at thresholds.
+// Shows incrementing seconds with reassuring messages at thresholds,
+// and bytes downloaded while the server reports a download in progress.
 
 import { useEffect, useState } from "react";
 import { useDatasetStore } from "@/stores/datasetStore";
+import { formatFileSize } from "@/utils/fileSize";
 
 interface LoadingETAProps {
   datasetId: string;
@@ -26,6 +28,9 @@ export function LoadingETA({ datasetId }: LoadingETAProps) {
   const startTime = useDatasetStore(
     (s) => s.loadingStartTimes[datasetId]
   );
+  const progress = useDatasetStore(
+    (s) => s.datasets.find((d) => d.id === datasetId)?.load_progress
+  );
   const [elapsed, setElapsed] = useState(0);
 
   useEffect(() => {
@@ -44,6 +49,12 @@ export function LoadingETA({ datasetId }: LoadingETAProps) {
   if (startTime == null) return null;
 
   const message = getMessage(elapsed);
+  const downloaded =
+    progress?.phase === "downloading" && progress.bytes_done != null
+      ? progress.bytes_total
+        ? `${formatFileSize(progress.bytes_done)} of ${formatFileSize(progress.bytes_total)}`
+        : formatFileSize(progress.bytes_done)
+      : null;
 
   return (
     <div
@@ -52,6 +63,9 @@ export function LoadingETA({ datasetId }: LoadingETAProps) {
       style={{ color: "var(--color-text-secondary)" }}
     >
       Loading... {formatElapsed(elapsed)}
+      {downloaded && (
+        <span data-testid="loading-eta-bytes"> ({downloaded})</span>
+      )}
       {message && (
         <span data-testid="loading-eta-message">
           {" "}&mdash; {message}
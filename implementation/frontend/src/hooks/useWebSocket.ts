@@ -4,7 +4,7 @@
 // Disconnects on unmount/logout.
 // Routes incoming events to Zustand stores:
 //   chat_token / chat_complete / chat_error -> chatStore
-//   dataset_loaded / dataset_error -> datasetStore
+//   dataset_loading / dataset_loaded / dataset_error -> datasetStore
 //   usage_update / rate_limit_warning -> uiStore + invalidate ["usage"] query
 
 import { useEffect, useRef } from "react";
@@ -12,7 +12,7 @@ import { useQueryClient } from "@tanstack/react-query";
 import { ChatDFSocket } from "@/lib/websocket";
 import { useChatStore, type SqlExecution, type TraceEntry } from "@/stores/chatStore";
 import { useConnectionStore } from "@/stores/connectionStore";
-import { useDatasetStore } from "@/stores/datasetStore";
+import { useDatasetStore, type ColumnProfile } from "@/stores/datasetStore";
 import { useQueryHistoryStore } from "@/stores/queryHistoryStore";
 import { useToastStore } from "@/stores/toastStore";
 
@@ -213,12 +213,60 @@ export function useWebSocket(isAuthenticated: boolean): void {
           }
           break;
         }
+        case "dl": { // dataset_loading (compressed): phase / bytes downloaded
+          const datasetStore = useDatasetStore.getState();
+          const dsId = msg.did as string;
+          if (dsId && datasetStore.datasets.some((d) => d.id === dsId)) {
+            datasetStore.updateDataset(dsId, {
+              status: "loading",
+              load_progress: {
+                phase: (msg.ph as string) ?? "queued",
+                bytes_done: (msg.bd as number) ?? null,
+                bytes_total: (msg.bt as number) ?? null,
+              },
+            });
+          }
+          break;
+        }
+        case "dld": { // dataset_loaded (compressed)
+          const datasetStore = useDatasetStore.getState();
+          const dsId = msg.did as string;
+          if (!dsId) break;
+          const updates = {
+            name: msg.n as string,
+            row_count: msg.rc as number,
+            column_count: msg.cc as number,
+            schema_json: JSON.stringify(msg.sc ?? []),
+            status: "ready" as const,
+            error_message: null,
+            file_size_bytes: (msg.fs as number) ?? null,
+            load_progress: undefined,
+          };
+          if (datasetStore.datasets.some((d) => d.id === dsId)) {
+            datasetStore.updateDataset(dsId, updates);
+          } else {
+            // Loaded by the assistant, or before the HTTP response arrived
+            datasetStore.addDataset({
+              id: dsId,
+              conversation_id:
+                (msg.cid as string) ||
+                useChatStore.getState().activeConversationId ||
+                "",
+              url: (msg.u as string) ?? "",
+              ...updates,
+            });
+          }
+          break;
+        }
+        case "de": // dataset_error (compressed)
         case "dataset_error": {
           const datasetStore = useDatasetStore.getState();
-          if (msg.dataset_id) {
-            datasetStore.updateDataset(msg.dataset_id as string, {
+          const dsId = (msg.dataset_id || msg.did) as string | undefined;
+          if (dsId) {
+            datasetStore.updateDataset(dsId, {
               status: "error",
-              error_message: (msg.error as string) ?? "Unknown error",
+              error_message: ((msg.error || msg.e) as string) ?? "Unknown error",
+              load_progress: undefined,
             });
           }
           break;
@@ -226,17 +274,7 @@ export function useWebSocket(isAuthenticated: boolean): void {
         case "dataset_profiled": {
           const datasetStore = useDatasetStore.getState();
           const dsId = msg.dataset_id as string;
-          const profiles = msg.profiles as Array<{
-            name: string;
-            null_count: number;
-            null_percent: number;
-            unique_count: number;
-            min?: number | null;
-            max?: number | null;
-            mean?: number | null;
-            min_length?: number | null;
-            max_length?: number | null;
-          }>;
+          const profiles = msg.profiles as ColumnProfile[];
           if (dsId && profiles) {
             datasetStore.setColumnProfiles(dsId, profiles);
           }
@@ -13,6 +13,13 @@ export interface Dataset {
   status: "loading" | "ready" | "error";
   error_message: string | null;
   file_size_bytes?: number | null;
+  load_progress?: DatasetLoadProgress;
+}
+
+export interface DatasetLoadProgress {
+  phase: string;
+  bytes_done: number | null;
+  bytes_total: number | null;
 }
 
 export interface ColumnProfile {
@@ -25,6 +32,8 @@ export interface ColumnProfile {
   mean?: number | null;
   min_length?: number | null;
   max_length?: number | null;
+  top_values?: Array<{ value: string | number | boolean; count: number }>;
+  histogram?: { edges: number[]; counts: number[] };
 }
 
 interface DatasetState {